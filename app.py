@@ -6,11 +6,23 @@ import matplotlib.font_manager as fm
 import platform
 import calendar as cal_mod
 from math import radians, sin, cos, sqrt, atan2
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from io import BytesIO
 from pathlib import Path
 import sys
 import requests
 
+from calendar_bits import days_to_mask, month_grid, month_occupancy
+from booking_import import load_bookings, trailing_summary
+from comps import SPEC_COLS, TARGET_COLS, CompsEngine, comps_summary, find_coord_cols
+from rerun_profiler import PROFILE_DIR, start_rerun_profiler
+from memory_diagnostics import REPORT_QUERY, TRACKER as memory_tracker, start_if_enabled as start_memtrace
+from report_export import ReportService
+from listing_store import STATS_QUERY as QUERY_STATS_QUERY, ListingStore, source_version, \
+    RAW_PATH, CLUSTERED_PATH, AO_PATH
+from result_cache import STATS_QUERY as CACHE_STATS_QUERY, ResultCache
+from session_store import SessionVault, current_session, streamlit_session_alive
+
 # ── 페이지 설정 ───────────────────────────────────────────────────────────────
 st.set_page_config(
     page_title="에어비앤비 수익 최적화",
@@ -19,6 +31,10 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# ── 옵트인 프로파일링 (AIRBNB_PROFILE=1, 또는 AIRBNB_PROFILE_QUERY=1 서버의 ?profile=1) ──
+_profiler = start_rerun_profiler(st.query_params, __file__)
+start_memtrace()  # AIRBNB_MEMTRACE=1 서버만 — 단계별 메모리 잔존량 추적
+
 # ── 한글 폰트 ─────────────────────────────────────────────────────────────────
 def set_korean_font():
     import os
@@ -379,61 +395,141 @@ CLUSTER_INFO = {
 }
 
 # ── 데이터 로드 ───────────────────────────────────────────────────────────────
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/raw/seoul_airbnb_cleaned.csv")
-    cluster_df = pd.read_csv("data/processed/district_clustered.csv")
-    df = df.merge(
-        cluster_df[["district", "cluster", "cluster_name"]],
-        on="district", how="left",
-    )
-    return df, cluster_df
-
-@st.cache_data
-def build_poi_db():
-    """데이터셋에서 유니크 POI 목록 추출"""
-    df = pd.read_csv("data/raw/seoul_airbnb_cleaned.csv")
-    cols = ["nearest_poi_name", "nearest_poi_addr", "nearest_poi_type_name",
-            "nearest_poi_lat", "nearest_poi_lng"]
-    poi_df = df[cols].dropna(subset=["nearest_poi_name", "nearest_poi_lat", "nearest_poi_lng"])
-    poi_df = poi_df.drop_duplicates(subset=["nearest_poi_name"]).reset_index(drop=True)
-    return poi_df
-
-df, cluster_df = load_data()
-active_df = df[
-    (df["refined_status"] == "Active") & (df["operation_status"] == "Operating")
-].copy()
-poi_db = build_poi_db()
+def file_version(path):
+    """파일 mtime — 집계 테이블이 교체되면 캐시를 새로 만들도록 캐시 키로 사용"""
+    return Path(path).stat().st_mtime_ns
+
+@st.cache_resource(max_entries=2)
+def get_listing_store(sources_version):
+    """프로세스당 1개 — 원본·자치구 군집·AO CSV 를 인덱스된 SQLite 로 적재한 조회 계층 (원본이 바뀌면 재구축)"""
+    return ListingStore.open()
+
+@st.cache_data(max_entries=2)
+def build_poi_db(sources_version):
+    """데이터셋에서 유니크 POI 목록 추출 (이름별 첫 행, 좌표 있는 것만)"""
+    return get_listing_store(sources_version).pois()
+
+listing_version = source_version(RAW_PATH, CLUSTERED_PATH, AO_PATH)
+listing_store   = get_listing_store(listing_version)
+poi_db          = build_poi_db(listing_version)
+
+@st.cache_resource(max_entries=2)
+def get_comps_engine(sources_version):
+    """숙소 유형별 유사 숙소 KD-tree — 원본에 위·경도 컬럼이 없으면 None (리스팅 원본이 바뀌면 재생성)
+
+    실운영 행 중 KD-tree 에 필요한 컬럼 (숙소 유형·위경도·스펙 5개·목표값 3개) 만 저장소에서 읽습니다.
+    """
+    store = get_listing_store(sources_version)
+    coords = find_coord_cols(store.columns)
+    if coords is None:
+        return None
+    return CompsEngine(store.active(["room_type", *coords, *SPEC_COLS, *TARGET_COLS]), coord_cols=coords)
 
 # ── ML 모델 로드 (INTEGRATION_GUIDE.md 캐싱 패턴) ─────────────────────────────
 _PKG_DIR = Path(__file__).parent / "revpar_model_package"
 if str(_PKG_DIR) not in sys.path:
     sys.path.insert(0, str(_PKG_DIR))
 
-from predict_utils import load_models, predict_revpar, compute_health_score  # noqa: E402
+from predict_utils import predict_revpar, compute_health_score  # noqa: E402
+from lever_optimizer import optimize_levers, describe_levers  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+from new_host_lattice import LATTICE_FILE, NewHostLattice  # noqa: E402
+from district_stats import DistrictStatsIndex  # noqa: E402
+from explain import explain_listing, CATEGORY_LABELS, FEATURE_LABELS  # noqa: E402
+from seasonality import SeasonalityProfiles, PROFILES_PATH, project_12m, trend_from_revpar  # noqa: E402
+from cell_clusters import CellClusterMap, CELL_CLUSTERS_PATH  # noqa: E402
+from elasticity import ElasticityTable, ELASTICITY_PATH, ELASTICITY_CLIP  # noqa: E402
+from supply_shock import model_frame, simulate_supply_shock, supply_grid  # noqa: E402
+from price_calendar import dow_factors, price_calendar, to_csv, to_ical  # noqa: E402
+from health_leaderboard import HealthLeaderboard, LEADERBOARD_PATH  # noqa: E402
 
 @st.cache_resource
-def load_ml_models():
-    return load_models(_PKG_DIR / "models")
-
-@st.cache_data
-def load_district_lookup():
+def get_model_registry():
+    """프로세스당 1개 — models/ 를 감시해 검증된 새 아티팩트로 교체"""
+    return ModelRegistry(_PKG_DIR / "models")
+
+@st.cache_resource(max_entries=2)
+def get_new_host_lattice(model_version, lattice_version):
+    """신규 호스터 사전 계산 격자 — 파일이 없거나 (배포 시 생성) 현재 모델과 다르면 None (실시간 예측)"""
+    return NewHostLattice.load(_PKG_DIR / "models")
+
+@st.cache_resource(max_entries=2)
+def get_seasonality(profiles_version):
+    """자치구·클러스터별 월 계절 지수 — 프로필 파일이 없으면 평탄 (전부 1.0)"""
+    return SeasonalityProfiles.load(PROFILES_PATH)
+
+@st.cache_resource(max_entries=2)
+def get_cell_clusters(cells_version):
+    """격자 셀 시장 군집 (좌표 → 셀 O(1)) — cell_clusters.csv 가 없으면 None"""
+    return CellClusterMap.load(CELL_CLUSTERS_PATH)
+
+@st.cache_resource(max_entries=2)
+def get_elasticity_table(table_version):
+    """시장 유형 × 숙소 유형별 추정 탄력성 — elasticity.csv 가 없으면 빈 테이블 (CLUSTER_INFO 기본값)"""
+    return ElasticityTable.load(ELASTICITY_PATH)
+
+@st.cache_data(max_entries=2)
+def load_district_lookup(lookup_version):
     return pd.read_csv(str(_PKG_DIR / "district_lookup.csv")).set_index("district")
 
 @st.cache_data
 def load_cluster_listings():
     return pd.read_csv(str(_PKG_DIR / "cluster_listings_ao.csv"))
 
-ml_artifacts       = load_ml_models()
-ml_district_lookup = load_district_lookup()
-ml_ao_df           = load_cluster_listings()
+# rerun 시작 시점의 모델 버전을 이번 실행 끝까지 사용 (새 버전은 다음 rerun부터)
+ml_version, ml_artifacts = get_model_registry().current()
+ml_lookup_version  = file_version(_PKG_DIR / "district_lookup.csv")
+ml_district_lookup = load_district_lookup(ml_lookup_version)
+
+@st.cache_resource
+def get_district_stats():
+    """자치구별 사진 수·평점·리뷰 수·최소박 평균 (Active+Operating) — *_rel_dist 피처용"""
+    return DistrictStatsIndex.from_listings(load_cluster_listings())
+
+@st.cache_resource(max_entries=2)
+def get_health_leaderboard(board_version, ao_version):
+    """클러스터·자치구별 정렬된 헬스 종합 점수 — 배치 파일이 없으면 AO 전체를 바로 채점"""
+    return HealthLeaderboard.load(LEADERBOARD_PATH) or HealthLeaderboard.from_listings(load_cluster_listings())
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_optimize_levers(listing_items: tuple, opex_per_month: float, district: str, model_version: str, top_k: int = 3):
+    return optimize_levers(dict(listing_items), opex_per_month, top_k,
+                           rel_dist_means=get_district_stats().means(district), **ml_artifacts)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_explain(listing_items: tuple, model_version: str):
+    """AI 예측 근거 (TreeSHAP 기여도) — 같은 입력이면 재계산 없이 반환"""
+    return explain_listing(dict(listing_items), **ml_artifacts)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_supply_shock(district: str, grid: tuple, sources_version, lookup_version, model_version: str):
+    """자치구 AO 리스팅 전체 × 공급 변화 그리드 배치 재채점 → 변화율 분포 요약 (리스팅이 없으면 None)"""
+    frame = model_frame(listing_store.district_rows(district), ml_district_lookup, get_district_stats())
+    if frame.empty:
+        return None
+    return simulate_supply_shock(frame, grid, **ml_artifacts).summary()
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_supply_shock_listing(listing_items: tuple, grid: tuple, model_version: str):
+    """내 숙소 1건 × 공급 변화 그리드 → added 인덱스의 ADR·RevPAR 와 변화율"""
+    res = simulate_supply_shock(pd.DataFrame([dict(listing_items)]), grid, **ml_artifacts)
+    return pd.DataFrame({"adr": res.adr[:, 0], "revpar": res.revpar[:, 0],
+                         "adr_shift": res.adr_shift[:, 0], "revpar_shift": res.revpar_shift[:, 0]},
+                        index=res.grid)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_booking_summary(data: bytes, filename: str, today: date, short_history: bool = False):
+    """예약 내역 파일 → 최근 12개월 평일/주말 예약률 (예약 없는 달은 0%, 같은 파일·같은 날이면 재계산 없이 반환)"""
+    return trailing_summary(load_bookings(data, filename), today=today, short_history=short_history)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_bench(district, room_type, sources_version):
+    """실운영 중 같은 자치구 × 숙소 종류 — (is_active, district, room_type) 인덱스 조회"""
+    return listing_store.bench(district, room_type)
 
 # ── 헬퍼 함수 ────────────────────────────────────────────────────────────────
 def get_bench(district, room_type):
-    return active_df[
-        (active_df["district"] == district) &
-        (active_df["room_type"] == room_type)
-    ]
+    return cached_bench(district, room_type, listing_version)
 
 def bench_val(bench, col, default, pct=50):
     if len(bench) > 0 and col in bench.columns:
@@ -467,7 +563,14 @@ def geocode_address(address: str):
     return None, None, None
 
 def find_nearby_pois(lat, lng, max_km=2.0):
-    """반경 max_km 내 POI 목록 반환 (거리 순 정렬)"""
+    """반경 max_km 내 POI 목록 반환 (거리 순 정렬) — 같은 좌표·반경은 공유 결과 캐시에서"""
+    return get_result_cache().get_or_compute(
+        "poi", file_version("data/raw/seoul_airbnb_cleaned.csv"),
+        {"lat": lat, "lng": lng, "max_km": max_km},
+        lambda: scan_nearby_pois(lat, lng, max_km),
+    )
+
+def scan_nearby_pois(lat, lng, max_km):
     results = []
     for _, row in poi_db.iterrows():
         dist = haversine_km(lat, lng, row["nearest_poi_lat"], row["nearest_poi_lng"])
@@ -522,7 +625,32 @@ def init_state():
         if k not in st.session_state:
             st.session_state[k] = v
 
+@st.cache_resource
+def get_report_service():
+    """프로세스당 1개 — 리포트 HTML/PDF 를 스크립트 스레드 밖에서 생성하는 스레드 풀"""
+    return ReportService(max_workers=2)
+
+@st.cache_resource
+def get_result_cache():
+    """프로세스당 1개 — 호스트의 모든 워커가 공유하는 SQLite 결과 캐시 (예측·헬스스코어·주변 POI)"""
+    return ResultCache()
+
+@st.cache_resource
+def get_session_vault():
+    """프로세스당 1개 — 15분 이상 유휴 세션을 압축 블롭으로 보관 (닫힌 세션은 스윕 때 정리)"""
+    return SessionVault(idle_seconds=900, is_alive=streamlit_session_alive)
+
+# 복원 키는 Streamlit 세션 id — 공유 가능한 URL 이 아니라 같은 브라우저 세션만 자기 상태를 되찾음
+_session_id, _ = current_session()
+if "step" not in st.session_state:
+    st.session_state.update(get_session_vault().restore(_session_id) or {})
+
+def touch_session():
+    """전체 rerun 과 fragment 재실행마다 — 유휴 시각 갱신 (fragment 만 도는 동안 세션 키가 비워지지 않도록)"""
+    get_session_vault().touch(*current_session())
+
 init_state()
+touch_session()
 
 # ── 공통 UI 컴포넌트 ─────────────────────────────────────────────────────────
 def render_logo():
@@ -629,6 +757,14 @@ def section_title(title, subtitle=""):
     sub = f'<p style="color:#888;font-size:13px;margin:4px 0 16px;">{subtitle}</p>' if subtitle else ""
     st.markdown(f'<h3 style="color:#484848;margin:0 0 4px;font-weight:700;">{title}</h3>{sub}', unsafe_allow_html=True)
 
+def show_chart(fig, key):
+    """st.pyplot 과 같은 설정으로 PNG 를 한 번 굽고 화면 표시 + 리포트용으로 보관"""
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    st.session_state.setdefault("report_charts", {})[key] = buf.getvalue()
+    st.image(buf, width="stretch")
+
 # ── 달력 컴포넌트 ─────────────────────────────────────────────────────────────
 def render_calendar():
     """인터랙티브 달력: 예약된 날짜 클릭 선택 → 예약률 반환"""
@@ -684,9 +820,7 @@ def render_calendar():
     st.markdown(header_html, unsafe_allow_html=True)
 
     # ── 달력 그리드 — 일요일 시작 ────────────────────────────────────────────
-    cal_mod.setfirstweekday(6)   # 6 = Sunday first
-    month_cal = cal_mod.monthcalendar(year, month)
-    cal_mod.setfirstweekday(0)   # 원상복구 (Monday)
+    month_cal = month_grid(year, month)   # 일요일 시작 (전역 firstweekday 미변경)
     year_holidays = HOLIDAYS.get(year, {})
 
     for w_idx, week in enumerate(month_cal):
@@ -761,30 +895,52 @@ def render_calendar():
     </div>
     """, unsafe_allow_html=True)
 
-    booked_count = len(booked)
-    occ_rate = booked_count / days_in_month if days_in_month > 0 else 0
-
-    # 평일 / 주말 분리 (월~금=평일, 토~일=주말)
-    weekdays_total = weekends_total = weekdays_booked = weekends_booked = 0
-    for d in range(1, days_in_month + 1):
-        dow = datetime(year, month, d).weekday()  # 0=Mon..4=Fri, 5=Sat, 6=Sun
-        if dow >= 5:
-            weekends_total += 1
-            if d in booked:
-                weekends_booked += 1
-        else:
-            weekdays_total += 1
-            if d in booked:
-                weekdays_booked += 1
-
-    weekday_occ = weekdays_booked / weekdays_total if weekdays_total > 0 else 0
-    weekend_occ = weekends_booked / weekends_total if weekends_total > 0 else 0
+    # 평일 / 주말 분리 (월~금=평일, 토~일=주말) — 월별 요일 마스크 AND + popcount
+    occ = month_occupancy(year, month, days_to_mask(booked))
+    occ_rate, booked_count = occ["occ_rate"], occ["booked"]
+    weekday_occ, weekend_occ = occ["weekday_occ"], occ["weekend_occ"]
+    weekdays_booked, weekdays_total = occ["weekdays_booked"], occ["weekdays_total"]
+    weekends_booked, weekends_total = occ["weekends_booked"], occ["weekends_total"]
 
     return (occ_rate, booked_count, days_in_month,
             weekday_occ, weekend_occ,
             weekdays_booked, weekdays_total,
             weekends_booked, weekends_total)
 
+def render_booking_import():
+    """iCal / CSV 예약 내역 업로드 → render_calendar 와 같은 9개 값 (월 평균), 가져온 내역이 없으면 None"""
+    imported = st.session_state.get("booking_import")
+    with st.expander("📥 예약 내역 파일로 한 번에 입력 (iCal / CSV)", expanded=imported is not None):
+        st.caption("에어비앤비 캘린더 내보내기(.ics) 또는 예약 내역 CSV를 올리면 최근 12개월 예약률을 "
+                   "한 번에 계산합니다. 호스트가 막아 둔 날과 취소된 예약은 빠지고, 예약이 없는 달은 0%로 셉니다.")
+        nonce = st.session_state.get("booking_file_nonce", 0)
+        up = st.file_uploader("예약 내역 파일", type=["ics", "csv"], key=f"booking_file_{nonce}",
+                              label_visibility="collapsed")
+        short = st.checkbox("운영한 지 12개월이 안 됐어요 (첫 예약 달부터 계산)", key="booking_short_history")
+        if up is not None:
+            try:
+                imported = cached_booking_summary(up.getvalue(), up.name, date.today(), short)
+                st.session_state.booking_import = imported
+            except ValueError as e:
+                st.error(f"파일을 읽지 못했습니다: {e}")
+        if imported is not None:
+            monthly = pd.DataFrame(imported["monthly"])
+            monthly.index = [f"{y}-{m:02d}" for y, m in zip(monthly["year"], monthly["month"])]
+            st.caption(f"{imported['start']:%Y년 %m월} ~ {imported['end']:%Y년 %m월} "
+                       f"({imported['months']}개월) · {imported['nights']:,}박")
+            st.bar_chart(monthly[["weekday_occ", "weekend_occ"]].rename(
+                columns={"weekday_occ": "평일", "weekend_occ": "주말"}), height=180)
+            if st.button("↩ 달력으로 직접 입력", key="booking_clear"):
+                st.session_state.booking_import = None
+                st.session_state.booking_file_nonce = nonce + 1   # 업로더 비우기
+                st.rerun()
+    if imported is None:
+        return None
+    return (imported["occ_rate"], imported["booked"], imported["days_in_month"],
+            imported["weekday_occ"], imported["weekend_occ"],
+            imported["weekdays_booked"], imported["weekdays_total"],
+            imported["weekends_booked"], imported["weekends_total"])
+
 # ─────────────────────────────────────────────────────────────────────────────
 # STEP 1 — 숙소 기본 정보 + 호스터 유형 선택
 # ─────────────────────────────────────────────────────────────────────────────
@@ -801,9 +957,11 @@ def step1():
             '<div style="font-weight:600;font-size:14px;margin-bottom:6px;">📍 자치구</div>',
             unsafe_allow_html=True,
         )
-        districts = sorted(df["district"].dropna().unique())
+        districts = listing_store.districts()
         options_kr = [DISTRICT_KR.get(d, d) for d in districts]
-        default_idx = districts.index("Mapo-gu") if "Mapo-gu" in districts else 0
+        _cur = st.session_state.district  # 2단계에서 주소 기준으로 바꾼 자치구 유지
+        default_idx = (districts.index(_cur) if _cur in districts
+                       else districts.index("Mapo-gu") if "Mapo-gu" in districts else 0)
         sel_kr = st.selectbox("자치구 선택", options_kr, index=default_idx, label_visibility="collapsed")
         st.session_state.district = districts[options_kr.index(sel_kr)]
 
@@ -1074,18 +1232,21 @@ def step2_existing():
     )
     st.session_state.my_adr = my_adr
 
-    # ── 달력 예약률 ──────────────────────────────────────────────────────────
-    st.markdown(
-        '<div style="font-weight:700;font-size:14px;color:#484848;margin:20px 0 6px;">📅 예약된 날짜 선택</div>'
-        '<div style="font-size:12px;color:#888;margin-bottom:12px;">'
-        '예약이 완료된 날짜를 클릭하세요. 빨간 날짜 = 예약됨 / 회색 = 비어있음</div>',
-        unsafe_allow_html=True,
-    )
+    # ── 달력 예약률 (예약 내역 파일을 가져왔으면 최근 12개월 월 평균) ────────
+    occ = render_booking_import()
+    if occ is None:
+        st.markdown(
+            '<div style="font-weight:700;font-size:14px;color:#484848;margin:20px 0 6px;">📅 예약된 날짜 선택</div>'
+            '<div style="font-size:12px;color:#888;margin-bottom:12px;">'
+            '예약이 완료된 날짜를 클릭하세요. 빨간 날짜 = 예약됨 / 회색 = 비어있음</div>',
+            unsafe_allow_html=True,
+        )
+        occ = render_calendar()
 
     (occ_rate, booked_count, days_in_month,
      weekday_occ, weekend_occ,
      wd_booked, wd_total,
-     we_booked, we_total) = render_calendar()
+     we_booked, we_total) = occ
     st.session_state.my_occ_pct = int(occ_rate * 100)
     st.session_state.weekday_occ_pct = int(weekday_occ * 100)
     st.session_state.weekend_occ_pct = int(weekend_occ * 100)
@@ -1318,6 +1479,271 @@ def step4_existing():
             st.session_state.step = 5
             st.rerun()
 
+# ─────────────────────────────────────────────────────────────────────────────
+# STEP 5 부분 재실행 단위 (st.fragment)
+# 탭 안의 위젯을 조작하면 이 함수만 다시 실행됩니다 — 데이터 준비·ML 예측·
+# 다른 탭은 건드리지 않습니다. 인자는 step5()가 한 번 계산한 공유 분석값입니다.
+# ─────────────────────────────────────────────────────────────────────────────
+@st.cache_data(show_spinner=False)
+def price_sim_curve(my_adr, my_occ, elasticity, total_opex):
+    """요금 변화율 -30%~+50% 구간의 월 순이익 곡선 (슬라이더와 무관하게 1회 계산)"""
+    x_range = np.linspace(-0.30, 0.50, 80)
+    occ     = np.clip(my_occ * (1 + elasticity * x_range), 0.0, 1.0)
+    profits = my_adr * (1 + x_range) * occ * 30 * 0.97 - total_opex
+    return x_range, profits
+
+def price_sim_point(my_adr, my_occ, elasticity, total_opex, delta):
+    """요금을 delta (비율) 만큼 바꿨을 때 (1박 요금, 예약률, 하루 실수익, 월 순이익)"""
+    new_adr  = my_adr * (1 + delta)
+    new_occ  = min(1.0, max(0.0, my_occ * (1 + elasticity * delta)))
+    new_revp = new_adr * new_occ
+    return new_adr, new_occ, new_revp, new_revp * 30 * 0.97 - total_opex
+
+@st.fragment
+def render_price_simulation(my_adr, my_occ, my_revpar, net_profit, total_opex, elasticity):
+    """요금 변경 시뮬레이션 — 슬라이더 변경 시 이 블록만 재실행"""
+    touch_session()
+    delta_pct = st.slider("요금 변화율 (%)", -30, 50, 0, 5)
+    new_adr, new_occ, new_revp, new_net = price_sim_point(my_adr, my_occ, elasticity, total_opex, delta_pct / 100)
+    p_change  = new_net - net_profit
+
+    cs1, cs2 = st.columns(2)
+    with cs1:
+        sim_rows = [
+            ("1박 요금", f"₩{int(my_adr):,}", f"₩{int(new_adr):,}", f"{delta_pct:+d}%"),
+            ("예약률", f"{my_occ:.0%}", f"{new_occ:.0%}", f"{(new_occ-my_occ)*100:+.1f}%p"),
+            ("하루 실수익", f"₩{int(my_revpar):,}", f"₩{int(new_revp):,}",
+             f"{(new_revp/my_revpar-1)*100:+.1f}%" if my_revpar > 0 else "-"),
+            ("월 순이익", f"₩{int(net_profit):,}", f"₩{int(new_net):,}", f"₩{p_change:+,.0f}"),
+        ]
+        html = ('<div style="background:white;border-radius:12px;padding:20px;'
+                'box-shadow:0 2px 10px rgba(0,0,0,0.06);">'
+                '<div style="display:grid;grid-template-columns:2fr 1fr 1fr 1fr;'
+                'color:#888;font-size:12px;font-weight:600;padding-bottom:8px;'
+                'border-bottom:1.5px solid #F0F0F0;margin-bottom:4px;">'
+                '<span>항목</span><span style="text-align:right;">현재</span>'
+                '<span style="text-align:right;">변경 후</span>'
+                '<span style="text-align:right;">변화</span></div>')
+        for label, cur, nxt, chg in sim_rows:
+            w = "700" if "순이익" in label else "400"
+            chg_c = "#2E7D32" if ("+" in chg and "₩-" not in chg) else "#C62828" if ("-" in chg and "₩+" not in chg) else "#484848"
+            html += (f'<div style="display:grid;grid-template-columns:2fr 1fr 1fr 1fr;'
+                     f'padding:9px 0;border-bottom:1px solid #F5F5F5;font-weight:{w};">'
+                     f'<span style="font-size:13px;">{label}</span>'
+                     f'<span style="text-align:right;font-size:13px;">{cur}</span>'
+                     f'<span style="text-align:right;font-size:13px;">{nxt}</span>'
+                     f'<span style="text-align:right;font-size:13px;color:{chg_c};">{chg}</span></div>')
+        html += "</div>"
+        st.markdown(html, unsafe_allow_html=True)
+
+        if delta_pct == 0:
+            st.info("슬라이더를 움직여 요금 변화 효과를 확인하세요.")
+        elif delta_pct > 0 and p_change > 0:
+            st.success(f"✅ 요금 인상 효과 — 순이익 ₩{p_change:+,.0f} 증가")
+        elif delta_pct > 0:
+            st.error(f"❌ 요금 인상 역효과 — 순이익 ₩{abs(p_change):,.0f} 감소")
+        elif p_change > 0:
+            st.success(f"✅ 요금 인하로 예약률 상승 → 순이익 ₩{p_change:+,.0f} 증가")
+        else:
+            st.warning(f"⚠️ 요금 인하 시 순이익 ₩{abs(p_change):,.0f} 감소")
+
+    with cs2:
+        x_range, profits = price_sim_curve(my_adr, my_occ, elasticity, total_opex)
+        fig4, ax4 = plt.subplots(figsize=(5, 3.8))
+        ax4.plot(x_range*100, profits, color="#FF5A5F", linewidth=2.5)
+        ax4.axhline(0, color="#767676", linestyle="--", lw=1.2, alpha=0.6, label="손익분기선")
+        ax4.axvline(delta_pct, color="#FFB400", linestyle="--", lw=1.5, label=f"현재 ({delta_pct:+d}%)")
+        ax4.scatter([delta_pct], [new_net], color="#FFB400", s=70, zorder=6)
+        ax4.fill_between(x_range*100, profits, 0, where=profits > 0, alpha=0.07, color="#4CAF50")
+        ax4.fill_between(x_range*100, profits, 0, where=profits <= 0, alpha=0.07, color="#FF5A5F")
+        ax4.set_xlabel("요금 변화율 (%)"); ax4.set_ylabel("월 순이익 (원)")
+        ax4.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f"₩{y/10000:.0f}만"))
+        ax4.legend(fontsize=8)
+        ax4.spines["top"].set_visible(False); ax4.spines["right"].set_visible(False)
+        ax4.set_facecolor("#FAFAFA"); fig4.patch.set_facecolor("#FAFAFA")
+        fig4.tight_layout()
+        show_chart(fig4, "price_sim")
+        best_idx  = int(np.argmax(profits))
+        best_adr  = my_adr * (1 + x_range[best_idx])
+        best_prof = profits[best_idx]
+        st.success(f"🎯 최대 순이익: ₩{int(best_adr):,} ({x_range[best_idx]*100:+.0f}%) → 월 ₩{int(best_prof):,}")
+
+
+def description_template(room_type, d_name):
+    """숙소 유형·스타일·구성(session_state)에 맞춘 숙소 설명 템플릿 문자열"""
+    _room_style = st.session_state.get("my_room_style", "모던/미니멀")
+    _guests   = int(st.session_state.my_guests   or 2)
+    _bedrooms = int(st.session_state.my_bedrooms or 1)
+    _baths    = float(st.session_state.my_baths_count or 1)
+    _beds     = int(st.session_state.my_beds or 1)
+
+    _style_adj = {
+        "모던/미니멀": "깔끔하고 심플한 모던",
+        "빈티지/레트로": "감성적인 빈티지",
+        "한옥/전통": "한국 전통 감성이 살아있는",
+        "아늑/가정적": "따뜻하고 아늑한",
+        "럭셔리/프리미엄": "고급스러운 프리미엄",
+    }.get(_room_style, "세련된")
+
+    if room_type == "entire_home":
+        _privacy = "숙소 전체를 단독으로 사용하실 수 있어 프라이빗한 공간이 필요하신 분께 적합합니다."
+        _space   = f"침실 {_bedrooms}개, 욕실 {int(_baths)}개로 구성된 집 전체입니다."
+        _intro   = f"{_style_adj} 감성의 {d_name} 집 전체를 단독으로 즐겨보세요."
+    elif room_type == "private_room":
+        _privacy = "침실은 단독으로 사용하시고, 거실·주방·욕실은 다른 게스트와 함께 이용합니다."
+        _space   = "개인 침실을 단독으로 이용하시며, 그 외 공간은 공용입니다."
+        _intro   = f"{_style_adj} 분위기의 {d_name} 개인실에서 편안하게 머무르세요."
+    elif room_type == "hotel_room":
+        _privacy = "호텔 수준의 서비스와 편의시설을 갖춘 독립 객실입니다."
+        _space   = "객실 내 침실과 욕실이 완비되어 있습니다."
+        _intro   = f"{d_name}에 위치한 {_style_adj} 호텔 스타일 객실입니다."
+    else:
+        _privacy = "합리적인 가격으로 서울을 여행하시는 분께 적합한 다인실입니다."
+        _space   = "침대와 기본 수납공간이 제공됩니다."
+        _intro   = f"{d_name}의 {_style_adj} 다인실에서 새로운 여행자들을 만나보세요."
+
+    template = f"""◼ 숙소 소개
+{_intro} [가까운 지하철역 또는 주요 명소 — 직접 입력: 예) 홍대입구역 도보 5분 거리에 위치하여] 서울 주요 지역으로의 이동이 편리합니다.
+{_privacy}
+
+[숙소만의 특별한 포인트 — 직접 입력: 예) 통창으로 들어오는 자연광, 루프탑 테라스, 한강 뷰 등]
+
+◼ 숙소 구성
+최대 {_guests}명 이용 가능 · {_space}
+
+침실에는 [침대 종류 — 직접 입력: 예) 킹사이즈 침대 / 더블베드 / 싱글 침대 {_beds}개]이 갖춰져 있으며, [주요 가전·가구 — 직접 입력: 예) 에어컨, 난방, TV, 냉장고, 전자레인지, 세탁기, 드레스룸]가 제공됩니다.
+
+◼ 기본 제공 어메니티
+[직접 입력: 예) 수건, 헤어드라이기, 샴푸, 컨디셔너, 바디워시, 핸드워시, 비누, 티슈, 슬리퍼]가 기본으로 제공됩니다.
+[별도 준비 필요 항목 — 직접 입력: 예) 칫솔·치약은 개별적으로 준비해주시기 바랍니다.]
+
+◼ 체크인 / 체크아웃
+체크인: [직접 입력: 예) 15:00 이후] / 체크아웃: [직접 입력: 예) 11:00 이전]
+[입실 방법 — 직접 입력: 예) 도어락으로 키 없이 입실 가능합니다. 예약 확정 후 비밀번호를 안내드립니다.]
+
+◼ 주의사항
+[직접 입력: 예) 금연 / 반려동물 동반 불가 / 파티·행사 불가 / 층간소음 주의 / 쓰레기 분리수거 안내]"""
+    return template
+
+@st.fragment
+def render_description_tab(room_type, d_name):
+    """숙소 설명 템플릿 — 텍스트 편집 시 이 블록만 재실행"""
+    touch_session()
+    section_title(
+        "✍️ 숙소 설명 생성",
+        "내 숙소 유형에 맞는 설명 템플릿입니다. [직접 입력] 부분을 채워 완성하세요.",
+    )
+
+    st.markdown(
+        '<div style="background:#FFF9F7;border:1.5px solid #FFD0CF;border-radius:12px;'
+        'padding:14px 18px;margin-bottom:14px;font-size:13px;color:#484848;line-height:1.7;">'
+        '💡 <b>사용 방법</b>: 아래 텍스트를 복사해 에어비앤비 숙소 설명란에 붙여넣은 뒤, '
+        '<span style="color:#FF5A5F;font-weight:700;">[직접 입력]</span> 부분을 '
+        '내 숙소 상황에 맞게 직접 수정해주세요. '
+        '가구·가전·어메니티는 실제 보유 여부를 확인 후 작성해야 합니다.'
+        '</div>',
+        unsafe_allow_html=True,
+    )
+
+    st.text_area(
+        "숙소 설명 템플릿 (복사 후 수정하여 사용)",
+        value=description_template(room_type, d_name),
+        height=430,
+        key="desc_template_area",
+    )
+
+    coral_box(
+        '<div style="font-size:13px;line-height:1.8;">'
+        '📌 <b>설명 작성 꿀팁</b><br>'
+        '• <b>첫 문장</b>이 검색 결과 미리보기로 노출됩니다. 가장 매력적인 포인트를 먼저 쓰세요.<br>'
+        '• <b>지하철역·버스 정류장</b> 이름과 도보 시간을 구체적으로 명시하면 예약률이 높아집니다.<br>'
+        '• <b>어메니티 목록</b>은 구체적일수록 좋습니다. 없는 항목을 적으면 나중에 분쟁 원인이 됩니다.<br>'
+        '• <b>주의사항</b>은 명확하게 적어야 불필요한 환불 요청을 예방할 수 있습니다.'
+        '</div>'
+    )
+
+@st.fragment(run_every=1.0)
+def report_job_status():
+    """생성 중인 리포트 작업 폴링 — 끝나면 전체 재실행 한 번으로 다운로드 버튼 표시"""
+    touch_session()
+    job = st.session_state.get("report_job")
+    if job is None or job.done():
+        st.rerun()
+    st.caption(f"⏳ 리포트 생성 중… {job.elapsed:.1f}초 (다른 탭은 계속 사용할 수 있습니다)")
+
+@st.fragment
+def render_report_export(snapshot):
+    """분석 리포트 다운로드 — 생성은 스레드 풀에서, 이 블록은 작업 핸들만 확인"""
+    touch_session()
+    section_title("📥 분석 리포트 다운로드", "수익 요약·요금 시뮬레이션·주변 관광지·헬스 스코어·숙소 설명을 한 파일로 저장합니다.")
+    c_fmt, c_make = st.columns([1, 1])
+    fmt = c_fmt.radio("리포트 형식", ("HTML", "PDF"), horizontal=True, key="report_fmt", label_visibility="collapsed")
+    if c_make.button("📄 리포트 만들기", key="report_make", use_container_width=True):
+        # 화면에 이미 그린 차트 PNG 와 사용자가 고친 설명을 제출 시점 그대로 넘김
+        snapshot = {
+            **snapshot,
+            "description": st.session_state.get("desc_template_area") or snapshot["description"],
+            "charts": dict(st.session_state.get("report_charts", {})),
+        }
+        st.session_state.report_job = get_report_service().submit(
+            snapshot, fmt.lower(), filename=f"airbnb_report_{datetime.now():%Y%m%d_%H%M}")
+
+    job = st.session_state.get("report_job")
+    if job is None:
+        return
+    if not job.done():
+        report_job_status()
+    elif job.failed():
+        st.error(f"리포트 생성 중 오류가 발생했습니다: {job.future.exception()}")
+    else:
+        data = job.result()
+        st.download_button(
+            f"⬇️ {job.filename} 다운로드 ({len(data) / 1024:,.0f} KB · {job.elapsed:.1f}초)",
+            data, file_name=job.filename, mime=job.mime,
+            key="report_download", on_click="ignore", use_container_width=True,
+        )
+
+@st.fragment
+def render_supply_shock(district, d_name, listing_items):
+    """자치구 공급 변화 시뮬레이션 — 그리드 전체를 한 번에 채점해 캐시, 슬라이더는 결과만 조회"""
+    touch_session()
+    if not st.toggle("🏗️ 이 지역에 숙소가 더 생기면? — 공급 변화 시뮬레이션", key="supply_shock_on"):
+        return
+    if district not in ml_district_lookup.index:
+        st.info("이 지역의 실운영 숙소 데이터가 없어 시뮬레이션할 수 없습니다.")
+        return
+    # 그리드는 자치구 숙소 수 대비 비율 (-50% ~ +100%) — 작은 구에서 숙소 수가 0 아래로 가거나 과도하게 외삽되지 않도록
+    count = int(ml_district_lookup.loc[district, "district_listing_count"])
+    grid = supply_grid(count)
+    with st.spinner(f"{d_name} 숙소 전체를 공급 시나리오별로 다시 예측하는 중..."):
+        summary = cached_supply_shock(district, grid, listing_version, ml_lookup_version, ml_version)
+    if summary is None:
+        st.info("이 지역의 실운영 숙소 데이터가 없어 시뮬레이션할 수 없습니다.")
+        return
+    default = int(round(count * 0.25))
+    added = st.select_slider("새로 생기는 집 전체 숙소 수 (음수 = 줄어듦)", options=summary["added"].tolist(),
+                             value=default if default in grid else 0,
+                             format_func=lambda a: f"{a:+,}개 ({a / count:+.0%})" if a else "0 (현재)",
+                             key=f"supply_shock_added_{district}")
+    r = summary.set_index("added").loc[added]
+
+    def pct(v):
+        return f"{v:+.1%}"
+
+    cols = st.columns(3 if listing_items else 2)
+    cols[0].metric("지역 숙소 ADR 변화 (중앙값)", pct(r["adr_p50"]),
+                   help=f"하위 10% {pct(r['adr_p10'])} · 상위 10% {pct(r['adr_p90'])}", delta_color="off")
+    cols[1].metric("지역 숙소 하루 수익 변화 (중앙값)", pct(r["revpar_p50"]),
+                   help=f"하위 10% {pct(r['revpar_p10'])} · 상위 10% {pct(r['revpar_p90'])}", delta_color="off")
+    if listing_items:
+        mine = cached_supply_shock_listing(listing_items, grid, ml_version).loc[added]
+        cols[2].metric("내 숙소 AI 적정 요금", f"₩{int(mine['adr']):,}", pct(mine["adr_shift"]))
+    st.caption(
+        f"{d_name} 실운영 숙소 {int(r['n']):,}개 기준 · 숙소 수 {int(r['district_listing_count']):,}개 · "
+        f"집 전체 비율 {r['district_entire_home_rate']:.0%} · 슈퍼호스트 비율 {r['district_superhost_rate']:.0%} "
+        "(새 숙소는 모두 집 전체·신규 호스트로 가정)"
+    )
+
 # ─────────────────────────────────────────────────────────────────────────────
 # STEP 5 — 분석 결과 대시보드
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1338,9 +1764,8 @@ def step5():
     my_loc_name   = st.session_state.my_location_name
 
     bench     = get_bench(district, room_type)
-    b_adr     = bench_val(bench, "ttm_avg_rate", 100000)
-    b_adr_p25 = bench_val(bench, "ttm_avg_rate", 70000, 25)
-    b_adr_p75 = bench_val(bench, "ttm_avg_rate", 140000, 75)
+    _adr_q    = listing_store.bench_percentiles(district, room_type, "ttm_avg_rate", (50, 25, 75))
+    b_adr, b_adr_p25, b_adr_p75 = map(float, _adr_q) if _adr_q is not None else (100000, 70000, 140000)
     b_revpar  = bench_val(bench, "ttm_revpar", 40000)
     b_occ     = bench_val(bench, "ttm_occupancy", 0.40)
 
@@ -1366,10 +1791,27 @@ def step5():
     net_profit      = monthly_revenue - airbnb_fee - total_opex
     bep_adr         = (total_opex / 0.97) / (30 * my_occ) if my_occ > 0 else 0
 
-    d_row        = cluster_df[cluster_df["district"] == district]
+    d_row        = listing_store.district_info(district)
+    # 확인된 주소가 군집된 격자 셀 안이면 자치구 대신 셀의 시장 유형·지표 사용
+    _cells = get_cell_clusters(CELL_CLUSTERS_PATH.stat().st_mtime_ns if CELL_CLUSTERS_PATH.exists() else 0)
+    _cell  = (_cells.lookup(st.session_state.my_lat, st.session_state.my_lng)
+              if _cells is not None and st.session_state.location_confirmed and st.session_state.my_lat else None)
+    market_scope = dn(district)
+    if _cell is not None:
+        d_row = pd.DataFrame([_cell])
+        market_scope = f"{market_scope} · 주소 주변 {int(_cell['cell_m'])}m 구역"
     cluster_name = d_row["cluster_name"].values[0] if len(d_row) > 0 else "중가 균형시장"
     c_info       = CLUSTER_INFO.get(cluster_name, CLUSTER_INFO["중가 균형시장"])
-    elasticity   = c_info["elasticity"]
+    _el = get_elasticity_table(ELASTICITY_PATH.stat().st_mtime_ns if ELASTICITY_PATH.exists() else 0) \
+        .lookup(cluster_name, room_type)
+    elasticity   = _el["elasticity"] if _el else c_info["elasticity"]
+    if _el is None:
+        el_source = "기본 가정값"
+    elif _el["clipped"]:
+        el_source = (f"실운영 {int(_el['n']):,}개 추정값 {abs(_el['raw_elasticity']):.2f} 이 허용 범위 "
+                     f"{abs(ELASTICITY_CLIP[1]):.2f}~{abs(ELASTICITY_CLIP[0]):.2f} 밖이라 제한")
+    else:
+        el_source = f"실운영 {int(_el['n']):,}개 추정 · 95% 구간 {abs(_el['ci_high']):.2f}~{abs(_el['ci_low']):.2f}"
     d_name       = dn(district)
     rt_name      = ROOM_TYPE_KR.get(room_type, room_type)
 
@@ -1427,10 +1869,21 @@ def step5():
         "photos_tier":             _photos_tier(my_photos or 0),
         "ttm_avg_rate":            my_adr,
     }
+    # 기존 호스터: 자치구 평균 대비 사진·평점·리뷰·최소박 비율 (신규 호스터는 입력이 기본값 → 1.0 유지)
+    if host_type == "existing":
+        _listing = get_district_stats().assemble(_listing, district)
 
+    # 신규 호스터는 대부분 기본값 → 사전 계산 격자 조회 (격자 밖 조합은 실시간 예측)
+    _lattice_path = _PKG_DIR / "models" / LATTICE_FILE
+    _lattice = (get_new_host_lattice(ml_version, file_version(_lattice_path) if _lattice_path.exists() else 0)
+                if host_type == "new" else None)
     try:
-        _ml    = predict_revpar(_listing, opex_per_month=total_opex, **ml_artifacts)
-        _ml_ok = True
+        _predict = _lattice.predict if _lattice is not None else predict_revpar
+        _ml      = get_result_cache().get_or_compute(
+            "predict", ml_version, {"listing": _listing, "opex": total_opex, "lattice": _lattice is not None},
+            lambda: _predict(_listing, opex_per_month=total_opex, **ml_artifacts),
+        )
+        _ml_ok   = True
     except Exception:
         _ml_ok = False
         _ml    = {}
@@ -1438,7 +1891,7 @@ def step5():
     # 헬스스코어 (기존 호스터 전용)
     if host_type == "existing":
         _cluster_id       = int(_dl["cluster"])
-        _cluster_listings = ml_ao_df[ml_ao_df["cluster"] == _cluster_id]
+        _cluster_n        = listing_store.cluster_peer_count(_cluster_id)
         _user_vals = {
             "my_reviews":    my_reviews or 0,
             "my_rating":     my_rating  or 4.5,
@@ -1451,7 +1904,11 @@ def step5():
             "my_baths":    float(st.session_state.my_baths_count or bench_val(bench, "baths",    1)),
         }
         try:
-            _hs    = compute_health_score(_user_vals, _cluster_listings)
+            _hs    = get_result_cache().get_or_compute(
+                "health", file_version(_PKG_DIR / "cluster_listings_ao.csv"),
+                {"cluster": _cluster_id, "user": _user_vals},
+                lambda: compute_health_score(_user_vals, listing_store.cluster_peers(_cluster_id)),
+            )
             _hs_ok = True
         except Exception:
             _hs_ok = False
@@ -1459,6 +1916,11 @@ def step5():
     else:
         _hs_ok = False
         _hs    = {}
+    # 같은 클러스터·자치구 실운영 숙소 중 종합 점수 순위 (정렬된 배열 이진 탐색)
+    _hs_rank = get_health_leaderboard(
+        LEADERBOARD_PATH.stat().st_mtime_ns if LEADERBOARD_PATH.exists() else 0,
+        file_version(_PKG_DIR / "cluster_listings_ao.csv"),
+    ).rank(_hs["composite"], cluster=_cluster_id, district=district) if _hs_ok else {}
 
     st.markdown("""
     <div style="text-align:center;padding:20px 0 4px;">
@@ -1692,11 +2154,64 @@ def step5():
                 ax.set_title(f"월 운영비 구성 (₩{total_opex:,})", fontsize=11)
                 fig.patch.set_facecolor("#FAFAFA")
                 fig.tight_layout()
-                st.pyplot(fig)
-                plt.close()
+                show_chart(fig, "opex_pie")
             else:
+                st.session_state.get("report_charts", {}).pop("opex_pie", None)
                 st.info("운영비를 입력하면 구성 차트가 표시됩니다.")
 
+        # ── 향후 12개월 수익 전망 (계절성) ──────────────────────────────────
+        st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
+        section_title("📅 향후 12개월 수익 전망", "지역 계절성과 월별 일수를 반영한 월 순이익 예상입니다.")
+        _seasonality = get_seasonality(PROFILES_PATH.stat().st_mtime_ns if PROFILES_PATH.exists() else 0)
+        _season = _seasonality.profile(district, int(_dl["cluster"]))
+        # 기존 호스터의 요금·예약률은 달력의 한 달 값 → 그 달 계절 지수로 나눠 연평균 수준으로 환산
+        # (예약 내역 파일을 가져왔으면 예약률이 이미 12개월 평균이라 환산하지 않음)
+        _my_season = (1.0 if st.session_state.get("booking_import")
+                      else _season[st.session_state.calendar_month - 1])
+        _my_base = my_revpar / _my_season if host_type == "existing" else my_revpar
+        _bases = [_my_base] + ([_ml["RevPAR_pred"]] if _ml_ok else [])
+        # 추세 (ttm/l90d 모멘텀): 가져온 12개월 예약 내역의 최근 3개월 vs 12개월 예약률 (요금은 일정하다고 봄)
+        _imported = st.session_state.get("booking_import") if host_type == "existing" else None
+        _my_trend = 0.0
+        if _imported and _imported["months"] >= 12:
+            _im = pd.DataFrame(_imported["monthly"])
+            _ttm_occ = _im["booked"].sum() / _im["days_in_month"].sum()
+            _l90d_occ = _im["booked"].iloc[-3:].sum() / _im["days_in_month"].iloc[-3:].sum()
+            _my_trend = float(np.clip(trend_from_revpar(_ttm_occ, _l90d_occ, _season, _imported["end"].month)[0], -0.5, 0.5))
+        _trends = [_my_trend] + ([0.0] if _ml_ok else [])
+        _now = datetime.now()
+        _sy, _sm = (_now.year + 1, 1) if _now.month == 12 else (_now.year, _now.month + 1)
+        _proj = project_12m(np.array(_bases), total_opex, _sy, _sm, _season, np.array(_trends), fee_rate=0.03)
+
+        _labels = [f"{m}월" for _, m in _proj["months"]]
+        _my_profit = _proj["profit"][0]
+        fig5, ax5 = plt.subplots(figsize=(9, 3.4))
+        ax5.bar(_labels, _my_profit, color=np.where(_my_profit >= 0, "#00A699", "#FF5A5F"),
+                alpha=0.85, label="현재 요금·예약률 기준")
+        if _ml_ok:
+            ax5.plot(_labels, _proj["profit"][1], color="#484848", marker="o", lw=2, ms=4, label="AI 예측 기준")
+        ax5.axhline(0, color="#767676", lw=1, alpha=0.6)
+        ax5.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f"₩{y/10000:.0f}만"))
+        ax5.set_ylabel("월 순이익"); ax5.legend(fontsize=8)
+        ax5.spines["top"].set_visible(False); ax5.spines["right"].set_visible(False)
+        ax5.set_facecolor("#FAFAFA"); fig5.patch.set_facecolor("#FAFAFA")
+        fig5.tight_layout()
+        show_chart(fig5, "projection_12m")
+
+        _best, _worst = int(np.argmax(_my_profit)), int(np.argmin(_my_profit))
+        _note = "" if _seasonality.is_flat else f"성수기 {_labels[_best]} · 비수기 {_labels[_worst]}"
+        if _imported and _imported["months"] >= 12:
+            _note += f"{' · ' if _note else ''}최근 3개월 추세 {_my_trend:+.0%} (몇 달에 걸쳐 줄어든다고 가정)"
+        st.markdown(
+            f'<div style="font-size:13px;color:#484848;">12개월 누적 순이익 '
+            f'<b>₩{int(_my_profit.sum()):,}</b> (매출 ₩{int(_proj["revenue"][0].sum()):,})'
+            f'<span style="font-size:11px;color:#AAAAAA;margin-left:8px;">{_note}</span></div>',
+            unsafe_allow_html=True,
+        )
+        if _seasonality.is_flat:
+            st.info("계절성 프로필 (seasonality_profiles.csv) 이 아직 생성되지 않아 모든 달을 같은 수준으로 보고 "
+                    "월별 일수 차이만 반영했습니다. 성수기·비수기 차이는 프로필 생성 후 표시됩니다.")
+
         # ── AI 시장 예측 섹션 ────────────────────────────────────────────────
         if _ml_ok:
             st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
@@ -1739,6 +2254,50 @@ def step5():
                 unsafe_allow_html=True,
             )
 
+            # 예측 근거 — 카테고리별 TreeSHAP 기여도 (학습 데이터 평균 숙소 대비)
+            try:
+                _exp = cached_explain(tuple(sorted(_listing.items())), ml_version)
+            except Exception:
+                _exp = None
+            if _exp is not None:
+                def _fx(v, unit):
+                    if abs(v) < 0.005:
+                        return '<span style="color:#BBBBBB;">–</span>'
+                    color = "#2E7D32" if v > 0 else "#C62828"
+                    txt = f"{v:+.0%}" if unit == "pct" else f"{v * 100:+.1f}%p"
+                    return f'<b style="color:{color};">{txt}</b>'
+
+                exp_rows = ""
+                for cat, label in CATEGORY_LABELS.items():
+                    a, o = _exp["adr_pct"][cat], _exp["occ_pp"][cat]
+                    if abs(a) < 0.005 and abs(o) < 0.005:
+                        continue
+                    exp_rows += (
+                        f'<tr><td style="padding:5px 0;font-size:13px;color:#484848;">{label}</td>'
+                        f'<td style="text-align:right;font-size:13px;">{_fx(a, "pct")}</td>'
+                        f'<td style="text-align:right;font-size:13px;">{_fx(o, "pp")}</td></tr>'
+                    )
+                drags = " · ".join(
+                    f'{FEATURE_LABELS.get(f, f)} ({v:+.0%} 요금)' if m == "adr"
+                    else f'{FEATURE_LABELS.get(f, f)} ({v * 100:+.1f}%p 예약률)'
+                    for m, f, v in _exp["drags"]
+                )
+                st.markdown(
+                    f'<div style="background:white;border-radius:12px;padding:16px 18px;margin-top:12px;'
+                    f'box-shadow:0 2px 10px rgba(0,0,0,0.06);">'
+                    f'<div style="font-size:13px;font-weight:700;color:#484848;margin-bottom:4px;">🔍 AI 예측 근거</div>'
+                    f'<div style="font-size:11px;color:#AAAAAA;margin-bottom:8px;">'
+                    f'평균 숙소(1박 ₩{int(_exp["adr_base"]):,} · 예약률 {_exp["occ_base"]:.0%}) 대비 각 항목의 영향</div>'
+                    f'<table style="width:100%;border-collapse:collapse;">'
+                    f'<tr><th></th><th style="text-align:right;font-size:11px;color:#888;font-weight:600;">1박 요금</th>'
+                    f'<th style="text-align:right;font-size:11px;color:#888;font-weight:600;">예약률</th></tr>'
+                    f'{exp_rows}</table>'
+                    + (f'<div style="font-size:12px;color:#C62828;margin-top:10px;">'
+                       f'📉 예측을 가장 끌어내리는 요인: {drags}</div>' if drags else "")
+                    + '</div>',
+                    unsafe_allow_html=True,
+                )
+
     # ── TAB 2: 요금 전략 ─────────────────────────────────────────────────────
     with tab2:
         section_title("💡 내 숙소에 맞는 적정 요금")
@@ -1792,86 +2351,96 @@ def step5():
             unsafe_allow_html=True,
         )
 
+        # ── 나와 비슷한 숙소 (위치·스펙 최근접 이웃) ─────────────────────────
+        _comps_engine = get_comps_engine(listing_version)
+        _cs = None
+        if my_lat and my_lng and _comps_engine is not None and room_type in _comps_engine.indexes:
+            try:
+                _cs = comps_summary(_comps_engine.query(
+                    room_type, my_lat, my_lng,
+                    bedrooms=st.session_state.my_bedrooms, baths=st.session_state.my_baths_count,
+                    guests=st.session_state.my_guests,
+                    rating=my_rating if host_type == "existing" else None,
+                    photos=my_photos or None, k=30,
+                ))
+            except Exception:
+                _cs = None
+        if _cs is not None and _cs["n"] > 0:
+            _cs_occ = "-" if pd.isna(_cs["occ_p50"]) else f'{_cs["occ_p50"]:.0%}'
+            st.markdown(
+                f'<div style="background:white;border-radius:12px;padding:16px 18px;margin-top:12px;'
+                f'box-shadow:0 2px 10px rgba(0,0,0,0.06);">'
+                f'<div style="font-size:13px;font-weight:700;color:#484848;margin-bottom:8px;">'
+                f'🏘️ 나와 가장 비슷한 숙소 {_cs["n"]}곳 (위치·침실·욕실·인원·평점·사진 기준)</div>'
+                f'<div style="display:flex;justify-content:space-between;flex-wrap:wrap;gap:10px;">'
+                f'<span style="font-size:13px;color:#767676;">1박 요금 중앙값 '
+                f'<b style="color:#484848;">₩{int(_cs["adr_p50"]):,}</b></span>'
+                f'<span style="font-size:13px;color:#767676;">요금 중간 50% '
+                f'<b style="color:#484848;">₩{int(_cs["adr_p25"]):,} ~ ₩{int(_cs["adr_p75"]):,}</b></span>'
+                f'<span style="font-size:13px;color:#767676;">예약률 중앙값 '
+                f'<b style="color:#484848;">{_cs_occ}</b></span>'
+                f'<span style="font-size:11px;color:#AAA;align-self:center;">'
+                f'내 숙소에서 중앙 {_cs["median_km"]:.1f}km</span>'
+                f'</div></div>',
+                unsafe_allow_html=True,
+            )
+
         # F. 요금 시뮬레이션 (기존 호스터 전용)
         if host_type == "existing":
             st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
             section_title(
                 "📊 요금 변경 시뮬레이션",
-                f"이 지역({cluster_name})은 요금을 10% 올리면 예약률이 약 {abs(elasticity)*10:.0f}% 변화합니다.",
+                f"이 지역({cluster_name})은 요금을 10% 올리면 예약률이 약 {abs(elasticity)*10:.0f}% 변화합니다. "
+                f"(탄력성 {abs(elasticity):.2f} — {el_source})",
             )
 
-            delta_pct = st.slider("요금 변화율 (%)", -30, 50, 0, 5)
-            delta     = delta_pct / 100
-            new_adr   = my_adr * (1 + delta)
-            new_occ   = min(1.0, max(0.0, my_occ * (1 + elasticity * delta)))
-            new_revp  = new_adr * new_occ
-            new_net   = new_revp * 30 * 0.97 - total_opex
-            p_change  = new_net - net_profit
-
-            cs1, cs2 = st.columns(2)
-            with cs1:
-                sim_rows = [
-                    ("1박 요금", f"₩{int(my_adr):,}", f"₩{int(new_adr):,}", f"{delta_pct:+d}%"),
-                    ("예약률", f"{my_occ:.0%}", f"{new_occ:.0%}", f"{(new_occ-my_occ)*100:+.1f}%p"),
-                    ("하루 실수익", f"₩{int(my_revpar):,}", f"₩{int(new_revp):,}",
-                     f"{(new_revp/my_revpar-1)*100:+.1f}%" if my_revpar > 0 else "-"),
-                    ("월 순이익", f"₩{int(net_profit):,}", f"₩{int(new_net):,}", f"₩{p_change:+,.0f}"),
-                ]
-                html = ('<div style="background:white;border-radius:12px;padding:20px;'
-                        'box-shadow:0 2px 10px rgba(0,0,0,0.06);">'
-                        '<div style="display:grid;grid-template-columns:2fr 1fr 1fr 1fr;'
-                        'color:#888;font-size:12px;font-weight:600;padding-bottom:8px;'
-                        'border-bottom:1.5px solid #F0F0F0;margin-bottom:4px;">'
-                        '<span>항목</span><span style="text-align:right;">현재</span>'
-                        '<span style="text-align:right;">변경 후</span>'
-                        '<span style="text-align:right;">변화</span></div>')
-                for label, cur, nxt, chg in sim_rows:
-                    w = "700" if "순이익" in label else "400"
-                    chg_c = "#2E7D32" if ("+" in chg and "₩-" not in chg) else "#C62828" if ("-" in chg and "₩+" not in chg) else "#484848"
-                    html += (f'<div style="display:grid;grid-template-columns:2fr 1fr 1fr 1fr;'
-                             f'padding:9px 0;border-bottom:1px solid #F5F5F5;font-weight:{w};">'
-                             f'<span style="font-size:13px;">{label}</span>'
-                             f'<span style="text-align:right;font-size:13px;">{cur}</span>'
-                             f'<span style="text-align:right;font-size:13px;">{nxt}</span>'
-                             f'<span style="text-align:right;font-size:13px;color:{chg_c};">{chg}</span></div>')
-                html += "</div>"
-                st.markdown(html, unsafe_allow_html=True)
-
-                if delta_pct == 0:
-                    st.info("슬라이더를 움직여 요금 변화 효과를 확인하세요.")
-                elif delta_pct > 0 and p_change > 0:
-                    st.success(f"✅ 요금 인상 효과 — 순이익 ₩{p_change:+,.0f} 증가")
-                elif delta_pct > 0:
-                    st.error(f"❌ 요금 인상 역효과 — 순이익 ₩{abs(p_change):,.0f} 감소")
-                elif p_change > 0:
-                    st.success(f"✅ 요금 인하로 예약률 상승 → 순이익 ₩{p_change:+,.0f} 증가")
-                else:
-                    st.warning(f"⚠️ 요금 인하 시 순이익 ₩{abs(p_change):,.0f} 감소")
-
-            with cs2:
-                x_range = np.linspace(-0.30, 0.50, 80)
-                profits = [
-                    my_adr*(1+d) * min(1., max(0., my_occ*(1+elasticity*d))) * 30 * 0.97 - total_opex
-                    for d in x_range
-                ]
-                fig4, ax4 = plt.subplots(figsize=(5, 3.8))
-                ax4.plot(x_range*100, profits, color="#FF5A5F", linewidth=2.5)
-                ax4.axhline(0, color="#767676", linestyle="--", lw=1.2, alpha=0.6, label="손익분기선")
-                ax4.axvline(delta_pct, color="#FFB400", linestyle="--", lw=1.5, label=f"현재 ({delta_pct:+d}%)")
-                ax4.scatter([delta_pct], [new_net], color="#FFB400", s=70, zorder=6)
-                ax4.fill_between(x_range*100, profits, 0, where=[p > 0 for p in profits], alpha=0.07, color="#4CAF50")
-                ax4.fill_between(x_range*100, profits, 0, where=[p <= 0 for p in profits], alpha=0.07, color="#FF5A5F")
-                ax4.set_xlabel("요금 변화율 (%)"); ax4.set_ylabel("월 순이익 (원)")
-                ax4.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f"₩{y/10000:.0f}만"))
-                ax4.legend(fontsize=8)
-                ax4.spines["top"].set_visible(False); ax4.spines["right"].set_visible(False)
-                ax4.set_facecolor("#FAFAFA"); fig4.patch.set_facecolor("#FAFAFA")
-                fig4.tight_layout()
-                st.pyplot(fig4); plt.close()
-                best_idx  = int(np.argmax(profits))
-                best_adr  = my_adr * (1 + x_range[best_idx])
-                best_prof = profits[best_idx]
-                st.success(f"🎯 최대 순이익: ₩{int(best_adr):,} ({x_range[best_idx]*100:+.0f}%) → 월 ₩{int(best_prof):,}")
+            render_price_simulation(my_adr, my_occ, my_revpar, net_profit, total_opex, elasticity)
+
+        # ── 365일 요금 캘린더 (요일 × 계절 × 탄력성) ─────────────────────────
+        st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
+        section_title(
+            "📆 365일 요금 캘린더",
+            "수요가 몰리는 주말·성수기는 올리고 한산한 날은 내려 예약률을 일정하게 유지하는 날짜별 추천 요금입니다.",
+        )
+        if host_type == "existing":
+            # 기준 요금은 AI 적정 요금 (연평균 수준), 없으면 달력의 한 달 요금을 연평균으로 환산
+            _cal_base = _ml["ADR_pred"] if _ml_ok else my_adr / _my_season
+            # 요일 지수는 평일·주말 예약률 — 예약된 날이 많을수록 덜 수축 (예약 내역은 월 평균 × 개월 수)
+            _booked_days = st.session_state.get("weekdays_booked", 0) + st.session_state.get("weekends_booked", 0)
+            if st.session_state.get("booking_import"):
+                _booked_days *= st.session_state.booking_import["months"]
+            _cal_dow = dow_factors(
+                st.session_state.get("weekday_occ_pct", 0) / 100,
+                st.session_state.get("weekend_occ_pct", 0) / 100,
+                n_days=_booked_days,
+            )
+        else:
+            _cal_base = _ml["ADR_pred"] if _ml_ok else my_adr
+            _cal_dow = dow_factors()
+        _cal = price_calendar(_cal_base, date.today() + timedelta(days=1), _season, _cal_dow, elasticity)
+        _cal_price = _cal["price"][0]
+        cc1, cc2, cc3 = st.columns(3)
+        cc1.metric("최저 요금", f"₩{int(_cal_price.min()):,}")
+        cc2.metric("평균 요금", f"₩{int(_cal_price.mean()):,}")
+        cc3.metric("최고 요금", f"₩{int(_cal_price.max()):,}")
+        st.line_chart(
+            pd.DataFrame({"추천 요금": _cal_price}, index=pd.to_datetime(_cal["dates"])),
+            height=240,
+        )
+        if host_type == "existing" and _ml_ok:
+            st.caption(f"기준 요금: AI 적정 요금 ₩{int(_cal_base):,} (현재 요금 ₩{int(my_adr):,} 이 아닌 시장 기준)")
+        if host_type == "existing" and np.ptp(_cal_dow) == 0:
+            st.caption("평일·주말 예약 차이가 없어 계절성만 반영했습니다.")
+        dc1, dc2 = st.columns(2)
+        dc1.download_button(
+            "⬇️ CSV (엑셀)", to_csv(_cal, [0]), file_name="price_calendar.csv", mime="text/csv",
+            key="price_calendar_csv", on_click="ignore", use_container_width=True,
+        )
+        dc2.download_button(
+            "⬇️ iCal (캘린더 앱)", to_ical(_cal, 0, name=f"{d_name} {rt_name} 추천 요금"),
+            file_name="price_calendar.ics", mime="text/calendar",
+            key="price_calendar_ics", on_click="ignore", use_container_width=True,
+        )
 
     # ── TAB 3: 주변 관광지 ────────────────────────────────────────────────────
     with tab3:
@@ -1991,7 +2560,7 @@ def step5():
     def _render_market_tab(tab_obj):
         with tab_obj:
             section_title(
-                f"{c_info['emoji']} {d_name} 시장 유형: {cluster_name}",
+                f"{c_info['emoji']} {market_scope} 시장 유형: {cluster_name}",
                 c_info["desc"],
             )
             col_m1, col_m2 = st.columns([1, 1.4])
@@ -2023,93 +2592,9 @@ def step5():
                         unsafe_allow_html=True,
                     )
 
-    # ── 숙소 설명 탭 렌더링 함수 ────────────────────────────────────────────
-    def _render_description_tab():
-        _room_style = st.session_state.get("my_room_style", "모던/미니멀")
-        _guests   = int(st.session_state.my_guests   or 2)
-        _bedrooms = int(st.session_state.my_bedrooms or 1)
-        _baths    = float(st.session_state.my_baths_count or 1)
-        _beds     = int(st.session_state.my_beds or 1)
-
-        section_title(
-            "✍️ 숙소 설명 생성",
-            "내 숙소 유형에 맞는 설명 템플릿입니다. [직접 입력] 부분을 채워 완성하세요.",
-        )
-
-        _style_adj = {
-            "모던/미니멀": "깔끔하고 심플한 모던",
-            "빈티지/레트로": "감성적인 빈티지",
-            "한옥/전통": "한국 전통 감성이 살아있는",
-            "아늑/가정적": "따뜻하고 아늑한",
-            "럭셔리/프리미엄": "고급스러운 프리미엄",
-        }.get(_room_style, "세련된")
-
-        if room_type == "entire_home":
-            _privacy = "숙소 전체를 단독으로 사용하실 수 있어 프라이빗한 공간이 필요하신 분께 적합합니다."
-            _space   = f"침실 {_bedrooms}개, 욕실 {int(_baths)}개로 구성된 집 전체입니다."
-            _intro   = f"{_style_adj} 감성의 {d_name} 집 전체를 단독으로 즐겨보세요."
-        elif room_type == "private_room":
-            _privacy = "침실은 단독으로 사용하시고, 거실·주방·욕실은 다른 게스트와 함께 이용합니다."
-            _space   = "개인 침실을 단독으로 이용하시며, 그 외 공간은 공용입니다."
-            _intro   = f"{_style_adj} 분위기의 {d_name} 개인실에서 편안하게 머무르세요."
-        elif room_type == "hotel_room":
-            _privacy = "호텔 수준의 서비스와 편의시설을 갖춘 독립 객실입니다."
-            _space   = "객실 내 침실과 욕실이 완비되어 있습니다."
-            _intro   = f"{d_name}에 위치한 {_style_adj} 호텔 스타일 객실입니다."
-        else:
-            _privacy = "합리적인 가격으로 서울을 여행하시는 분께 적합한 다인실입니다."
-            _space   = "침대와 기본 수납공간이 제공됩니다."
-            _intro   = f"{d_name}의 {_style_adj} 다인실에서 새로운 여행자들을 만나보세요."
-
-        template = f"""◼ 숙소 소개
-{_intro} [가까운 지하철역 또는 주요 명소 — 직접 입력: 예) 홍대입구역 도보 5분 거리에 위치하여] 서울 주요 지역으로의 이동이 편리합니다.
-{_privacy}
-
-[숙소만의 특별한 포인트 — 직접 입력: 예) 통창으로 들어오는 자연광, 루프탑 테라스, 한강 뷰 등]
-
-◼ 숙소 구성
-최대 {_guests}명 이용 가능 · {_space}
-
-침실에는 [침대 종류 — 직접 입력: 예) 킹사이즈 침대 / 더블베드 / 싱글 침대 {_beds}개]이 갖춰져 있으며, [주요 가전·가구 — 직접 입력: 예) 에어컨, 난방, TV, 냉장고, 전자레인지, 세탁기, 드레스룸]가 제공됩니다.
-
-◼ 기본 제공 어메니티
-[직접 입력: 예) 수건, 헤어드라이기, 샴푸, 컨디셔너, 바디워시, 핸드워시, 비누, 티슈, 슬리퍼]가 기본으로 제공됩니다.
-[별도 준비 필요 항목 — 직접 입력: 예) 칫솔·치약은 개별적으로 준비해주시기 바랍니다.]
-
-◼ 체크인 / 체크아웃
-체크인: [직접 입력: 예) 15:00 이후] / 체크아웃: [직접 입력: 예) 11:00 이전]
-[입실 방법 — 직접 입력: 예) 도어락으로 키 없이 입실 가능합니다. 예약 확정 후 비밀번호를 안내드립니다.]
-
-◼ 주의사항
-[직접 입력: 예) 금연 / 반려동물 동반 불가 / 파티·행사 불가 / 층간소음 주의 / 쓰레기 분리수거 안내]"""
-
-        st.markdown(
-            '<div style="background:#FFF9F7;border:1.5px solid #FFD0CF;border-radius:12px;'
-            'padding:14px 18px;margin-bottom:14px;font-size:13px;color:#484848;line-height:1.7;">'
-            '💡 <b>사용 방법</b>: 아래 텍스트를 복사해 에어비앤비 숙소 설명란에 붙여넣은 뒤, '
-            '<span style="color:#FF5A5F;font-weight:700;">[직접 입력]</span> 부분을 '
-            '내 숙소 상황에 맞게 직접 수정해주세요. '
-            '가구·가전·어메니티는 실제 보유 여부를 확인 후 작성해야 합니다.'
-            '</div>',
-            unsafe_allow_html=True,
-        )
-
-        st.text_area(
-            "숙소 설명 템플릿 (복사 후 수정하여 사용)",
-            value=template,
-            height=430,
-            key="desc_template_area",
-        )
-
-        coral_box(
-            '<div style="font-size:13px;line-height:1.8;">'
-            '📌 <b>설명 작성 꿀팁</b><br>'
-            '• <b>첫 문장</b>이 검색 결과 미리보기로 노출됩니다. 가장 매력적인 포인트를 먼저 쓰세요.<br>'
-            '• <b>지하철역·버스 정류장</b> 이름과 도보 시간을 구체적으로 명시하면 예약률이 높아집니다.<br>'
-            '• <b>어메니티 목록</b>은 구체적일수록 좋습니다. 없는 항목을 적으면 나중에 분쟁 원인이 됩니다.<br>'
-            '• <b>주의사항</b>은 명확하게 적어야 불필요한 환불 요청을 예방할 수 있습니다.'
-            '</div>'
-        )
+            if _ml_ok:
+                st.markdown("<br>", unsafe_allow_html=True)
+                render_supply_shock(district, d_name, tuple(sorted(_listing.items())))
 
     if host_type == "existing":
         with tab4:
@@ -2187,13 +2672,13 @@ def step5():
         _render_market_tab(tab5)
 
         with tab7:
-            _render_description_tab()
+            render_description_tab(room_type, d_name)
 
         # ── TAB 6: 헬스 스코어 (기존 호스터) ────────────────────────────────
         with tab6:
             section_title(
                 "🩺 숙소 운영 건강 점수",
-                f"동일 클러스터({cluster_name}) 내 Active+Operating 숙소 {len(_cluster_listings):,}개와 비교한 5가지 운영 건강 지표입니다.",
+                f"동일 클러스터({cluster_name}) 내 Active+Operating 숙소 {_cluster_n:,}개와 비교한 5가지 운영 건강 지표입니다.",
             )
             if _hs_ok:
                 grade_colors = {
@@ -2201,6 +2686,11 @@ def step5():
                     "C": "#FFB400", "D": "#FF8C00", "F": "#C62828",
                 }
                 gc = grade_colors.get(_hs["grade"], "#767676")
+                _rank_txt = "<br>".join(
+                    f'{label} {r["n"]:,}곳 중 <b>상위 {max(1, int(np.ceil(r["top_pct"])))}%</b>'
+                    for label, r in (("클러스터", _hs_rank.get("cluster")), (d_name, _hs_rank.get("district")))
+                    if r and not (label == d_name and r["n"] == _hs_rank.get("cluster", {}).get("n"))  # 1구 1클러스터
+                ) or "클러스터 내 백분위 기준"
 
                 hs_c1, hs_c2 = st.columns([1, 2])
                 with hs_c1:
@@ -2213,7 +2703,7 @@ def step5():
                         f'<div style="background:{gc};color:white;border-radius:50%;width:52px;height:52px;'
                         f'display:inline-flex;align-items:center;justify-content:center;'
                         f'font-size:24px;font-weight:800;margin-top:14px;">{_hs["grade"]}</div>'
-                        f'<div style="font-size:11px;color:#767676;margin-top:10px;">클러스터 내 백분위 기준</div>'
+                        f'<div style="font-size:11px;color:#767676;margin-top:10px;">{_rank_txt}</div>'
                         f'</div>',
                         unsafe_allow_html=True,
                     )
@@ -2260,13 +2750,83 @@ def step5():
                     st.markdown(actions_html, unsafe_allow_html=True)
                 else:
                     st.success("🎉 모든 운영 지표가 클러스터 상위권입니다! 현재 상태를 유지하세요.")
+
+                # 개선 레버 조합별 AI 예상 효과
+                if _ml_ok:
+                    try:
+                        _levers = cached_optimize_levers(tuple(sorted(_listing.items())), float(total_opex), district, ml_version)
+                    except Exception:
+                        _levers = None
+                    if _levers is not None and len(_levers) > 0 and _levers["gain"].iloc[0] > 0:
+                        st.markdown("<br>", unsafe_allow_html=True)
+                        lever_html = (
+                            '<div style="background:#F1F8F4;border:1.5px solid #C8E6C9;'
+                            'border-radius:12px;padding:16px 18px;">'
+                            '<div style="font-size:13px;font-weight:700;color:#2E7D32;margin-bottom:10px;">'
+                            '🤖 AI가 계산한 개선 조합 TOP 3 (월 순이익 기준)</div>'
+                        )
+                        for i, (_, lv) in enumerate(_levers.iterrows(), 1):
+                            if lv["gain"] <= 0:
+                                break
+                            _edge = ('<span style="font-size:11px;color:#E65100;"> · 검토한 요금 범위의 끝 '
+                                     '(-30% ~ +50%) — 그 바깥은 계산하지 않음</span>' if lv["adr_at_edge"] else "")
+                            lever_html += (
+                                f'<div style="display:flex;justify-content:space-between;gap:8px;'
+                                f'padding:7px 0;border-bottom:1px solid #E8F5E9;">'
+                                f'<span style="font-size:13px;color:#484848;">{i}. {" · ".join(describe_levers(lv, _listing))}{_edge}</span>'
+                                f'<span style="font-size:13px;font-weight:700;color:#2E7D32;white-space:nowrap;">'
+                                f'+₩{int(lv["gain"]):,}/월</span></div>'
+                            )
+                        lever_html += (
+                            '<div style="font-size:11px;color:#888;margin-top:8px;">'
+                            '즉시예약·최소박·사진 수·추가요금·1박 요금 조합을 AI 예약률 모델로 일괄 평가한 결과입니다.</div>'
+                            '</div>'
+                        )
+                        st.markdown(lever_html, unsafe_allow_html=True)
             else:
                 st.warning("헬스 스코어 계산 중 오류가 발생했습니다.")
 
     else:
         _render_market_tab(tab4)
         with tab5:
-            _render_description_tab()
+            render_description_tab(room_type, d_name)
+
+    # ── 리포트 다운로드 (이번 실행에서 계산한 값만 스냅샷으로 넘김) ─────────────
+    st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
+    _sim_rows = []
+    for _d in (-0.2, -0.1, 0.0, 0.1, 0.2, 0.3):
+        _a, _o, _r, _n = price_sim_point(my_adr, my_occ, elasticity, total_opex, _d)
+        _sim_rows.append((f"{_d:+.0%}", f"₩{int(_a):,}", f"{_o:.0%}", f"₩{int(_r):,}", f"₩{int(_n):,}"))
+    _x_range, _profits = price_sim_curve(my_adr, my_occ, elasticity, total_opex)
+    _bi = int(np.argmax(_profits))
+    _kpis = [
+        ("하루 평균 실수익", f"₩{int(my_revpar):,}", f"지역 평균 ₩{int(b_revpar):,}"),
+        ("월 예상 순이익", f"₩{int(net_profit):,}", _profit_label),
+        ("현재 1박 요금", f"₩{int(my_adr):,}", f"본전 요금 ₩{int(bep_adr):,}"),
+        ("예약률", f"{my_occ:.0%}", f"지역 평균 {b_occ:.0%}"),
+        ("12개월 누적 순이익", f"₩{int(_my_profit.sum()):,}", _note),
+    ]
+    if _ml_ok:
+        _kpis.append(("AI 예측 하루 수익", f"₩{int(_ml['RevPAR_pred']):,}",
+                      f"요금 ₩{int(_ml['ADR_pred']):,} · 예약률 {_ml['Occ_pred']:.0%}"))
+    render_report_export({
+        "title": f"{d_name} {rt_name} 수익 분석 리포트",
+        "generated_at": f"{datetime.now():%Y-%m-%d %H:%M}",
+        "badges": [market_scope, rt_name, host_badge, f"{c_info['emoji']} {cluster_name}"],
+        "kpis": _kpis,
+        "pnl": [("월 매출", f"₩{int(monthly_revenue):,}"), ("에어비앤비 수수료 (3%)", f"- ₩{int(airbnb_fee):,}"),
+                ("월 운영비", f"- ₩{int(total_opex):,}"), ("월 순이익", f"₩{int(net_profit):,}")],
+        "pricing": {
+            "note": f"적정 1박 요금 ₩{rec_min:,} ~ ₩{rec_max:,} · {cluster_name} 시장은 요금 10% 변경 시 "
+                    f"예약률이 약 {abs(elasticity) * 10:.0f}% 변화 (탄력성 {el_source})",
+            "rows": _sim_rows,
+            "best": f"최대 순이익 요금 ₩{int(my_adr * (1 + _x_range[_bi])):,} ({_x_range[_bi]:+.0%}) → "
+                    f"월 ₩{int(_profits[_bi]):,}",
+        },
+        "pois": [p for p in _nearby_pois if p["dist_km"] <= 2.0][:10] if my_lat and my_lng else [],
+        "health": {**_hs, "labels": {k: v[0] for k, v in comp_labels.items()}} if _hs_ok else None,
+        "description": description_template(room_type, d_name),
+    })
 
     # ── 다시 시작 ────────────────────────────────────────────────────────────
     st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
@@ -2290,16 +2850,44 @@ def step5():
 step      = st.session_state.get("step", 1)
 host_type = st.session_state.get("host_type", None)
 
-if step == 1:
-    step1()
-elif step == 2:
-    if host_type == "new":
-        step2_new()
-    else:
-        step2_existing()
-elif step == 3:
-    step3()
-elif step == 4:
-    step4_existing()
-else:
-    step5()
+_route = {1: "step1", 2: "step2_new" if host_type == "new" else "step2_existing",
+          3: "step3", 4: "step4_existing"}.get(step, "step5")
+
+try:
+    with memory_tracker.track(_route):
+        if step == 1:
+            step1()
+        elif step == 2:
+            if host_type == "new":
+                step2_new()
+            else:
+                step2_existing()
+        elif step == 3:
+            step3()
+        elif step == 4:
+            step4_existing()
+        else:
+            step5()
+finally:
+    if _profiler is not None:
+        _profile_paths = _profiler.stop().write(PROFILE_DIR, f"step{step}_{_session_id[:8]}")
+
+if _profiler is not None:
+    with st.expander(f"⏱️ 프로파일 — 이번 실행 {_profiler.wall_ms:,.0f} ms"):
+        st.dataframe(pd.DataFrame(_profiler.top_functions(20)), hide_index=True, use_container_width=True)
+        st.caption(f"speedscope: {_profile_paths['speedscope'].name} · flamegraph: "
+                   f"{_profile_paths['collapsed'].name} ({PROFILE_DIR})")
+
+if st.query_params.get(QUERY_STATS_QUERY) == "1":
+    with st.expander("🔎 리스팅 저장소 쿼리 지연 (이 프로세스)"):
+        st.dataframe(pd.DataFrame(listing_store.latency()), hide_index=True, use_container_width=True)
+        st.caption(f"{listing_store.path}")
+
+if st.query_params.get(CACHE_STATS_QUERY) == "1":
+    with st.expander("🗄️ 공유 결과 캐시 적중률 (호스트 전체 누적)"):
+        st.dataframe(pd.DataFrame(get_result_cache().stats()), hide_index=True, use_container_width=True)
+        st.caption(f"{get_result_cache().path}")
+
+if memory_tracker.enabled and st.query_params.get(REPORT_QUERY) == "1":
+    with st.expander("🧠 단계별 메모리 잔존량 (프로세스 전체)"):
+        st.dataframe(pd.DataFrame(memory_tracker.report()), hide_index=True, use_container_width=True)
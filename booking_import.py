@@ -0,0 +1,281 @@
+"""
+booking_import.py — 예약 내역 파일(iCal / CSV) → 월별 평일·주말 예약률
+======================================================================
+
+사용법:
+    from booking_import import load_bookings, trailing_summary
+
+    hist = load_bookings(uploaded.getvalue(), uploaded.name)   # BookingHistory (calendar_bits)
+    s = trailing_summary(hist)                                  # 최근 12개월 요약 (아래 참조)
+    s["occ_rate"], s["weekday_occ"], s["weekend_occ"]
+
+    python booking_import.py reservations.ics                  # 파일 요약 출력
+    python booking_import.py                                    # 합성 5년치 벤치마크
+
+지원 형식:
+    iCal (.ics) — 에어비앤비 · 부킹닷컴 등의 캘린더 내보내기. VEVENT 의 DTSTART ~ DTEND
+                  (체크아웃 날 제외) 를 숙박일로 봅니다. 에어비앤비가 호스트 차단일을 내보내는
+                  "Not available" / "Blocked" 일정은 기본으로 제외합니다.
+    CSV         — 체크인 / 체크아웃 열 (또는 체크인 + 박 수 열). 에어비앤비 예약 내보내기
+                  ("Start date", "End date", "# of nights", "Status") 와 한글 열 이름을 인식하고,
+                  상태 열이 있으면 취소된 예약을 뺍니다.
+
+처리 방식:
+    파일은 줄 단위 (iCal) / 청크 단위 (CSV) 로 읽어 체크인·체크아웃 날짜 배열만 만들고,
+    expand_nights() 가 np.repeat 한 번으로 모든 숙박을 1박 단위 날짜로 펼칩니다.
+    겹치는 예약과 중복 날짜는 BookingHistory.from_nights() 에서 1번만 셉니다.
+"""
+
+import io
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from calendar_bits import BookingHistory, popcount32
+
+_BLOCKED = ("not available", "blocked", "unavailable", "closed", "예약 불가", "차단")
+_CANCELLED = ("cancel", "취소", "declined", "거절")
+
+_START_COLS = ("start date", "start", "check-in", "checkin", "check in", "arrival", "체크인", "시작일", "입실일")
+_END_COLS = ("end date", "end", "check-out", "checkout", "check out", "departure", "체크아웃", "종료일", "퇴실일")
+_NIGHTS_COLS = ("# of nights", "nights", "number of nights", "숙박일수", "박수", "박")
+_STATUS_COLS = ("status", "상태", "예약 상태")
+
+_ICAL_DATE = re.compile(r"(\d{8})")
+
+
+def expand_nights(starts, ends) -> np.ndarray:
+    """[start, end) 숙박 구간 배열 → 1박 단위 날짜 배열 (datetime64[D]). 0박 이하 구간은 무시."""
+    s = np.asarray(starts, dtype="datetime64[D]")
+    n = (np.asarray(ends, dtype="datetime64[D]") - s).astype(np.int64)
+    keep = n > 0
+    s, n = s[keep], n[keep]
+    if len(n) == 0:
+        return np.zeros(0, dtype="datetime64[D]")
+    offsets = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+    return np.repeat(s, n) + offsets
+
+
+def parse_ical(lines, skip_blocked: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """iCal 줄 반복자 → (체크인, 체크아웃) 날짜 배열. DTEND 가 없으면 1박으로 봅니다."""
+    starts, ends = [], []
+    in_event = False
+    start = end = summary = None
+    prev = ""
+
+    def flush(line):
+        nonlocal in_event, start, end, summary
+        key, _, value = line.partition(":")
+        name = key.split(";", 1)[0].upper()
+        if name == "BEGIN" and value.strip().upper() == "VEVENT":
+            in_event, start, end, summary = True, None, None, ""
+        elif not in_event:
+            return
+        elif name == "DTSTART":
+            m = _ICAL_DATE.search(value)
+            start = m.group(1) if m else None
+        elif name == "DTEND":
+            m = _ICAL_DATE.search(value)
+            end = m.group(1) if m else None
+        elif name == "SUMMARY":
+            summary = value.strip().lower()
+        elif name == "END" and value.strip().upper() == "VEVENT":
+            in_event = False
+            if start and not (skip_blocked and any(b in summary for b in _BLOCKED)):
+                starts.append(start)
+                ends.append(end or "")
+
+    for raw in lines:
+        line = raw.decode("utf-8", "replace") if isinstance(raw, bytes) else raw
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):        # RFC 5545 줄 접기 — 앞 줄에 이어 붙임
+            prev += line[1:]
+            continue
+        if prev:
+            flush(prev)
+        prev = line
+    if prev:
+        flush(prev)
+
+    s = pd.to_datetime(pd.Series(starts, dtype=object), format="%Y%m%d").to_numpy("datetime64[D]")
+    e = pd.to_datetime(pd.Series(ends, dtype=object), format="%Y%m%d", errors="coerce").to_numpy("datetime64[D]")
+    missing = np.isnat(e)
+    e[missing] = s[missing] + 1
+    return s, e
+
+
+def _find_col(columns, candidates) -> str | None:
+    norm = {str(c).strip().lower(): c for c in columns}
+    for cand in candidates:
+        if cand in norm:
+            return norm[cand]
+    return None
+
+
+def _csv_encoding(buffer) -> str:
+    """CSV 인코딩 판단 — UTF-8 (엑셀 내보내기의 BOM 포함) 을 먼저, 안 되면 cp949 (한글 엑셀)."""
+    raw = buffer.read()
+    buffer.seek(0)
+    if isinstance(raw, str):
+        return "utf-8"
+    try:
+        raw.decode("utf-8-sig")
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def parse_csv(buffer, chunksize: int = 50_000) -> tuple[np.ndarray, np.ndarray]:
+    """예약 CSV → (체크인, 체크아웃) 날짜 배열. 필요한 열만 chunksize 행씩 읽습니다."""
+    encoding = _csv_encoding(buffer)
+    header = pd.read_csv(buffer, nrows=0, encoding=encoding).columns
+    buffer.seek(0)
+    start_col = _find_col(header, _START_COLS)
+    end_col = _find_col(header, _END_COLS)
+    nights_col = _find_col(header, _NIGHTS_COLS)
+    status_col = _find_col(header, _STATUS_COLS)
+    if start_col is None or (end_col is None and nights_col is None):
+        raise ValueError(
+            f"체크인 / 체크아웃 (또는 박 수) 열을 찾지 못했습니다. 열 이름: {', '.join(map(str, header))}"
+        )
+
+    usecols = [c for c in (start_col, end_col, nights_col, status_col) if c is not None]
+    starts, ends = [], []
+    for chunk in pd.read_csv(buffer, usecols=usecols, chunksize=chunksize, dtype=str, encoding=encoding):
+        if status_col is not None:
+            status = chunk[status_col].fillna("").str.lower()
+            chunk = chunk[~status.str.contains("|".join(_CANCELLED), regex=True)]
+        s = pd.to_datetime(chunk[start_col], errors="coerce", format="mixed")
+        if end_col is not None:
+            e = pd.to_datetime(chunk[end_col], errors="coerce", format="mixed")
+        else:
+            nights = pd.to_numeric(chunk[nights_col], errors="coerce")
+            e = s + pd.to_timedelta(nights, unit="D")
+        ok = s.notna() & e.notna()
+        starts.append(s[ok].to_numpy("datetime64[D]"))
+        ends.append(e[ok].to_numpy("datetime64[D]"))
+    if not starts:
+        return np.zeros(0, dtype="datetime64[D]"), np.zeros(0, dtype="datetime64[D]")
+    return np.concatenate(starts), np.concatenate(ends)
+
+
+def load_bookings(data: bytes, filename: str = "", skip_blocked: bool = True) -> BookingHistory:
+    """업로드 파일 바이트 → BookingHistory. 형식은 내용 (BEGIN:VCALENDAR) 과 확장자로 판단."""
+    head = data[:512].lstrip(b"\xef\xbb\xbf").lstrip()
+    if head.upper().startswith(b"BEGIN:VCALENDAR") or filename.lower().endswith((".ics", ".ical")):
+        starts, ends = parse_ical(io.BytesIO(data), skip_blocked=skip_blocked)
+    else:
+        starts, ends = parse_csv(io.BytesIO(data))
+    return BookingHistory.from_nights(expand_nights(starts, ends))
+
+
+def trailing_summary(hist: BookingHistory, today: date | None = None, months: int = 12,
+                     short_history: bool = False) -> dict:
+    """최근 months 개월 (지난달까지, 진행 중인 달 제외) 평일/주말 예약률.
+
+    예약 내보내기에서 예약이 없는 달은 "데이터 없음" 이 아니라 예약률 0% 이므로, 파일의 첫·마지막
+    예약보다 바깥 달도 0 으로 채워 항상 months 개월 전체로 계산합니다. 호스트가 파일에 그보다 짧은
+    기간만 담겨 있다고 알려 준 경우 (short_history=True) 에만 파일의 첫 예약 달부터 셉니다.
+
+    Returns
+    -------
+    dict with keys:
+        start, end            — 구간 첫 달 / 마지막 달 (date, 1일)
+        months                — 구간 달 수
+        occ_rate, weekday_occ, weekend_occ  — 구간 전체 예약률 (month_occupancy 와 같은 키)
+        booked, days_in_month, weekdays_booked, weekends_booked, weekdays_total, weekends_total
+                              — 월 평균 일수 (step5 의 "월 매출" 계산과 같은 단위)
+        monthly               — 구간의 월별 행 list[dict] (BookingHistory.monthly 열)
+        nights                — 구간의 숙박일 수
+    """
+    if len(hist.masks) == 0:
+        raise ValueError("예약된 숙박일이 없습니다.")
+    today = today or date.today()
+    end_idx = today.year * 12 + today.month - 2                 # 지난달 (진행 중인 달 제외)
+    if hist.first > end_idx:
+        raise ValueError("지난달까지의 숙박이 없습니다 — 앞으로의 예약만 담긴 파일입니다.")
+    start_idx = end_idx - months + 1
+    if short_history:
+        start_idx = max(start_idx, hist.first)
+
+    # 구간 밖 달은 0 (예약 없음) 으로 채운 구간 전용 비트셋
+    masks = np.zeros(end_idx - start_idx + 1, dtype=np.uint32)
+    lo, hi = max(start_idx, hist.first), min(end_idx, hist.first + len(hist.masks) - 1)
+    if lo <= hi:
+        masks[lo - start_idx: hi - start_idx + 1] = hist.masks[lo - hist.first: hi - hist.first + 1]
+    window = BookingHistory(start_idx, masks)
+
+    occ = window.occupancy()
+    n = len(masks)
+    return {
+        "start": date(start_idx // 12, start_idx % 12 + 1, 1),
+        "end": date(end_idx // 12, end_idx % 12 + 1, 1),
+        "months": n,
+        "occ_rate": occ["occ_rate"],
+        "weekday_occ": occ["weekday_occ"],
+        "weekend_occ": occ["weekend_occ"],
+        "booked": round(occ["booked"] / n),
+        "days_in_month": round(occ["days_in_month"] / n),
+        "weekdays_booked": round(occ["weekdays_booked"] / n),
+        "weekends_booked": round(occ["weekends_booked"] / n),
+        "weekdays_total": round(occ["weekdays_total"] / n),
+        "weekends_total": round(occ["weekends_total"] / n),
+        "monthly": window.monthly().to_dict("records"),
+        "nights": int(popcount32(window.masks & window.full).sum()),
+    }
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            hist = load_bookings(f.read(), sys.argv[1])
+        s = trailing_summary(hist)
+        print(f"{s['start']:%Y-%m} ~ {s['end']:%Y-%m} ({s['months']}개월) · 전체 {s['nights']}박")
+        print(f"  예약률 {s['occ_rate']:.0%} · 평일 {s['weekday_occ']:.0%} · 주말 {s['weekend_occ']:.0%}")
+        print(pd.DataFrame(s["monthly"]).to_string(index=False))
+        sys.exit(0)
+
+    # 합성 5년치 — 1~6박 예약이 평균 60% 점유, 주 1회 차단일
+    rng = np.random.default_rng(0)
+    day0 = np.datetime64("2021-01-01")
+    starts, cur = [], 0
+    while cur < 365 * 5:
+        cur += int(rng.integers(0, 4))
+        n = int(rng.integers(1, 7))
+        starts.append((cur, n))
+        cur += n
+    ev = []
+    for i, (off, n) in enumerate(starts):
+        s, e = day0 + off, day0 + off + n
+        summary = "Airbnb (Not available)" if i % 7 == 0 else "Reserved"
+        ev.append("BEGIN:VEVENT\r\n"
+                  f"DTSTART;VALUE=DATE:{str(s).replace('-', '')}\r\n"
+                  f"DTEND;VALUE=DATE:{str(e).replace('-', '')}\r\n"
+                  f"SUMMARY:{summary}\r\nUID:{i}@airbnb.com\r\nEND:VEVENT\r\n")
+    ics = ("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + "".join(ev) + "END:VCALENDAR\r\n").encode()
+    csv = pd.DataFrame({
+        "Status": np.where(np.arange(len(starts)) % 11 == 0, "Canceled by guest", "Confirmed"),
+        "Start date": [str(day0 + o) for o, _ in starts],
+        "End date": [str(day0 + o + n) for o, n in starts],
+        "# of nights": [n for _, n in starts],
+    }).to_csv(index=False).encode()
+
+    def bench(data, name, reps=20):
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            s = trailing_summary(load_bookings(data, name), today=date(2026, 1, 15))
+        return (time.perf_counter() - t0) / reps * 1000, s
+
+    t_ics, s_ics = bench(ics, "export.ics")
+    t_csv, s_csv = bench(csv, "reservations.csv")
+    print(f"[예약 내역 가져오기] 합성 5년 · 예약 {len(starts):,}건")
+    for label, t, s, size in (("iCal", t_ics, s_ics, len(ics)), ("CSV ", t_csv, s_csv, len(csv))):
+        print(f"  {label} {size / 1024:6.0f} KB → {t:6.2f} ms · 전체 {s['nights']:,}박 · "
+              f"{s['start']:%Y-%m}~{s['end']:%Y-%m} 예약률 {s['occ_rate']:.0%} "
+              f"(평일 {s['weekday_occ']:.0%} / 주말 {s['weekend_occ']:.0%})")
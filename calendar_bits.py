@@ -0,0 +1,233 @@
+"""
+calendar_bits.py — 비트셋 기반 달력 예약률 계산
+================================================
+
+사용법:
+    from calendar_bits import days_to_mask, month_occupancy, BookingHistory
+
+    mask = days_to_mask({1, 2, 3, 6, 7})                 # 일(1~31) → 비트 (bit d-1)
+    occ = month_occupancy(2026, 3, mask)                 # dict (아래 참조)
+
+    hist = BookingHistory.from_nights(nights)            # 숙박일 배열 (datetime64[D])
+    hist.occupancy()                                     # 전 기간 평일/주말 합산
+    hist.monthly()                                       # 월별 DataFrame
+
+한 달 예약 상태는 31비트 정수 하나입니다. (year, month) 마다
+전체 / 평일(월~금) / 주말(토·일) 마스크를 1회 계산해 캐시하므로,
+예약일 수·평일/주말 예약 수는 AND + popcount 로 끝납니다.
+여러 달은 uint32 배열로 두고 바이트 popcount 테이블로 한 번에 셉니다.
+
+평일/주말 구분은 app.py 기존 기준(요일만, 공휴일은 구분하지 않음)과 같습니다.
+"""
+
+import calendar as cal_mod
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+_SUNDAY_FIRST = cal_mod.Calendar(firstweekday=6)
+
+# 바이트 popcount 테이블 — numpy 버전과 무관하게 uint32 배열 popcount
+_POP8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount32(arr: np.ndarray) -> np.ndarray:
+    """uint32 배열 원소별 1비트 개수."""
+    a = np.ascontiguousarray(arr, dtype=np.uint32)
+    return _POP8[a.view(np.uint8)].reshape(*a.shape, 4).sum(axis=-1, dtype=np.int64)
+
+
+def days_to_mask(days) -> int:
+    mask = 0
+    for d in days:
+        mask |= 1 << (int(d) - 1)
+    return mask
+
+
+def mask_to_days(mask: int) -> set[int]:
+    return {d + 1 for d in range(31) if mask >> d & 1}
+
+
+@lru_cache(maxsize=None)
+def month_masks(year: int, month: int) -> tuple[int, int, int, int]:
+    """(days_in_month, full_mask, weekday_mask, weekend_mask)."""
+    first_dow, days_in_month = cal_mod.monthrange(year, month)  # 0=월
+    weekend = 0
+    for d in range(days_in_month):
+        if (first_dow + d) % 7 >= 5:
+            weekend |= 1 << d
+    full = (1 << days_in_month) - 1
+    return days_in_month, full, full & ~weekend, weekend
+
+
+@lru_cache(maxsize=None)
+def month_grid(year: int, month: int) -> tuple[tuple[int, ...], ...]:
+    """일요일 시작 주 단위 달력 (빈 칸 = 0). 전역 firstweekday 를 건드리지 않습니다."""
+    return tuple(tuple(w) for w in _SUNDAY_FIRST.monthdayscalendar(year, month))
+
+
+def month_occupancy(year: int, month: int, mask: int) -> dict:
+    """한 달 예약 마스크 → 예약률 요약.
+
+    Returns
+    -------
+    dict with keys:
+        occ_rate, booked, days_in_month,
+        weekday_occ, weekend_occ,
+        weekdays_booked, weekdays_total, weekends_booked, weekends_total
+    """
+    days, full, wd_mask, we_mask = month_masks(year, month)
+    booked = (mask & full).bit_count()
+    wd_booked = (mask & wd_mask).bit_count()
+    we_booked = (mask & we_mask).bit_count()
+    wd_total = wd_mask.bit_count()
+    we_total = we_mask.bit_count()
+    return {
+        "occ_rate": booked / days if days else 0,
+        "booked": booked,
+        "days_in_month": days,
+        "weekday_occ": wd_booked / wd_total if wd_total else 0,
+        "weekend_occ": we_booked / we_total if we_total else 0,
+        "weekdays_booked": wd_booked,
+        "weekdays_total": wd_total,
+        "weekends_booked": we_booked,
+        "weekends_total": we_total,
+    }
+
+
+class BookingHistory:
+    """연속된 여러 달의 예약 비트셋 (uint32 배열, 월 인덱스 = year*12 + month-1)."""
+
+    def __init__(self, first_month_idx: int, masks: np.ndarray):
+        self.first = int(first_month_idx)
+        self.masks = np.asarray(masks, dtype=np.uint32)
+        n = len(self.masks)
+        idx = self.first + np.arange(n)
+        self.years = idx // 12
+        self.months = idx % 12 + 1
+        mm = [month_masks(int(y), int(m)) for y, m in zip(self.years, self.months)]
+        self.days = np.array([x[0] for x in mm], dtype=np.int64)
+        self.full = np.array([x[1] for x in mm], dtype=np.uint32)
+        self.weekday = np.array([x[2] for x in mm], dtype=np.uint32)
+        self.weekend = np.array([x[3] for x in mm], dtype=np.uint32)
+
+    @classmethod
+    def from_nights(cls, nights) -> "BookingHistory":
+        """숙박일(1박 = 체크인 날짜) 배열 → 월별 비트셋. 중복 날짜는 1번만 셉니다."""
+        d = np.unique(np.asarray(nights, dtype="datetime64[D]"))
+        if len(d) == 0:
+            return cls(0, np.zeros(0, dtype=np.uint32))
+        m = d.astype("datetime64[M]")
+        month_idx = m.astype(np.int64) + 1970 * 12
+        day = (d - m.astype("datetime64[D]")).astype(np.int64)  # 0-based
+        first = int(month_idx.min())
+        masks = np.zeros(int(month_idx.max()) - first + 1, dtype=np.uint32)
+        np.bitwise_or.at(masks, month_idx - first, (np.uint32(1) << day.astype(np.uint32)))
+        return cls(first, masks)
+
+    @classmethod
+    def from_month_masks(cls, month_masks_by_ym: dict[tuple[int, int], int]) -> "BookingHistory":
+        """{(year, month): mask} → 연속 구간 비트셋 (빠진 달은 0)."""
+        if not month_masks_by_ym:
+            return cls(0, np.zeros(0, dtype=np.uint32))
+        keys = {y * 12 + m - 1: v for (y, m), v in month_masks_by_ym.items()}
+        first, last = min(keys), max(keys)
+        masks = np.zeros(last - first + 1, dtype=np.uint32)
+        for k, v in keys.items():
+            masks[k - first] = v
+        return cls(first, masks)
+
+    def _window(self, start: date | None, end: date | None) -> np.ndarray:
+        idx = self.first + np.arange(len(self.masks))
+        sel = np.ones(len(idx), dtype=bool)
+        if start is not None:
+            sel &= idx >= start.year * 12 + start.month - 1
+        if end is not None:
+            sel &= idx <= end.year * 12 + end.month - 1
+        return sel
+
+    def monthly(self) -> pd.DataFrame:
+        """월별 예약일·평일/주말 예약 수와 예약률."""
+        b = self.masks & self.full
+        wd_b, we_b = popcount32(b & self.weekday), popcount32(b & self.weekend)
+        wd_t, we_t = popcount32(self.weekday), popcount32(self.weekend)
+        return pd.DataFrame({
+            "year": self.years,
+            "month": self.months,
+            "days_in_month": self.days,
+            "booked": wd_b + we_b,
+            "weekdays_booked": wd_b,
+            "weekdays_total": wd_t,
+            "weekends_booked": we_b,
+            "weekends_total": we_t,
+            "occ_rate": (wd_b + we_b) / self.days,
+            "weekday_occ": wd_b / np.maximum(wd_t, 1),
+            "weekend_occ": we_b / np.maximum(we_t, 1),
+        })
+
+    def occupancy(self, start: date | None = None, end: date | None = None) -> dict:
+        """start~end (월 단위, 양끝 포함) 합산 예약률 — month_occupancy 와 같은 키."""
+        sel = self._window(start, end)
+        b = self.masks[sel] & self.full[sel]
+        wd_b = int(popcount32(b & self.weekday[sel]).sum())
+        we_b = int(popcount32(b & self.weekend[sel]).sum())
+        wd_t = int(popcount32(self.weekday[sel]).sum())
+        we_t = int(popcount32(self.weekend[sel]).sum())
+        days = int(self.days[sel].sum())
+        return {
+            "occ_rate": (wd_b + we_b) / days if days else 0,
+            "booked": wd_b + we_b,
+            "days_in_month": days,
+            "weekday_occ": wd_b / wd_t if wd_t else 0,
+            "weekend_occ": we_b / we_t if we_t else 0,
+            "weekdays_booked": wd_b,
+            "weekdays_total": wd_t,
+            "weekends_booked": we_b,
+            "weekends_total": we_t,
+        }
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+if __name__ == "__main__":
+    import time
+    from datetime import datetime
+
+    rng = np.random.default_rng(0)
+    booked = set(rng.choice(np.arange(1, 32), 18, replace=False).tolist()) - {31}
+
+    def loop_version(year, month, booked):
+        days_in_month = cal_mod.monthrange(year, month)[1]
+        wd_t = we_t = wd_b = we_b = 0
+        for d in range(1, days_in_month + 1):
+            if datetime(year, month, d).weekday() >= 5:
+                we_t += 1
+                we_b += d in booked
+            else:
+                wd_t += 1
+                wd_b += d in booked
+        return wd_b, wd_t, we_b, we_t
+
+    n = 20_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        loop_version(2026, 3, booked)
+    t_loop = (time.perf_counter() - t0) / n * 1e6
+    mask = days_to_mask(booked)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        month_occupancy(2026, 3, mask)
+    t_bits = (time.perf_counter() - t0) / n * 1e6
+
+    nights = np.datetime64("2022-01-01") + rng.choice(365 * 4, 900, replace=False)
+    t0 = time.perf_counter()
+    hist = BookingHistory.from_nights(nights)
+    summary = hist.occupancy()
+    t_hist = (time.perf_counter() - t0) * 1000
+
+    print("[달력 예약률 계산]")
+    print(f"  한 달 (루프)       : {t_loop:7.2f} µs")
+    print(f"  한 달 (비트셋)     : {t_bits:7.2f} µs")
+    print(f"  4년 {len(nights)}박 일괄 : {t_hist:7.2f} ms  "
+          f"(평일 {summary['weekday_occ']:.1%} / 주말 {summary['weekend_occ']:.1%})")
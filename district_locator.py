@@ -0,0 +1,135 @@
+"""
+district_locator.py — 좌표 → 자치구 판별 (STRtree point-in-polygon)
+====================================================================
+
+사용법:
+    locator = DistrictLocator.load()              # 경계 파일 로드 + STRtree
+    locator.locate(37.5563, 126.9220)             # "Mapo-gu" (서울 밖이면 None)
+    locator.locate_many(lats, lngs)               # 배치 — object 배열
+
+경계 파일 (data/processed/seoul_districts.geojson):
+    FeatureCollection, feature 마다 properties.district (영문 구 이름, district_clustered.csv 와 동일)
+    로드 시 1회 STRtree 를 만들고, 조회는 bbox 후보 → polygon 포함 검사 순서로 진행합니다.
+
+    공식 경계(통계청 SGIS 등 GeoJSON)로 교체:
+        python district_locator.py build 원본.geojson [이름_속성]
+        → 영문 구 이름으로 매핑, 단순화(tolerance 0.0005° ≈ 50m) 후 저장
+
+    경계 파일은 아직 저장소에 포함돼 있지 않습니다. 중심점 Voronoi 같은 근사 경계는 구 경계 근처에서
+    틀린 구를 돌려주므로 (예: 구로디지털단지 → 금천구) 쓰지 않고, app.py 의 자치구 변경 제안도
+    공식 경계 파일을 build 로 만들어 넣은 뒤에 연결합니다.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import shapely
+from shapely.geometry import mapping, shape
+from shapely.strtree import STRtree
+
+BOUNDARY_PATH = Path(__file__).parent / "data" / "processed" / "seoul_districts.geojson"
+
+# 공식 경계 파일의 한글 구 이름 → 영문 (district_clustered.csv 기준)
+DISTRICT_KR_TO_EN = {
+    "도봉구": "Dobong-gu", "동대문구": "Dongdaemun-gu", "동작구": "Dongjak-gu",
+    "은평구": "Eunpyeong-gu", "강북구": "Gangbuk-gu", "강동구": "Gangdong-gu",
+    "강남구": "Gangnam-gu", "강서구": "Gangseo-gu", "금천구": "Geumcheon-gu",
+    "구로구": "Guro-gu", "관악구": "Gwanak-gu", "광진구": "Gwangjin-gu",
+    "종로구": "Jongno-gu", "중구": "Jung-gu", "중랑구": "Jungnang-gu",
+    "마포구": "Mapo-gu", "노원구": "Nowon-gu", "서초구": "Seocho-gu",
+    "서대문구": "Seodaemun-gu", "성북구": "Seongbuk-gu", "성동구": "Seongdong-gu",
+    "송파구": "Songpa-gu", "양천구": "Yangcheon-gu", "영등포구": "Yeongdeungpo-gu",
+    "용산구": "Yongsan-gu",
+}
+
+
+class DistrictLocator:
+    """자치구 경계 polygon 의 STRtree. 좌표는 (위도, 경도) 순서로 받습니다."""
+
+    def __init__(self, names, polygons):
+        self.names = np.array(list(names), dtype=object)
+        self.polygons = list(polygons)
+        for poly in self.polygons:
+            shapely.prepare(poly)
+        self.tree = STRtree(self.polygons)
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> "DistrictLocator":
+        p = Path(path) if path else BOUNDARY_PATH
+        with open(p, encoding="utf-8") as f:
+            fc = json.load(f)
+        names = [ft["properties"]["district"] for ft in fc["features"]]
+        polygons = [shape(ft["geometry"]) for ft in fc["features"]]
+        return cls(names, polygons)
+
+    def locate(self, lat: float, lng: float) -> str | None:
+        """좌표가 속한 자치구 영문 이름 (경계 밖이면 None)."""
+        hits = self.tree.query(shapely.Point(lng, lat), predicate="within")
+        return self.names[hits[0]] if len(hits) else None
+
+    def locate_many(self, lats, lngs) -> np.ndarray:
+        """좌표 배열 → 자치구 이름 배열 (object, 경계 밖은 None)."""
+        points = shapely.points(np.asarray(lngs, dtype=np.float64), np.asarray(lats, dtype=np.float64))
+        src, dst = self.tree.query(points, predicate="within")
+        out = np.full(len(points), None, dtype=object)
+        out[src] = self.names[dst]  # 경계선 위 점은 마지막 일치 구로
+        return out
+
+
+def _write_feature_collection(names, polygons, path: Path) -> Path:
+    features = []
+    for name, poly in zip(names, polygons):
+        geom = shapely.set_precision(poly, 1e-5)  # 소수점 5자리 ≈ 1m
+        features.append({"type": "Feature", "properties": {"district": name}, "geometry": mapping(geom)})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f, ensure_ascii=False)
+    return path
+
+
+def build_boundaries(src: str | Path, name_field: str = "name", tolerance: float = 0.0005,
+                     out: str | Path | None = None) -> Path:
+    """공식 구 경계 GeoJSON (WGS84) → 단순화한 번들 파일."""
+    with open(src, encoding="utf-8") as f:
+        fc = json.load(f)
+    names, polygons = [], []
+    for ft in fc["features"]:
+        raw = str(ft["properties"][name_field]).strip()
+        name = DISTRICT_KR_TO_EN.get(raw, raw)
+        names.append(name)
+        polygons.append(shape(ft["geometry"]).simplify(tolerance, preserve_topology=True))
+    return _write_feature_collection(names, polygons, Path(out) if out else BOUNDARY_PATH)
+
+
+# ── CLI / 벤치마크 (직접 실행 시) ─────────────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        p = build_boundaries(sys.argv[2], *(sys.argv[3:4] or []))
+        print(f"[자치구 경계] {p} 저장 ({p.stat().st_size / 1024:.0f} KB)")
+        sys.exit(0)
+    if not BOUNDARY_PATH.exists():
+        sys.exit(f"경계 파일이 없습니다 — python district_locator.py build 원본.geojson [이름_속성] ({BOUNDARY_PATH})")
+
+    t0 = time.perf_counter()
+    locator = DistrictLocator.load()
+    t_load = (time.perf_counter() - t0) * 1000
+
+    n = 20_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        name = locator.locate(37.5563, 126.9220)
+    t_one = (time.perf_counter() - t0) / n * 1e6
+
+    rng = np.random.default_rng(0)
+    lats, lngs = rng.uniform(37.43, 37.70, 100_000), rng.uniform(126.76, 127.19, 100_000)
+    t0 = time.perf_counter()
+    found = locator.locate_many(lats, lngs)
+    t_batch = (time.perf_counter() - t0) * 1e6 / len(lats)
+
+    print(f"[자치구 판별] {len(locator.names)}개 구 · 로드+STRtree {t_load:.1f} ms")
+    print(f"  단건 (홍대입구 → {name}) : {t_one:6.1f} µs/점")
+    print(f"  배치 10만 점           : {t_batch:6.2f} µs/점 (서울 안 {np.mean(found != None):.0%})")  # noqa: E711
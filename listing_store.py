@@ -0,0 +1,376 @@
+"""
+listing_store.py — 리스팅 조회 계층 (SQLite 인덱스 + 준비된 쿼리 + 쿼리별 지연)
+==========================================================================
+
+사용법 (app.py):
+    store = get_listing_store(source_version(RAW_PATH, CLUSTERED_PATH, AO_PATH))   # st.cache_resource, 원본이 바뀌면 재구축
+    bench = store.bench("Mapo-gu", "entire_home")               # 실운영 (Active+Operating) 벤치마크 행
+    store.bench_percentiles("Mapo-gu", "entire_home", "ttm_avg_rate", (50, 25, 75))
+    store.cluster_peers(2)                                      # cluster_listings_ao.csv 의 같은 클러스터
+    store.district_rows("Mapo-gu")                              # 한 자치구 실운영 행
+    store.active(["room_type", "latitude", "longitude"])        # 실운영 전체 중 필요한 컬럼만 (유사 숙소 KD-tree)
+    store.latency()                                             # 쿼리별 호출 수 · p50 / p95 / 최대 ms
+
+    python listing_store.py --build                             # 배포 단계: data/processed/listings.sqlite 구축 (앱은 열기만)
+    python listing_store.py                                     # 구축 + pandas 마스크 대비 벤치마크
+    python listing_store.py data/raw/seoul_airbnb_cleaned.csv --scale 10   # 원본 10배 (다년치 가정)
+
+왜 pandas 마스크가 아닌가:
+    get_bench · active_df · cluster_df · ml_ao_df 필터는 매 조회마다 전체 프레임을 훑는 불리언 마스크였고,
+    원본 CSV 전체를 프로세스마다 메모리에 올려야 했습니다. 여기서는 원본을 청크 단위로 읽어 SQLite 파일
+    1개로 한 번 적재하고, (is_active, district, room_type) · (is_active, cluster) · 상태 · AO cluster /
+    district 인덱스로 필요한 행만 읽습니다. 원본이 메모리보다 커도 적재와 조회 모두 청크 · 인덱스 단위입니다.
+
+테이블:
+    listings   — seoul_airbnb_cleaned.csv + district_clustered 의 cluster / cluster_name + is_active
+    districts  — district_clustered.csv
+    ao         — revpar_model_package/cluster_listings_ao.csv
+    meta       — 원본 파일 버전 (이름 · mtime · 크기). 다르면 open() 이 임시 파일로 재구축 후 교체.
+
+DuckDB 가 아닌 이유:
+    조회가 전부 "인덱스 키 1~3개로 수백 행" 형태라 행 저장 + B-tree 로 충분하고, 표준 라이브러리라
+    requirements 에 의존성을 늘리지 않습니다. 백분위는 인덱스로 뽑은 한 컬럼에 np.percentile 을 적용해
+    기존 bench_val 과 같은 값 (선형 보간) 을 냅니다.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows — 잠금 없이 os.replace 의 원자적 교체만 사용
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+_ROOT = Path(__file__).parent
+RAW_PATH = _ROOT / "data" / "raw" / "seoul_airbnb_cleaned.csv"
+CLUSTERED_PATH = _ROOT / "data" / "processed" / "district_clustered.csv"
+AO_PATH = _ROOT / "revpar_model_package" / "cluster_listings_ao.csv"
+STORE_PATH = _ROOT / "data" / "processed" / "listings.sqlite"
+STATS_QUERY = "querystats"
+
+POI_COLS = ["nearest_poi_name", "nearest_poi_addr", "nearest_poi_type_name",
+            "nearest_poi_lat", "nearest_poi_lng"]
+
+_INDEXES = """
+CREATE INDEX listings_bench   ON listings(is_active, district, room_type);
+CREATE INDEX listings_cluster ON listings(is_active, cluster);
+CREATE INDEX listings_status  ON listings(refined_status, operation_status);
+CREATE INDEX listings_district ON listings(district);
+CREATE INDEX districts_district ON districts(district);
+CREATE INDEX ao_cluster  ON ao(cluster);
+CREATE INDEX ao_district ON ao(district);
+"""
+
+# 준비된 쿼리 — {cols} 는 listings 원본 컬럼 목록 (is_active 제외), {col} 은 검증된 컬럼 1개
+QUERIES = {
+    "bench":         "SELECT {cols} FROM listings WHERE is_active = 1 AND district = ? AND room_type = ?",
+    "bench_values":  "SELECT {col} FROM listings WHERE is_active = 1 AND district = ? AND room_type = ? "
+                     "AND {col} IS NOT NULL",
+    "active":        "SELECT {cols} FROM listings WHERE is_active = 1",
+    "district_rows": "SELECT {cols} FROM listings WHERE is_active = 1 AND district = ?",
+    "cluster_rows":  "SELECT {cols} FROM listings WHERE is_active = 1 AND cluster = ?",
+    "cluster_peers": "SELECT * FROM ao WHERE cluster = ?",
+    "cluster_peer_count": "SELECT COUNT(*) AS n FROM ao WHERE cluster = ?",
+    "district_info": "SELECT * FROM districts WHERE district = ?",
+    "districts":     "SELECT DISTINCT district FROM listings WHERE district IS NOT NULL ORDER BY district",
+    # drop_duplicates(keep="first") 와 같은 행 — 이름별 첫 rowid
+    "pois":          "SELECT {poi_cols} FROM listings WHERE rowid IN ("
+                     "SELECT MIN(rowid) FROM listings WHERE nearest_poi_name IS NOT NULL "
+                     "AND nearest_poi_lat IS NOT NULL AND nearest_poi_lng IS NOT NULL "
+                     "GROUP BY nearest_poi_name) ORDER BY rowid",
+}
+
+
+def source_version(*paths) -> str:
+    """원본 파일 이름 · mtime · 크기 — meta 에 저장해 재구축 여부를 판단."""
+    parts = []
+    for p in map(Path, paths):
+        st = p.stat() if p.exists() else None
+        parts.append(f"{p.name}:{st.st_mtime_ns}:{st.st_size}" if st else f"{p.name}:-")
+    return "|".join(parts)
+
+
+def build_store(path=STORE_PATH, raw_path=RAW_PATH, clustered_path=CLUSTERED_PATH, ao_path=AO_PATH,
+                chunksize: int = 100_000) -> dict:
+    """CSV 3개 → SQLite 파일 (청크 적재 + 인덱스). 임시 파일에 만든 뒤 교체합니다. 단계별 초 반환."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        timings = _build(tmp, raw_path, clustered_path, ao_path, chunksize)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)        # 실패한 빌드의 임시 파일을 남기지 않음
+        raise
+    return timings
+
+
+def _build(tmp: Path, raw_path, clustered_path, ao_path, chunksize: int) -> dict:
+    timings = {}
+    t0 = time.perf_counter()
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        clustered = pd.read_csv(clustered_path)
+        clustered.to_sql("districts", conn, index=False)
+        cmap = clustered[["district", "cluster", "cluster_name"]]
+        n = 0
+        for chunk in pd.read_csv(raw_path, chunksize=chunksize, low_memory=False):
+            chunk = chunk.merge(cmap, on="district", how="left")
+            chunk["is_active"] = ((chunk["refined_status"] == "Active")
+                                  & (chunk["operation_status"] == "Operating")).astype(np.int8)
+            chunk.to_sql("listings", conn, index=False, if_exists="append")
+            n += len(chunk)
+        pd.read_csv(ao_path).to_sql("ao", conn, index=False)
+        timings["적재"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        conn.executescript(_INDEXES)
+        conn.execute("ANALYZE")
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("source_version", source_version(raw_path, clustered_path, ao_path)),
+            ("rows", str(n)),
+        ])
+        conn.commit()
+        timings["인덱스"] = time.perf_counter() - t0
+    finally:
+        conn.close()
+    return timings
+
+
+def _stored_version(path: Path) -> str | None:
+    """저장소 파일 meta 의 원본 버전 — 파일이 없거나 깨졌으면 None."""
+    if not path.exists():
+        return None
+    try:
+        with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source_version'").fetchone()
+            return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+
+@contextmanager
+def _build_lock(path: Path):
+    """저장소 옆 .lock 파일에 배타 잠금 — 여러 워커 중 한 프로세스만 재구축 (fcntl 이 없는 OS 는 잠금 없음)."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f"{path.name}.lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class ListingStore:
+    """읽기 전용 SQLite 리스팅 저장소 — 스레드마다 연결 1개, 쿼리별 지연 기록."""
+
+    def __init__(self, path=STORE_PATH, window: int = 2_048):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._lat: dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._rows: dict[str, int] = {}
+        self._districts = None
+        cols = [r[1] for r in self._conn().execute("PRAGMA table_info(listings)") if r[1] != "is_active"]
+        self.columns = cols
+        self._sql = {name: q.format(cols=", ".join(f'"{c}"' for c in cols), col="{col}",
+                                    poi_cols=", ".join(POI_COLS))
+                     for name, q in QUERIES.items()}
+
+    @classmethod
+    def open(cls, path=STORE_PATH, raw_path=RAW_PATH, clustered_path=CLUSTERED_PATH, ao_path=AO_PATH):
+        """저장소 파일의 원본 버전이 현재 CSV 와 다르면 (또는 파일이 없으면) 재구축 후 엽니다.
+
+        배포 단계에서 `python listing_store.py --build` 로 미리 만들어 두면 여기서는 버전만 확인하고
+        엽니다. 재구축이 필요하면 잠금을 잡은 한 프로세스만 만들고, 기다린 나머지는 잠금을 얻은 뒤
+        버전을 다시 확인해 그 결과를 그대로 엽니다.
+        """
+        path = Path(path)
+        want = source_version(raw_path, clustered_path, ao_path)
+        if _stored_version(path) != want:
+            with _build_lock(path):
+                if _stored_version(path) != want:
+                    build_store(path, raw_path, clustered_path, ao_path)
+        return cls(path)
+
+    # ── 연결 ────────────────────────────────────────────────────────────────
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _frame(self, name: str, params=(), sql: str | None = None) -> pd.DataFrame:
+        t0 = time.perf_counter()
+        out = pd.read_sql_query(sql or self._sql[name], self._conn(), params=params)
+        self._record(name, time.perf_counter() - t0, len(out))
+        return out
+
+    def _record(self, name: str, seconds: float, rows: int) -> None:
+        with self._lock:
+            self._lat[name].append(seconds)
+            self._rows[name] = rows
+
+    # ── 준비된 쿼리 ─────────────────────────────────────────────────────────
+    def bench(self, district: str, room_type: str) -> pd.DataFrame:
+        """실운영 (Active+Operating) 중 같은 자치구 × 숙소 종류 — 기존 get_bench 와 같은 행."""
+        return self._frame("bench", (district, room_type))
+
+    def bench_percentiles(self, district: str, room_type: str, col: str, pcts=(50,)) -> np.ndarray | None:
+        """한 컬럼만 인덱스로 읽어 백분위 (np.percentile 선형 보간). 값이 없으면 None."""
+        if col not in self.columns:
+            raise KeyError(f"listings 에 없는 컬럼: {col}")
+        t0 = time.perf_counter()
+        sql = self._sql["bench_values"].format(col=f'"{col}"')
+        vals = np.array([r[0] for r in self._conn().execute(sql, (district, room_type))], dtype=np.float64)
+        out = np.percentile(vals, pcts) if len(vals) else None
+        self._record("bench_percentiles", time.perf_counter() - t0, len(vals))
+        return out
+
+    def active(self, columns=None) -> pd.DataFrame:
+        """실운영 (Active+Operating) 전체 행. columns 를 주면 그 컬럼만 읽습니다 (전체 원본 행을 올리지 않도록)."""
+        if columns is None:
+            return self._frame("active")
+        missing = [c for c in columns if c not in self.columns]
+        if missing:
+            raise KeyError(f"listings 에 없는 컬럼: {', '.join(missing)}")
+        return self._frame("active", sql=QUERIES["active"].format(cols=", ".join(f'"{c}"' for c in columns)))
+
+    def district_rows(self, district: str) -> pd.DataFrame:
+        return self._frame("district_rows", (district,))
+
+    def cluster_rows(self, cluster: int) -> pd.DataFrame:
+        return self._frame("cluster_rows", (int(cluster),))
+
+    def cluster_peers(self, cluster: int) -> pd.DataFrame:
+        """cluster_listings_ao.csv 중 같은 클러스터 — compute_health_score 의 비교 집단."""
+        return self._frame("cluster_peers", (int(cluster),))
+
+    def cluster_peer_count(self, cluster: int) -> int:
+        return int(self._frame("cluster_peer_count", (int(cluster),))["n"].iloc[0])
+
+    def district_info(self, district: str) -> pd.DataFrame:
+        """district_clustered.csv 의 해당 자치구 행 (없으면 빈 프레임)."""
+        return self._frame("district_info", (district,))
+
+    def districts(self) -> list[str]:
+        """리스팅이 있는 자치구 (정렬). 저장소는 읽기 전용이라 첫 조회 결과를 재사용합니다."""
+        if self._districts is None:
+            self._districts = self._frame("districts")["district"].tolist()
+        return self._districts
+
+    def pois(self) -> pd.DataFrame:
+        """이름별 첫 행 기준 유니크 POI (좌표 있는 것만)."""
+        return self._frame("pois")
+
+    # ── 지연 ───────────────────────────────────────────────────────────────
+    def latency(self) -> list[dict]:
+        """쿼리별 최근 window 회 호출의 지연 (ms) 과 마지막 결과 행 수."""
+        with self._lock:
+            snap = {k: np.array(v) * 1000 for k, v in self._lat.items()}
+            rows = dict(self._rows)
+        return [{"query": k, "calls": len(v), "p50_ms": float(np.percentile(v, 50)),
+                 "p95_ms": float(np.percentile(v, 95)), "max_ms": float(v.max()), "rows_last": rows[k]}
+                for k, v in sorted(snap.items())]
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    ap = argparse.ArgumentParser(description="ListingStore 구축 + pandas 마스크 대비 쿼리 지연")
+    ap.add_argument("raw", nargs="?", default=str(RAW_PATH))
+    ap.add_argument("--scale", type=int, default=1, help="원본을 k배로 복제 (다년치 데이터 가정)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--build", action="store_true", help="벤치마크 없이 앱이 여는 저장소 파일만 구축")
+    args = ap.parse_args()
+
+    if args.build:
+        t0 = time.perf_counter()
+        ListingStore.open(STORE_PATH, Path(args.raw))
+        print(f"[리스팅 저장소] {STORE_PATH} · {time.perf_counter() - t0:.1f} s")
+        raise SystemExit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(args.raw)
+        if args.scale > 1:
+            raw = Path(tmp) / "raw.csv"
+            src = pd.read_csv(args.raw, low_memory=False)
+            for i in range(args.scale):
+                src.to_csv(raw, mode="a", header=i == 0, index=False)
+        timings = build_store(Path(tmp) / "listings.sqlite", raw)
+        store = ListingStore(Path(tmp) / "listings.sqlite")
+        n_rows = store._conn().execute("SELECT value FROM meta WHERE key = 'rows'").fetchone()[0]
+
+        t0 = time.perf_counter()
+        df = pd.read_csv(raw, low_memory=False)
+        cdf = pd.read_csv(CLUSTERED_PATH)
+        df = df.merge(cdf[["district", "cluster", "cluster_name"]], on="district", how="left")
+        ao = pd.read_csv(AO_PATH)
+        t_pandas_load = time.perf_counter() - t0
+
+        pairs = df[["district", "room_type"]].dropna().drop_duplicates().itertuples(index=False)
+        pairs = list(pairs)
+        clusters = sorted(ao["cluster"].unique())
+        pd_lat = defaultdict(list)
+
+        def timed(name, fn):
+            t = time.perf_counter()
+            fn()
+            pd_lat[name].append(time.perf_counter() - t)
+
+        for _ in range(args.repeat):
+            timed("active", lambda: df[(df["refined_status"] == "Active") & (df["operation_status"] == "Operating")])
+            store.active()
+        active_df = df[(df["refined_status"] == "Active") & (df["operation_status"] == "Operating")]
+        for _ in range(args.repeat):
+            for d, r in pairs:
+                timed("bench", lambda: active_df[(active_df["district"] == d) & (active_df["room_type"] == r)])
+                store.bench(d, r)
+                timed("bench_percentiles", lambda: np.percentile(
+                    active_df[(active_df["district"] == d) & (active_df["room_type"] == r)]["ttm_avg_rate"].dropna(),
+                    (50, 25, 75)) if len(active_df) else None)
+                store.bench_percentiles(d, r, "ttm_avg_rate", (50, 25, 75))
+            for d in {p.district for p in pairs}:
+                timed("district_rows", lambda: active_df[active_df["district"] == d])
+                store.district_rows(d)
+                timed("district_info", lambda: cdf[cdf["district"] == d])
+                store.district_info(d)
+            for c in clusters:
+                timed("cluster_peers", lambda: ao[ao["cluster"] == c])
+                store.cluster_peers(c)
+
+        # 같은 답인지 확인 (자치구 × 숙소 종류 1개)
+        d, r = pairs[0]
+        mask = active_df[(active_df["district"] == d) & (active_df["room_type"] == r)]
+        got = store.bench_percentiles(d, r, "ttm_avg_rate", (50, 25, 75))
+        assert len(store.bench(d, r)) == len(mask)
+        assert np.allclose(got, np.percentile(mask["ttm_avg_rate"].dropna(), (50, 25, 75)))
+
+        print(f"[리스팅 저장소] 원본 {int(n_rows):,}행 (×{args.scale}) · 자치구×숙소 {len(pairs)}쌍 · 반복 {args.repeat}")
+        print(f"  SQLite 적재 {timings['적재']:.2f} s · 인덱스 {timings['인덱스']:.2f} s"
+              f" · 파일 {(Path(tmp) / 'listings.sqlite').stat().st_size / 2**20:.0f} MB"
+              f" | pandas 전체 로드 {t_pandas_load:.2f} s")
+        print(f"  {'쿼리':18s} {'SQLite p50':>11s} {'p95':>9s} {'pandas p50':>11s} {'p95':>9s}   행")
+        for row in store.latency():
+            pl = np.array(pd_lat.get(row["query"], [np.nan])) * 1000
+            print(f"  {row['query']:18s} {row['p50_ms']:9.2f}ms {row['p95_ms']:7.2f}ms "
+                  f"{np.percentile(pl, 50):9.2f}ms {np.percentile(pl, 95):7.2f}ms  {row['rows_last']:,}")
@@ -0,0 +1,244 @@
+"""
+load_test.py — 동시 세션 부하 테스트 (AppTest 헤드리스, 1단계 → 5단계)
+=======================================================================
+
+사용법:
+    python load_test.py                                    # 동시 1, 2, 4, 8 세션 · 워커당 3세션
+    python load_test.py --concurrency 1,4,16 --sessions-per-worker 5 --slo-p95 1.5
+    python load_test.py --json load_report.json            # 결과를 JSON 으로도 저장
+
+동시성 단계마다 concurrency 개의 워커 프로세스를 띄우고, 각 워커가 memory_soak.random_session
+으로 만든 무작위 호스터 (신규/기존 · 자치구 · 숙소 종류 · 좌표 · 요금) 를 새 AppTest 세션으로
+1단계부터 5단계까지 (신규 1→2→3→5, 기존 1→2→3→4→5) 쉬지 않고 (think time 0) 렌더합니다.
+워커는 시작할 때 1세션을 돌려 st.cache_data / st.cache_resource 를 채우고, 모든 워커가 준비된
+뒤 (Barrier) 에 측정을 시작합니다.
+
+출력:
+    동시성 단계별 — 처리량 (세션/s), 재실행 지연 p50/p95/p99, 세션당 CPU 초,
+                    CPU 사용률, 워커(= 동시 세션 1개) 당 RSS
+    단계별       — step1 … step5 재실행 지연 p50/p95/p99
+    포화점       — 처리량이 최대치의 95% 에 처음 닿는 동시성과 코어당 환산 값,
+                    --slo-p95 를 지키는 최대 동시성
+
+왜 스레드가 아니라 프로세스인가:
+    AppTest.run() 은 실행할 때마다 전역 Runtime._instance 를 목 객체로 바꿨다가 None 으로
+    되돌립니다. 한 프로세스에서 AppTest 를 동시에 돌리면 다른 세션이 실행 중에 Runtime 을
+    잃어 "Runtime hasn't been created!" 로 죽습니다. 워커 프로세스 1개가 세션 1개씩 순서대로
+    돌리면 이 경합이 없고, 세션당 CPU (process_time) 와 RSS 를 정확히 잴 수 있습니다.
+    결과는 "코어마다 서버 프로세스 1개" 배포의 용량입니다. 캐시는 워커마다 따로 찹니다.
+
+    AppTest 는 세션마다 새 ScriptCache 를 만들어 app.py 를 매번 다시 컴파일합니다 (서버는
+    프로세스당 1번). 그대로 두면 step1 지연에 컴파일 ~250 ms 가 섞이므로 share_script_cache()
+    로 워커마다 공용 캐시 1개를 쓰게 합니다.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+import warnings
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from memory_soak import APP_PATH, random_session, rss_mb, run_session
+
+STEP_NAMES = {1: "step1", 3: "step3", 4: "step4_existing", 5: "step5"}
+
+
+def step_name(step: int, host_type: str) -> str:
+    """app.py 의 라우터와 같은 단계 이름 (memory_diagnostics 리포트와 맞춤)."""
+    if step == 2:
+        return "step2_new" if host_type == "new" else "step2_existing"
+    return STEP_NAMES.get(step, "step5")
+
+
+def share_script_cache() -> None:
+    """모든 AppTest 세션이 app.py 바이트코드를 프로세스 공용 ScriptCache 1개에서 가져오게 함."""
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    if getattr(ScriptCache.get_bytecode, "_shared", False):
+        return
+    shared, get_bytecode = ScriptCache(), ScriptCache.get_bytecode
+
+    def shared_get_bytecode(self, script_path):
+        return get_bytecode(shared, script_path)
+
+    shared_get_bytecode._shared = True
+    ScriptCache.get_bytecode = shared_get_bytecode
+
+
+def cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+
+def _pct(values, qs=(50, 95, 99)) -> dict:
+    v = np.asarray(values, dtype=np.float64) * 1000
+    return {f"p{q}_ms": round(float(np.percentile(v, q)), 1) for q in qs} if len(v) else {}
+
+
+# ── 워커 프로세스 ───────────────────────────────────────────────────────────
+_TIMEOUT = 120.0
+
+
+def _init_worker(barrier, seed: int, timeout: float) -> None:
+    """캐시를 채우는 워밍업 1세션 (측정 제외) 뒤 다른 워커가 모두 준비될 때까지 대기."""
+    global _TIMEOUT
+    warnings.filterwarnings("ignore")
+    os.chdir(APP_PATH.parent)  # app.py 의 data/ 상대 경로
+    share_script_cache()
+    _TIMEOUT = timeout
+    try:
+        run_session(*random_session(random.Random(seed)), timeout=timeout)
+    except Exception as e:     # 워밍업 실패는 본 세션에서 다시 드러남 — Barrier 는 지켜야 함
+        print(f"  워커 {os.getpid()} 워밍업 실패: {e}", flush=True)
+    barrier.wait(timeout * 10)   # 다른 워커의 워밍업이 죽으면 영원히 기다리지 않음
+
+
+def _session_job(job) -> dict:
+    state, steps = job
+    start, cpu0 = time.time(), time.process_time()
+    try:
+        elapsed, error = run_session(state, steps, _TIMEOUT), ""
+    except Exception as e:     # 한 세션 실패로 단계 전체를 버리지 않음
+        elapsed, error = [], str(e)
+    return {
+        "pid": os.getpid(),
+        "names": [step_name(s, state["host_type"]) for s in steps],
+        "elapsed": elapsed,
+        "start": start,
+        "end": time.time(),
+        "cpu_s": time.process_time() - cpu0,
+        "rss_mb": rss_mb(),
+        "error": error,
+    }
+
+
+def run_level(concurrency: int, jobs: list, timeout: float, seed: int = 0) -> dict:
+    """jobs [(state, steps), ...] 를 워커 concurrency 개로 동시에 돌려 지표 dict 반환."""
+    # AppTest 는 워커 안에서 app.py 를 __main__ 으로 실행하므로, 워커에 넘기는 함수는
+    # __main__ 이 아닌 모듈 이름 (load_test) 으로 피클되어야 워밍업 뒤에도 찾을 수 있음
+    from load_test import _init_worker, _session_job
+
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(concurrency)
+    try:
+        with ProcessPoolExecutor(concurrency, mp_context=ctx, initializer=_init_worker,
+                                 initargs=(barrier, seed, timeout)) as ex:
+            results = list(ex.map(_session_job, jobs))
+    except BrokenProcessPool as e:  # 워커가 죽음 (메모리 부족 등) — 단계 전체를 실패로 기록
+        now = time.time()
+        results = [{"pid": 0, "names": [], "elapsed": [], "start": now, "end": now, "cpu_s": 0.0,
+                    "rss_mb": 0.0, "error": f"워커 프로세스 비정상 종료: {e}"} for _ in jobs]
+
+    ok = [r for r in results if not r["error"]]
+    failures = [r["error"] for r in results if r["error"]]
+    latencies = defaultdict(list)          # 단계 이름 → [초, ...]
+    for r in ok:
+        for name, sec in zip(r["names"], r["elapsed"]):
+            latencies[name].append(sec)
+    every = [s for v in latencies.values() for s in v]
+    wall = max(r["end"] for r in results) - min(r["start"] for r in results)
+    cpu = sum(r["cpu_s"] for r in results)
+    worker_rss = defaultdict(float)
+    for r in results:
+        worker_rss[r["pid"]] = max(worker_rss[r["pid"]], r["rss_mb"])
+
+    return {
+        "concurrency": concurrency,
+        "sessions": len(ok),
+        "failures": len(failures),
+        "first_failure": failures[0] if failures else "",
+        "wall_s": round(wall, 2),
+        "sessions_per_s": round(len(ok) / wall, 3) if wall else 0.0,
+        "reruns": len(every),
+        **_pct(every),
+        "cpu_s_per_session": round(cpu / max(len(results), 1), 3),
+        "cpu_util_pct": round(cpu / (wall * cpu_count()) * 100, 1) if wall else 0.0,
+        "rss_mb_per_worker": round(float(np.mean(list(worker_rss.values()))) if ok else 0.0, 1),
+        "steps": {name: {"n": len(v), **_pct(v)} for name, v in sorted(latencies.items())},
+    }
+
+
+def saturation(levels: list[dict], slo_p95_ms: float, cores: int) -> dict:
+    """처리량이 최대치의 95% 에 처음 닿는 동시성 (이후로는 지연만 늘어남) + SLO 내 최대 동시성."""
+    best = max(levels, key=lambda r: r["sessions_per_s"])
+    knee = next(r for r in levels if r["sessions_per_s"] >= 0.95 * best["sessions_per_s"])
+    within = [r["concurrency"] for r in levels if r.get("p95_ms", np.inf) <= slo_p95_ms]
+    return {
+        "cores": cores,
+        "saturation_concurrency": knee["concurrency"],
+        "saturation_concurrency_per_core": round(knee["concurrency"] / cores, 2),
+        "max_sessions_per_s": best["sessions_per_s"],
+        "max_sessions_per_s_per_core": round(best["sessions_per_s"] / cores, 3),
+        "slo_p95_ms": slo_p95_ms,
+        "max_concurrency_within_slo": max(within) if within else 0,
+    }
+
+
+def format_report(levels: list[dict], sat: dict) -> str:
+    out = [f"{'동시':>4} {'세션':>5} {'세션/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+           f"{'CPU s/세션':>10} {'CPU %':>6} {'MB/워커':>8}"]
+    for r in levels:
+        out.append(f"{r['concurrency']:4d} {r['sessions']:5d} {r['sessions_per_s']:7.2f} "
+                   f"{r.get('p50_ms', 0):8.0f} {r.get('p95_ms', 0):8.0f} {r.get('p99_ms', 0):8.0f} "
+                   f"{r['cpu_s_per_session']:10.2f} {r['cpu_util_pct']:6.1f} {r['rss_mb_per_worker']:8.0f}"
+                   + (f"  실패 {r['failures']}: {r['first_failure'][:60]}" if r["failures"] else ""))
+    out.append("")
+    names = sorted({n for r in levels for n in r["steps"]})
+    out.append(f"{'단계 (p50 / p95 ms)':18s} " + " ".join(f"{'동시 ' + str(r['concurrency']):>15}" for r in levels))
+    for n in names:
+        cells = []
+        for r in levels:
+            s = r["steps"].get(n)
+            cells.append(f"{s['p50_ms']:6.0f} / {s['p95_ms']:6.0f}" if s else f"{'-':>15}")
+        out.append(f"{n:18s} " + " ".join(cells))
+    out.append("")
+    out.append(f"포화점: 동시 {sat['saturation_concurrency']} 세션 "
+               f"(코어 {sat['cores']}개 → 코어당 {sat['saturation_concurrency_per_core']}) · "
+               f"최대 {sat['max_sessions_per_s']:.2f} 세션/s (코어당 {sat['max_sessions_per_s_per_core']:.2f})")
+    out.append(f"재실행 p95 ≤ {sat['slo_p95_ms']:.0f} ms 를 지키는 최대 동시성: {sat['max_concurrency_within_slo']}")
+    return "\n".join(out) + "\n"
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--concurrency", default="1,2,4,8", help="쉼표로 구분한 동시 세션 수 단계")
+    ap.add_argument("--sessions-per-worker", type=int, default=3)
+    ap.add_argument("--slo-p95", type=float, default=2.0, help="재실행 p95 지연 목표 (초)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    cores = cpu_count()
+    print(f"[부하 테스트] 코어 {cores}개 · 단계 {args.concurrency} · 워커당 {args.sessions_per_worker}세션",
+          flush=True)
+
+    levels = []
+    for c in (int(x) for x in args.concurrency.split(",")):
+        jobs = [random_session(rng) for _ in range(c * args.sessions_per_worker)]
+        levels.append(run_level(c, jobs, args.timeout, args.seed))
+        r = levels[-1]
+        print(f"  동시 {c:3d}: {r['sessions']} 세션 {r['wall_s']:.1f} s · "
+              f"{r['sessions_per_s']:.2f} 세션/s · p95 {r.get('p95_ms', 0):.0f} ms", flush=True)
+
+    sat = saturation(levels, args.slo_p95 * 1000, cores)
+    print("\n" + format_report(levels, sat))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"levels": levels, "saturation": sat}, f, ensure_ascii=False, indent=2)
+    return 1 if any(r["failures"] for r in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
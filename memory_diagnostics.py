@@ -0,0 +1,168 @@
+"""
+memory_diagnostics.py — 단계별 메모리 증가 추적 (tracemalloc)
+=============================================================
+
+사용법 (app.py):
+    start_if_enabled()                                # AIRBNB_MEMTRACE=1 일 때만 tracemalloc 시작
+    with TRACKER.track("step5"):                      # 추적 중이 아니면 아무 일도 하지 않음
+        step5()
+    TRACKER.report()                                  # 단계별 rolling 리포트 (list[dict])
+
+    켜는 방법:  AIRBNB_MEMTRACE=1 streamlit run app.py
+    리포트 보기: URL 에 ?memreport=1 (추적 중인 서버에서만 표시)
+    장시간 검증: python memory_soak.py --sessions 2000
+
+측정 방식:
+    매 렌더     — tracemalloc.get_traced_memory() 의 렌더 전후 차이 (= 이번 렌더가 남긴 바이트)
+                  를 단계별 최근 window 개 rolling 창에 기록합니다. 비용은 µs 수준입니다.
+    N번째 렌더마다 — gc.collect() 후 스냅샷을 떠서
+                  이번 렌더 전후 차이를 소스 줄별로 단계마다 누적합니다. 렌더마다 꾸준히
+                  양수로 남는 줄이 누수 후보입니다 (line_growth, 샘플 렌더당 평균 KB).
+                  스냅샷 1회는 추적 중인 블록 수에 비례해 수십~수백 ms 입니다.
+
+    tracemalloc 은 프로세스 전체를 추적하므로, 동시에 다른 세션이 렌더 중이면 그 할당도
+    섞입니다. 정확한 줄 단위 귀속은 memory_soak.py 처럼 세션을 순차로 돌릴 때 얻습니다.
+"""
+
+import gc
+import os
+import threading
+import tracemalloc
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+MEMTRACE_ENV = "AIRBNB_MEMTRACE"
+REPORT_QUERY = "memreport"
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def start_if_enabled(nframes: int = 1) -> bool:
+    """AIRBNB_MEMTRACE=1 이면 tracemalloc 을 시작 (이미 추적 중이면 그대로). 추적 여부 반환."""
+    if os.environ.get(MEMTRACE_ENV, "").lower() in ("1", "true", "yes", "on") and not tracemalloc.is_tracing():
+        tracemalloc.start(nframes)
+    return tracemalloc.is_tracing()
+
+
+def _location(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+
+class StepMemoryTracker:
+    """위저드 단계별 렌더 1회당 남는 바이트 + 주기적 스냅샷 비교."""
+
+    def __init__(self, window: int = 200, snapshot_every: int = 50, top_n: int = 10):
+        self.window = window
+        self.snapshot_every = snapshot_every
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self.renders: Counter = Counter()
+        self.retained_total: Counter = Counter()              # 단계별 누적 (바이트)
+        self.deltas = defaultdict(lambda: deque(maxlen=window))
+        self.sampled: Counter = Counter()                     # 스냅샷을 뜬 렌더 수
+        self.line_growth = defaultdict(Counter)               # 단계 → {소스 줄: 샘플 렌더 누적 바이트}
+
+    @property
+    def enabled(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    @contextmanager
+    def track(self, step: str):
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        with self._lock:
+            self.renders[step] += 1
+            sample = (self.renders[step] - 1) % self.snapshot_every == 0
+        before_snap = self._snapshot() if sample else None
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            if sample:
+                after_snap = self._snapshot()
+            delta = tracemalloc.get_traced_memory()[0] - before
+            with self._lock:
+                self.deltas[step].append(delta)
+                self.retained_total[step] += delta
+                if sample:
+                    self.sampled[step] += 1
+                    acc = self.line_growth[step]
+                    for stat in after_snap.compare_to(before_snap, "lineno"):
+                        if stat.size_diff:
+                            acc[_location(stat)] += stat.size_diff
+
+    def top_lines(self, step: str, n: int | None = None) -> list[tuple[str, float]]:
+        """단계의 샘플 렌더당 평균 잔존 KB 상위 소스 줄 [(위치, KB), ...] (양수만)."""
+        k = max(self.sampled[step], 1)
+        return [(loc, size / 1024 / k) for loc, size in self.line_growth[step].most_common(n or self.top_n)
+                if size > 0]
+
+    def report(self) -> list[dict]:
+        """단계별 렌더 수 · 최근 window 렌더당 잔존 KB (평균 / p95) · 누적 MB · 잔존 1위 소스 줄."""
+        with self._lock:
+            rows = []
+            for step in sorted(self.renders):
+                d = np.asarray(self.deltas[step], dtype=np.float64) / 1024
+                top = self.top_lines(step, 1)
+                rows.append({
+                    "step": step,
+                    "renders": self.renders[step],
+                    "retained_kb_mean": round(float(d.mean()), 1) if len(d) else 0.0,
+                    "retained_kb_p95": round(float(np.percentile(d, 95)), 1) if len(d) else 0.0,
+                    "retained_mb_total": round(self.retained_total[step] / 2**20, 2),
+                    "top_line": f"{top[0][0]} (+{top[0][1]:,.1f} KB/render)" if top else "",
+                })
+            return rows
+
+    def format_report(self, lines: int = 5) -> str:
+        out = [f"{'step':16s} {'renders':>7} {'KB/render':>9} {'p95 KB':>8} {'total MB':>9}"]
+        for r in self.report():
+            out.append(f"{r['step']:16s} {r['renders']:7d} {r['retained_kb_mean']:9.1f} "
+                       f"{r['retained_kb_p95']:8.1f} {r['retained_mb_total']:9.2f}")
+            for loc, kb in self.top_lines(r["step"], lines):
+                out.append(f"    +{kb:9,.1f} KB/render  {loc}")
+        return "\n".join(out) + "\n"
+
+
+# 프로세스당 1개 — app.py 와 memory_soak.py 가 같은 객체를 봅니다
+TRACKER = StepMemoryTracker()
+
+
+# ── 사용 예시 (직접 실행 시) ──────────────────────────────────────────────────
+if __name__ == "__main__":
+    import time
+
+    tracemalloc.start(1)
+    tracker = StepMemoryTracker(snapshot_every=20)
+    leaky_cache = []
+
+    def render_clean():
+        return [str(i) * 10 for i in range(2_000)]         # 렌더 후 모두 해제
+
+    def render_leaky():
+        leaky_cache.append(bytearray(20_000))               # 렌더마다 20 KB 잔존
+
+    t0 = time.perf_counter()
+    for _ in range(200):
+        with tracker.track("clean"):
+            render_clean()
+        with tracker.track("leaky"):
+            render_leaky()
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    print(f"[단계별 메모리] 렌더 400회 {elapsed:.0f} ms (스냅샷 {2 * 200 // 20}회 포함)")
+    print(tracker.format_report(3))
@@ -0,0 +1,158 @@
+"""
+memory_soak.py — 장시간 세션 반복 메모리 검증 (AppTest 헤드리스)
+===============================================================
+
+사용법:
+    python memory_soak.py                               # 2,000 세션 (1코어 기준 수 시간)
+    python memory_soak.py --sessions 200 --max-kb-per-session 8
+
+세션마다 새 AppTest (= 새 Streamlit 세션) 를 만들어 무작위 호스터 유형·자치구·숙소 종류·
+좌표·요금·예약일로 1단계부터 5단계까지 (신규: 1→2→3→5, 기존: 1→2→3→4→5) 렌더합니다.
+앱과 같은 프로세스에서 돌므로 st.cache_data / st.cache_resource 와 모듈 전역 상태는
+실제 서버처럼 세션 간에 공유됩니다.
+
+판정:
+    워밍업 이후 sample_every 세션마다 gc.collect() 뒤 tracemalloc 추적 바이트와 RSS 를 기록하고,
+    세션 수에 대한 기울기(KB/세션)가 --max-kb-per-session 이하이면 통과 (종료 코드 0).
+    기울기는 Theil–Sen (모든 샘플 쌍 기울기의 중앙값) 으로 구합니다 — st.cache_data 항목이
+    채워졌다 밀려나며 생기는 수십 MB 톱니는 최소제곱 기울기를 크게 흔들지만 중앙값은 거의
+    움직이지 않고, 세션마다 꾸준히 남는 누수만 기울기로 나타납니다.
+    실패하면 종료 코드 1 — 워밍업 직후 대비 가장 많이 늘어난 소스 줄과
+    memory_diagnostics.TRACKER 의 단계별 리포트를 함께 출력합니다.
+"""
+
+import argparse
+import gc
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from memory_diagnostics import MEMTRACE_ENV, TRACKER
+from session_store import DISTRICTS, ROOM_TYPES
+
+APP_PATH = Path(__file__).parent / "app.py"
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:  # /proc 가 없는 OS — 최대 RSS 로 대체 (macOS 는 바이트 단위)
+        r = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return r / 2**20 if sys.platform == "darwin" else r / 1024
+
+
+def theil_sen_slope(x, y) -> float:
+    """모든 (i < j) 쌍의 기울기 중앙값 — 톱니형 캐시 변동에 둔감한 추세."""
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    i, j = np.triu_indices(len(x), k=1)
+    return float(np.median((y[j] - y[i]) / (x[j] - x[i])))
+
+
+def random_session(rng: random.Random) -> tuple[dict, list[int]]:
+    """무작위 호스터 입력 + 방문할 단계 순서."""
+    host = rng.choice(("new", "existing"))
+    state = {
+        "host_type": host,
+        "district": rng.choice(DISTRICTS),
+        "room_type": rng.choice(ROOM_TYPES),
+        "my_adr": rng.randrange(40_000, 300_000, 1_000),
+        "my_photos": rng.randrange(0, 80),
+        "my_guests": rng.randrange(1, 9),
+        "my_bedrooms": rng.randrange(0, 5),
+        "my_baths_count": rng.choice((1, 1, 1.5, 2)),
+        "my_lat": rng.uniform(37.45, 37.68),
+        "my_lng": rng.uniform(126.82, 127.15),
+        "location_confirmed": True,
+        "my_location_name": "soak",
+    }
+    if host == "existing":
+        state.update({
+            "booked_days": set(rng.sample(range(1, 29), rng.randrange(0, 28))),
+            "my_rating": round(rng.uniform(3.8, 5.0), 2),
+            "my_reviews": rng.randrange(0, 400),
+            "my_min_nights": rng.randrange(1, 7),
+            "my_instant": rng.random() < 0.5,
+            "my_superhost": rng.random() < 0.3,
+        })
+    return state, ([1, 2, 3, 5] if host == "new" else [1, 2, 3, 4, 5])
+
+
+def run_session(state: dict, steps: list[int], timeout: float) -> list[float]:
+    """새 AppTest 세션으로 steps 를 차례로 렌더하고 단계별 재실행 시간(초) 반환."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    for k, v in state.items():
+        at.session_state[k] = v
+    elapsed = []
+    for step in steps:
+        at.session_state["step"] = step
+        t0 = time.perf_counter()
+        at.run()
+        elapsed.append(time.perf_counter() - t0)
+        if at.exception:
+            raise RuntimeError(f"step {step} 예외: {at.exception[0].message}")
+    return elapsed
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--sessions", type=int, default=2_000)
+    ap.add_argument("--warmup", type=int, default=20, help="캐시가 차는 동안은 판정에서 제외")
+    ap.add_argument("--sample-every", type=int, default=10)
+    ap.add_argument("--max-kb-per-session", type=float, default=8.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--timeout", type=float, default=120.0)
+    args = ap.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    os.environ[MEMTRACE_ENV] = "1"
+    os.chdir(APP_PATH.parent)  # app.py 의 data/ 상대 경로
+    tracemalloc.start(1)
+    rng = random.Random(args.seed)
+
+    samples, baseline = [], None
+    t0 = time.perf_counter()
+    for i in range(1, args.sessions + 1):
+        run_session(*random_session(rng), timeout=args.timeout)
+        if i == args.warmup:
+            gc.collect()
+            baseline = tracemalloc.take_snapshot()
+        if i >= args.warmup and (i - args.warmup) % args.sample_every == 0:
+            gc.collect()
+            traced = tracemalloc.get_traced_memory()[0] / 1024
+            samples.append((i, traced, rss_mb()))
+            print(f"  세션 {i:5d}  traced {traced / 1024:8.1f} MB  RSS {samples[-1][2]:8.1f} MB  "
+                  f"({(time.perf_counter() - t0) / i:.2f} s/세션)", flush=True)
+
+    if len(samples) < 2:
+        print("판정하려면 --sessions 가 --warmup + 2 × --sample-every 이상이어야 합니다.")
+        return 2
+
+    x = [s[0] for s in samples]
+    slope_kb = theil_sen_slope(x, [s[1] for s in samples])
+    slope_rss = theil_sen_slope(x, [s[2] for s in samples]) * 1024
+    ok = slope_kb <= args.max_kb_per_session
+
+    print(f"\n[메모리 소크] 세션 {args.sessions:,}개 · {time.perf_counter() - t0:.0f} s")
+    print(f"  traced 증가 {slope_kb:+.2f} KB/세션 · RSS 증가 {slope_rss:+.2f} KB/세션 "
+          f"(한도 {args.max_kb_per_session} KB/세션) → {'통과' if ok else '실패'}")
+    print("\n" + TRACKER.format_report())
+    if baseline is not None:
+        gc.collect()
+        print("워밍업 이후 증가 상위 소스 줄:")
+        for stat in tracemalloc.take_snapshot().compare_to(baseline, "lineno")[:10]:
+            print(f"  {stat.size_diff / 1024:+10,.1f} KB  {stat.count_diff:+8d} blocks  {stat.traceback[0]}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+report_export.py — 5단계 분석 리포트 (HTML / PDF) 백그라운드 생성
+=================================================================
+
+사용법 (app.py):
+    service = get_report_service()                # st.cache_resource, 프로세스당 1개
+    job = service.submit(snapshot, "html")        # 즉시 반환 — 스레드 풀에서 생성
+    if job.done():
+        st.download_button("다운로드", job.result(), file_name=job.filename, mime=job.mime)
+
+    # 단독 실행 — 예시 스냅샷으로 생성 시간 측정
+    python report_export.py
+
+snapshot 은 step5() 가 이미 계산한 값만 담은 평범한 dict 입니다.
+워커 스레드는 st.session_state 나 Streamlit API 에 손대지 않고 이 dict 만 읽습니다.
+    title        str                  리포트 제목
+    generated_at str                  생성 시각 (표시용)
+    badges       list[str]            자치구 · 숙소 유형 · 호스터 유형 · 시장 유형
+    kpis         list[(label, value, sub)]
+    pnl          list[(label, value)] 월 손익 계산서
+    pricing      dict | None          {"note", "rows": [(변화율, 요금, 예약률, 하루 수익, 월 순이익)], "best"}
+    pois         list[dict]           find_nearby_pois() 결과 상위 N개 (name, type, dist_m, addr)
+    health       dict | None          compute_health_score() 결과 + "labels" (구성요소 한글 이름)
+    description  str                  숙소 설명 템플릿 (사용자가 편집한 내용 우선)
+    charts       dict[str, bytes]     대시보드에 이미 그린 차트 PNG (다시 그리지 않음)
+
+PDF 는 matplotlib 의 객체 지향 API (Figure + PdfPages) 로 만듭니다.
+pyplot 전역 상태를 쓰지 않으므로 스크립트 스레드와 동시에 돌아도 안전하고,
+추가 PDF 라이브러리 없이 앱과 같은 한글 폰트 설정을 그대로 씁니다.
+"""
+
+import base64
+import html
+import io
+import re
+import textwrap
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.image import imread
+
+FORMATS = {
+    "html": ("text/html", "html"),
+    "pdf":  ("application/pdf", "pdf"),
+}
+
+CHART_TITLES = {
+    "opex_pie":       "월 운영비 구성",
+    "projection_12m": "향후 12개월 순이익 전망",
+    "price_sim":      "요금 변화율별 월 순이익",
+}
+
+_A4 = (8.27, 11.69)                  # 인치
+_MARGIN = 0.6
+_EMOJI = re.compile("[\U0001F000-\U0001FAFF☀-➿️]")  # PDF 한글 폰트에 없는 글리프
+
+
+class ReportJob:
+    """submit() 이 돌려주는 작업 핸들 — session_state 에 넣어두고 매 실행마다 done() 으로 확인."""
+
+    __slots__ = ("future", "fmt", "filename", "submitted", "finished")
+
+    def __init__(self, future: Future, fmt: str, filename: str):
+        self.future = future
+        self.fmt = fmt
+        self.filename = filename
+        self.submitted = time.perf_counter()
+        self.finished = None
+        future.add_done_callback(self._mark)
+
+    def _mark(self, _):
+        self.finished = time.perf_counter()
+
+    @property
+    def mime(self) -> str:
+        return FORMATS[self.fmt][0]
+
+    @property
+    def elapsed(self) -> float:
+        """제출 후 경과 (완료됐으면 생성에 걸린) 시간 (초)."""
+        return (self.finished or time.perf_counter()) - self.submitted
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def failed(self) -> bool:
+        return self.future.done() and self.future.exception() is not None
+
+    def result(self) -> bytes:
+        return self.future.result()
+
+
+class ReportService:
+    """리포트 생성 전용 스레드 풀. 프로세스당 1개를 모든 세션이 공유합니다."""
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+
+    def submit(self, snapshot: dict, fmt: str = "html", filename: str = "airbnb_report") -> ReportJob:
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식: {fmt!r} (가능: {', '.join(FORMATS)})")
+        build = build_html if fmt == "html" else build_pdf
+        return ReportJob(self._pool.submit(build, snapshot), fmt, f"{filename}.{FORMATS[fmt][1]}")
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ── HTML ─────────────────────────────────────────────────────────────────────
+_CSS = """
+body{font-family:'Apple SD Gothic Neo','Malgun Gothic','NanumGothic',sans-serif;
+  background:#FFF9F7;color:#484848;max-width:860px;margin:0 auto;padding:28px 24px;}
+h1{color:#FF5A5F;margin:0 0 6px;} h2{font-size:18px;border-bottom:2px solid #FFD0CF;padding-bottom:6px;margin-top:34px;}
+.meta{color:#999;font-size:12px;margin-bottom:12px;}
+.badge{display:inline-block;background:#FFF0EE;color:#FF5A5F;font-size:12px;font-weight:700;
+  padding:3px 10px;border-radius:20px;margin:0 6px 6px 0;}
+.kpis{display:grid;grid-template-columns:repeat(auto-fit,minmax(180px,1fr));gap:10px;}
+.card{background:white;border-radius:12px;padding:14px;text-align:center;box-shadow:0 2px 10px rgba(0,0,0,0.06);}
+.card .l{font-size:12px;color:#888;} .card .v{font-size:21px;font-weight:700;margin:4px 0;} .card .s{font-size:11px;color:#767676;}
+table{width:100%;border-collapse:collapse;background:white;font-size:13px;}
+th,td{padding:8px 10px;border-bottom:1px solid #F0F0F0;text-align:right;} th{color:#888;font-weight:600;}
+td:first-child,th:first-child{text-align:left;}
+img{max-width:100%;display:block;margin:12px auto;}
+.bar{background:#EBEBEB;border-radius:6px;height:10px;} .bar div{background:#00A699;height:10px;border-radius:6px;}
+pre{white-space:pre-wrap;background:white;border-radius:12px;padding:16px;font-size:13px;line-height:1.7;font-family:inherit;}
+.note{font-size:12px;color:#767676;}
+"""
+
+
+def _img(png: bytes, alt: str) -> str:
+    return f'<img alt="{html.escape(alt)}" src="data:image/png;base64,{base64.b64encode(png).decode("ascii")}">'
+
+
+def _table(header, rows) -> str:
+    e = html.escape
+    out = "<table><tr>" + "".join(f"<th>{e(str(h))}</th>" for h in header) + "</tr>"
+    for row in rows:
+        out += "<tr>" + "".join(f"<td>{e(str(c))}</td>" for c in row) + "</tr>"
+    return out + "</table>"
+
+
+def build_html(snapshot: dict) -> bytes:
+    """스냅샷 → 이미지까지 base64 로 품은 단일 HTML 파일 (UTF-8 바이트)."""
+    e = html.escape
+    charts = snapshot.get("charts", {})
+    parts = [
+        f'<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+        f'<title>{e(snapshot["title"])}</title><style>{_CSS}</style></head><body>',
+        f'<h1>{e(snapshot["title"])}</h1><div class="meta">{e(snapshot["generated_at"])} 생성</div>',
+        "".join(f'<span class="badge">{e(b)}</span>' for b in snapshot.get("badges", [])),
+        "<h2>📊 수익 요약</h2><div class=\"kpis\">",
+        "".join(f'<div class="card"><div class="l">{e(l)}</div><div class="v">{e(v)}</div>'
+                f'<div class="s">{e(s)}</div></div>' for l, v, s in snapshot["kpis"]),
+        "</div>",
+    ]
+    if snapshot.get("pnl"):
+        parts.append("<h2>💰 월 손익 계산서</h2>" + _table(("항목", "금액"), snapshot["pnl"]))
+    for key in ("opex_pie", "projection_12m"):
+        if key in charts:
+            parts.append(_img(charts[key], CHART_TITLES[key]))
+
+    pricing = snapshot.get("pricing")
+    if pricing:
+        parts.append(f'<h2>💡 요금 변경 시뮬레이션</h2><p class="note">{e(pricing["note"])}</p>')
+        parts.append(_table(("요금 변화", "1박 요금", "예약률", "하루 수익", "월 순이익"), pricing["rows"]))
+        if pricing.get("best"):
+            parts.append(f'<p>🎯 {e(pricing["best"])}</p>')
+        if "price_sim" in charts:
+            parts.append(_img(charts["price_sim"], CHART_TITLES["price_sim"]))
+
+    parts.append("<h2>📍 주변 관광지</h2>")
+    if snapshot.get("pois"):
+        parts.append(_table(("관광지", "유형", "거리", "주소"),
+                            [(p["name"], p["type"], _dist_txt(p["dist_m"]), p.get("addr", ""))
+                             for p in snapshot["pois"]]))
+    else:
+        parts.append('<p class="note">주소를 확인하지 않았거나 2km 이내 관광지가 없습니다.</p>')
+
+    health = snapshot.get("health")
+    if health:
+        parts.append(f'<h2>🩺 헬스 스코어 — {int(health["composite"])}/100 ({e(health["grade"])})</h2>')
+        for key, v in health["components"].items():
+            parts.append(f'<div style="margin:8px 0;"><b>{e(health["labels"].get(key, key))}</b> {int(v)}/100'
+                         f'<div class="bar"><div style="width:{v:.0f}%"></div></div></div>')
+        parts.append("<ul>" + "".join(f"<li>{e(a)}</li>" for a in health["actions"]) + "</ul>")
+
+    parts.append(f'<h2>✍️ 숙소 설명 템플릿</h2><pre>{e(snapshot["description"])}</pre></body></html>')
+    return "".join(parts).encode("utf-8")
+
+
+def _dist_txt(dist_m: int) -> str:
+    return f"{dist_m}m" if dist_m < 1000 else f"{dist_m / 1000:.2f}km"
+
+
+# ── PDF ──────────────────────────────────────────────────────────────────────
+class _PdfWriter:
+    """A4 페이지에 글줄과 이미지를 위에서 아래로 흘려 넣는 최소 레이아웃."""
+
+    def __init__(self, pdf: PdfPages):
+        self.pdf = pdf
+        self.fig = None
+        self.y = 0.0
+
+    def _page(self):
+        self._flush()
+        self.fig = Figure(figsize=_A4)
+        self.fig.patch.set_facecolor("white")
+        self.y = _A4[1] - _MARGIN
+
+    def _flush(self):
+        if self.fig is not None:
+            self.pdf.savefig(self.fig)
+            self.fig = None
+
+    def _room(self, height: float):
+        if self.fig is None or self.y - height < _MARGIN:
+            self._page()
+
+    def text(self, s: str, size: float = 10, color: str = "#484848", bold: bool = False, gap: float = 0.06):
+        height = size / 72 * 1.45
+        self._room(height)
+        self.fig.text(_MARGIN / _A4[0], (self.y - height) / _A4[1], _EMOJI.sub("", s).strip(),
+                      fontsize=size, color=color, fontweight="bold" if bold else "normal")
+        self.y -= height + gap
+
+    def paragraph(self, s: str, size: float = 9.5, width: int = 58, **kw):
+        for raw in s.splitlines():
+            for line in textwrap.wrap(raw.strip(), width) or [""]:
+                self.text(line, size=size, gap=0.0, **kw)
+
+    def image(self, png: bytes, max_h: float = 4.2):
+        arr = imread(io.BytesIO(png), format="png")
+        w = _A4[0] - 2 * _MARGIN
+        h = min(w * arr.shape[0] / arr.shape[1], max_h)
+        w = h * arr.shape[1] / arr.shape[0]
+        self._room(h + 0.1)
+        ax = self.fig.add_axes(((_A4[0] - w) / 2 / _A4[0], (self.y - h) / _A4[1], w / _A4[0], h / _A4[1]))
+        ax.imshow(arr)
+        ax.axis("off")
+        self.y -= h + 0.15
+
+    def close(self):
+        self._flush()
+
+
+def build_pdf(snapshot: dict) -> bytes:
+    """스냅샷 → A4 PDF 바이트. 차트는 대시보드에서 그린 PNG 를 그대로 붙입니다."""
+    charts = snapshot.get("charts", {})
+    buf = io.BytesIO()
+    with PdfPages(buf) as pdf:
+        w = _PdfWriter(pdf)
+        w.text(snapshot["title"], size=18, color="#FF5A5F", bold=True)
+        w.text(f'{snapshot["generated_at"]} 생성 · ' + " · ".join(snapshot.get("badges", [])), size=9, color="#888888")
+
+        w.text("수익 요약", size=14, bold=True, gap=0.12)
+        for label, value, sub in snapshot["kpis"]:
+            w.text(f"{label}: {value}   ({sub})", size=10.5)
+        for label, value in snapshot.get("pnl", []):
+            w.text(f"{label}: {value}", size=10)
+        for key in ("opex_pie", "projection_12m"):
+            if key in charts:
+                w.image(charts[key])
+
+        pricing = snapshot.get("pricing")
+        if pricing:
+            w.text("요금 변경 시뮬레이션", size=14, bold=True, gap=0.12)
+            w.text(pricing["note"], size=9, color="#767676")
+            w.text("요금 변화 | 1박 요금 | 예약률 | 하루 수익 | 월 순이익", size=9.5, color="#888888", bold=True)
+            for row in pricing["rows"]:
+                w.text(" | ".join(str(c) for c in row), size=9.5)
+            if pricing.get("best"):
+                w.text(pricing["best"], size=10, color="#2E7D32")
+            if "price_sim" in charts:
+                w.image(charts["price_sim"], max_h=3.6)
+
+        w.text("주변 관광지", size=14, bold=True, gap=0.12)
+        for i, p in enumerate(snapshot.get("pois", []), 1):
+            w.text(f"{i}. {p['name']} ({p['type']}) — {_dist_txt(p['dist_m'])}", size=10)
+        if not snapshot.get("pois"):
+            w.text("주소를 확인하지 않았거나 2km 이내 관광지가 없습니다.", size=9.5, color="#767676")
+
+        health = snapshot.get("health")
+        if health:
+            w.text(f'헬스 스코어 {int(health["composite"])}/100 ({health["grade"]})', size=14, bold=True, gap=0.12)
+            for key, v in health["components"].items():
+                w.text(f'{health["labels"].get(key, key)}: {int(v)}/100', size=10)
+            for a in health["actions"]:
+                w.paragraph(f"• {a}", size=9.5)
+
+        w.text("숙소 설명 템플릿", size=14, bold=True, gap=0.12)
+        w.paragraph(snapshot["description"])
+        w.close()
+    return buf.getvalue()
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+if __name__ == "__main__":
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    def _chart():
+        fig = Figure(figsize=(9, 3.4))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.bar(range(12), np.random.default_rng(0).normal(5e5, 2e5, 12), color="#00A699")
+        out = io.BytesIO()
+        fig.savefig(out, format="png", dpi=200, bbox_inches="tight")
+        return out.getvalue()
+
+    png = _chart()
+    snap = {
+        "title": "마포구 집 전체 수익 분석 리포트",
+        "generated_at": "2025-10-01 12:00",
+        "badges": ["마포구", "집 전체", "기존 호스터", "고가 프리미엄 시장"],
+        "kpis": [("하루 평균 실수익", "₩62,000", "▲ 지역 평균 대비 ₩8,000"),
+                 ("월 예상 순이익", "₩1,240,000", "흑자")],
+        "pnl": [("월 매출", "₩1,860,000"), ("월 운영비", "- ₩540,000")],
+        "pricing": {"note": "탄력성 -1.2", "best": "최대 순이익 ₩121,000 (+10%)",
+                    "rows": [(f"{d:+d}%", "₩110,000", "56%", "₩61,600", "₩1,252,000") for d in range(-20, 31, 10)]},
+        "pois": [{"name": f"관광지 {i}", "type": "관광지", "dist_m": 120 * i, "addr": "서울 마포구"} for i in range(1, 11)],
+        "health": {"composite": 72, "grade": "B", "components": {"review_signal": 80, "location": 64},
+                   "labels": {"review_signal": "리뷰 신호", "location": "위치"},
+                   "actions": ["✅ 사진을 23장 이상으로 늘리세요."]},
+        "description": "◼ 숙소 소개\n" + "햇살 좋은 집입니다. " * 40,
+        "charts": {"opex_pie": png, "projection_12m": png, "price_sim": png},
+    }
+
+    for fmt, build in (("html", build_html), ("pdf", build_pdf)):
+        t0 = time.perf_counter()
+        data = build(snap)
+        print(f"[{fmt}] {len(data) / 1024:7.1f} KB  {(time.perf_counter() - t0) * 1000:7.1f} ms")
+
+    service = ReportService()
+    t0 = time.perf_counter()
+    jobs = [service.submit(snap, fmt) for fmt in ("html", "pdf") for _ in range(4)]
+    print(f"[submit] 8개 제출 {(time.perf_counter() - t0) * 1000:.2f} ms (호출 스레드는 막히지 않음)")
+    for job in jobs:
+        job.result()
+    print(f"[pool]   8개 완료 {max(j.elapsed for j in jobs):.2f} s · 실패 {sum(j.failed() for j in jobs)}")
+    service.shutdown()
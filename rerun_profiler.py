@@ -0,0 +1,290 @@
+"""
+rerun_profiler.py — 스크립트 실행 1회 샘플링 프로파일러 (speedscope / flamegraph 출력)
+=====================================================================================
+
+사용법 (app.py):
+    _profiler = start_rerun_profiler(st.query_params, __file__)   # AIRBNB_PROFILE=1 또는 허용된 ?profile=1 일 때만
+    ...
+    try:
+        <라우터>
+    finally:
+        if _profiler is not None:
+            _profile_paths = _profiler.stop().write(PROFILE_DIR, f"step{step}_{token[:8]}")
+
+    켜는 방법:
+        서버 전체  — AIRBNB_PROFILE=1 streamlit run app.py
+        세션 1개   — AIRBNB_PROFILE_QUERY=1 로 띄운 서버에서만 URL 에 ?profile=1 추가
+                     (서버 플래그가 없으면 방문자가 쿼리 파라미터로 켤 수 없습니다)
+    옵트인하지 않은 세션은 dict 조회 1번 외에 비용이 없습니다.
+
+출력 (profiles/ 폴더, 실행 1회당 3개 파일):
+    <stem>.speedscope.json  — https://www.speedscope.app 에 끌어다 놓으면 flamegraph / 시간순 보기
+    <stem>.collapsed.txt    — "frame;frame;frame 가중치" (flamegraph.pl, speedscope 모두 읽음)
+    <stem>.top.txt          — self / total 시간 상위 함수 표
+    최근 AIRBNB_PROFILE_KEEP 회(기본 50) 실행분만 남기고 오래된 파일은 쓸 때마다 지웁니다.
+
+샘플링 방식:
+    별도 스레드가 interval 마다 sys._current_frames() 로 스크립트 실행 스레드의 스택을 읽습니다.
+    스택은 첫 app.py 프레임부터 기록해 Streamlit 런타임 프레임은 빠집니다.
+    프로파일 중에는 sys.setswitchinterval 을 interval 로 낮춰 GIL 을 오래 잡는 구간에서도
+    샘플이 나오게 합니다. 프로세스 전체 설정이라 모듈 수준 참조 카운트(락 보호)로 관리해,
+    겹쳐 도는 프로파일러 중 마지막 하나가 끝날 때 처음 값으로 되돌립니다
+    (프로파일 중인 동안만 다른 세션도 스레드 전환이 잦아집니다).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+PROFILE_ENV = "AIRBNB_PROFILE"
+PROFILE_QUERY_ENV = "AIRBNB_PROFILE_QUERY"
+PROFILE_KEEP_ENV = "AIRBNB_PROFILE_KEEP"
+PROFILE_QUERY = "profile"
+PROFILE_DIR = Path(__file__).parent / "profiles"
+PROFILE_SUFFIXES = (".speedscope.json", ".collapsed.txt", ".top.txt")
+
+_TRUE = ("1", "true", "yes", "on")
+
+# sys.setswitchinterval 은 프로세스 전체 설정 — 겹친 프로파일러끼리 참조 카운트로 공유
+_switch_lock = threading.Lock()
+_switch_users = 0
+_switch_saved: float | None = None
+
+
+def _env_on(name: str) -> bool:
+    return os.environ.get(name, "").lower() in _TRUE
+
+
+def profiling_enabled(query_params=None) -> bool:
+    """환경변수, 또는 서버가 허용한 경우(AIRBNB_PROFILE_QUERY=1) 쿼리 파라미터(?profile=1)로 결정."""
+    if _env_on(PROFILE_ENV):
+        return True
+    return (_env_on(PROFILE_QUERY_ENV) and query_params is not None
+            and str(query_params.get(PROFILE_QUERY, "")).lower() in _TRUE)
+
+
+def _acquire_switch_interval(interval: float):
+    global _switch_users, _switch_saved
+    with _switch_lock:
+        if _switch_users == 0:
+            _switch_saved = sys.getswitchinterval()
+        _switch_users += 1
+        sys.setswitchinterval(min(sys.getswitchinterval(), interval))
+
+
+def _release_switch_interval():
+    global _switch_users, _switch_saved
+    with _switch_lock:
+        _switch_users -= 1
+        if _switch_users == 0:
+            sys.setswitchinterval(_switch_saved)
+            _switch_saved = None
+
+
+def prune_profiles(out_dir: str | Path = PROFILE_DIR, keep: int | None = None) -> int:
+    """out_dir 에서 최근 keep 회 실행분(stem 단위)만 남기고 삭제 — 지운 파일 수."""
+    if keep is None:
+        keep = int(os.environ.get(PROFILE_KEEP_ENV) or 50)
+    runs: dict[str, list[Path]] = {}
+    for p in Path(out_dir).iterdir():
+        for suffix in PROFILE_SUFFIXES:
+            if p.name.endswith(suffix):
+                runs.setdefault(p.name[: -len(suffix)], []).append(p)
+    old = sorted(runs, key=lambda stem: max(p.stat().st_mtime_ns for p in runs[stem]), reverse=True)[keep:]
+    removed = 0
+    for stem in old:
+        for p in runs[stem]:
+            p.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+class SamplingProfiler:
+    """한 스레드의 호출 스택을 일정 간격으로 샘플링해 (스택 → 누적 ms) 로 모읍니다."""
+
+    def __init__(self, interval: float = 0.001, thread_id: int | None = None, root_file: str | None = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.root_file = os.path.abspath(root_file) if root_file else None
+        self.stacks: Counter = Counter()   # (frame_key, ...) 루트→리프 → 누적 ms
+        self.n_samples = 0
+        self.wall_ms = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._t0 = 0.0
+
+    # ── 수집 ─────────────────────────────────────────────────────────────────
+    def start(self) -> "SamplingProfiler":
+        _acquire_switch_interval(self.interval)
+        self._t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="rerun-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            _release_switch_interval()
+            self.wall_ms = (time.perf_counter() - self._t0) * 1000
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is not None:
+                self.stacks[self._stack(frame)] += (now - last) * 1000  # 가중치 = 직전 샘플 이후 경과 시간
+                self.n_samples += 1
+            last = now
+
+    def _stack(self, frame) -> tuple:
+        keys = []
+        while frame is not None:
+            code = frame.f_code
+            keys.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        keys.reverse()
+        if self.root_file:
+            for i, (_, filename, _) in enumerate(keys):
+                if filename == self.root_file:
+                    return tuple(keys[i:])
+        return tuple(keys)
+
+    # ── 집계 ─────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _label(key) -> str:
+        name, filename, line = key
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    def top_functions(self, n: int = 20) -> list[dict]:
+        """함수별 self(리프) / total(스택 어디든) ms — total 내림차순 상위 n개."""
+        self_ms, total_ms = Counter(), Counter()
+        for stack, ms in self.stacks.items():
+            if not stack:
+                continue
+            self_ms[stack[-1]] += ms
+            for key in set(stack):
+                total_ms[key] += ms
+        sampled = sum(self.stacks.values()) or 1.0
+        rows = []
+        for key, total in total_ms.most_common(n):
+            rows.append({
+                "function": self._label(key),
+                "self_ms": round(self_ms[key], 1),
+                "total_ms": round(total, 1),
+                "total_pct": round(total / sampled * 100, 1),
+            })
+        return rows
+
+    def to_collapsed(self) -> str:
+        """flamegraph.pl 입력 형식 (가중치는 µs 정수)."""
+        lines = [";".join(self._label(k) for k in stack) + f" {int(ms * 1000)}"
+                 for stack, ms in self.stacks.items() if stack]
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str) -> dict:
+        """speedscope 'sampled' 프로파일 (단위 ms)."""
+        index, frames, samples, weights = {}, [], [], []
+        for stack, ms in self.stacks.items():
+            ids = []
+            for key in stack:
+                if key not in index:
+                    index[key] = len(frames)
+                    frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                ids.append(index[key])
+            samples.append(ids)
+            weights.append(round(ms, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled", "name": name, "unit": "milliseconds",
+                "startValue": 0, "endValue": round(sum(weights), 3),
+                "samples": samples, "weights": weights,
+            }],
+            "name": name,
+            "exporter": "rerun_profiler",
+        }
+
+    def format_top(self, n: int = 20) -> str:
+        rows = self.top_functions(n)
+        out = [f"wall {self.wall_ms:.0f} ms · samples {self.n_samples:,} · interval {self.interval * 1000:.1f} ms",
+               f"{'total ms':>9} {'total %':>7} {'self ms':>8}  function"]
+        out += [f"{r['total_ms']:9.1f} {r['total_pct']:6.1f}% {r['self_ms']:8.1f}  {r['function']}" for r in rows]
+        return "\n".join(out) + "\n"
+
+    def write(self, out_dir: str | Path = PROFILE_DIR, stem: str = "rerun", top_n: int = 30,
+              keep: int | None = None) -> dict:
+        """speedscope JSON · collapsed stack · top-N 표를 out_dir 에 쓰고 경로 dict 반환 (최근 keep 회만 보관)."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}_{stem}"
+        paths = {
+            "speedscope": out_dir / f"{stem}.speedscope.json",
+            "collapsed": out_dir / f"{stem}.collapsed.txt",
+            "top": out_dir / f"{stem}.top.txt",
+        }
+        paths["speedscope"].write_text(json.dumps(self.to_speedscope(stem)), encoding="utf-8")
+        paths["collapsed"].write_text(self.to_collapsed(), encoding="utf-8")
+        paths["top"].write_text(self.format_top(top_n), encoding="utf-8")
+        prune_profiles(out_dir, keep)
+        return paths
+
+
+def start_rerun_profiler(query_params=None, root_file: str | None = None, interval: float = 0.001):
+    """옵트인한 실행이면 현재(스크립트) 스레드를 샘플링하는 프로파일러를 시작해 반환, 아니면 None."""
+    if not profiling_enabled(query_params):
+        return None
+    return SamplingProfiler(interval=interval, root_file=root_file).start()
+
+
+# ── 사용 예시 (직접 실행 시) ──────────────────────────────────────────────────
+if __name__ == "__main__":
+    import tempfile
+
+    import numpy as np
+    import pandas as pd
+
+    def build_frame(n):
+        rng = np.random.default_rng(0)
+        return pd.DataFrame({"district": rng.integers(0, 25, n), "adr": rng.lognormal(11, 0.5, n)})
+
+    def python_loop(n):
+        total = 0.0
+        for i in range(n):
+            total += (i % 7) * 0.5
+        return total
+
+    def workload():
+        df = build_frame(400_000)
+        df.groupby("district")["adr"].describe()
+        python_loop(2_000_000)
+
+    t0 = time.perf_counter()
+    workload()
+    t_plain = (time.perf_counter() - t0) * 1000
+
+    with SamplingProfiler(root_file=__file__) as prof:
+        workload()
+
+    with tempfile.TemporaryDirectory() as d:
+        paths = prof.write(d, "demo")
+        sizes = {k: p.stat().st_size for k, p in paths.items()}
+
+    print(f"[재실행 프로파일러] 프로파일 없음 {t_plain:.0f} ms → 프로파일 중 {prof.wall_ms:.0f} ms "
+          f"(오버헤드 {prof.wall_ms / t_plain - 1:+.0%}) · 스택 {len(prof.stacks):,}종")
+    print("  파일: " + ", ".join(f"{k} {v / 1024:.1f} KB" for k, v in sizes.items()))
+    print(prof.format_top(8))
@@ -0,0 +1,327 @@
+"""
+result_cache.py — 프로세스 간 공유 결과 캐시 (SQLite · LRU/TTL · 적중률)
+=======================================================================
+
+사용법 (app.py):
+    cache = get_result_cache()                                    # st.cache_resource, 프로세스당 1개 연결 관리자
+    _ml = cache.get_or_compute("predict", ml_version, {"listing": _listing, "opex": total_opex},
+                               lambda: predict_revpar(_listing, opex_per_month=total_opex, **ml_artifacts))
+    cache.stats()                                                 # 네임스페이스별 적중률 · 항목 수 · 용량
+
+    AIRBNB_RESULT_CACHE=/var/cache/airbnb/results.sqlite streamlit run app.py    # 경로 지정 (기본 data/cache/)
+    ?cachestats=1                                                 # 화면 하단에 적중률 표
+
+왜 st.cache_data 와 별도인가:
+    st.cache_data / st.cache_resource 는 프로세스 메모리에만 있어, 레플리카마다 그리고 재시작할
+    때마다 인기 자치구 × 숙소 종류 조합의 예측 · 헬스스코어 · 주변 POI 를 다시 계산합니다.
+    ResultCache 는 호스트의 SQLite 파일 1개 (WAL) 를 모든 워커 프로세스가 함께 읽고 씁니다.
+
+키:
+    sha1(네임스페이스 + 버전 + 입력의 정규 JSON)  — dict 키 정렬, numpy 스칼라·배열 → 파이썬 값.
+    버전에는 모델 아티팩트 버전 (ml_version) 또는 입력 데이터 파일의 mtime 을 넣어,
+    모델이나 데이터가 바뀌면 예전 항목은 더 이상 조회되지 않고 LRU 로 밀려납니다.
+
+만료:
+    TTL   — created 가 ttl_seconds 보다 오래된 항목은 조회 시 미스, 정리 때 삭제
+    LRU   — evict_every 번 저장마다 accessed 최신순으로 max_entries 개 · max_bytes 까지만 남김
+    accessed 는 touch_seconds 이상 지났을 때만 갱신해 읽기 대부분이 쓰기 잠금을 잡지 않습니다.
+
+적중률:
+    네임스페이스별 hits / misses / errors 를 프로세스에 모았다가 flush_every 번마다 (그리고 종료 시)
+    counters 테이블에 더합니다 — stats() 는 모든 프로세스의 누적값입니다.
+    캐시 파일 오류 (잠금 시간 초과, 디스크 가득 등) 는 errors 로만 세고 계산 결과를 그대로 돌려줍니다.
+
+벤치마크는 `python result_cache.py` 로 확인할 수 있습니다.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+RESULT_CACHE_ENV = "AIRBNB_RESULT_CACHE"
+STATS_QUERY = "cachestats"
+DEFAULT_PATH = Path(__file__).parent / "data" / "cache" / "results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    ns       TEXT NOT NULL,
+    value    BLOB NOT NULL,
+    size     INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    ns        TEXT PRIMARY KEY,
+    hits      INTEGER NOT NULL DEFAULT 0,
+    misses    INTEGER NOT NULL DEFAULT 0,
+    errors    INTEGER NOT NULL DEFAULT 0,
+    evictions INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# accessed 최신순으로 순위·누적 용량을 매겨 한도를 넘는 항목만 삭제
+_EVICT_LRU = """
+DELETE FROM entries WHERE key IN (
+    SELECT key FROM (
+        SELECT key, ROW_NUMBER() OVER w AS rn, SUM(size) OVER w AS cum
+        FROM entries WINDOW w AS (ORDER BY accessed DESC)
+    ) WHERE rn > ? OR cum > ?
+)
+RETURNING ns
+"""
+
+_MISS = object()
+
+
+def _canon(obj):
+    """json.dumps default — numpy 값과 집합을 정규 파이썬 값으로."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"캐시 키로 쓸 수 없는 값: {type(obj).__name__}")
+
+
+def make_key(ns: str, version, payload) -> str:
+    """네임스페이스 · 버전 · 입력 → 40자 sha1 (dict 순서와 numpy 타입에 무관)."""
+    blob = json.dumps([ns, str(version), payload], sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False, default=_canon)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """호스트 내 모든 워커 프로세스가 공유하는 SQLite 결과 캐시."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = 50_000,
+        max_bytes: int = 256 * 2**20,
+        ttl_seconds: float = 7 * 86_400,
+        touch_seconds: float = 60.0,
+        evict_every: int = 64,
+        flush_every: int = 32,
+    ):
+        self.path = Path(path or os.environ.get(RESULT_CACHE_ENV) or DEFAULT_PATH)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.touch_seconds = touch_seconds
+        self.evict_every = evict_every
+        self.flush_every = flush_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending: dict[str, Counter] = {}
+        self._n_pending = 0
+        self._n_sets = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+        atexit.register(self.flush)                                # 종료 직전 남은 카운터까지 반영
+
+    # ── 연결 (스레드 · 프로세스마다 1개) ───────────────────────────────────
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():     # fork 후 부모 연결은 쓰지 않음
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    # ── 조회 / 저장 ─────────────────────────────────────────────────────────
+    def get(self, ns: str, version, payload, default=None):
+        """적중하면 저장된 값, 아니면 default."""
+        value = self._get(ns, make_key(ns, version, payload))
+        return default if value is _MISS else value
+
+    def set(self, ns: str, version, payload, value) -> None:
+        self._set(ns, make_key(ns, version, payload), value)
+
+    def get_or_compute(self, ns: str, version, payload, compute):
+        """적중하면 저장된 값, 아니면 compute() 결과를 저장하고 반환 (compute 예외는 그대로 전파)."""
+        key = make_key(ns, version, payload)
+        value = self._get(ns, key)
+        if value is _MISS:
+            value = compute()
+            self._set(ns, key, value)
+        return value
+
+    def _get(self, ns: str, key: str):
+        now = time.time()
+        try:
+            row = self._conn().execute(
+                "SELECT value, created, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self._count(ns, "misses")
+                return _MISS
+            if now - row[2] > self.touch_seconds:
+                self._conn().execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            value = pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError):
+            self._count(ns, "errors")
+            return _MISS
+        self._count(ns, "hits")
+        return value
+
+    def _set(self, ns: str, key: str, value) -> None:
+        now = time.time()
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self._conn().execute(
+                "INSERT OR REPLACE INTO entries (key, ns, value, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, ns, blob, len(blob), now, now))
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+            self._count(ns, "errors")
+            return
+        with self._lock:
+            self._n_sets += 1
+            due = self._n_sets % self.evict_every == 0
+        if due:
+            self.evict()
+
+    # ── 만료 ───────────────────────────────────────────────────────────────
+    def evict(self) -> int:
+        """TTL 지난 항목과 LRU 한도 (max_entries · max_bytes) 를 넘는 항목 삭제. 삭제 수 반환."""
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            gone = Counter(ns for (ns,) in conn.execute(
+                "DELETE FROM entries WHERE created < ? RETURNING ns", (time.time() - self.ttl_seconds,)))
+            gone.update(ns for (ns,) in conn.execute(_EVICT_LRU, (self.max_entries, self.max_bytes)))
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._rollback()
+            return 0
+        for ns, n in gone.items():
+            self._count(ns, "evictions", n)
+        return sum(gone.values())
+
+    def clear(self) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM counters")
+        with self._lock:
+            self._pending.clear()
+            self._n_pending = 0
+
+    # ── 적중률 ─────────────────────────────────────────────────────────────
+    def _count(self, ns: str, field: str, n: int = 1) -> None:
+        with self._lock:
+            self._pending.setdefault(ns, Counter())[field] += n
+            self._n_pending += 1
+            due = self._n_pending >= self.flush_every
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """이 프로세스에 쌓인 카운터를 counters 테이블에 더합니다."""
+        with self._lock:
+            pending, self._pending, self._n_pending = self._pending, {}, 0
+        if not pending:
+            return
+        rows = [(ns, c["hits"], c["misses"], c["errors"], c["evictions"]) for ns, c in pending.items()]
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO counters (ns, hits, misses, errors, evictions) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(ns) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses, "
+                "errors = errors + excluded.errors, evictions = evictions + excluded.evictions", rows)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._rollback()
+
+    def stats(self) -> list[dict]:
+        """네임스페이스별 누적 적중률 · 항목 수 · 용량 (모든 프로세스 합계)."""
+        self.flush()
+        conn = self._conn()
+        sizes = {ns: (n, b) for ns, n, b in
+                 conn.execute("SELECT ns, COUNT(*), SUM(size) FROM entries GROUP BY ns")}
+        out = []
+        for ns, hits, misses, errors, evictions in conn.execute(
+                "SELECT ns, hits, misses, errors, evictions FROM counters ORDER BY ns"):
+            n, b = sizes.get(ns, (0, 0))
+            total = hits + misses
+            out.append({"namespace": ns, "hits": hits, "misses": misses, "errors": errors,
+                        "evictions": evictions, "hit_rate": hits / total if total else 0.0,
+                        "entries": n, "kb": (b or 0) / 1024})
+        return out
+
+    def _rollback(self) -> None:
+        try:
+            self._conn().execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+def _bench_worker(path, seed, n_ops, n_keys, compute_ms, out):
+    """Zipf 분포 (인기 자치구 × 숙소 종류 조합) 로 get_or_compute 를 n_ops 번."""
+    rng = np.random.default_rng(seed)
+    cache = ResultCache(path)
+    keys = np.minimum(rng.zipf(1.3, n_ops), n_keys) - 1
+    lat = []
+    for k in keys:
+        payload = {"district": int(k) % 25, "room_type": int(k) // 25, "adr": 100_000 + int(k)}
+        t0 = time.perf_counter()
+        cache.get_or_compute("predict", "bench", payload,
+                             lambda: time.sleep(compute_ms / 1000) or {"ADR_pred": float(k)})
+        lat.append(time.perf_counter() - t0)
+    cache.flush()
+    out.put(lat)
+
+
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing as mp
+    import tempfile
+
+    ap = argparse.ArgumentParser(description="ResultCache 다중 프로세스 벤치마크")
+    ap.add_argument("--procs", type=int, default=4)
+    ap.add_argument("--ops", type=int, default=2_000, help="프로세스당 조회 수")
+    ap.add_argument("--keys", type=int, default=400, help="서로 다른 입력 수")
+    ap.add_argument("--compute-ms", type=float, default=8.0, help="미스 1건 계산 시간 (predict_revpar 대역)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "results.sqlite"
+        ResultCache(path)
+        q = mp.Queue()
+        t0 = time.perf_counter()
+        procs = [mp.Process(target=_bench_worker, args=(path, s, args.ops, args.keys, args.compute_ms, q))
+                 for s in range(args.procs)]
+        for p in procs:
+            p.start()
+        lat = np.concatenate([q.get() for _ in procs]) * 1000
+        for p in procs:
+            p.join()
+        wall = time.perf_counter() - t0
+
+        cache = ResultCache(path)
+        s = cache.stats()[0]
+        hit_ms = lat[lat < args.compute_ms]
+        print(f"[결과 캐시] 프로세스 {args.procs}개 × {args.ops:,}회 · 입력 {args.keys}종 (Zipf 1.3) · 미스 {args.compute_ms:.0f} ms")
+        print(f"  적중률            {s['hit_rate']:.1%}  (hits {s['hits']:,} · misses {s['misses']:,} · errors {s['errors']})")
+        print(f"  적중 지연 p50/p99  {np.percentile(hit_ms, 50):.3f} / {np.percentile(hit_ms, 99):.3f} ms")
+        print(f"  전체 지연 평균     {lat.mean():.2f} ms  (캐시 없으면 {args.compute_ms:.2f} ms)")
+        print(f"  벽시계             {wall:.2f} s · 항목 {s['entries']:,}개 · {s['kb']:.0f} KB")
+
+        small = ResultCache(path, max_entries=100, evict_every=1)
+        small.set("predict", "bench", {"evict": True}, 0)
+        print(f"  LRU 정리 후 항목   {small.stats()[0]['entries']}개 (max_entries=100)")
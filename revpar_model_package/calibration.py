@@ -0,0 +1,95 @@
+"""
+calibration.py — RevPAR Isotonic 보정 (임계값 배열 + np.interp)
+================================================================
+
+사용법:
+    from calibration import IsotonicCalibrator
+
+    iso = IsotonicCalibrator.from_sklearn(joblib.load("models/iso_reg.pkl"))
+    iso(52_000)                      # 스칼라 → float
+    iso(np.array([...]))             # 배열 → ndarray
+    iso.predict([52_000])            # sklearn IsotonicRegression.predict 와 같은 호출
+
+load_models() 가 iso_reg.pkl 을 읽은 뒤 이 클래스로 바꿔 반환하므로,
+predict_revpar / predict_revpar_batch 등 기존 호출부는 그대로 동작합니다.
+
+학습 구간 밖 입력 처리 (iso_reg.out_of_bounds 를 따름):
+    'clip'  — X_min 미만은 첫 보정값, X_max 초과는 마지막 보정값 (현재 모델 설정)
+    'nan'   — 구간 밖은 NaN
+    'raise' — 구간 밖 입력이 있으면 ValueError
+학습 구간 안에서는 sklearn 과 같은 선형 보간이므로 결과가 동일합니다.
+"""
+
+import numpy as np
+
+
+class IsotonicCalibrator:
+    """IsotonicRegression 의 (X_thresholds_, y_thresholds_) 구간 선형 함수."""
+
+    __slots__ = ("x", "y", "out_of_bounds")
+
+    def __init__(self, x_thresholds, y_thresholds, out_of_bounds: str = "clip"):
+        self.x = np.ascontiguousarray(x_thresholds, dtype=np.float64)
+        self.y = np.ascontiguousarray(y_thresholds, dtype=np.float64)
+        if out_of_bounds not in ("clip", "nan", "raise"):
+            raise ValueError(f"out_of_bounds 는 'clip'|'nan'|'raise' 중 하나: {out_of_bounds!r}")
+        self.out_of_bounds = out_of_bounds
+
+    @classmethod
+    def from_sklearn(cls, iso_reg) -> "IsotonicCalibrator":
+        """학습된 sklearn IsotonicRegression 에서 임계값 배열만 추출합니다."""
+        return cls(iso_reg.X_thresholds_, iso_reg.y_thresholds_, iso_reg.out_of_bounds)
+
+    @property
+    def x_range(self) -> tuple[float, float]:
+        return float(self.x[0]), float(self.x[-1])
+
+    def __call__(self, x):
+        """스칼라 입력은 float, 배열 입력은 같은 shape 의 ndarray 를 반환합니다."""
+        arr = np.asarray(x, dtype=np.float64)
+        out = np.interp(arr, self.x, self.y)  # 구간 밖은 양끝 값 (= clip)
+        if self.out_of_bounds != "clip":
+            outside = (arr < self.x[0]) | (arr > self.x[-1])
+            if self.out_of_bounds == "raise" and outside.any():
+                raise ValueError(f"보정 학습 구간 {self.x_range} 밖의 입력이 있습니다.")
+            out = np.where(outside, np.nan, out)
+        return float(out) if out.ndim == 0 else out
+
+    def predict(self, X) -> np.ndarray:
+        """sklearn IsotonicRegression.predict 호환 — 항상 1차원 ndarray."""
+        return np.atleast_1d(self(np.ravel(np.asarray(X, dtype=np.float64))))
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+if __name__ == "__main__":
+    import time
+    import warnings
+    from pathlib import Path
+
+    import joblib
+
+    warnings.filterwarnings("ignore")  # pkl 저장 당시 sklearn 버전 경고
+    iso = joblib.load(Path(__file__).parent / "models" / "iso_reg.pkl")
+    cal = IsotonicCalibrator.from_sklearn(iso)
+
+    rng = np.random.default_rng(0)
+    lo, hi = cal.x_range
+    batch = rng.uniform(lo * 0.5, hi * 1.2, 100_000)  # 구간 밖 입력 포함
+    max_diff = float(np.max(np.abs(cal.predict(batch) - iso.predict(batch))))
+
+    def bench(fn, n):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        return (time.perf_counter() - t0) / n
+
+    x0 = 52_000.0
+    t_sk_1 = bench(lambda: iso.predict([x0])[0], 2_000)
+    t_np_1 = bench(lambda: cal(x0), 20_000)
+    t_sk_b = bench(lambda: iso.predict(batch), 20)
+    t_np_b = bench(lambda: cal.predict(batch), 20)
+
+    print(f"[Isotonic 보정] 임계값 {len(cal.x)}개 · 학습 구간 ₩{lo:,.0f} ~ ₩{hi:,.0f}")
+    print(f"  단건   sklearn {t_sk_1 * 1e6:8.1f} µs → np.interp {t_np_1 * 1e6:6.2f} µs")
+    print(f"  10만건 sklearn {t_sk_b * 1e3:8.2f} ms → np.interp {t_np_b * 1e3:6.2f} ms")
+    print(f"  최대 차이 (구간 밖 포함 10만건): {max_diff:.2e}")
@@ -0,0 +1,282 @@
+"""
+cell_clusters.py — 격자 셀 단위 시장 군집 (자치구 4군집의 세분화)
+=================================================================
+
+사용법:
+    # 전체 리스팅 → data/processed/cell_clusters.csv (단계별 소요 시간 출력)
+    python cell_clusters.py build data/raw/seoul_airbnb_cleaned.csv --cell-m 500 --k 4
+
+    # 셀 크기별 실행 시간 벤치마크 (파일은 쓰지 않음)
+    python cell_clusters.py bench data/raw/seoul_airbnb_cleaned.csv
+
+    from cell_clusters import CellClusterMap
+    cells = CellClusterMap.load()                       # 파일이 없으면 None
+    row = cells.lookup(37.5563, 126.9236)               # dict (cluster, cluster_name, 지표 …) 또는 None
+    ids = cells.lookup_many(lat_array, lng_array)       # 군집 번호 배열 (-1 = 셀 없음)
+
+격자:
+    서울 남서쪽 바깥 GRID_ORIGIN 을 원점으로 위·경도를 km 평면 좌표로 바꾸고 cell_m 미터
+    정사각형으로 나눕니다. 셀 번호 = iy * nx + ix 이므로 좌표 → 셀은 나눗셈 두 번,
+    셀 → 군집은 조밀 배열 인덱싱 한 번 (O(1)) 입니다.
+
+지표 (district_aggregates.district_clustered 와 같은 정의, 셀 단위):
+    median_revpar_ao — Active+Operating 리스팅 ttm_revpar 중앙값
+    dormant_ratio    — operation_status != Operating 비율
+    superhost_rate   — 슈퍼호스트 비율 (전체)
+    supply_share     — 서울 전체 리스팅 중 이 셀의 비율
+    리스팅이 min_listings 미만이거나 AO 리스팅이 3개 미만인 셀은 군집에서 빠지며,
+    앱은 이 경우 자치구 군집을 그대로 씁니다.
+
+군집:
+    [log RevPAR, 휴면 비율, 슈퍼호스트 비율, log 공급 비중] 을 표준화해 리스팅 수를 가중치로
+    MiniBatchKMeans 에 넣습니다. 군집 중심을 district_clustered.csv 의 자치구 군집 중심
+    (같은 방식으로 표준화) 과 헝가리안 매칭해 cluster 번호·cluster_name 을 기존 4군집
+    (CLUSTER_INFO) 과 맞춥니다. 모델 입력 피처 cluster 는 학습 당시 자치구 군집이므로
+    바꾸지 않습니다 — 셀 군집은 시장 유형 설명과 전략에만 씁니다.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from sklearn.cluster import MiniBatchKMeans
+
+_PKG_DIR = Path(__file__).parent
+CELL_CLUSTERS_PATH = _PKG_DIR.parent / "data" / "processed" / "cell_clusters.csv"
+DISTRICT_CLUSTERED_PATH = _PKG_DIR.parent / "data" / "processed" / "district_clustered.csv"
+
+GRID_ORIGIN = (37.40, 126.74)        # (위도, 경도) — 서울 경계 남서쪽 바깥
+GRID_EXTENT_KM = (38.0, 44.0)        # (남북, 동서) — 서울 전체를 덮는 범위
+_KM_PER_DEG_LAT = 110.574
+_KM_PER_DEG_LNG = 111.320 * np.cos(np.radians(37.55))
+
+MIN_AO = 3
+
+
+def grid_shape(cell_m: float) -> tuple[int, int]:
+    """(ny, nx) — cell_m 미터 격자의 행·열 수."""
+    return (int(np.ceil(GRID_EXTENT_KM[0] * 1000 / cell_m)),
+            int(np.ceil(GRID_EXTENT_KM[1] * 1000 / cell_m)))
+
+
+def cell_index(lat, lng, cell_m: float) -> np.ndarray:
+    """위·경도 배열 → 셀 번호 배열 (격자 밖이거나 좌표 결측이면 -1)."""
+    ny, nx = grid_shape(cell_m)
+    y = (np.asarray(lat, dtype=np.float64) - GRID_ORIGIN[0]) * _KM_PER_DEG_LAT * 1000 / cell_m
+    x = (np.asarray(lng, dtype=np.float64) - GRID_ORIGIN[1]) * _KM_PER_DEG_LNG * 1000 / cell_m
+    inside = (y >= 0) & (y < ny) & (x >= 0) & (x < nx)          # NaN 은 False
+    iy = np.where(inside, y, 0).astype(np.int64)
+    ix = np.where(inside, x, 0).astype(np.int64)
+    return np.where(inside, iy * nx + ix, -1)
+
+
+def cell_center(cell_id, cell_m: float) -> tuple[np.ndarray, np.ndarray]:
+    _, nx = grid_shape(cell_m)
+    iy, ix = np.divmod(np.asarray(cell_id, dtype=np.int64), nx)
+    lat = GRID_ORIGIN[0] + (iy + 0.5) * cell_m / 1000 / _KM_PER_DEG_LAT
+    lng = GRID_ORIGIN[1] + (ix + 0.5) * cell_m / 1000 / _KM_PER_DEG_LNG
+    return lat, lng
+
+
+def aggregate_cells(df: pd.DataFrame, cell_m: float = 500.0, min_listings: int = 10,
+                    lat_col: str = "latitude", lng_col: str = "longitude") -> pd.DataFrame:
+    """리스팅 → 셀별 지표 (bincount / groupby 한 번씩, 행 루프 없음).
+
+    필요 컬럼: lat_col, lng_col, district, refined_status, operation_status, superhost, ttm_revpar
+    """
+    cell = cell_index(df[lat_col], df[lng_col], cell_m)
+    keep = cell >= 0
+    cell = cell[keep]
+    sub = df.loc[keep]
+    ids, inv = np.unique(cell, return_inverse=True)
+    n = len(ids)
+
+    ao = ((sub["refined_status"] == "Active") & (sub["operation_status"] == "Operating")).to_numpy()
+    total = np.bincount(inv, minlength=n)
+    ao_count = np.bincount(inv, weights=ao, minlength=n)
+    dormant = np.bincount(inv, weights=(sub["operation_status"] != "Operating").to_numpy(), minlength=n)
+    superhost = np.bincount(inv, weights=sub["superhost"].fillna(False).astype(bool).to_numpy(), minlength=n)
+    median_revpar = (pd.Series(sub["ttm_revpar"].to_numpy()[ao]).groupby(inv[ao]).median()
+                     .reindex(range(n)).to_numpy())
+
+    # 셀의 다수 자치구 — (셀, 자치구) 쌍 개수를 세어 행별 argmax
+    dcode, dnames = pd.factorize(sub["district"])
+    pair = np.bincount(inv * len(dnames) + dcode, minlength=n * len(dnames)).reshape(n, len(dnames))
+
+    lat, lng = cell_center(ids, cell_m)
+    out = pd.DataFrame({
+        "cell_id": ids,
+        "lat": lat.round(5),
+        "lng": lng.round(5),
+        "district": np.asarray(dnames)[pair.argmax(axis=1)],
+        "total_listings": total,
+        "ao_count": ao_count.astype(np.int64),
+        "median_revpar_ao": np.round(median_revpar, 2),
+        "dormant_ratio": dormant / total,
+        "superhost_rate": superhost / total,
+        "supply_share": total / max(int(total.sum()), 1),
+    })
+    return out[(out["total_listings"] >= min_listings) & (out["ao_count"] >= MIN_AO)].reset_index(drop=True)
+
+
+def _feature_matrix(frame: pd.DataFrame) -> np.ndarray:
+    """군집 공간 — log RevPAR · 휴면 비율 · 슈퍼호스트 비율 · log 공급 비중, 표 안에서 표준화."""
+    x = np.column_stack([
+        np.log1p(frame["median_revpar_ao"].to_numpy(dtype=np.float64)),
+        frame["dormant_ratio"].to_numpy(dtype=np.float64),
+        frame["superhost_rate"].to_numpy(dtype=np.float64),
+        np.log(frame["supply_share"].to_numpy(dtype=np.float64)),
+    ])
+    std = x.std(axis=0)
+    return (x - x.mean(axis=0)) / np.where(std > 0, std, 1.0)
+
+
+def _match_clusters(cell_centers: np.ndarray, district: pd.DataFrame) -> np.ndarray:
+    """셀 군집 중심 → 자치구 군집 번호. 헝가리안 1:1 매칭, 남는 셀 군집은 가장 가까운 자치구 군집."""
+    zd = _feature_matrix(district)
+    d_ids = np.sort(district["cluster"].unique())
+    d_centers = np.vstack([zd[district["cluster"].to_numpy() == c].mean(axis=0) for c in d_ids])
+    cost = ((cell_centers[:, None, :] - d_centers[None, :, :]) ** 2).sum(axis=-1)
+    mapping = d_ids[cost.argmin(axis=1)]
+    rows, cols = linear_sum_assignment(cost)
+    mapping[rows] = d_ids[cols]
+    return mapping
+
+
+def cluster_cells(cells: pd.DataFrame, district: pd.DataFrame, k: int = 4,
+                  batch_size: int = 1024, seed: int = 0) -> pd.DataFrame:
+    """셀 표에 cluster / cluster_name / cluster_rank 컬럼을 붙여 반환."""
+    if len(cells) < k:
+        raise ValueError(f"군집할 셀이 {len(cells)}개로 k={k} 보다 적습니다 — cell_m 을 키우거나 min_listings 를 낮추세요.")
+    z = _feature_matrix(cells)
+    km = MiniBatchKMeans(n_clusters=k, batch_size=batch_size, n_init=3, random_state=seed)
+    labels = km.fit_predict(z, sample_weight=cells["total_listings"].to_numpy(dtype=np.float64))
+    cluster = _match_clusters(km.cluster_centers_, district)[labels]
+
+    names = district.drop_duplicates("cluster").set_index("cluster")
+    out = cells.copy()
+    out["cluster"] = cluster
+    out["cluster_name"] = names["cluster_name"].reindex(cluster).to_numpy()
+    out["cluster_rank"] = names["cluster_rank"].reindex(cluster).to_numpy()
+    return out
+
+
+def build(df: pd.DataFrame, district: pd.DataFrame, cell_m: float = 500.0, k: int = 4,
+          min_listings: int = 10, timings: dict | None = None) -> pd.DataFrame:
+    """리스팅 + 자치구 군집표 → cell_clusters.csv 스키마 (cell_m 컬럼 포함)."""
+    t0 = time.perf_counter()
+    cells = aggregate_cells(df, cell_m, min_listings)
+    t1 = time.perf_counter()
+    out = cluster_cells(cells, district, k)
+    t2 = time.perf_counter()
+    if timings is not None:
+        timings.update(aggregate_ms=(t1 - t0) * 1000, cluster_ms=(t2 - t1) * 1000)
+    out.insert(1, "cell_m", float(cell_m))
+    return out
+
+
+class CellClusterMap:
+    """셀 번호 → 셀 표 행 번호 조밀 배열. lookup 은 좌표 변환 + 배열 인덱싱 1번."""
+
+    def __init__(self, cells: pd.DataFrame):
+        self.cells = cells.reset_index(drop=True)
+        self.cell_m = float(self.cells["cell_m"].iloc[0])
+        self.ny, self.nx = grid_shape(self.cell_m)
+        self._row = np.full(self.ny * self.nx, -1, dtype=np.int32)
+        self._row[self.cells["cell_id"].to_numpy(dtype=np.int64)] = np.arange(len(self.cells), dtype=np.int32)
+        self._cluster = self.cells["cluster"].to_numpy(dtype=np.int64)
+        self._records = self.cells.to_dict("records")
+        self._row_list = self._row.tolist()              # 단건 조회는 numpy 호출 없이
+        self._scale = (_KM_PER_DEG_LAT * 1000 / self.cell_m, _KM_PER_DEG_LNG * 1000 / self.cell_m)
+
+    @classmethod
+    def load(cls, path: str | Path = CELL_CLUSTERS_PATH) -> "CellClusterMap | None":
+        path = Path(path)
+        if not path.exists():
+            return None
+        cells = pd.read_csv(path)
+        return cls(cells) if len(cells) else None
+
+    def _rows(self, lat, lng) -> np.ndarray:
+        cell = cell_index(lat, lng, self.cell_m)
+        return np.where(cell >= 0, self._row[np.maximum(cell, 0)], -1)
+
+    def lookup(self, lat: float, lng: float) -> dict | None:
+        """좌표가 속한 셀의 행 (cluster, cluster_name, 지표 …). 군집된 셀이 아니면 None."""
+        y = (lat - GRID_ORIGIN[0]) * self._scale[0]
+        x = (lng - GRID_ORIGIN[1]) * self._scale[1]
+        if not (0 <= y < self.ny and 0 <= x < self.nx):   # NaN 도 여기서 걸러짐
+            return None
+        r = self._row_list[int(y) * self.nx + int(x)]
+        return None if r < 0 else self._records[r]
+
+    def lookup_many(self, lat, lng) -> np.ndarray:
+        """좌표 배열 → 셀 군집 번호 배열 (-1 = 군집된 셀 없음)."""
+        rows = self._rows(lat, lng)
+        return np.where(rows >= 0, self._cluster[np.maximum(rows, 0)], -1)
+
+
+def _summary(out: pd.DataFrame, district: pd.DataFrame) -> str:
+    d_cluster = district.set_index("district")["cluster"]
+    differs = (out["cluster"].to_numpy() != d_cluster.reindex(out["district"]).to_numpy())
+    lines = [f"  셀 {len(out):,}개 · 자치구 군집과 다른 셀 {differs.mean():.0%} "
+             f"(리스팅 가중 {np.average(differs, weights=out['total_listings']):.0%})"]
+    counts = out.groupby("cluster_name")["total_listings"].agg(["size", "sum"])
+    for name, row in counts.iterrows():
+        lines.append(f"    {name:12s} 셀 {int(row['size']):5,d} · 리스팅 {int(row['sum']):7,d}")
+    return "\n".join(lines)
+
+
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="격자 셀 단위 시장 군집")
+    ap.add_argument("command", choices=("build", "bench"))
+    ap.add_argument("listings", help="data/raw/seoul_airbnb_cleaned.csv")
+    ap.add_argument("--cell-m", type=float, default=500.0)
+    ap.add_argument("--k", type=int, default=4)
+    ap.add_argument("--min-listings", type=int, default=10)
+    ap.add_argument("--district", default=str(DISTRICT_CLUSTERED_PATH))
+    ap.add_argument("--out", default=str(CELL_CLUSTERS_PATH))
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    usecols = ["district", "refined_status", "operation_status", "superhost", "ttm_revpar", "latitude", "longitude"]
+    df = pd.read_csv(args.listings, usecols=usecols)
+    district = pd.read_csv(args.district, encoding="utf-8-sig")
+    t_read = (time.perf_counter() - t0) * 1000
+    print(f"[셀 군집] 리스팅 {len(df):,}행 읽기 {t_read:.0f} ms")
+
+    sizes = [args.cell_m] if args.command == "build" else [1000.0, 500.0, 250.0, 100.0]
+    for cell_m in sizes:
+        timings = {}
+        try:
+            out = build(df, district, cell_m, args.k, args.min_listings, timings)
+        except ValueError as e:
+            print(f"  {cell_m:6.0f} m: {e}")
+            continue
+        cmap = CellClusterMap(out)
+        lat = df["latitude"].to_numpy()
+        lng = df["longitude"].to_numpy()
+        t1 = time.perf_counter()
+        cmap.lookup_many(lat, lng)
+        t_many = (time.perf_counter() - t1) / len(df) * 1e9
+        t1 = time.perf_counter()
+        for i in range(2_000):
+            cmap.lookup(lat[i], lng[i])
+        t_one = (time.perf_counter() - t1) / 2_000 * 1e6
+        print(f"  {cell_m:6.0f} m: 집계 {timings['aggregate_ms']:6.1f} ms · 군집 {timings['cluster_ms']:6.1f} ms · "
+              f"조회 1건 {t_one:5.1f} µs / 일괄 {t_many:5.1f} ns/건")
+        print(_summary(out, district))
+
+    if args.command == "build":
+        out_path = Path(args.out)
+        tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+        out.to_csv(tmp, index=False, encoding="utf-8")
+        tmp.replace(out_path)
+        print(f"  → {out_path}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,315 @@
+"""
+district_aggregates.py — 자치구 통계 증분 갱신 엔진
+====================================================
+
+사용법:
+    # 최초 1회: 현재 전체 리스팅으로 상태 생성
+    python district_aggregates.py init  data/raw/seoul_airbnb_cleaned.csv
+
+    # 매월: 새 스냅샷 반영 → district_lookup.csv / district_clustered.csv 재작성
+    python district_aggregates.py apply data/raw/snapshot_2025_10.csv
+
+    from district_aggregates import DistrictAggregator
+    agg = DistrictAggregator.load()
+    agg.apply_delta(upserts_df, removed_ids)
+    agg.write_tables()
+
+유지하는 통계 (자치구별):
+    running count  : 전체 리스팅 수, Active+Operating 수, 휴면 수,
+                     슈퍼호스트 수 (전체 / AO), 집 전체 수 (AO)
+    quantile sketch: AO 리스팅 ttm_revpar 로그 히스토그램 (상대 오차 ≈ 0.5%)
+                     → district_median_revpar / median_revpar_ao
+
+히스토그램 버킷 카운트는 더하기·빼기가 모두 가능하므로 리스팅 추가·삭제·변경을
+변경된 행 수에 비례하는 시간으로 반영합니다. 리스팅별 이전 상태는 정수 행렬의 한 행
+(ID → 행 번호 dict, 삭제된 행은 빈 슬롯으로 재사용) 에 제자리로 덮어쓰므로 델타마다
+전체 상태를 복사하지 않습니다. 스냅샷 전체를 받은 경우에도 리스팅별 이전 상태와
+벡터 비교해 달라진 행만 반영합니다.
+
+클러스터(cluster, cluster_name, cluster_rank)와 자치구 인구(ttm_pop)는
+노트북 산출물을 그대로 유지합니다 — 군집 재학습은 이 엔진의 범위가 아닙니다.
+
+테이블 파일은 임시 파일에 쓴 뒤 os.replace 로 교체하므로 앱은 항상 완전한
+버전만 읽습니다. app.py 는 파일 mtime 을 캐시 키로 사용해 재시작 없이 새 버전을 읽습니다.
+"""
+
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+_PKG_DIR = Path(__file__).parent
+DISTRICT_LOOKUP_PATH = _PKG_DIR / "district_lookup.csv"
+DISTRICT_CLUSTERED_PATH = _PKG_DIR.parent / "data" / "processed" / "district_clustered.csv"
+STATE_PATH = _PKG_DIR.parent / "data" / "processed" / "district_agg_state.pkl"
+
+# ── 로그 히스토그램 스케치 설정 ──────────────────────────────────────────────
+# 버킷 0 = RevPAR 0 이하, 버킷 1.. = [1원, 1천만원] 구간을 1% 간격 로그 분할
+_SKETCH_RATIO = 1.01
+_SKETCH_EDGES = np.concatenate(
+    [[0.0], np.exp(np.arange(0, np.log(1e7) + np.log(_SKETCH_RATIO), np.log(_SKETCH_RATIO)))]
+)
+_SKETCH_MIDS = np.concatenate(
+    [[0.0], np.sqrt(_SKETCH_EDGES[1:-1] * _SKETCH_EDGES[2:]), [_SKETCH_EDGES[-1]]]
+)
+N_BINS = len(_SKETCH_MIDS)
+
+# 리스팅별 상태 → 자치구 카운터 컬럼 (순서 = _counts 열 순서)
+_COUNTER_COLS = ["total", "ao", "dormant", "superhost_all", "superhost_ao", "entire_ao"]
+# 리스팅별 상태 행렬 열: [자치구 코드, *_COUNTER_COLS, revpar_bin]
+_STATE_COLS = ["district_code", *_COUNTER_COLS, "revpar_bin"]
+
+
+def revpar_to_bin(revpar) -> np.ndarray:
+    """RevPAR 값(배열)을 스케치 버킷 번호로 변환합니다."""
+    v = np.nan_to_num(np.asarray(revpar, dtype=float), nan=0.0)
+    return np.clip(np.searchsorted(_SKETCH_EDGES, v, side="right") - 1, 0, N_BINS - 1)
+
+
+def sketch_quantile(hist: np.ndarray, q: float) -> float:
+    """히스토그램 한 행에서 q 분위수 추정 (버킷 기하 중앙값)."""
+    n = hist.sum()
+    if n == 0:
+        return float("nan")
+    cum = np.cumsum(hist)
+    return float(_SKETCH_MIDS[np.searchsorted(cum, q * n, side="left")])
+
+
+def listing_state(df: pd.DataFrame, id_col: str = "listing_id") -> pd.DataFrame:
+    """원본 리스팅 행을 집계에 필요한 최소 상태로 변환합니다.
+
+    필요 컬럼: id_col, district, room_type, refined_status, operation_status,
+               superhost, ttm_revpar
+    """
+    ao = (df["refined_status"] == "Active") & (df["operation_status"] == "Operating")
+    superhost = df["superhost"].fillna(False).astype(bool)
+    return pd.DataFrame(
+        {
+            "district": df["district"].astype(str).to_numpy(),
+            "total": 1,
+            "ao": ao.astype(int).to_numpy(),
+            "dormant": (df["operation_status"] != "Operating").astype(int).to_numpy(),
+            "superhost_all": superhost.astype(int).to_numpy(),
+            "superhost_ao": (superhost & ao).astype(int).to_numpy(),
+            "entire_ao": ((df["room_type"] == "entire_home") & ao).astype(int).to_numpy(),
+            "revpar_bin": np.where(ao, revpar_to_bin(df["ttm_revpar"]), -1),
+        },
+        index=pd.Index(df[id_col].to_numpy(), name=id_col),
+    )
+
+
+class DistrictAggregator:
+    """자치구 카운터 + RevPAR 스케치를 리스팅 단위 델타로 유지합니다."""
+
+    def __init__(self, lookup: pd.DataFrame, clustered: pd.DataFrame, id_col: str = "listing_id"):
+        # 노트북 산출물에서 유지하는 정적 컬럼 (군집·인구)
+        self._static_lookup = lookup[["district", "cluster", "cluster_name", "ttm_pop"]].copy()
+        self._static_clustered = clustered[
+            ["district", "median_pop", "cluster", "cluster_rank", "cluster_name"]
+        ].copy()
+        self.id_col = id_col
+        self.districts: list[str] = list(self._static_lookup["district"])
+        self._code = {d: i for i, d in enumerate(self.districts)}
+        self._counts = np.zeros((len(self.districts), len(_COUNTER_COLS)), dtype=np.int64)
+        self._hist = np.zeros((len(self.districts), N_BINS), dtype=np.int64)
+        # 리스팅별 상태: ID → 행 번호, 행렬은 용량을 두 배씩 늘리고 삭제된 행은 _free 로 재사용
+        self._row: dict = {}
+        self._rows = np.zeros((0, len(_STATE_COLS)), dtype=np.int64)
+        self._free: list[int] = []
+        self._n = 0
+        self.version = 0
+
+    # ── 생성 / 저장 ──────────────────────────────────────────────────────────
+    @classmethod
+    def from_listings(cls, df: pd.DataFrame, id_col: str = "listing_id") -> "DistrictAggregator":
+        lookup = pd.read_csv(DISTRICT_LOOKUP_PATH)
+        clustered = pd.read_csv(DISTRICT_CLUSTERED_PATH, encoding="utf-8-sig")
+        agg = cls(lookup, clustered, id_col=id_col)
+        agg.apply_snapshot(df)
+        return agg
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> "DistrictAggregator":
+        p = Path(path) if path else STATE_PATH
+        if not p.exists():
+            raise FileNotFoundError(
+                f"집계 상태 파일이 없습니다: {p}\n"
+                "먼저 `python district_aggregates.py init <listings.csv>` 를 실행하세요."
+            )
+        return joblib.load(p)
+
+    def save(self, path: str | Path | None = None) -> None:
+        p = Path(path) if path else STATE_PATH
+        tmp = p.with_suffix(p.suffix + ".tmp")
+        joblib.dump(self, tmp)
+        os.replace(tmp, p)
+
+    # ── 델타 반영 ────────────────────────────────────────────────────────────
+    def _district_codes(self, districts) -> np.ndarray:
+        for d in pd.unique(districts):
+            if d not in self._code:
+                self._code[d] = len(self.districts)
+                self.districts.append(d)
+                self._counts = np.vstack([self._counts, np.zeros((1, len(_COUNTER_COLS)), np.int64)])
+                self._hist = np.vstack([self._hist, np.zeros((1, N_BINS), np.int64)])
+        return np.fromiter((self._code[d] for d in districts), dtype=np.int64, count=len(districts))
+
+    def _accumulate(self, rows: np.ndarray, sign: int) -> None:
+        if len(rows) == 0:
+            return
+        codes = rows[:, 0]
+        np.add.at(self._counts, codes, sign * rows[:, 1:-1])
+        bins = rows[:, -1]
+        has_bin = bins >= 0
+        np.add.at(self._hist, (codes[has_bin], bins[has_bin]), sign)
+
+    def _state_rows(self, state: pd.DataFrame) -> np.ndarray:
+        """listing_state 결과 → 상태 행렬 행 (자치구 이름을 코드로)."""
+        out = np.empty((len(state), len(_STATE_COLS)), dtype=np.int64)
+        out[:, 0] = self._district_codes(state["district"].to_numpy())
+        out[:, 1:] = state[[*_COUNTER_COLS, "revpar_bin"]].to_numpy(dtype=np.int64)
+        return out
+
+    def _slots(self, n: int) -> list[int]:
+        """빈 행 n개 — 삭제로 비운 행부터, 모자라면 행렬을 두 배로 늘려 끝에서."""
+        k = min(n, len(self._free))
+        reuse = self._free[len(self._free) - k:]
+        del self._free[len(self._free) - k:]
+        fresh = n - k
+        if self._n + fresh > len(self._rows):
+            grown = np.zeros((max(2 * len(self._rows), self._n + fresh), len(_STATE_COLS)), dtype=np.int64)
+            grown[:self._n] = self._rows[:self._n]
+            self._rows = grown
+        self._n += fresh
+        return reuse + list(range(self._n - fresh, self._n))
+
+    def apply_delta(self, upserts: pd.DataFrame | None = None, removed_ids=()) -> int:
+        """추가·변경 리스팅(원본 행)과 삭제 ID를 반영합니다. 반영된 행 수를 반환합니다.
+
+        ID 조회·상태 행 덮어쓰기 모두 델타 행 수에 비례합니다 (전체 상태 복사 없음).
+        """
+        if upserts is not None and len(upserts):
+            upserts = upserts.drop_duplicates(self.id_col, keep="last")
+            new_state = listing_state(upserts, self.id_col)
+            new_ids = list(new_state.index)
+            new_rows = self._state_rows(new_state)
+        else:
+            new_ids, new_rows = [], np.zeros((0, len(_STATE_COLS)), dtype=np.int64)
+
+        # 이전 상태 빼기 — 변경된 리스팅과 삭제된 리스팅
+        upserted = set(new_ids)
+        removed = [i for i in pd.unique(pd.Index(removed_ids)) if i in self._row and i not in upserted]
+        old_idx = [self._row[i] for i in new_ids if i in self._row] + [self._row[i] for i in removed]
+        self._accumulate(self._rows[old_idx], -1)
+        self._accumulate(new_rows, +1)
+
+        # 상태 행 갱신 — 기존 ID 는 제자리, 새 ID 는 빈 슬롯, 삭제 ID 의 행은 빈 슬롯으로
+        for i in removed:
+            self._free.append(self._row.pop(i))
+        missing = [i for i in new_ids if i not in self._row]
+        for i, slot in zip(missing, self._slots(len(missing))):
+            self._row[i] = slot
+        if new_ids:
+            self._rows[[self._row[i] for i in new_ids]] = new_rows
+
+        self.version += 1
+        return len(old_idx) + len(new_ids)
+
+    def apply_snapshot(self, df: pd.DataFrame) -> int:
+        """전체 스냅샷을 받아 이전 상태와 비교하고, 달라진 리스팅만 반영합니다."""
+        snap = listing_state(df.drop_duplicates(self.id_col, keep="last"), self.id_col)
+        known = snap.index.isin(list(self._row))
+        common = snap.index[known]
+        old = self._rows[[self._row[i] for i in common]]
+        changed = common[(old != self._state_rows(snap.loc[common])).any(axis=1)]
+        added = snap.index[~known]
+        snap_ids = set(snap.index)
+        removed = [i for i in self._row if i not in snap_ids]
+        return self.apply_delta(df[df[self.id_col].isin(changed.union(added))], removed)
+
+    # ── 테이블 산출 ──────────────────────────────────────────────────────────
+    def _frame(self) -> pd.DataFrame:
+        out = pd.DataFrame(self._counts, columns=_COUNTER_COLS)
+        out.insert(0, "district", self.districts)
+        out["median_revpar_ao"] = [sketch_quantile(h, 0.5) for h in self._hist]
+        return out
+
+    def district_lookup(self) -> pd.DataFrame:
+        """district_lookup.csv 와 같은 스키마."""
+        f = self._frame()
+        ao = f["ao"].where(f["ao"] > 0)
+        out = self._static_lookup[["district", "cluster", "cluster_name"]].merge(
+            pd.DataFrame({
+                "district": f["district"],
+                "district_median_revpar": f["median_revpar_ao"].round(2),
+                "district_listing_count": f["ao"],
+                "district_superhost_rate": f["superhost_ao"] / ao,
+                "district_entire_home_rate": f["entire_ao"] / ao,
+            }),
+            on="district", how="left",
+        )
+        return out.merge(self._static_lookup[["district", "ttm_pop"]], on="district", how="left")
+
+    def district_clustered(self) -> pd.DataFrame:
+        """data/processed/district_clustered.csv 와 같은 스키마."""
+        f = self._frame()
+        total = f["total"].where(f["total"] > 0)
+        out = pd.DataFrame({
+            "district": f["district"],
+            "total_listings": f["total"],
+            "ao_count": f["ao"],
+            "median_revpar_ao": f["median_revpar_ao"].round(2),
+            "dormant_count": f["dormant"],
+            "superhost_rate": f["superhost_all"] / total,
+        }).merge(self._static_clustered, on="district", how="inner")
+        out["dormant_ratio"] = out["dormant_count"] / out["total_listings"].where(out["total_listings"] > 0)
+        out["supply_share"] = out["total_listings"] / max(int(out["total_listings"].sum()), 1)
+        return out[[
+            "district", "total_listings", "ao_count", "median_revpar_ao", "dormant_count",
+            "superhost_rate", "median_pop", "dormant_ratio", "supply_share",
+            "cluster", "cluster_rank", "cluster_name",
+        ]]
+
+    def write_tables(
+        self,
+        lookup_path: str | Path | None = None,
+        clustered_path: str | Path | None = None,
+    ) -> None:
+        """두 룩업 테이블을 원자적으로 교체합니다."""
+        for frame, path, enc in (
+            (self.district_lookup(), Path(lookup_path or DISTRICT_LOOKUP_PATH), "utf-8"),
+            (self.district_clustered(), Path(clustered_path or DISTRICT_CLUSTERED_PATH), "utf-8-sig"),
+        ):
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            frame.to_csv(tmp, index=False, encoding=enc)
+            os.replace(tmp, path)
+
+
+# ── CLI (직접 실행 시) ────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    # 상태 pkl 이 __main__ 이 아닌 모듈 경로로 저장되도록 재import
+    from district_aggregates import DistrictAggregator
+
+    parser = argparse.ArgumentParser(description="자치구 통계 증분 갱신")
+    parser.add_argument("command", choices=["init", "apply"])
+    parser.add_argument("listings_csv")
+    parser.add_argument("--id-col", default="listing_id")
+    args = parser.parse_args()
+
+    snapshot = pd.read_csv(args.listings_csv)
+    t0 = time.perf_counter()
+    if args.command == "init":
+        agg = DistrictAggregator.from_listings(snapshot, id_col=args.id_col)
+        n = len(snapshot)
+    else:
+        agg = DistrictAggregator.load()
+        n = agg.apply_snapshot(snapshot)
+    agg.write_tables()
+    agg.save()
+
+    print(f"[자치구 집계 v{agg.version}] {n:,}개 리스팅 반영 · {(time.perf_counter() - t0) * 1000:.0f} ms")
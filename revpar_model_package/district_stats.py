@@ -0,0 +1,117 @@
+"""
+district_stats.py — 자치구 평균 기반 *_rel_dist 경쟁 피처
+==========================================================
+
+사용법:
+    from district_stats import DistrictStatsIndex
+
+    stats = DistrictStatsIndex.load()                 # cluster_listings_ao.csv (Active+Operating)
+    listing = stats.assemble(listing, "Mapo-gu")      # 단건: rel_dist 4개 채운 새 dict
+    frame = stats.assemble_batch(frame, "district")   # 배치: district 컬럼 기준 일괄 계산
+
+피처 정의 (predict_utils 입력 설명과 동일):
+    photos_rel_dist      = photos_count   / 자치구 평균 photos_count
+    rating_rel_dist      = rating_overall / 자치구 평균 rating_overall
+    reviews_rel_dist     = num_reviews    / 자치구 평균 num_reviews
+    min_nights_rel_dist  = min_nights     / 자치구 평균 min_nights
+
+자치구 평균은 로드 시 1회 groupby 로 (자치구 × 4) 배열에 담아 두고,
+조회는 dict 인덱스 → 배열 행 1개로 끝납니다. 모르는 자치구·평균 0 은 1.0 (= 자치구 평균).
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# rel_dist 피처 → 원본 컬럼
+REL_DIST_SOURCES = {
+    "photos_rel_dist": "photos_count",
+    "rating_rel_dist": "rating_overall",
+    "reviews_rel_dist": "num_reviews",
+    "min_nights_rel_dist": "min_nights",
+}
+
+
+def rel_dist(values, means):
+    """값 / 자치구 평균 (평균이 0 이하·NaN 이면 1.0). 스칼라·배열 모두 가능."""
+    values = np.asarray(values, dtype=np.float64)
+    means = np.asarray(means, dtype=np.float64)
+    ok = means > 0
+    out = np.where(ok, values / np.where(ok, means, 1.0), 1.0)
+    return float(out) if out.ndim == 0 else out
+
+
+class DistrictStatsIndex:
+    """자치구별 photos_count·rating_overall·num_reviews·min_nights 평균."""
+
+    def __init__(self, districts, means: np.ndarray):
+        self.districts = list(districts)
+        self.means_table = np.asarray(means, dtype=np.float64)  # (자치구 수, 4)
+        self._row = {d: i for i, d in enumerate(self.districts)}
+
+    @classmethod
+    def from_listings(cls, listings: pd.DataFrame) -> "DistrictStatsIndex":
+        """Active+Operating 리스팅 DataFrame (district + 원본 4개 컬럼) 에서 생성."""
+        cols = list(REL_DIST_SOURCES.values())
+        g = listings[["district", *cols]].astype({c: float for c in cols}).groupby("district")[cols].mean()
+        return cls(g.index, g.to_numpy())
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> "DistrictStatsIndex":
+        p = Path(path) if path else Path(__file__).parent / "cluster_listings_ao.csv"
+        return cls.from_listings(pd.read_csv(p))
+
+    def means(self, district: str) -> dict | None:
+        """{원본 컬럼: 자치구 평균}. 모르는 자치구면 None."""
+        i = self._row.get(district)
+        if i is None:
+            return None
+        return dict(zip(REL_DIST_SOURCES.values(), self.means_table[i].tolist()))
+
+    def assemble(self, listing_features: dict, district: str) -> dict:
+        """rel_dist 4개를 채운 listing dict 사본 (모르는 자치구는 1.0)."""
+        out = dict(listing_features)
+        m = self.means(district)
+        for feat, src in REL_DIST_SOURCES.items():
+            mean = m[src] if m else 0.0
+            out[feat] = float(listing_features.get(src) or 0) / mean if mean > 0 else 1.0
+        return out
+
+    def assemble_batch(self, frame: pd.DataFrame, district: str | pd.Series = "district") -> pd.DataFrame:
+        """district 컬럼명(또는 행별 Series) 기준으로 rel_dist 4개 컬럼을 채운 사본."""
+        names = frame[district] if isinstance(district, str) else pd.Series(district, index=frame.index)
+        idx = pd.Index(self.districts).get_indexer(names)
+        means = np.where((idx >= 0)[:, None], self.means_table[np.maximum(idx, 0)], np.nan)
+        out = frame.copy()
+        for j, (feat, src) in enumerate(REL_DIST_SOURCES.items()):
+            out[feat] = rel_dist(out[src].to_numpy(dtype=np.float64), means[:, j])
+        return out
+
+
+# ── 사용 예시 (직접 실행 시) ──────────────────────────────────────────────────
+if __name__ == "__main__":
+    import time
+
+    t0 = time.perf_counter()
+    stats = DistrictStatsIndex.load()
+    t_build = (time.perf_counter() - t0) * 1000
+
+    listing = {"photos_count": 25, "rating_overall": 4.8, "num_reviews": 50, "min_nights": 2}
+    n = 20_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        out = stats.assemble(listing, "Mapo-gu")
+    t_one = (time.perf_counter() - t0) / n * 1e6
+
+    ao = pd.read_csv(Path(__file__).parent / "cluster_listings_ao.csv")
+    t0 = time.perf_counter()
+    batch = stats.assemble_batch(ao)
+    t_batch = (time.perf_counter() - t0) * 1000
+
+    print(f"[자치구 통계 인덱스] 자치구 {len(stats.districts)}개 · 생성 {t_build:.1f} ms")
+    print("  마포구 평균: " + ", ".join(f"{k} {v:.2f}" for k, v in stats.means("Mapo-gu").items()))
+    print("  예시 rel_dist: " + ", ".join(f"{k} {out[k]:.2f}" for k in REL_DIST_SOURCES))
+    print(f"  단건 조립 {t_one:.1f} µs · 배치 {len(batch):,}건 {t_batch:.1f} ms")
+    print("  배치 자치구 평균 검증 (≈1.0): "
+          + ", ".join(f"{batch.groupby('district')[k].mean().mean():.3f}" for k in REL_DIST_SOURCES))
@@ -0,0 +1,382 @@
+"""
+elasticity.py — 시장 유형 × 숙소 유형별 가격 탄력성 추정 (log-log 회귀 + 부트스트랩 CI)
+=======================================================================================
+
+사용법:
+    # 전체 리스팅 → data/processed/elasticity.csv (단계별 소요 시간 출력)
+    python elasticity.py build data/raw/seoul_airbnb_cleaned.csv --bootstrap 400
+
+    # 알려진 탄력성으로 합성한 리스팅으로 복원 정확도·속도 확인 (파일은 쓰지 않음)
+    python elasticity.py bench                            # 합성 데이터면 95% 구간의 실제값 포함 수도 출력
+    python elasticity.py bench data/raw/seoul_airbnb_cleaned.csv
+
+    from elasticity import ElasticityTable
+    table = ElasticityTable.load()                        # 파일이 없으면 빈 테이블
+    row = table.lookup("중가 균형시장", "entire_home")     # dict (elasticity, ci_low, ci_high, n …) 또는 None
+
+모형:
+    Active+Operating 리스팅마다
+        log(예약률) = a + e · log(ADR) + 통제변수 · b + 자치구 고정효과 [+ 숙소 유형 고정효과]
+    를 시장 유형(district_clustered 의 cluster_name) × 숙소 유형 그룹별로 최소제곱 적합합니다.
+    e 가 "요금 1% 변화 → 예약률 e% 변화" 탄력성이고, 앱의 요금 시뮬레이션
+    (예약률 × (1 + e × 요금 변화율)) 에 그대로 들어갑니다.
+    통제변수: 침실·욕실·인원·평점·log 사진 수·log 리뷰 수·log 최소박·슈퍼호스트·즉시예약.
+    같은 시장 유형의 숙소 유형 전체를 묶은 "all" 행 (숙소 유형 고정효과 포함) 도 함께 만들어
+    표본이 적은 숙소 유형의 대체값으로 씁니다.
+
+절단 (Tobit):
+    예약률은 100% 를 넘을 수 없고 1% 미만은 1% 로 올려 쓰므로, 싼 숙소일수록 100% 에 붙어
+    "요금을 내려도 예약률이 안 오르는" 것처럼 보여 최소제곱 e 가 0 쪽으로 치우칩니다.
+    100% / 1% 에 붙은 행은 "그 이상 / 이하" 라는 정보만 쓰는 양쪽 절단 정규 우도 (Tobit) 로
+    적합합니다 — Olsen 모수화 (β/σ, 1/σ) 에서 로그우도가 오목해 Newton 몇 번이면 수렴합니다.
+
+부트스트랩:
+    그룹마다 B 개 재표본을 다항 분포 가중치 행렬 W (B, n) 로 한꺼번에 표현합니다.
+    점추정 θ̂ 에서 행별 도함수를 한 번 구해 두고, 재표본마다 가중 Newton 1단계 (one-step
+    bootstrap) 를 밟습니다. 헤세 행렬 W @ (X ⊗ X · h), 기울기 W @ (X · g) 두 번의 행렬곱과
+    np.linalg.solve 배치 한 번이라 재표본마다 적합을 다시 돌지 않습니다.
+    95% 구간은 재표본 e 의 2.5 / 97.5 백분위입니다.
+
+사용 조건:
+    횡단면 회귀라 숙소 품질이 통제변수로 다 잡히지 않으면 e 가 0 이나 양수로 나올 수 있습니다.
+    표본이 min_n 이상이고 95% 구간 상단이 0 미만인 행만 usable 로 표시하며,
+    lookup() 은 usable 행만 돌려줍니다 (없으면 None → 앱은 CLUSTER_INFO 기본값 사용).
+"""
+
+import argparse
+import hashlib
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.special import log_ndtr
+
+_PKG_DIR = Path(__file__).parent
+ELASTICITY_PATH = _PKG_DIR.parent / "data" / "processed" / "elasticity.csv"
+DISTRICT_CLUSTERED_PATH = _PKG_DIR.parent / "data" / "processed" / "district_clustered.csv"
+
+CONTROL_COLS = ("bedrooms", "baths", "guests", "rating_overall", "photos_count",
+                "num_reviews", "min_nights", "superhost", "instant_book")
+ALL_ROOMS = "all"
+ELASTICITY_CLIP = (-3.0, -0.05)      # 시뮬레이션에 넘기는 값의 허용 범위
+TABLE_COLS = ["cluster_name", "room_type", "n", "elasticity", "ci_low", "ci_high",
+              "se", "r2", "censored", "usable", "version"]
+
+_OCC_FLOOR = 0.01                    # log(0) 방지 — 예약률 1% 미만은 1% 로
+
+
+def _flag(s: pd.Series) -> np.ndarray:
+    """True/False · t/f · 1/0 혼재 컬럼 → 0/1 float."""
+    if s.dtype == bool:
+        return s.to_numpy(dtype=np.float64)
+    return s.astype(str).str.strip().str.lower().isin(("true", "t", "1", "1.0", "yes", "y")).to_numpy(dtype=np.float64)
+
+
+def _controls(df: pd.DataFrame) -> np.ndarray:
+    """통제변수 행렬 (n, k) — 결측은 그룹 중앙값, 열마다 평균 0 으로 중심화."""
+    cols = []
+    for c in CONTROL_COLS:
+        if c not in df.columns:
+            continue
+        if c in ("superhost", "instant_book"):
+            v = _flag(df[c])
+        else:
+            v = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=np.float64)
+            if c in ("photos_count", "num_reviews"):
+                v = np.log1p(np.clip(v, 0, None))
+            elif c == "min_nights":
+                v = np.log(np.clip(v, 1, 30))
+        med = np.nanmedian(v) if np.isfinite(v).any() else 0.0
+        v = np.where(np.isfinite(v), v, med)
+        cols.append(v - v.mean())
+    return np.column_stack(cols) if cols else np.empty((len(df), 0))
+
+
+def _dummies(values: pd.Series) -> np.ndarray:
+    """범주 → 첫 수준을 뺀 0/1 행렬 (수준이 1개면 열 없음)."""
+    codes, levels = pd.factorize(values, sort=True)
+    if len(levels) < 2:
+        return np.empty((len(values), 0))
+    return (codes[:, None] == np.arange(1, len(levels))[None, :]).astype(np.float64)
+
+
+def design(df: pd.DataFrame, room_effects: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """(X, y) — X 의 0열 = 절편, 1열 = log(ADR)."""
+    adr = df["ttm_avg_rate"].to_numpy(dtype=np.float64)
+    occ = df["ttm_occupancy"].to_numpy(dtype=np.float64)
+    parts = [np.ones((len(df), 1)), np.log(adr)[:, None], _controls(df), _dummies(df["district"])]
+    if room_effects:
+        parts.append(_dummies(df["room_type"]))
+    return np.hstack(parts), np.log(np.clip(occ, _OCC_FLOOR, 1.0))
+
+
+def _tobit_terms(X: np.ndarray, y: np.ndarray, theta: np.ndarray, lower: float, upper: float):
+    """행별 로그우도와 (u = x·γ, τ) 에 대한 1·2차 도함수 — Olsen 모수화 θ = (γ, τ) = (β/σ, 1/σ).
+
+    y <= lower 는 아래로, y >= upper 는 위로 절단된 행 (실제 수요는 그 너머) 으로 봅니다.
+    """
+    gamma, tau = theta[:-1], theta[-1]
+    u = X @ gamma
+    lo, hi = y <= lower, y >= upper
+    mid = ~(lo | hi)
+    ll, g_u, g_t = np.empty_like(y), np.empty_like(y), np.empty_like(y)
+    h_uu, h_ut, h_tt = np.empty_like(y), np.empty_like(y), np.empty_like(y)
+
+    r = tau * y[mid] - u[mid]
+    ll[mid] = np.log(tau) - 0.5 * r ** 2 - 0.5 * np.log(2 * np.pi)
+    g_u[mid], g_t[mid] = r, 1 / tau - r * y[mid]
+    h_uu[mid], h_ut[mid], h_tt[mid] = -1.0, y[mid], -1 / tau ** 2 - y[mid] ** 2
+
+    # 절단 행: log Φ(s), s = u - τ·upper (위) / τ·lower - u (아래)
+    for rows, c, sign in ((hi, upper, 1.0), (lo, lower, -1.0)):
+        sc = sign * (u[rows] - tau * c)
+        log_cdf = log_ndtr(sc)
+        lam = np.exp(-0.5 * sc ** 2 - 0.5 * np.log(2 * np.pi) - log_cdf)    # φ(s) / Φ(s)
+        d2 = -lam * (sc + lam)
+        ll[rows] = log_cdf
+        g_u[rows], g_t[rows] = sign * lam, -sign * c * lam
+        h_uu[rows], h_ut[rows], h_tt[rows] = d2, -c * d2, c ** 2 * d2
+    return ll, g_u, g_t, h_uu, h_ut, h_tt
+
+
+def fit_loglog(X: np.ndarray, y: np.ndarray, n_boot: int = 400, rng=None, chunk: int = 128,
+               lower: float = -np.inf, upper: float = np.inf) -> dict:
+    """log-log 회귀 점추정 + 다항 가중치 배치 부트스트랩 (절단 행은 Tobit 우도).
+
+    Parameters
+    ----------
+    X : ndarray (n, p)
+        design() 결과. 1열이 log(ADR).
+    y : ndarray (n,)
+        log(예약률).
+    n_boot : int
+        부트스트랩 재표본 수. 0 이면 구간 없이 점추정만.
+    chunk : int
+        한 번에 만드는 재표본 수 — (chunk, n) 가중치 행렬 메모리 상한.
+    lower, upper : float
+        y 의 절단값 (예약률 하한 / 100%). 이 값에 붙은 행은 "그 이상 / 이하" 로만 씁니다.
+        둘 다 무한대면 보통 최소제곱과 같습니다.
+
+    Returns
+    -------
+    dict with keys: n, elasticity, ci_low, ci_high, se, r2, censored
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    n, p = X.shape
+    beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+    sigma = max(float(np.std(y - X @ beta)), 1e-6)
+    theta = np.append(beta / sigma, 1 / sigma)
+
+    # 점추정: Newton (Olsen 모수화에서 로그우도가 오목) + 단계 절반 줄이기
+    ll = _tobit_terms(X, y, theta, lower, upper)[0].sum()
+    for _ in range(50):
+        _, g_u, g_t, h_uu, h_ut, h_tt = _tobit_terms(X, y, theta, lower, upper)
+        grad = np.append(X.T @ g_u, g_t.sum())
+        hess = np.block([[(X * h_uu[:, None]).T @ X, (X.T @ h_ut)[:, None]],
+                         [(h_ut @ X)[None, :], np.array([[h_tt.sum()]])]])
+        step = np.linalg.solve(hess - np.eye(p + 1) * 1e-10 * n, grad)
+        for _ in range(30):
+            cand = theta - step
+            if cand[-1] > 0 and (cand_ll := _tobit_terms(X, y, cand, lower, upper)[0].sum()) >= ll:
+                break
+            step = step / 2
+        else:
+            break                            # 더 오르지 않음 — 수렴
+        theta, gain, ll = cand, cand_ll - ll, cand_ll
+        if gain < 1e-9 * n:
+            break
+    beta = theta[:-1] / theta[-1]
+    resid = y - X @ beta
+    ss_tot = float(((y - y.mean()) ** 2).sum())
+    r2 = 1.0 - float(resid @ resid) / ss_tot if ss_tot > 0 else 0.0
+
+    # 부트스트랩: 점추정에서 가중 Newton 1단계 (one-step bootstrap). 행별 도함수는 θ̂ 에서 한 번만
+    # 구하므로 재표본 B 개의 헤세 행렬도 W @ (X ⊗ X · h) 행렬곱 한 번입니다.
+    boots = np.empty(0)
+    if n_boot > 0:
+        _, g_u, g_t, h_uu, h_ut, h_tt = _tobit_terms(X, y, theta, lower, upper)
+        xx = (X[:, :, None] * X[:, None, :]).reshape(n, p * p) * h_uu[:, None]
+        xu = X * h_ut[:, None]
+        xg = np.column_stack([X * g_u[:, None], g_t])
+        ridge = np.eye(p + 1) * 1e-8 * n     # 재표본에서 빠진 더미 열로 특이행렬이 되는 것 방지
+        uniform = np.full(n, 1.0 / n)
+        out = []
+        for start in range(0, n_boot, chunk):
+            w = rng.multinomial(n, uniform, size=min(chunk, n_boot - start)).astype(np.float64)
+            hess = np.empty((len(w), p + 1, p + 1))
+            hess[:, :p, :p] = (w @ xx).reshape(-1, p, p)
+            hess[:, :p, p] = hess[:, p, :p] = w @ xu
+            hess[:, p, p] = w @ h_tt
+            th = theta[None, :] - np.linalg.solve(hess - ridge, (w @ xg)[:, :, None])[:, :, 0]
+            out.append(th[:, 1] / th[:, -1])
+        boots = np.concatenate(out)
+
+    lo, hi = np.percentile(boots, (2.5, 97.5)) if len(boots) else (np.nan, np.nan)
+    return {"n": n, "elasticity": float(beta[1]), "ci_low": float(lo), "ci_high": float(hi),
+            "se": float(boots.std(ddof=1)) if len(boots) > 1 else np.nan, "r2": r2,
+            "censored": float(((y <= lower) | (y >= upper)).mean())}
+
+
+def prepare_listings(listings: pd.DataFrame, district: pd.DataFrame) -> pd.DataFrame:
+    """AO 리스팅만 남기고 자치구 → cluster_name 부여, ADR·예약률이 양수인 행만."""
+    df = listings
+    if "refined_status" in df.columns and "operation_status" in df.columns:
+        df = df[(df["refined_status"] == "Active") & (df["operation_status"] == "Operating")]
+    df = df.merge(district[["district", "cluster_name"]], on="district", how="inner")
+    ok = (pd.to_numeric(df["ttm_avg_rate"], errors="coerce") > 0) & (pd.to_numeric(df["ttm_occupancy"], errors="coerce") > 0)
+    return df.loc[ok].reset_index(drop=True)
+
+
+def data_version(df: pd.DataFrame) -> str:
+    """입력 데이터 지문 — 같은 리스팅으로 다시 만들면 같은 값."""
+    h = hashlib.sha1()
+    for c in ("ttm_avg_rate", "ttm_occupancy"):
+        h.update(df[c].to_numpy(dtype=np.float64).tobytes())
+    h.update("|".join(df["cluster_name"].astype(str) + df["room_type"].astype(str)).encode())
+    return h.hexdigest()[:10]
+
+
+def estimate(df: pd.DataFrame, n_boot: int = 400, min_n: int = 150, seed: int = 0,
+             timings: dict | None = None) -> pd.DataFrame:
+    """prepare_listings() 결과 → TABLE_COLS 테이블 (시장 유형 × 숙소 유형 + 시장 유형 전체)."""
+    rng = np.random.default_rng(seed)
+    version = f"{datetime.now():%Y%m%d}-{data_version(df)}"
+    t0 = time.perf_counter()
+    records = []
+    for name, g in df.groupby("cluster_name", sort=True):
+        groups = [(ALL_ROOMS, g, True)] + [(rt, gr, False) for rt, gr in g.groupby("room_type", sort=True)]
+        for room, sub, room_effects in groups:
+            if len(sub) < 30:      # 통제변수·고정효과 수보다 충분히 많아야 함
+                continue
+            X, y = design(sub, room_effects)
+            records.append({"cluster_name": name, "room_type": room,
+                            **fit_loglog(X, y, n_boot, rng, lower=np.log(_OCC_FLOOR), upper=0.0)})
+    if timings is not None:
+        timings["fit_ms"] = (time.perf_counter() - t0) * 1000
+    out = pd.DataFrame(records, columns=TABLE_COLS[:-2])
+    out["usable"] = (out["n"] >= min_n) & (out["ci_high"] < 0)
+    out["version"] = version
+    return out
+
+
+class ElasticityTable:
+    """(cluster_name, room_type) → 탄력성 행. 숙소 유형 행이 없거나 못 쓰면 시장 유형 전체 행."""
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table.reset_index(drop=True)
+        ok = self.table[self.table["usable"].astype(bool)] if len(self.table) else self.table
+        self._rows = {(r["cluster_name"], r["room_type"]): r for r in ok.to_dict("records")}
+
+    @property
+    def version(self) -> str | None:
+        return str(self.table["version"].iloc[0]) if len(self.table) else None
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> "ElasticityTable":
+        p = Path(path) if path else ELASTICITY_PATH
+        if not p.exists():
+            return cls(pd.DataFrame(columns=TABLE_COLS))
+        return cls(pd.read_csv(p, encoding="utf-8"))
+
+    def save(self, path: str | Path | None = None) -> Path:
+        p = Path(path) if path else ELASTICITY_PATH
+        tmp = p.with_suffix(p.suffix + ".tmp")
+        self.table.to_csv(tmp, index=False, encoding="utf-8", float_format="%.4f")
+        tmp.replace(p)
+        return p
+
+    def lookup(self, cluster_name: str, room_type: str) -> dict | None:
+        """usable 행 dict — 없으면 None.
+
+        elasticity · ci_low · ci_high 는 ELASTICITY_CLIP 으로 절단한 값이고, 절단 전 추정값은
+        raw_elasticity, 점추정이 범위 밖이었는지는 clipped 입니다.
+        """
+        row = self._rows.get((cluster_name, room_type)) or self._rows.get((cluster_name, ALL_ROOMS))
+        if row is None:
+            return None
+        e = float(np.clip(row["elasticity"], *ELASTICITY_CLIP))
+        return {**row, "elasticity": e, "raw_elasticity": float(row["elasticity"]),
+                "clipped": e != row["elasticity"],
+                "ci_low": float(np.clip(row["ci_low"], *ELASTICITY_CLIP)),
+                "ci_high": float(np.clip(row["ci_high"], *ELASTICITY_CLIP))}
+
+
+def synthetic_listings(n: int = 32_000, seed: int = 0) -> tuple[pd.DataFrame, dict]:
+    """알려진 탄력성으로 합성한 AO 리스팅 + {(cluster_name, room_type): 실제 e}."""
+    rng = np.random.default_rng(seed)
+    names = ["프리미엄 관광거점", "성장형 주거상권", "중가 균형시장", "가격민감 외곽형"]
+    rooms = ["entire_home", "private_room", "hotel_room", "shared_room"]
+    base_e = dict(zip(names, (-0.7, -0.8, -1.1, -1.5)))
+    room_shift = dict(zip(rooms, (0.0, -0.2, 0.1, -0.3)))
+    cluster = rng.integers(0, 4, n)
+    room = rng.choice(4, n, p=(0.6, 0.3, 0.05, 0.05))
+    district = np.array([f"D{c}-{k}" for c, k in zip(cluster, rng.integers(0, 6, n))])
+    bedrooms = rng.integers(0, 5, n)
+    photos = rng.integers(1, 80, n)
+    quality = 0.15 * bedrooms + 0.1 * np.log1p(photos)
+    log_adr = 11.2 + quality + rng.normal(0, 0.45, n)
+    e = np.array([base_e[names[c]] + room_shift[rooms[r]] for c, r in zip(cluster, room)])
+    log_occ = -0.9 + e * (log_adr - 11.4) + 0.5 * quality + rng.normal(0, 0.35, n)
+    df = pd.DataFrame({
+        "district": district, "cluster_name": np.array(names)[cluster], "room_type": np.array(rooms)[room],
+        "ttm_avg_rate": np.exp(log_adr), "ttm_occupancy": np.clip(np.exp(log_occ), 0.005, 1.0),
+        "bedrooms": bedrooms, "baths": 1 + bedrooms // 2, "guests": 2 + bedrooms,
+        "rating_overall": rng.uniform(4.0, 5.0, n), "photos_count": photos,
+        "num_reviews": rng.integers(0, 300, n), "min_nights": rng.integers(1, 7, n),
+        "superhost": rng.random(n) < 0.3, "instant_book": rng.random(n) < 0.5,
+    })
+    truth = {(nm, rt): base_e[nm] + room_shift[rt] for nm in names for rt in rooms}
+    return df, truth
+
+
+# ── CLI / 벤치마크 (직접 실행 시) ─────────────────────────────────────────────
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="시장 유형 × 숙소 유형별 가격 탄력성 추정")
+    ap.add_argument("command", choices=("build", "bench"))
+    ap.add_argument("listings", nargs="?", help="data/raw/seoul_airbnb_cleaned.csv (bench 는 생략 시 합성 데이터)")
+    ap.add_argument("--bootstrap", type=int, default=400)
+    ap.add_argument("--min-n", type=int, default=150)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--district", default=str(DISTRICT_CLUSTERED_PATH))
+    ap.add_argument("--out", default=str(ELASTICITY_PATH))
+    args = ap.parse_args(argv)
+    if args.command == "build" and not args.listings:
+        ap.error("build 에는 리스팅 CSV 경로가 필요합니다.")
+
+    t0 = time.perf_counter()
+    truth = None
+    if args.listings:
+        usecols = {"district", "room_type", "refined_status", "operation_status",
+                   "ttm_avg_rate", "ttm_occupancy", *CONTROL_COLS}
+        raw = pd.read_csv(args.listings, usecols=lambda c: c in usecols)
+        df = prepare_listings(raw, pd.read_csv(args.district, encoding="utf-8-sig"))
+    else:
+        df, truth = synthetic_listings(seed=args.seed)
+    print(f"[탄력성] AO 리스팅 {len(df):,}행 준비 {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    timings = {}
+    table = estimate(df, args.bootstrap, args.min_n, args.seed, timings)
+    print(f"  그룹 {len(table)}개 · 부트스트랩 {args.bootstrap}회 적합 {timings['fit_ms'] / 1000:.2f} s "
+          f"· usable {int(table['usable'].sum())}개 · version {table['version'].iloc[0]}")
+    covered = []
+    for _, r in table.iterrows():
+        real = ""
+        if truth and r["room_type"] != ALL_ROOMS:
+            e_true = truth[(r["cluster_name"], r["room_type"])]
+            covered.append(r["ci_low"] <= e_true <= r["ci_high"])
+            real = f"  (실제 {e_true:+.2f}{'' if covered[-1] else ' 구간 밖'})"
+        print(f"    {r['cluster_name']:10s} {r['room_type']:13s} n={r['n']:6,d}  e={r['elasticity']:+.2f} "
+              f"[{r['ci_low']:+.2f}, {r['ci_high']:+.2f}]  R²={r['r2']:.2f}  절단 {r['censored']:.0%}"
+              f"{'' if r['usable'] else '  ✗'}{real}")
+    if covered:
+        print(f"  95% 구간이 실제 탄력성을 포함: {sum(covered)}/{len(covered)}")
+
+    if args.command == "build":
+        p = ElasticityTable(table).save(args.out)
+        print(f"  → {p}")
+
+
+if __name__ == "__main__":
+    _main()
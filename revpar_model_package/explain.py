@@ -0,0 +1,259 @@
+"""
+explain.py — AI 예측 근거 (LightGBM TreeSHAP 피처 기여도)
+=========================================================
+
+사용법:
+    from explain import explain_listing, explain_batch
+
+    exp = explain_listing(listing, **artifacts)       # 단건 — UI 카테고리별 기여도 dict
+    exp["adr_pct"]        # {"location": +0.08, ...}  ADR 에 대한 배율 효과 (exp(φ) - 1)
+    exp["occ_pp"]         # {"booking_policy": -0.04, ...}  예약률 기여 (0~1 스케일)
+    exp["drags"]          # 예측을 가장 많이 끌어내리는 피처 [(모델, 피처, 효과), ...]
+
+    portfolio = explain_batch(frame, **artifacts)     # 배치 — 행마다 카테고리 기여도 컬럼
+
+기여도는 booster_.predict(pred_contrib=True) 가 돌려주는 TreeSHAP 값이며,
+행마다 (기준값 + 피처 기여도 합) 이 원래 예측과 정확히 같습니다.
+    Model A (ADR)  : log1p(ADR) 스케일 → 카테고리 합 φ 를 exp(φ) - 1 (% 효과)로 표시
+    Model B (예약률): 예약률 스케일 그대로 (%p)
+
+카테고리는 헬스 스코어 5개 컴포넌트에 시장(자치구·클러스터)·요금 차이를 더한 7개입니다.
+입력 인코딩·rel_dist 기본값·price_gap_oof 계산은 predict_revpar_batch 와 같습니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from predict_utils import _REL_DIST_COLS, _encode_frame
+
+# 피처 → UI 카테고리 (헬스 스코어 components 키 + market / price)
+FEATURE_CATEGORIES = {
+    # 리뷰 신호
+    "rating_overall": "review_signal", "num_reviews": "review_signal", "superhost": "review_signal",
+    "rating_rel_dist": "review_signal", "reviews_rel_dist": "review_signal",
+    # 사진 품질
+    "photos_count": "listing_quality", "photos_tier": "listing_quality", "photos_rel_dist": "listing_quality",
+    # 예약 정책
+    "min_nights": "booking_policy", "instant_book": "booking_policy",
+    "extra_guest_fee_policy": "booking_policy", "min_nights_rel_dist": "booking_policy",
+    # 위치
+    "nearest_poi_dist_km": "location", "poi_dist_category": "location", "nearest_poi_type_name": "location",
+    # 숙소 구성
+    "bedrooms": "listing_config", "baths": "listing_config", "guests": "listing_config",
+    "room_type": "listing_config",
+    # 시장 (자치구·클러스터 — 호스트가 바꿀 수 없는 값)
+    "cluster": "market", "district_median_revpar": "market", "district_listing_count": "market",
+    "district_superhost_rate": "market", "district_entire_home_rate": "market", "ttm_pop": "market",
+    "is_active_operating": "market",
+    # 요금 차이 (내 요금 - 시장 적정 ADR)
+    "price_gap_oof": "price",
+}
+
+CATEGORY_LABELS = {
+    "review_signal": "리뷰 신호", "listing_quality": "사진 품질", "booking_policy": "예약 정책",
+    "location": "위치", "listing_config": "숙소 구성", "market": "시장·자치구", "price": "요금 수준",
+}
+
+FEATURE_LABELS = {
+    "rating_overall": "평점", "num_reviews": "리뷰 수", "superhost": "슈퍼호스트",
+    "rating_rel_dist": "자치구 대비 평점", "reviews_rel_dist": "자치구 대비 리뷰 수",
+    "photos_count": "사진 수", "photos_tier": "사진 구간", "photos_rel_dist": "자치구 대비 사진 수",
+    "min_nights": "최소 숙박일", "instant_book": "즉시예약", "extra_guest_fee_policy": "추가 게스트 요금",
+    "min_nights_rel_dist": "자치구 대비 최소박", "nearest_poi_dist_km": "관광지 거리",
+    "poi_dist_category": "관광지 거리 구간", "nearest_poi_type_name": "가까운 관광지 유형",
+    "bedrooms": "침실 수", "baths": "욕실 수", "guests": "최대 인원", "room_type": "숙소 유형",
+    "cluster": "상권 클러스터", "district_median_revpar": "자치구 RevPAR 수준",
+    "district_listing_count": "자치구 경쟁 숙소 수", "district_superhost_rate": "자치구 슈퍼호스트 비율",
+    "district_entire_home_rate": "자치구 집 전체 비율", "ttm_pop": "자치구 인구",
+    "is_active_operating": "운영 상태", "price_gap_oof": "시장 대비 내 요금",
+}
+
+# 호스트가 바꿀 수 있는 카테고리 (drags 후보)
+ACTIONABLE = ("review_signal", "listing_quality", "booking_policy", "price")
+
+
+def _category_matrix(features) -> np.ndarray:
+    """(피처 수 + 1, 카테고리 수) 0/1 행렬 — 기여도 @ 행렬 = 카테고리 합 (마지막 base 행은 0)."""
+    cats = list(CATEGORY_LABELS)
+    m = np.zeros((len(features) + 1, len(cats)))
+    for i, f in enumerate(features):
+        m[i, cats.index(FEATURE_CATEGORIES[f])] = 1.0
+    return m
+
+
+def _contrib_arrays(X_a, X_b_base, ttm_avg_rate, model_A, model_B):
+    """인코딩된 피처 배열 → (phi_a, phi_b). 마지막 열이 기준값."""
+    phi_a = model_A.booster_.predict(X_a, pred_contrib=True)
+    adr_pred = np.expm1(phi_a.sum(axis=1))  # 기여도 합 = 원래 예측 (predict 재호출 불필요)
+    ttm = np.where(np.isnan(ttm_avg_rate), adr_pred, ttm_avg_rate)
+    phi_b = model_B.booster_.predict(np.column_stack([X_b_base, ttm - adr_pred]), pred_contrib=True)
+    return phi_a, phi_b
+
+
+def _listing_row(listing_features: dict, features, class_index: dict) -> np.ndarray:
+    """listing dict → 인코딩된 1행 배열 (DataFrame 생성 없이; unseen → -1, rel_dist 기본 1.0)."""
+    row = []
+    for f in features:
+        v = listing_features.get(f, 1.0 if f in _REL_DIST_COLS else None)
+        if f in class_index:
+            v = class_index[f].get(str(v), -1)
+        row.append(np.nan if v is None else v)
+    return np.array([row], dtype=np.float64)
+
+
+def feature_contributions(
+    listings: pd.DataFrame,
+    *,
+    model_A,
+    model_B,
+    iso_reg=None,
+    encoders: dict,
+    feature_config: dict,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Model A·B 의 피처별 TreeSHAP 기여도 (booster 호출 2회).
+
+    Returns
+    -------
+    (adr_contrib, occ_contrib) : pd.DataFrame 2개 (listings 와 같은 index)
+        컬럼 = 모델 피처 + "base" (기준값). 행 합계 = log1p(ADR) / 예약률(클립 전).
+    """
+    FEATURES_A = feature_config["FEATURES_A"]
+    FEATURES_B_BASE = feature_config["FEATURES_B_BASE"]
+
+    rows = _encode_frame(listings, encoders)
+    for col in _REL_DIST_COLS:
+        rows[col] = rows[col].fillna(1.0) if col in rows.columns else 1.0
+    ttm = (rows["ttm_avg_rate"].to_numpy(dtype=np.float64) if "ttm_avg_rate" in rows.columns
+           else np.full(len(rows), np.nan))
+
+    phi_a, phi_b = _contrib_arrays(rows[FEATURES_A].to_numpy(dtype=np.float64),
+                                   rows[FEATURES_B_BASE].to_numpy(dtype=np.float64), ttm, model_A, model_B)
+    adr = pd.DataFrame(phi_a, index=listings.index, columns=[*FEATURES_A, "base"])
+    occ = pd.DataFrame(phi_b, index=listings.index, columns=[*FEATURES_B_BASE, "price_gap_oof", "base"])
+    return adr, occ
+
+
+def aggregate_categories(contrib: pd.DataFrame) -> pd.DataFrame:
+    """피처 기여도 → CATEGORY_LABELS 순서의 카테고리 합 (해당 피처가 없는 카테고리는 0)."""
+    m = _category_matrix(contrib.columns[:-1])
+    return pd.DataFrame(contrib.to_numpy() @ m, index=contrib.index, columns=list(CATEGORY_LABELS))
+
+
+def explain_batch(listings: pd.DataFrame, **artifacts) -> pd.DataFrame:
+    """포트폴리오 일괄 설명 — 행마다 adr_<카테고리> (% 효과), occ_<카테고리> (예약률 기여) 컬럼.
+
+    TreeSHAP 은 예측보다 수백 배 무거워 (1코어 기준 행당 수 ms) LightGBM 이 행 단위로
+    멀티스레드 분산합니다. 화면 렌더링 경로에서는 explain_listing 을 쓰세요.
+    """
+    adr, occ = feature_contributions(listings, **artifacts)
+    out = pd.concat([np.expm1(aggregate_categories(adr)).add_prefix("adr_"),
+                     aggregate_categories(occ).add_prefix("occ_")], axis=1)
+    out["ADR_base"] = np.expm1(adr["base"])
+    out["Occ_base"] = occ["base"]
+    return out
+
+
+def explain_listing(listing_features: dict, top_n: int = 3, *, model_A, model_B, iso_reg=None,
+                    encoders: dict, feature_config: dict) -> dict:
+    """단건 설명 (app.py AI 예측 근거 카드용). DataFrame 을 만들지 않는 빠른 경로.
+
+    Returns
+    -------
+    dict with keys:
+        adr_base  : float — 학습 데이터 평균 기준 ADR (원)
+        occ_base  : float — 기준 예약률 (0~1)
+        adr_pct   : dict  — 카테고리 → ADR 배율 효과 (0.08 = +8%)
+        occ_pp    : dict  — 카테고리 → 예약률 기여 (0.03 = +3%p)
+        drags     : list[(str, str, float)] — 바꿀 수 있는 피처 중 가장 크게 끌어내리는 top_n
+                    ("adr", 피처, % 효과) 또는 ("occ", 피처, %p 기여)
+    """
+    FEATURES_A = feature_config["FEATURES_A"]
+    FEATURES_B_BASE = feature_config["FEATURES_B_BASE"]
+    class_index = {col: {c: i for i, c in enumerate(le.classes_)} for col, le in encoders.items()}
+
+    ttm = listing_features.get("ttm_avg_rate")
+    phi_a, phi_b = _contrib_arrays(
+        _listing_row(listing_features, FEATURES_A, class_index),
+        _listing_row(listing_features, FEATURES_B_BASE, class_index),
+        np.array([np.nan if ttm is None else ttm], dtype=np.float64), model_A, model_B,
+    )
+    phi_a, phi_b = phi_a[0], phi_b[0]
+    features_b = [*FEATURES_B_BASE, "price_gap_oof"]
+    cats = list(CATEGORY_LABELS)
+
+    # ADR 은 % 효과, 예약률은 %p — 같은 척도(RevPAR 배율)로 비교해 순위를 매김
+    occ_total = max(float(phi_b.sum()), 1e-3)
+    candidates = [("adr", f, float(np.expm1(v)), float(np.expm1(v))) for f, v in zip(FEATURES_A, phi_a)]
+    candidates += [("occ", f, float(v), float(v) / occ_total) for f, v in zip(features_b, phi_b)]
+    drags = sorted(
+        (c for c in candidates if c[3] < 0 and FEATURE_CATEGORIES[c[1]] in ACTIONABLE),
+        key=lambda c: c[3],
+    )[:top_n]
+
+    return {
+        "adr_base": float(np.expm1(phi_a[-1])),
+        "occ_base": float(phi_b[-1]),
+        "adr_pct": dict(zip(cats, np.expm1(phi_a @ _category_matrix(FEATURES_A)).tolist())),
+        "occ_pp": dict(zip(cats, (phi_b @ _category_matrix(features_b)).tolist())),
+        "drags": [(m, f, v) for m, f, v, _ in drags],
+    }
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+if __name__ == "__main__":
+    import time
+    import warnings
+    from pathlib import Path
+
+    from predict_utils import load_models, predict_revpar_batch
+
+    warnings.filterwarnings("ignore")  # pkl 저장 당시 sklearn 버전 경고
+    artifacts = load_models()
+
+    example = {
+        "cluster": 2, "nearest_poi_dist_km": 0.5, "poi_dist_category": "보통",
+        "bedrooms": 2, "baths": 1, "guests": 4, "room_type": "entire_home",
+        "nearest_poi_type_name": "관광지", "district_median_revpar": 50000,
+        "district_listing_count": 800, "district_superhost_rate": 0.25,
+        "district_entire_home_rate": 0.70, "ttm_pop": 100000,
+        "min_nights": 5, "instant_book": 0, "superhost": 0, "rating_overall": 4.6,
+        "photos_count": 12, "num_reviews": 20, "extra_guest_fee_policy": "1",
+        "photos_tier": "하", "is_active_operating": 1, "ttm_avg_rate": 110000,
+    }
+
+    explain_listing(example, **artifacts)
+    n = 200
+    t0 = time.perf_counter()
+    for _ in range(n):
+        exp = explain_listing(example, **artifacts)
+    t_one = (time.perf_counter() - t0) / n * 1000
+
+    # 포트폴리오 — 실데이터 운영 지표 + 예시 숙소의 시장·구성 피처
+    ao = pd.read_csv(Path(__file__).parent / "cluster_listings_ao.csv")
+    frame = pd.DataFrame([example] * len(ao))
+    for c in ("cluster", "num_reviews", "rating_overall", "photos_count", "min_nights",
+              "nearest_poi_dist_km", "bedrooms", "baths"):
+        frame[c] = ao[c].to_numpy()
+    frame["instant_book"] = ao["instant_book"].astype(int).to_numpy()
+    frame = frame.head(2_000)
+    t0 = time.perf_counter()
+    portfolio = explain_batch(frame, **artifacts)
+    t_batch = (time.perf_counter() - t0) * 1000
+
+    # 기여도 합 = 원래 예측 검증 + 단건 경로 = 배치 경로 검증
+    adr, occ = feature_contributions(frame, **artifacts)
+    pred = predict_revpar_batch(frame, **artifacts)
+    one = explain_listing(frame.iloc[7].to_dict(), **artifacts)
+    err_1 = max(abs(one["adr_pct"][c] - portfolio[f"adr_{c}"].iloc[7]) for c in CATEGORY_LABELS)
+    err_a = float(np.max(np.abs(np.expm1(adr.sum(axis=1)) - pred["ADR_pred"]) / pred["ADR_pred"]))
+    err_b = float(np.max(np.abs(np.clip(occ.sum(axis=1), 0, 1) - pred["Occ_pred"])))
+
+    print(f"[예측 근거] 기준 ADR ₩{exp['adr_base']:,.0f} · 기준 예약률 {exp['occ_base']:.1%}")
+    for cat, label in CATEGORY_LABELS.items():
+        print(f"  {label:8s} ADR {exp['adr_pct'][cat]:+7.1%}   예약률 {exp['occ_pp'][cat] * 100:+6.1f}%p")
+    print("  끌어내리는 요인: " + ", ".join(
+        f"{FEATURE_LABELS[f]} ({v:+.1%})" if m == "adr" else f"{FEATURE_LABELS[f]} ({v * 100:+.1f}%p)"
+        for m, f, v in exp["drags"]))
+    print(f"  단건 {t_one:.2f} ms · 배치 {len(frame):,}건 {t_batch:.0f} ms "
+          f"({t_batch / len(frame) * 1000:.0f} µs/건)")
+    print(f"  합계 검증: ADR 상대오차 {err_a:.1e} · 예약률 오차 {err_b:.1e} · 단건=배치 {err_1:.1e}")
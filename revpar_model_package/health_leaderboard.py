@@ -0,0 +1,162 @@
+"""
+health_leaderboard.py — 헬스스코어 순위표 (클러스터 · 자치구별 정렬된 종합 점수)
+==========================================================================
+
+사용법:
+    # cluster_listings_ao.csv 전체를 배치 채점 → data/processed/health_leaderboard.csv
+    python health_leaderboard.py build
+
+    # 전체 채점 시간 · 스칼라 compute_health_score 대비 · 순위 조회 지연 (파일은 쓰지 않음)
+    python health_leaderboard.py bench
+    # 배치 == 스칼라 일치는 tests/test_health_leaderboard.py 가 검사합니다
+
+    from health_leaderboard import HealthLeaderboard
+    board = HealthLeaderboard.load()                      # 파일이 없으면 None
+    board = HealthLeaderboard.from_listings(ao)           # 또는 AO 프레임에서 바로
+    board.rank(72.4, cluster=2, district="Mapo-gu")
+    # {"cluster": {"n": 1905, "rank": 311, "top_pct": 16.3}, "district": {...}}
+
+채점:
+    AO 리스팅마다 자기 클러스터를 비교 집단으로 compute_health_score_batch (predict_utils) 를 적용합니다.
+    컬럼마다 클러스터별로 한 번 정렬한 뒤 searchsorted 로 백분위를 구하므로 전체가 O(n log n) 이고,
+    결과는 리스팅별 compute_health_score 와 같습니다 (반올림 포함).
+
+순위:
+    (scope, key) 마다 종합 점수를 오름차순 정렬해 보관합니다 — scope 는 cluster / district.
+    rank = (내 점수보다 높은 리스팅 수) + 1 을 이진 탐색 한 번 (O(log n)) 으로 구하고,
+    상위 % = rank / n × 100 입니다 (동점은 같은 순위, 최하위 밖이면 100%).
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from predict_utils import HEALTH_COMPONENTS, compute_health_score, compute_health_score_batch
+
+_PKG_DIR = Path(__file__).parent
+AO_PATH = _PKG_DIR / "cluster_listings_ao.csv"
+LEADERBOARD_PATH = _PKG_DIR.parent / "data" / "processed" / "health_leaderboard.csv"
+SCOPES = ("cluster", "district")
+TABLE_COLS = ["scope", "key", "composite"]
+
+
+def scalar_inputs(row) -> dict:
+    """AO 행 → compute_health_score 의 user_vals dict (배치 결과와 비교할 때 같은 입력)."""
+    return {
+        "my_reviews": row["num_reviews"], "my_rating": row["rating_overall"], "my_photos": row["photos_count"],
+        "my_instant": bool(row["instant_book"]), "my_min_nights": row["min_nights"],
+        "my_extra_fee": bool(row["extra_guest_fee_policy"]), "my_poi_dist": row["nearest_poi_dist_km"],
+        "my_bedrooms": row["bedrooms"], "my_baths": row["baths"],
+    }
+
+
+def score_listings(ao: pd.DataFrame) -> pd.DataFrame:
+    """AO 리스팅 전체를 자기 클러스터 기준으로 채점 — ao 컬럼 + 5개 컴포넌트 · composite · grade."""
+    return ao.join(compute_health_score_batch(ao, ao, group_col="cluster"))
+
+
+class HealthLeaderboard:
+    """(scope, key) → 오름차순 정렬된 종합 점수 배열."""
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table.reset_index(drop=True)
+        self._sorted = {
+            (scope, str(key)): np.sort(g.to_numpy(dtype=np.float64))
+            for (scope, key), g in self.table.groupby(["scope", "key"], sort=False)["composite"]
+        }
+
+    @classmethod
+    def from_scores(cls, scores: pd.DataFrame) -> "HealthLeaderboard":
+        parts = [pd.DataFrame({"scope": scope, "key": scores[scope].astype(str), "composite": scores["composite"]})
+                 for scope in SCOPES if scope in scores.columns]
+        return cls(pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=TABLE_COLS))
+
+    @classmethod
+    def from_listings(cls, ao: pd.DataFrame) -> "HealthLeaderboard":
+        return cls.from_scores(score_listings(ao))
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> "HealthLeaderboard | None":
+        p = Path(path) if path else LEADERBOARD_PATH
+        if not p.exists():
+            return None
+        return cls(pd.read_csv(p, encoding="utf-8", dtype={"key": str}))
+
+    def save(self, path: str | Path | None = None) -> Path:
+        p = Path(path) if path else LEADERBOARD_PATH
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(p.suffix + ".tmp")
+        self.table.sort_values(TABLE_COLS).to_csv(tmp, index=False, encoding="utf-8", float_format="%.1f")
+        tmp.replace(p)
+        return p
+
+    def rank(self, composite: float, **keys) -> dict:
+        """scope=key 마다 {"n", "rank", "top_pct"} — 순위표에 없는 scope 는 빠집니다."""
+        out = {}
+        for scope, key in keys.items():
+            arr = self._sorted.get((scope, str(key)))
+            if arr is None or len(arr) == 0:
+                continue
+            n = len(arr)
+            rank = n - int(np.searchsorted(arr, composite, side="right")) + 1
+            out[scope] = {"n": n, "rank": rank, "top_pct": min(100.0, 100.0 * rank / n)}
+        return out
+
+
+# ── 배치 생성 / 벤치마크 (직접 실행 시) ───────────────────────────────────────
+def _main(argv=None):
+    ap = argparse.ArgumentParser(description="헬스스코어 순위표 배치 생성")
+    ap.add_argument("command", choices=("build", "bench"))
+    ap.add_argument("--ao", default=str(AO_PATH))
+    ap.add_argument("--out", default=str(LEADERBOARD_PATH))
+    ap.add_argument("--sample", type=int, default=300, help="bench: 스칼라 비교 표본 수")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    ao = pd.read_csv(args.ao)
+    t_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    scores = score_listings(ao)
+    t_score = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    board = HealthLeaderboard.from_scores(scores)
+    t_sort = time.perf_counter() - t0
+    print(f"[헬스 순위표] AO 리스팅 {len(ao):,}행 · 읽기 {t_load * 1000:.0f} ms · "
+          f"배치 채점 {t_score * 1000:.0f} ms · 정렬 {t_sort * 1000:.0f} ms")
+    for c, g in scores.groupby("cluster"):
+        print(f"    cluster {c}  n={len(g):6,d}  composite p25/p50/p75 = "
+              f"{g['composite'].quantile(0.25):.1f} / {g['composite'].median():.1f} / {g['composite'].quantile(0.75):.1f}"
+              f"  A~F {'/'.join(str((g['grade'] == x).sum()) for x in 'ABCDF')}")
+
+    if args.command == "build":
+        print(f"  → {board.save(args.out)}")
+        return
+
+    # 스칼라 compute_health_score 와 값 · 시간 비교 (표본)
+    rng = np.random.default_rng(0)
+    idx = rng.choice(len(ao), min(args.sample, len(ao)), replace=False)
+    peers = {c: g for c, g in ao.groupby("cluster")}
+    t0 = time.perf_counter()
+    mismatch = 0
+    for i in idx:
+        r = ao.iloc[i]
+        h = compute_health_score(scalar_inputs(r), peers[r["cluster"]])
+        row = scores.iloc[i]
+        mismatch += (h["composite"] != row["composite"] or h["grade"] != row["grade"]
+                     or any(h["components"][k] != row[k] for k in HEALTH_COMPONENTS))
+    per_row = (time.perf_counter() - t0) / len(idx)
+    print(f"  스칼라 compute_health_score {per_row * 1000:.2f} ms/행 → 전체 환산 {per_row * len(ao):.1f} s "
+          f"(배치 대비 {per_row * len(ao) / t_score:,.0f}배) · 불일치 {mismatch}/{len(idx)}")
+
+    q = rng.uniform(0, 100, 10_000)
+    t0 = time.perf_counter()
+    for v in q:
+        board.rank(v, cluster=3, district="Jongno-gu")
+    print(f"  rank() 조회 {(time.perf_counter() - t0) / len(q) * 1e6:.1f} µs/회 (클러스터 + 자치구)")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,199 @@
+"""
+lever_optimizer.py — 운영 레버 What-if 최적화
+=============================================
+
+사용법:
+    from predict_utils import load_models
+    from lever_optimizer import optimize_levers
+
+    artifacts = load_models()
+    top = optimize_levers(listing, opex_per_month=500_000, top_k=5, **artifacts)
+
+호스트가 직접 바꿀 수 있는 운영 레버 조합을 모두 나열해
+Model B(예약률) 1회 배치 호출로 채점하고, 월 순이익 증가분이 큰 순서로 반환합니다.
+
+레버 그리드:
+    instant_book            : 0 | 1
+    min_nights              : 1, 2, 3 + 현재값
+    photos_count            : 현재값 + 23, 29, 35  (photos_tier 자동 계산)
+    extra_guest_fee_policy  : '0' | '1'
+    ADR                     : 현재 요금 × (1 + -30% ~ +50%, 5% 간격 — app.py 요금 시뮬레이션과 같은 구간)
+
+결과 정리:
+    트리 모델과 등위 보정은 일부 레버에 반응하지 않아 월 순이익이 같은 조합이 여러 개 나옵니다.
+    순이익이 같으면 바꿀 레버가 가장 적은 조합 1개만 남깁니다.
+    최적 요금이 그리드 끝 (-30% / +50%) 이면 adr_at_edge 로 표시합니다 — 더 바깥이 나을 수 있지만
+    현재 요금에서 멀수록 모델이 외삽하는 구간이라 그리드를 더 넓히지 않습니다.
+
+Model A(ADR) 입력에는 레버가 없으므로 시장 적정 ADR은 1번만 예측합니다.
+순이익 = 보정 RevPAR × 30 × (1 - 수수료 3%) - 월 운영비  (app.py 요금 시뮬레이션과 동일)
+"""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from district_stats import REL_DIST_SOURCES, rel_dist
+from predict_utils import _encode_frame, _REL_DIST_COLS, get_photos_tier
+
+AIRBNB_FEE_RATE = 0.03
+
+INSTANT_BOOK_GRID = (0, 1)
+MIN_NIGHTS_GRID = (1, 2, 3)
+PHOTOS_GRID = (23, 29, 35)
+EXTRA_FEE_GRID = ("0", "1")
+ADR_DELTA_GRID = tuple(np.round(np.arange(-0.30, 0.501, 0.05), 2))
+
+LEVER_COLS = ["instant_book", "min_nights", "photos_count", "extra_guest_fee_policy", "adr_delta"]
+
+
+def build_lever_grid(listing_features: dict) -> pd.DataFrame:
+    """현재 리스팅 값을 포함하는 레버 조합 전체를 DataFrame으로 생성합니다."""
+    min_nights = sorted({int(listing_features["min_nights"]), *MIN_NIGHTS_GRID})
+    photos = sorted({int(listing_features["photos_count"]), *PHOTOS_GRID})
+    grid = pd.DataFrame(
+        list(product(INSTANT_BOOK_GRID, min_nights, photos, EXTRA_FEE_GRID, ADR_DELTA_GRID)),
+        columns=LEVER_COLS,
+    )
+    grid["photos_tier"] = grid["photos_count"].map(get_photos_tier)
+    return grid
+
+
+def optimize_levers(
+    listing_features: dict,
+    opex_per_month: float,
+    top_k: int = 5,
+    *,
+    rel_dist_means: dict | None = None,
+    model_A,
+    model_B,
+    iso_reg,
+    encoders: dict,
+    feature_config: dict,
+) -> pd.DataFrame:
+    """레버 조합별 월 순이익을 배치 예측해 상위 top_k 조합을 반환합니다.
+
+    Parameters
+    ----------
+    listing_features : dict
+        predict_revpar 와 같은 입력 dict (app.py step5 의 _listing).
+        ttm_avg_rate 가 현재 1박 요금으로 사용됩니다 (없으면 ADR 예측값).
+    opex_per_month : float
+        월 운영비 합계 (원).
+    top_k : int
+        반환할 조합 수.
+    rel_dist_means : dict | None
+        DistrictStatsIndex.means(자치구) — 주면 조합마다 사진 수·최소박의
+        *_rel_dist 를 다시 계산합니다. None 이면 입력 dict 의 값(없으면 1.0) 고정.
+    **artifacts
+        load_models() 반환값을 그대로 언패킹해서 전달.
+
+    Returns
+    -------
+    pd.DataFrame (gain 내림차순, 최대 top_k 행, 월 순이익이 서로 다른 조합만) with columns:
+        instant_book, min_nights, photos_count, photos_tier,
+        extra_guest_fee_policy, adr_delta, adr, occ, revpar, net_profit,
+        gain, n_changes, adr_at_edge
+        gain = 현재 레버 조합 대비 월 순이익 증가분 (원)
+        n_changes = 현재 대비 바뀌는 레버 수 (순이익이 같은 조합 중 가장 적은 것만 남김)
+        adr_at_edge = 요금 변화가 ADR_DELTA_GRID 의 끝값인지
+    """
+    FEATURES_A = feature_config["FEATURES_A"]
+    FEATURES_B_BASE = feature_config["FEATURES_B_BASE"]
+
+    base = pd.DataFrame([listing_features])
+    for col in _REL_DIST_COLS:
+        if col not in base.columns:
+            base[col] = 1.0
+
+    # ── Model A: 레버와 무관 → 1회 예측 ─────────────────────────────────────
+    adr_pred = float(np.expm1(model_A.predict(_encode_frame(base, encoders)[FEATURES_A])[0]))
+    cur_adr = float(listing_features.get("ttm_avg_rate") or adr_pred)
+
+    # ── 레버 그리드 구성 ───────────────────────────────────────────────────
+    grid = build_lever_grid(listing_features)
+    rows = base.loc[base.index.repeat(len(grid))].reset_index(drop=True)
+    for col in ("instant_book", "min_nights", "photos_count", "photos_tier", "extra_guest_fee_policy"):
+        rows[col] = grid[col].to_numpy()
+    if rel_dist_means is not None:
+        for feat, src in REL_DIST_SOURCES.items():
+            rows[feat] = rel_dist(rows[src].to_numpy(dtype=np.float64), rel_dist_means[src])
+    grid["adr"] = cur_adr * (1 + grid["adr_delta"])
+
+    # ── Model B: 그리드 전체 1회 배치 호출 ──────────────────────────────────
+    X_b = _encode_frame(rows, encoders)[FEATURES_B_BASE]
+    X_b["price_gap_oof"] = grid["adr"].to_numpy() - adr_pred
+    grid["occ"] = np.clip(model_B.predict(X_b), 0, 1)
+
+    grid["revpar"] = iso_reg.predict(grid["adr"].to_numpy() * grid["occ"].to_numpy())
+    grid["net_profit"] = grid["revpar"] * 30 * (1 - AIRBNB_FEE_RATE) - opex_per_month
+
+    # ── 현재 조합 대비 증가분 ───────────────────────────────────────────────
+    is_current = (
+        (grid["instant_book"] == int(listing_features["instant_book"]))
+        & (grid["min_nights"] == int(listing_features["min_nights"]))
+        & (grid["photos_count"] == int(listing_features["photos_count"]))
+        & (grid["extra_guest_fee_policy"] == str(listing_features["extra_guest_fee_policy"]))
+        & (grid["adr_delta"] == 0)
+    )
+    baseline = float(grid.loc[is_current, "net_profit"].iloc[0])
+    grid["gain"] = grid["net_profit"] - baseline
+
+    # 동일 증가분이면 바꿔야 할 레버가 적은 조합 우선
+    grid["n_changes"] = (
+        (grid["instant_book"] != int(listing_features["instant_book"])).astype(int)
+        + (grid["min_nights"] != int(listing_features["min_nights"]))
+        + (grid["photos_count"] != int(listing_features["photos_count"]))
+        + (grid["extra_guest_fee_policy"] != str(listing_features["extra_guest_fee_policy"]))
+        + (grid["adr_delta"] != 0)
+    )
+    grid = grid.sort_values(["gain", "n_changes"], ascending=[False, True], kind="stable")
+    # 예측 순이익이 같은 조합 (모델·보정이 반응하지 않는 레버만 다른 것) 은 변경이 가장 적은 1개만
+    grid = grid[~grid["net_profit"].round(0).duplicated()]
+    grid["adr_at_edge"] = grid["adr_delta"].isin((ADR_DELTA_GRID[0], ADR_DELTA_GRID[-1]))
+    return grid.head(top_k).reset_index(drop=True)
+
+
+def describe_levers(row, listing_features: dict) -> list[str]:
+    """최적화 결과 한 행을 현재 값과 비교해 변경 사항 문구 목록으로 변환합니다."""
+    changes = []
+    if int(row["instant_book"]) != int(listing_features["instant_book"]):
+        changes.append("즉시예약 " + ("켜기" if row["instant_book"] else "끄기"))
+    if int(row["min_nights"]) != int(listing_features["min_nights"]):
+        changes.append(f"최소 {int(row['min_nights'])}박")
+    if int(row["photos_count"]) != int(listing_features["photos_count"]):
+        changes.append(f"사진 {int(row['photos_count'])}장")
+    if str(row["extra_guest_fee_policy"]) != str(listing_features["extra_guest_fee_policy"]):
+        changes.append("추가 게스트 요금 " + ("받기" if row["extra_guest_fee_policy"] == "1" else "없애기"))
+    if row["adr_delta"] != 0:
+        changes.append(f"요금 {row['adr_delta']*100:+.0f}% (₩{int(row['adr']):,})")
+    return changes or ["현재 설정 유지"]
+
+
+# ── 사용 예시 (직접 실행 시) ──────────────────────────────────────────────────
+if __name__ == "__main__":
+    import time
+
+    from predict_utils import load_models
+
+    example = {
+        "cluster": 2, "nearest_poi_dist_km": 0.5, "poi_dist_category": "보통",
+        "bedrooms": 2, "baths": 1, "guests": 4, "room_type": "entire_home",
+        "nearest_poi_type_name": "관광지", "district_median_revpar": 50000,
+        "district_listing_count": 800, "district_superhost_rate": 0.25,
+        "district_entire_home_rate": 0.70, "ttm_pop": 100000,
+        "min_nights": 5, "instant_book": 0, "superhost": 0, "rating_overall": 4.6,
+        "photos_count": 12, "num_reviews": 20, "extra_guest_fee_policy": "1",
+        "photos_tier": "하", "is_active_operating": 1, "ttm_avg_rate": 110000,
+    }
+
+    artifacts = load_models()
+    t0 = time.perf_counter()
+    top = optimize_levers(example, 500_000, top_k=5, **artifacts)
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    print(f"[레버 최적화] 그리드 {len(build_lever_grid(example))}개 조합 · {elapsed:.1f} ms")
+    for _, r in top.iterrows():
+        edge = "  (요금 그리드 끝)" if r["adr_at_edge"] else ""
+        print(f"  +₩{r['gain']:>10,.0f}  {' / '.join(describe_levers(r, example))}{edge}")
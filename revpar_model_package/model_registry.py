@@ -0,0 +1,241 @@
+"""
+model_registry.py — 모델 아티팩트 버전 관리 + 무중단 교체
+==========================================================
+
+사용법:
+    from model_registry import ModelRegistry
+
+    registry = ModelRegistry()          # 현재 models/ 로드 + 감시 스레드 시작
+    version, artifacts = registry.current()
+    result = predict_revpar(listing, 500_000, **artifacts)
+
+    # 골든셋 재생성 (현재 모델 기준 기대값 저장)
+    python model_registry.py build-golden
+
+동작:
+    1. 감시 스레드가 poll_seconds 마다 models/ 의 아티팩트 파일
+       (model_a.pkl, model_b.pkl, iso_reg.pkl, encoders.pkl, feature_config.json)
+       이름·크기·mtime 으로 지문(version)을 계산합니다.
+    2. 지문이 바뀌고 다음 폴링에서도 같으면 (복사 중인 파일 배제) 새 버전을 로드합니다.
+    3. golden_set.json 의 입력으로 배치 예측해 기대값과 비교 검증합니다.
+       - 모든 예측값이 유한하고 ADR > 0, 0 ≤ Occ ≤ 1
+       - ADR / RevPAR 중앙 상대 오차 ≤ rtol (기본 25% — 재학습 허용 범위)
+    4. 통과하면 (version, artifacts) 튜플 참조를 한 번에 교체합니다.
+       실패하면 기존 버전을 유지하고 history 에 사유를 남깁니다.
+
+세션 격리:
+    current() 는 튜플을 통째로 반환하므로 한 번의 스크립트 실행(rerun) 안에서는
+    교체가 일어나도 시작 시점의 모델을 끝까지 사용합니다. 새 버전은 다음 rerun 부터 적용됩니다.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from predict_utils import _MODELS_DIR, load_models, predict_revpar_batch
+
+ARTIFACT_FILES = (
+    "model_a.pkl",
+    "model_b.pkl",
+    "iso_reg.pkl",
+    "encoders.pkl",
+    "feature_config.json",
+)
+GOLDEN_FILE = "golden_set.json"
+
+
+def artifacts_fingerprint(models_dir: str | Path) -> str:
+    """아티팩트 파일 이름·크기·mtime 기반 버전 문자열 (12자리)."""
+    d = Path(models_dir)
+    h = hashlib.sha1()
+    for name in ARTIFACT_FILES:
+        st = (d / name).stat()
+        h.update(f"{name}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return h.hexdigest()[:12]
+
+
+def load_golden_set(models_dir: str | Path) -> dict | None:
+    p = Path(models_dir) / GOLDEN_FILE
+    if not p.exists():
+        return None
+    with open(p, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def validate_artifacts(artifacts: dict, golden: dict | None, rtol: float = 0.25) -> tuple[bool, str]:
+    """골든셋 입력으로 배치 예측해 새 아티팩트를 검증합니다. (ok, 사유) 반환."""
+    if golden is None:
+        return True, "골든셋 없음 — 로드만 확인"
+
+    inputs = pd.DataFrame(golden["inputs"])
+    pred = predict_revpar_batch(inputs, **artifacts)
+
+    values = pred[["ADR_pred", "Occ_pred", "RevPAR_pred"]].to_numpy()
+    if not np.isfinite(values).all():
+        return False, "예측값에 NaN/inf 포함"
+    if (pred["ADR_pred"] <= 0).any():
+        return False, "ADR 예측값 ≤ 0"
+    if ((pred["Occ_pred"] < 0) | (pred["Occ_pred"] > 1)).any():
+        return False, "예약률 예측값이 0~1 범위 밖"
+
+    for col in ("ADR_pred", "RevPAR_pred"):
+        expected = np.asarray(golden["expected"][col], dtype=float)
+        rel = np.abs(pred[col].to_numpy() - expected) / np.maximum(np.abs(expected), 1.0)
+        med = float(np.median(rel))
+        if med > rtol:
+            return False, f"{col} 중앙 상대 오차 {med:.1%} > 허용 {rtol:.0%}"
+    return True, "골든셋 검증 통과"
+
+
+class ModelRegistry:
+    """models/ 폴더를 감시해 검증된 새 아티팩트로 원자적으로 교체합니다."""
+
+    def __init__(
+        self,
+        models_dir: str | Path | None = None,
+        poll_seconds: float = 30.0,
+        rtol: float = 0.25,
+        start: bool = True,
+    ):
+        self.models_dir = Path(models_dir) if models_dir else _MODELS_DIR
+        self.poll_seconds = poll_seconds
+        self.rtol = rtol
+        self.history: list[dict] = []
+
+        version = artifacts_fingerprint(self.models_dir)
+        self._active = (version, load_models(self.models_dir))
+        self._pending: str | None = None
+        self._rejected: set[str] = set()
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._log(version, "active", "초기 로드")
+
+        if start:
+            self.start()
+
+    # ── 조회 ────────────────────────────────────────────────────────────────
+    def current(self) -> tuple[str, dict]:
+        """(version, artifacts) — rerun 시작 시 1회 호출해 끝까지 사용하세요."""
+        return self._active
+
+    @property
+    def version(self) -> str:
+        return self._active[0]
+
+    # ── 감시 스레드 ──────────────────────────────────────────────────────────
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_seconds + 1)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check_now()
+            except Exception as e:  # 감시 스레드는 죽지 않고 다음 폴링에서 재시도
+                self._log(self._pending or "?", "error", repr(e))
+
+    # ── 교체 ────────────────────────────────────────────────────────────────
+    def check_now(self, debounce: bool = True) -> bool:
+        """아티팩트 변경을 확인하고, 검증 통과 시 교체합니다. 교체 여부 반환."""
+        with self._reload_lock:
+            try:
+                version = artifacts_fingerprint(self.models_dir)
+            except FileNotFoundError:
+                return False  # 배포 중 파일이 잠시 없는 상태
+            if version == self._active[0] or version in self._rejected:
+                self._pending = None
+                return False
+            if debounce and version != self._pending:
+                self._pending = version  # 다음 폴링에서도 같으면 로드
+                return False
+            self._pending = None
+
+            try:
+                artifacts = load_models(self.models_dir)
+                ok, msg = validate_artifacts(artifacts, load_golden_set(self.models_dir), self.rtol)
+            except Exception as e:
+                ok, msg = False, f"로드 실패: {e!r}"
+
+            if not ok:
+                self._rejected.add(version)
+                self._log(version, "rejected", msg)
+                return False
+
+            self._active = (version, artifacts)
+            self._log(version, "active", msg)
+            return True
+
+    def _log(self, version: str, status: str, message: str) -> None:
+        self.history.append({
+            "version": version,
+            "status": status,
+            "message": message,
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        del self.history[:-50]
+
+
+def build_golden_set(models_dir: str | Path | None = None, lookup_path: str | Path | None = None) -> dict:
+    """자치구 × 숙소 유형 100개 대표 입력과 현재 모델 예측값으로 골든셋을 만듭니다."""
+    d = Path(models_dir) if models_dir else _MODELS_DIR
+    lp = Path(lookup_path) if lookup_path else Path(__file__).parent / "district_lookup.csv"
+    lookup = pd.read_csv(lp)
+
+    inputs = []
+    for _, row in lookup.iterrows():
+        for room_type in ("entire_home", "private_room", "hotel_room", "shared_room"):
+            inputs.append({
+                "cluster": int(row["cluster"]),
+                "district_median_revpar": float(row["district_median_revpar"]),
+                "district_listing_count": int(row["district_listing_count"]),
+                "district_superhost_rate": float(row["district_superhost_rate"]),
+                "district_entire_home_rate": float(row["district_entire_home_rate"]),
+                "ttm_pop": int(row["ttm_pop"]),
+                "room_type": room_type,
+                "bedrooms": 1, "baths": 1.0, "guests": 2,
+                "min_nights": 2, "instant_book": 1, "superhost": 0,
+                "rating_overall": 4.7, "photos_count": 25, "num_reviews": 30,
+                "extra_guest_fee_policy": "0", "is_active_operating": 1,
+                "nearest_poi_dist_km": 0.15, "poi_dist_category": "초근접",
+                "nearest_poi_type_name": "관광지", "photos_tier": "중상",
+            })
+
+    pred = predict_revpar_batch(pd.DataFrame(inputs), **load_models(d))
+    return {
+        "version": artifacts_fingerprint(d),
+        "inputs": inputs,
+        "expected": {
+            "ADR_pred": pred["ADR_pred"].round(2).tolist(),
+            "RevPAR_pred": pred["RevPAR_pred"].round(2).tolist(),
+        },
+    }
+
+
+# ── CLI (직접 실행 시) ────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "build-golden":
+        golden = build_golden_set()
+        with open(_MODELS_DIR / GOLDEN_FILE, "w", encoding="utf-8") as f:
+            json.dump(golden, f, ensure_ascii=False)
+        print(f"[골든셋] {len(golden['inputs'])}개 입력 저장 (모델 버전 {golden['version']})")
+    else:
+        registry = ModelRegistry(start=False)
+        version, artifacts = registry.current()
+        ok, msg = validate_artifacts(artifacts, load_golden_set(registry.models_dir), registry.rtol)
+        print(f"[모델 레지스트리] 버전 {version} · {msg}")
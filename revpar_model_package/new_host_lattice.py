@@ -0,0 +1,402 @@
+"""
+new_host_lattice.py — 신규 호스터 예측 격자 (사전 계산 룩업)
+==============================================================
+
+사용법:
+    from new_host_lattice import NewHostLattice
+
+    lattice = NewHostLattice.load()          # models/new_host_lattice.npz, 모델과 불일치 시 None
+    result = lattice.predict(listing, 500_000, **artifacts)   # 격자 밖이면 predict_revpar 로 폴백
+
+    # 격자 생성 — 배포 단계에서 1회, 모델·district_lookup.csv 교체 후 다시 (약 2분)
+    python new_host_lattice.py build
+
+    격자 파일 (약 5 MB) 은 모델 파일에서 언제든 다시 만들 수 있으므로 저장소에 넣지 않습니다
+    (.gitignore). 파일이 없으면 load() 가 None 을 돌려주고 앱은 실시간 예측을 씁니다.
+
+격자 구성:
+    Model A (ADR) — 자치구 25 × 숙소 유형 4 × 인원 1~8 × 침실 0~4 × 욕실 0~3
+                    × POI 거리 구간 × POI 유형 8  (uint16 양자화 log1p ADR)
+        POI 거리 축은 model_a 의 nearest_poi_dist_km 분할 임계값과 poi_dist_category 경계
+        (0.2 / 0.5 / 1.0 km) 로 나눈 구간이라, 실제 거리를 넣어도 트리 출력과 같습니다.
+        거리와 맞지 않는 poi_dist_category 가 들어오면 실시간 예측으로 폴백합니다.
+        파일에는 거리 축 방향 차분(uint16 wrap)을 저장하고 load() 에서 누적합으로 복원합니다
+        — 인접 거리 구간은 대부분 같은 값이라 압축이 3배 가량 잘 됩니다.
+    Model B (Occ) — 클러스터 × 숙소 유형 × 사진 수 × price_gap 구간  (uint16 양자화)
+        사진 수·price_gap 축은 model_b 분할 임계값에서 만들므로 트리 출력과 정확히 같습니다.
+        운영 레버는 신규 호스터 기본값(NEW_HOST_CONTEXT)일 때만 격자를 사용합니다.
+
+RevPAR 보정(iso_reg)과 순이익 계산은 조회 시 predict_revpar 와 같은 식으로 합니다.
+격자는 생성 당시 모델 파일 내용 해시를 기록하므로, 모델이 바뀌면 load() 가 None 을 반환합니다.
+"""
+
+import hashlib
+import json
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from predict_utils import (
+    _MODELS_DIR,
+    _REL_DIST_COLS,
+    _encode_frame,
+    get_photos_tier,
+    get_poi_dist_category,
+    load_models,
+    predict_revpar,
+)
+
+LATTICE_FILE = "new_host_lattice.npz"
+MODEL_FILES = ("model_a.pkl", "model_b.pkl", "encoders.pkl", "feature_config.json")
+
+DISTRICT_COLS = (
+    "cluster",
+    "district_median_revpar",
+    "district_listing_count",
+    "district_superhost_rate",
+    "district_entire_home_rate",
+    "ttm_pop",
+)
+GUESTS = np.arange(1, 9)
+BEDROOMS = np.arange(0, 5)
+BATHS = np.arange(0, 4)
+POI_DIST_CATEGORIES = ("초근접", "근접", "보통", "원거리")
+DIST_AXIS = 5   # adr 격자에서 POI 거리 구간 축
+
+# step5 에서 신규 호스터가 입력하지 않는 Model B 레버의 기본값
+NEW_HOST_CONTEXT = {
+    "min_nights": 2,
+    "instant_book": 0,
+    "superhost": 0,
+    "rating_overall": 4.5,
+    "num_reviews": 0,
+    "extra_guest_fee_policy": "0",
+    "is_active_operating": 1,
+}
+
+
+def model_content_hash(models_dir: str | Path | None = None) -> str:
+    """Model A/B·인코더·피처 설정 파일 내용 해시 (12자리). mtime 과 무관합니다."""
+    d = Path(models_dir) if models_dir else _MODELS_DIR
+    h = hashlib.sha1()
+    for name in MODEL_FILES:
+        h.update(name.encode())
+        h.update((d / name).read_bytes())
+    return h.hexdigest()[:12]
+
+
+def _split_thresholds(model, feature: str) -> np.ndarray:
+    """LightGBM 모델에서 feature 의 수치 분할 임계값 (정렬, 중복 제거)."""
+    booster = model.booster_ if hasattr(model, "booster_") else model
+    dump = booster.dump_model()
+    idx = dump["feature_names"].index(feature)
+    found = set()
+    stack = [t["tree_structure"] for t in dump["tree_info"]]
+    while stack:
+        node = stack.pop()
+        if "split_index" not in node:
+            continue
+        if node["split_feature"] == idx:
+            found.add(float(node["threshold"]))
+        stack.extend((node["left_child"], node["right_child"]))
+    return np.array(sorted(found))
+
+
+def _interval_points(thresholds: np.ndarray) -> np.ndarray:
+    """임계값 사이 구간마다 대표값 1개 (LightGBM: x <= t 이면 왼쪽)."""
+    if len(thresholds) == 0:
+        return np.zeros(1)
+    mids = (thresholds[:-1] + thresholds[1:]) / 2
+    return np.concatenate([[thresholds[0] - 1.0], mids, [thresholds[-1] + 1.0]])
+
+
+def _dist_segments(thresholds: np.ndarray) -> tuple[list, list]:
+    """POI 거리 축 — (model 구간 k, 거리 구분) 쌍과 구간마다 대표 거리.
+
+    model 구간 k 는 searchsorted(thresholds, x, "left") (x <= t 이면 왼쪽) 이고,
+    한 구간이 poi_dist_category 경계를 걸치면 구분별로 칸을 나눕니다.
+    """
+    bounds = [0.0, 0.2, 0.5, 1.0, np.inf]
+    edges = [-np.inf, *thresholds, np.inf]
+    keys, reps = [], []
+    for k in range(len(edges) - 1):
+        lo, hi = edges[k], edges[k + 1]
+        for c, cat in enumerate(POI_DIST_CATEGORIES):
+            seg_lo, seg_hi = max(lo, bounds[c]), min(hi, bounds[c + 1])
+            x = (seg_lo + seg_hi) / 2 if np.isfinite(seg_hi) else seg_lo + 1.0
+            # 빈 교집합 · 경계 한 점이 반대편 구간에 속하는 경우는 건너뜀
+            if int(np.searchsorted(thresholds, x, side="left")) != k or get_poi_dist_category(x) != cat:
+                continue
+            keys.append((k, cat))
+            reps.append(float(x))
+    return keys, reps
+
+
+def _quantize(values: np.ndarray) -> tuple[np.ndarray, float, float]:
+    lo, hi = float(values.min()), float(values.max())
+    scale = (hi - lo) or 1.0
+    q = np.round((values - lo) / scale * 65535).astype(np.uint16)
+    return q, lo, hi
+
+
+def _dequantize(q, lo: float, hi: float):
+    return lo + q.astype(np.float64) / 65535 * ((hi - lo) or 1.0)
+
+
+def _delta(q: np.ndarray) -> np.ndarray:
+    """거리 축 방향 차분 (uint16 wrap) — np.cumsum(..., dtype=np.uint16) 으로 정확히 복원됩니다."""
+    return np.diff(q, axis=DIST_AXIS, prepend=np.zeros_like(q.take([0], axis=DIST_AXIS)))
+
+
+def build_lattice(
+    models_dir: str | Path | None = None,
+    lookup_path: str | Path | None = None,
+) -> dict:
+    """격자 전체를 배치 예측해 저장용 배열 dict 를 반환합니다."""
+    d = Path(models_dir) if models_dir else _MODELS_DIR
+    lookup = pd.read_csv(lookup_path or Path(__file__).parent / "district_lookup.csv")
+    artifacts = load_models(d)
+    enc = artifacts["encoders"]
+    cfg = artifacts["feature_config"]
+
+    room_types = list(enc["room_type"].classes_)
+    poi_types = list(enc["nearest_poi_type_name"].classes_)
+    dist_th = _split_thresholds(artifacts["model_A"], "nearest_poi_dist_km")
+    dist_keys, dist_rep = _dist_segments(dist_th)
+
+    # ── Model A: ADR 격자 (자치구별로 나눠 예측 — 한 번에 만들면 프레임이 너무 큼) ──
+    shape_a = (len(lookup), len(room_types), len(GUESTS), len(BEDROOMS), len(BATHS),
+               len(dist_keys), len(poi_types))
+    grid = np.array(list(product(*(range(n) for n in shape_a[1:]))), dtype=np.int64)
+    log_adr = []
+    for i in range(len(lookup)):
+        X_a = pd.DataFrame({
+            **{c: np.repeat(lookup[c].iloc[i], len(grid)) for c in DISTRICT_COLS},
+            "room_type": np.array(room_types)[grid[:, 0]],
+            "guests": GUESTS[grid[:, 1]],
+            "bedrooms": BEDROOMS[grid[:, 2]],
+            "baths": BATHS[grid[:, 3]].astype(float),
+            "poi_dist_category": np.array([cat for _, cat in dist_keys])[grid[:, 4]],
+            "nearest_poi_dist_km": np.array(dist_rep)[grid[:, 4]],
+            "nearest_poi_type_name": np.array(poi_types)[grid[:, 5]],
+        })
+        log_adr.append(artifacts["model_A"].predict(_encode_frame(X_a, enc)[cfg["FEATURES_A"]]))
+    adr_q, adr_lo, adr_hi = _quantize(np.concatenate(log_adr))
+
+    # ── Model B: 예약률 격자 (신규 호스터 기본 레버) ─────────────────────────
+    clusters = np.sort(lookup["cluster"].unique())
+    photo_th = _split_thresholds(artifacts["model_B"], "photos_count")
+    # 마지막 칸이 모든 분할 임계값과 photos_tier '상'(36+) 경계 위 → 그 이상은 같은 값
+    photos = np.arange(max(int(np.ceil(photo_th.max())) if len(photo_th) else 0, 36) + 1)
+    gap_th = _split_thresholds(artifacts["model_B"], "price_gap_oof")
+    gaps = _interval_points(gap_th)
+
+    shape_b = (len(clusters), len(room_types), len(photos), len(gaps))
+    grid = np.array(list(product(*(range(n) for n in shape_b))), dtype=np.int64)
+    X_b = pd.DataFrame({
+        **NEW_HOST_CONTEXT,
+        "cluster": clusters[grid[:, 0]],
+        "room_type": np.array(room_types)[grid[:, 1]],
+        "photos_count": photos[grid[:, 2]],
+        "photos_tier": [get_photos_tier(int(p)) for p in photos[grid[:, 2]]],
+    }, index=np.arange(len(grid)))
+    X_b = _encode_frame(X_b, enc)
+    for col in _REL_DIST_COLS:
+        X_b[col] = 1.0
+    X_b = X_b[cfg["FEATURES_B_BASE"]].copy()
+    X_b["price_gap_oof"] = gaps[grid[:, 3]]
+    occ = np.clip(artifacts["model_B"].predict(X_b), 0, 1)
+    occ_q, occ_lo, occ_hi = _quantize(occ)
+
+    meta = {
+        "model_hash": model_content_hash(d),
+        "room_types": room_types,
+        "poi_types": poi_types,
+        "poi_dist_segments": [[k, cat] for k, cat in dist_keys],
+        "poi_dist_km": dist_rep,
+        "guests": GUESTS.tolist(),
+        "bedrooms": BEDROOMS.tolist(),
+        "baths": BATHS.tolist(),
+        "clusters": clusters.tolist(),
+        "context": NEW_HOST_CONTEXT,
+        "adr_range": [adr_lo, adr_hi],
+        "occ_range": [occ_lo, occ_hi],
+    }
+    return {
+        "adr_dq": _delta(adr_q.reshape(shape_a)),
+        "occ_q": occ_q.reshape(shape_b),
+        "district_keys": lookup[list(DISTRICT_COLS)].to_numpy(dtype=np.float64),
+        "gap_thresholds": gap_th,
+        "dist_thresholds": dist_th,
+        "meta": np.array(json.dumps(meta, ensure_ascii=False)),
+    }
+
+
+class NewHostLattice:
+    """사전 계산 격자 조회기. 격자에 없는 조합은 predict_revpar 로 폴백합니다."""
+
+    def __init__(self, arrays: dict):
+        self.meta = json.loads(str(arrays["meta"]))
+        self.adr_q = np.cumsum(arrays["adr_dq"], axis=DIST_AXIS, dtype=np.uint16)
+        self.occ_q = arrays["occ_q"]
+        self.gap_thresholds = arrays["gap_thresholds"]
+        self.dist_thresholds = arrays["dist_thresholds"]
+        self.model_hash = self.meta["model_hash"]
+        self._district = {tuple(row): i for i, row in enumerate(arrays["district_keys"].tolist())}
+        self._room = {v: i for i, v in enumerate(self.meta["room_types"])}
+        self._poi_type = {v: i for i, v in enumerate(self.meta["poi_types"])}
+        self._poi_dist = {(k, cat): i for i, (k, cat) in enumerate(self.meta["poi_dist_segments"])}
+        self._cluster = {v: i for i, v in enumerate(self.meta["clusters"])}
+        self._n_photos = self.occ_q.shape[2]
+
+    @classmethod
+    def load(cls, models_dir: str | Path | None = None) -> "NewHostLattice | None":
+        """격자 파일이 없거나 현재 모델과 다르면 None."""
+        d = Path(models_dir) if models_dir else _MODELS_DIR
+        p = d / LATTICE_FILE
+        if not p.exists():
+            return None
+        with np.load(p) as f:
+            lattice = cls({k: f[k] for k in f.files})
+        if lattice.model_hash != model_content_hash(d):
+            return None
+        return lattice
+
+    def save(self, models_dir: str | Path | None = None) -> Path:
+        d = Path(models_dir) if models_dir else _MODELS_DIR
+        p = d / LATTICE_FILE
+        np.savez_compressed(
+            p,
+            adr_dq=_delta(self.adr_q),
+            occ_q=self.occ_q,
+            district_keys=np.array(list(self._district), dtype=np.float64),
+            gap_thresholds=self.gap_thresholds,
+            dist_thresholds=self.dist_thresholds,
+            meta=np.array(json.dumps(self.meta, ensure_ascii=False)),
+        )
+        return p
+
+    # ── 조회 ────────────────────────────────────────────────────────────────
+    def _index(self, f: dict) -> tuple | None:
+        try:
+            for k, v in self.meta["context"].items():
+                if (str(f[k]) != v) if isinstance(v, str) else (float(f[k]) != v):
+                    return None
+            if any(float(f.get(col, 1.0)) != 1.0 for col in _REL_DIST_COLS):
+                return None
+            key = tuple(float(f[c]) for c in DISTRICT_COLS)
+            ints = [float(f[c]) for c in ("guests", "bedrooms", "baths", "photos_count")]
+            dist = float(f["nearest_poi_dist_km"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if any(x != int(x) for x in ints) or not np.isfinite(dist):
+            return None
+        guests, bedrooms, baths, photos = (int(x) for x in ints)
+        m = self.meta
+        if not (m["guests"][0] <= guests <= m["guests"][-1]
+                and m["bedrooms"][0] <= bedrooms <= m["bedrooms"][-1]
+                and m["baths"][0] <= baths <= m["baths"][-1]
+                and photos >= 0):
+            return None
+        idx = (
+            self._district.get(key),
+            self._room.get(f.get("room_type")),
+            self._poi_dist.get((int(np.searchsorted(self.dist_thresholds, dist, side="left")),
+                                f.get("poi_dist_category"))),
+            self._poi_type.get(f.get("nearest_poi_type_name")),
+            self._cluster.get(int(f["cluster"])),
+        )
+        if any(i is None for i in idx):
+            return None
+        d, r, pc, pt, c = idx
+        a_idx = (d, r, guests - m["guests"][0], bedrooms - m["bedrooms"][0], baths - m["baths"][0], pc, pt)
+        return a_idx, (c, r, min(photos, self._n_photos - 1))
+
+    def lookup(self, listing_features: dict, opex_per_month: float, iso_reg) -> dict | None:
+        """격자 조회 결과 (predict_revpar 와 같은 키). 격자 밖이면 None."""
+        idx = self._index(listing_features)
+        if idx is None:
+            return None
+        a_idx, b_idx = idx
+        adr_pred = float(np.expm1(_dequantize(self.adr_q[a_idx], *self.meta["adr_range"])))
+
+        gap = listing_features.get("ttm_avg_rate", adr_pred) - adr_pred
+        k = int(np.searchsorted(self.gap_thresholds, gap, side="left"))
+        occ_pred = float(_dequantize(self.occ_q[b_idx + (k,)], *self.meta["occ_range"]))
+
+        revpar_cal = float(iso_reg.predict([adr_pred * occ_pred])[0])
+        return {
+            "ADR_pred": adr_pred,
+            "Occ_pred": occ_pred,
+            "RevPAR_pred": revpar_cal,
+            "monthly_revenue": revpar_cal * 30,
+            "net_profit": revpar_cal * 30 - opex_per_month,
+            "revpar_trend": None,
+            "trend_label": None,
+        }
+
+    def predict(self, listing_features: dict, opex_per_month: float, **artifacts) -> dict:
+        """격자 조회, 실패 시 predict_revpar 실시간 예측."""
+        res = self.lookup(listing_features, opex_per_month, artifacts["iso_reg"])
+        if res is None:
+            res = predict_revpar(listing_features, opex_per_month, **artifacts)
+        return res
+
+
+# ── CLI / 검증 (직접 실행 시) ──────────────────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        t0 = time.perf_counter()
+        lattice = NewHostLattice(build_lattice())
+        p = lattice.save()
+        print(f"[신규 호스터 격자] ADR {lattice.adr_q.size:,}칸 · 예약률 {lattice.occ_q.size:,}칸 "
+              f"→ {p.name} ({p.stat().st_size / 1024:.0f} KB, {time.perf_counter() - t0:.1f}s)")
+        sys.exit(0)
+
+    artifacts = load_models()
+    lattice = NewHostLattice.load()
+    if lattice is None:
+        sys.exit("격자 파일이 없거나 모델과 다릅니다 — python new_host_lattice.py build")
+
+    lookup = pd.read_csv(Path(__file__).parent / "district_lookup.csv")
+    rng = np.random.default_rng(0)
+    samples = []
+    for _ in range(300):
+        row = lookup.iloc[rng.integers(len(lookup))]
+        dist = float(rng.uniform(0.01, 2.0))
+        photos = int(rng.integers(0, 60))
+        samples.append({
+            **{c: (float(row[c]) if "rate" in c or "revpar" in c else int(row[c])) for c in DISTRICT_COLS},
+            **NEW_HOST_CONTEXT,
+            "room_type": lattice.meta["room_types"][rng.integers(4)],
+            "guests": int(rng.integers(1, 9)),
+            "bedrooms": int(rng.integers(0, 5)),
+            "baths": float(rng.integers(0, 4)),
+            "poi_dist_category": get_poi_dist_category(dist),
+            "nearest_poi_dist_km": dist,
+            "nearest_poi_type_name": lattice.meta["poi_types"][rng.integers(8)],
+            "photos_count": photos,
+            "photos_tier": get_photos_tier(photos),
+            "ttm_avg_rate": float(rng.integers(40, 300)) * 1000,
+        })
+
+    t0 = time.perf_counter()
+    live = [predict_revpar(s, 500_000, **artifacts) for s in samples]
+    t_live = (time.perf_counter() - t0) / len(samples) * 1000
+    t0 = time.perf_counter()
+    fast = [lattice.predict(s, 500_000, **artifacts) for s in samples]
+    t_fast = (time.perf_counter() - t0) / len(samples) * 1000
+
+    hits = sum(lattice.lookup(s, 500_000, artifacts["iso_reg"]) is not None for s in samples)
+    err = {k: np.array([abs(a[k] - b[k]) / max(abs(a[k]), 1e-9) for a, b in zip(live, fast)])
+           for k in ("ADR_pred", "Occ_pred", "RevPAR_pred")}
+    print(f"[신규 호스터 격자] 표본 {len(samples)}개 (POI 거리 0.01~2.0 km 균등) · 격자 적중 {hits}/{len(samples)}")
+    print(f"  실시간 예측 : {t_live:7.2f} ms/건")
+    print(f"  격자 조회   : {t_fast:7.3f} ms/건")
+    print("  최대 상대 오차: " + " · ".join(f"{k} {v.max():.2e}" for k, v in err.items()))
+    print("  1% 초과 비율 : " + " · ".join(f"{k} {(v > 0.01).mean():.1%}" for k, v in err.items()))
@@ -62,6 +62,8 @@ import pandas as pd
 import joblib
 import json
 
+from calibration import IsotonicCalibrator
+
 _MODELS_DIR = Path(__file__).parent / "models"
 
 _REL_DIST_COLS = [
@@ -72,6 +74,20 @@ _REL_DIST_COLS = [
 ]
 
 
+def get_photos_tier(photos_count: int) -> str:
+    if photos_count < 14:   return "하"
+    elif photos_count < 23: return "중하"
+    elif photos_count <= 35: return "중상"
+    else:                   return "상"
+
+
+def get_poi_dist_category(dist_km: float) -> str:
+    if dist_km < 0.2:   return "초근접"
+    elif dist_km < 0.5: return "근접"
+    elif dist_km < 1.0: return "보통"
+    else:               return "원거리"
+
+
 def load_models(models_dir: str | Path | None = None) -> dict:
     """models/ 폴더에서 pkl 파일을 일괄 로드합니다.
 
@@ -79,6 +95,7 @@ def load_models(models_dir: str | Path | None = None) -> dict:
     -------
     dict with keys:
         model_A, model_B, iso_reg, encoders, feature_config
+        (iso_reg 는 IsotonicCalibrator — sklearn 과 같은 predict() 제공)
     """
     d = Path(models_dir) if models_dir else _MODELS_DIR
     if not d.exists():
@@ -89,7 +106,7 @@ def load_models(models_dir: str | Path | None = None) -> dict:
 
     model_A = joblib.load(d / "model_a.pkl")
     model_B = joblib.load(d / "model_b.pkl")
-    iso_reg = joblib.load(d / "iso_reg.pkl")
+    iso_reg = IsotonicCalibrator.from_sklearn(joblib.load(d / "iso_reg.pkl"))
     encoders = joblib.load(d / "encoders.pkl")
 
     with open(d / "feature_config.json", encoding="utf-8") as f:
@@ -197,6 +214,78 @@ def predict_revpar(
     }
 
 
+def _encode_frame(frame: pd.DataFrame, encoders: dict) -> pd.DataFrame:
+    """카테고리 컬럼을 LabelEncoder 인덱스로 일괄 변환 (unseen → -1)."""
+    out = frame.copy()
+    for col, le in encoders.items():
+        if col in out.columns:
+            mapping = {c: i for i, c in enumerate(le.classes_)}
+            out[col] = out[col].astype(str).map(mapping).fillna(-1).astype(int)
+    return out
+
+
+def predict_revpar_batch(
+    listings: pd.DataFrame,
+    opex_per_month: float | np.ndarray = 0.0,
+    *,
+    model_A,
+    model_B,
+    iso_reg,
+    encoders: dict,
+    feature_config: dict,
+) -> pd.DataFrame:
+    """여러 리스팅을 한 번의 모델 호출로 예측합니다 (predict_revpar 의 배치 버전).
+
+    Parameters
+    ----------
+    listings : pd.DataFrame
+        행마다 predict_revpar 의 listing_features 와 같은 컬럼.
+        ttm_avg_rate 컬럼이 없거나 NaN 이면 ADR 예측값을 사용합니다.
+    opex_per_month : float | np.ndarray
+        월 운영비 (스칼라 또는 행별 배열, 원).
+    **artifacts
+        load_models() 반환값을 그대로 언패킹해서 전달.
+
+    Returns
+    -------
+    pd.DataFrame (listings 와 같은 index) with columns:
+        ADR_pred, Occ_pred, RevPAR_pred, monthly_revenue, net_profit
+    """
+    FEATURES_A = feature_config["FEATURES_A"]
+    FEATURES_B_BASE = feature_config["FEATURES_B_BASE"]
+
+    rows = _encode_frame(listings, encoders)
+    for col in _REL_DIST_COLS:
+        if col not in rows.columns:
+            rows[col] = 1.0
+        else:
+            rows[col] = rows[col].fillna(1.0)
+
+    adr_pred = np.expm1(model_A.predict(rows[FEATURES_A]))
+
+    if "ttm_avg_rate" in rows.columns:
+        ttm_avg_rate = rows["ttm_avg_rate"].astype(float).fillna(pd.Series(adr_pred, index=rows.index))
+    else:
+        ttm_avg_rate = pd.Series(adr_pred, index=rows.index)
+
+    X_b = rows[FEATURES_B_BASE].copy()
+    X_b["price_gap_oof"] = ttm_avg_rate.to_numpy() - adr_pred
+    occ_pred = np.clip(model_B.predict(X_b), 0, 1)
+
+    revpar_cal = iso_reg.predict(adr_pred * occ_pred)
+
+    return pd.DataFrame(
+        {
+            "ADR_pred": adr_pred,
+            "Occ_pred": occ_pred,
+            "RevPAR_pred": revpar_cal,
+            "monthly_revenue": revpar_cal * 30,
+            "net_profit": revpar_cal * 30 - opex_per_month,
+        },
+        index=listings.index,
+    )
+
+
 def compute_health_score(user_vals: dict, cluster_listings) -> dict:
     """클러스터 내 백분위 기반 5-컴포넌트 헬스 스코어 (0~100).
 
@@ -332,6 +421,90 @@ def compute_health_score(user_vals: dict, cluster_listings) -> dict:
     }
 
 
+HEALTH_COMPONENTS = ("review_signal", "listing_quality", "booking_policy", "location", "listing_config")
+
+
+def _pct_rank_sorted(values: np.ndarray, sorted_peers: np.ndarray) -> np.ndarray:
+    """compute_health_score 의 pct_rank 배치판 — 정렬된 비교 집단에 searchsorted.
+
+    mean(peers <= v) 와 같은 값이며, v 가 NaN 이면 0, 비교 집단이 비면 50 입니다.
+    """
+    if len(sorted_peers) == 0:
+        return np.full(len(values), 50.0)
+    pct = np.searchsorted(sorted_peers, values, side="right") / len(sorted_peers) * 100
+    return np.where(np.isnan(values), 0.0, pct)
+
+
+def _truthy(s: pd.Series) -> np.ndarray:
+    if s.dtype == bool or pd.api.types.is_numeric_dtype(s):
+        return pd.to_numeric(s, errors="coerce").fillna(0).to_numpy() > 0
+    return s.astype(str).str.strip().str.lower().isin(("true", "t", "1", "yes")).to_numpy()
+
+
+def compute_health_score_batch(listings: pd.DataFrame, cluster_listings: pd.DataFrame,
+                               group_col: str = "cluster") -> pd.DataFrame:
+    """compute_health_score 를 리스팅 n개에 한 번에 (같은 group_col 값의 비교 집단 기준).
+
+    Parameters
+    ----------
+    listings : pd.DataFrame
+        cluster_listings_ao.csv 와 같은 컬럼 이름의 채점 대상.
+        num_reviews · rating_overall · photos_count · instant_book · min_nights ·
+        extra_guest_fee_policy · nearest_poi_dist_km · bedrooms · baths · group_col.
+        리뷰 수·사진 수가 없으면 0, 평점이 없으면 4.5 (app.py 입력 기본값과 같음).
+    cluster_listings : pd.DataFrame
+        비교 집단 전체 (보통 cluster_listings_ao.csv). group_col 로 나눠 컬럼마다 한 번 정렬합니다.
+
+    Returns
+    -------
+    pd.DataFrame (index = listings.index)
+        HEALTH_COMPONENTS 5개 · composite · grade — compute_health_score 와 같은 반올림.
+    """
+    n = len(listings)
+    vals = {
+        "num_reviews":         listings["num_reviews"].fillna(0),
+        "rating_overall":      listings["rating_overall"].fillna(4.5),
+        "min_nights":          listings["min_nights"],
+        "nearest_poi_dist_km": listings["nearest_poi_dist_km"],
+        "bedrooms":            listings["bedrooms"],
+        "baths":               listings["baths"],
+    }
+    vals = {c: pd.to_numeric(v, errors="coerce").to_numpy(dtype=np.float64) for c, v in vals.items()}
+    pct = {c: np.full(n, 50.0) for c in vals}
+
+    peer_groups = dict(tuple(cluster_listings.groupby(group_col, sort=False)))
+    for key, idx in listings.groupby(group_col, sort=False).indices.items():
+        peers = peer_groups.get(key, cluster_listings.iloc[:0])
+        for c, v in vals.items():
+            if c not in peers.columns:
+                continue                                    # 컬럼이 없으면 스칼라판처럼 50
+            ref = np.sort(pd.to_numeric(peers[c], errors="coerce").dropna().to_numpy(dtype=np.float64))
+            pct[c][idx] = _pct_rank_sorted(v[idx], ref)
+
+    photos = pd.to_numeric(listings["photos_count"], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    listing_quality = np.where(
+        (photos >= 23) & (photos <= 35), 100.0,
+        np.where(photos < 23, photos / 23 * 100, np.maximum(0.0, 100.0 - (photos - 35) * 2.5)),
+    )
+    review_signal = (pct["num_reviews"] + pct["rating_overall"]) / 2
+    booking_policy = (
+        0.4 * np.where(_truthy(listings["instant_book"]), 100.0, 0.0)
+        + 0.4 * (100 - pct["min_nights"])
+        + 0.2 * np.where(_truthy(listings["extra_guest_fee_policy"]), 0.0, 100.0)
+    )
+    location = 100 - pct["nearest_poi_dist_km"]
+    listing_config = (pct["bedrooms"] + pct["baths"]) / 2
+
+    comps = dict(zip(HEALTH_COMPONENTS, (review_signal, listing_quality, booking_policy, location, listing_config)))
+    composite = sum(comps.values()) / 5
+    grade = np.select([composite >= 80, composite >= 60, composite >= 40, composite >= 20],
+                      ["A", "B", "C", "D"], default="F")
+    out = pd.DataFrame({k: np.round(v, 1) for k, v in comps.items()}, index=listings.index)
+    out["composite"] = np.round(composite, 1)
+    out["grade"] = grade
+    return out
+
+
 # ── 사용 예시 (직접 실행 시) ──────────────────────────────────────────────────
 if __name__ == "__main__":
     example = {
@@ -0,0 +1,224 @@
+"""
+price_calendar.py — 365일 1박 추천 요금 캘린더 (요일 × 계절 × 탄력성)
+=====================================================================
+
+사용법:
+    from price_calendar import dow_factors, price_calendar, to_csv, to_ical
+
+    dow = dow_factors(weekday_occ=0.55, weekend_occ=0.85)         # (1, 7) 월~일 수요 지수
+    cal = price_calendar(adr_pred, date(2025, 11, 1), season, dow, elasticity)
+    cal["price"]                                                   # (n, 365) 원 단위 추천 요금
+    to_csv(cal, listing_ids)                                       # 날짜 × 리스팅 long CSV (bytes)
+    to_ical(cal, row=0)                                            # 한 리스팅의 종일 이벤트 iCal (bytes)
+
+    # 배치 벤치마크 — 리스팅 CSV 가 있으면 모델 ADR·계절성·탄력성까지 실제 파이프라인으로
+    python price_calendar.py                       # 합성 5,000 리스팅
+    python price_calendar.py data/raw/seoul_airbnb_cleaned.csv --out calendars.csv
+
+요금 규칙:
+    날짜 d 의 수요 지수 m = 계절 지수[월] × 요일 지수[요일]  (둘 다 평균 1.0)
+    app.py 요금 시뮬레이션과 같은 선형 수요  예약률 = 기준 예약률 × m × (1 + e × δ)  에서
+    예약률을 기준 수준으로 유지하는 요금 변화율  δ = (1/m - 1) / e  를 고릅니다.
+    수요가 몰리는 날은 요금을 올려 초과 수요를 수익으로, 한산한 날은 내려 공실을 줄입니다.
+    δ 는 요금 시뮬레이션 구간과 같은 -30% ~ +50% 로 자르고, 1,000원 단위로 반올림합니다.
+
+요일 지수:
+    step2_existing 의 평일 / 주말 (토·일) 예약률을 주간 평균으로 나눈 값입니다.
+    예약 표본이 적을수록 1.0 쪽으로 수축하고 0.5 ~ 1.5 로 자릅니다.
+    평일·주말 구분이 없으면 (신규 호스터) 1.0 — 계절성만 반영됩니다.
+"""
+
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+DELTA_BOUNDS = (-0.30, 0.50)
+DOW_CLIP = (0.5, 1.5)
+WEEKEND = np.array([False] * 5 + [True] * 2)       # 월=0 … 일=6 (calendar_bits 와 같은 토·일)
+WEEKDAY_KR = np.array(list("월화수목금토일"))
+
+
+def dow_factors(weekday_occ=None, weekend_occ=None, n_days=31, shrink: float = 14.0) -> np.ndarray:
+    """평일·주말 예약률 → (n, 7) 요일 수요 지수 (주간 평균 1.0).
+
+    Parameters
+    ----------
+    weekday_occ, weekend_occ : float | array (n,) | None
+        0~1 예약률. None 이거나 둘 다 0 이면 1.0.
+    n_days : int | array (n,)
+        예약된 날 수 (증거량) — 적을수록 1.0 쪽으로 수축 (n / (n + shrink)).
+    """
+    if weekday_occ is None or weekend_occ is None:
+        return np.ones((1, 7))
+    wd = np.atleast_1d(np.asarray(weekday_occ, dtype=np.float64))
+    we = np.atleast_1d(np.asarray(weekend_occ, dtype=np.float64))
+    avg = (5 * wd + 2 * we) / 7
+    ok = avg > 0
+    safe = np.where(ok, avg, 1.0)
+    w = np.asarray(n_days, dtype=np.float64) / (np.asarray(n_days, dtype=np.float64) + shrink)
+    f_wd = np.where(ok, 1 + w * (wd / safe - 1), 1.0)
+    f_we = np.where(ok, 1 + w * (we / safe - 1), 1.0)
+    out = np.where(WEEKEND[None, :], f_we[:, None], f_wd[:, None])
+    return np.clip(out, *DOW_CLIP)
+
+
+def price_calendar(
+    base_adr,
+    start: date,
+    season: np.ndarray,
+    dow: np.ndarray,
+    elasticity,
+    *,
+    days: int = 365,
+    bounds: tuple[float, float] = DELTA_BOUNDS,
+    round_to: int = 1_000,
+) -> dict:
+    """리스팅 n개 × days 일 추천 요금 (브로드캐스팅 1회).
+
+    Parameters
+    ----------
+    base_adr : float | array (n,)
+        연평균 기준 1박 요금 (원). predict_revpar 의 ADR_pred 등.
+    start : date
+        캘린더 첫날.
+    season : array (12,) | (n, 12)
+        SeasonalityProfiles.profile / lookup 결과 (1월이 인덱스 0).
+    dow : array (7,) | (n, 7)
+        dow_factors() 결과 (월요일이 인덱스 0).
+    elasticity : float | array (n,)
+        가격 탄력성 (음수). ElasticityTable.lookup 또는 CLUSTER_INFO 값.
+
+    Returns
+    -------
+    dict with keys:
+        dates  : ndarray datetime64[D] (days,)
+        demand : ndarray (n, days) — 수요 지수 m
+        delta  : ndarray (n, days) — 기준 요금 대비 변화율
+        price  : ndarray (n, days) — 추천 1박 요금 (원, round_to 단위)
+    """
+    dates = np.datetime64(start, "D") + np.arange(days)
+    month_idx = dates.astype("datetime64[M]").astype(np.int64) % 12
+    dow_idx = (dates.astype(np.int64) - 4) % 7          # 1970-01-01 = 목요일 → 월=0
+
+    base = np.atleast_1d(np.asarray(base_adr, dtype=np.float64))
+    season = np.atleast_2d(np.asarray(season, dtype=np.float64))[:, month_idx]
+    dow = np.atleast_2d(np.asarray(dow, dtype=np.float64))[:, dow_idx]
+    e = np.minimum(np.atleast_1d(np.asarray(elasticity, dtype=np.float64)), -1e-3)[:, None]
+
+    demand = season * dow
+    delta = np.clip((1.0 / demand - 1.0) / e, *bounds)
+    price = np.round(base[:, None] * (1.0 + delta) / round_to) * round_to
+    return {"dates": dates, "demand": demand, "delta": delta, "price": price}
+
+
+def to_frame(cal: dict, listing_ids=None) -> pd.DataFrame:
+    """long 형식 DataFrame — listing_id, date, weekday, demand, price."""
+    n, days = cal["price"].shape
+    ids = np.arange(n) if listing_ids is None else np.asarray(listing_ids)
+    dow_idx = (cal["dates"].astype(np.int64) - 4) % 7
+    return pd.DataFrame({
+        "listing_id": np.repeat(ids, days),
+        "date": np.tile(cal["dates"].astype(str), n),
+        "weekday": np.tile(WEEKDAY_KR[dow_idx], n),
+        "demand": np.round(cal["demand"].ravel(), 3),
+        "price": cal["price"].ravel().astype(np.int64),
+    })
+
+
+def to_csv(cal: dict, listing_ids=None) -> bytes:
+    """to_frame() 을 UTF-8 BOM CSV 로 (엑셀에서 한글 요일이 깨지지 않도록)."""
+    return to_frame(cal, listing_ids).to_csv(index=False).encode("utf-8-sig")
+
+
+def to_ical(cal: dict, row: int = 0, name: str = "추천 요금") -> bytes:
+    """한 리스팅의 날짜별 추천 요금을 종일 이벤트 VCALENDAR 로 (booking_import 가 읽는 형식과 같은 줄 규칙)."""
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%SZ")
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//airbnb-revpar//price-calendar//KO",
+             "CALSCALE:GREGORIAN", f"X-WR-CALNAME:{name}"]
+    days = cal["dates"].astype("datetime64[D]").astype(object)
+    for d, p in zip(days, cal["price"][row].astype(np.int64)):
+        ymd = d.strftime("%Y%m%d")
+        lines += ["BEGIN:VEVENT", f"UID:price-{row}-{ymd}", f"DTSTAMP:{stamp}",
+                  f"DTSTART;VALUE=DATE:{ymd}", f"DTEND;VALUE=DATE:{(d + timedelta(days=1)):%Y%m%d}",
+                  f"SUMMARY:₩{p:,}", "TRANSP:TRANSPARENT", "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+
+    ap = argparse.ArgumentParser(description="365일 추천 요금 캘린더 배치 생성")
+    ap.add_argument("listings", nargs="?", help="data/raw/seoul_airbnb_cleaned.csv (생략 시 합성)")
+    ap.add_argument("--n", type=int, default=5_000, help="합성 리스팅 수")
+    ap.add_argument("--out", help="long CSV 저장 경로")
+    args = ap.parse_args()
+
+    start = date.today() + timedelta(days=1)
+    timings = {}
+    t0 = time.perf_counter()
+    if args.listings:
+        from district_stats import DistrictStatsIndex
+        from elasticity import ElasticityTable
+        from predict_utils import load_models, predict_revpar_batch
+        from seasonality import SeasonalityProfiles
+        from supply_shock import model_frame
+
+        pkg = Path(__file__).parent
+        raw = pd.read_csv(args.listings)
+        if "refined_status" in raw.columns:
+            raw = raw[(raw["refined_status"] == "Active") & (raw["operation_status"] == "Operating")]
+        lookup = pd.read_csv(pkg / "district_lookup.csv")
+        frame = model_frame(raw, lookup, DistrictStatsIndex.load())
+        timings["입력 준비"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        base = predict_revpar_batch(frame, **load_models())["ADR_pred"].to_numpy()
+        timings["모델 ADR"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        season = SeasonalityProfiles.load().lookup(frame["district"], frame["cluster"])
+        names = frame["district"].map(pd.read_csv(pkg.parent / "data" / "processed" / "district_clustered.csv",
+                                                  encoding="utf-8-sig").set_index("district")["cluster_name"])
+        table = ElasticityTable.load()
+        el = np.array([(table.lookup(c, r) or {"elasticity": -1.1})["elasticity"]   # 표가 없으면 중가 균형시장 기본값
+                       for c, r in zip(names, frame["room_type"])])
+        dow = np.ones((len(frame), 7))
+        ids = np.arange(len(frame))
+        timings["계절성·탄력성 조회"] = time.perf_counter() - t0
+    else:
+        rng = np.random.default_rng(0)
+        n = args.n
+        base = rng.lognormal(11.4, 0.5, n)
+        t = np.arange(12)
+        season = 1 + rng.uniform(0.05, 0.3, (n, 1)) * np.cos(2 * np.pi * (t[None, :] - 6.5) / 12)
+        season /= season.mean(axis=1, keepdims=True)
+        dow = dow_factors(rng.uniform(0.3, 0.8, n), rng.uniform(0.4, 1.0, n), n_days=rng.integers(0, 31, n))
+        el = rng.uniform(-1.6, -0.6, n)
+        ids = np.arange(n)
+        timings["합성 입력"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cal = price_calendar(base, start, season, dow, el)
+    timings["캘린더 계산"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    data = to_csv(cal, ids)
+    timings["CSV 직렬화"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    ics = to_ical(cal, 0)
+    timings["iCal 1건"] = time.perf_counter() - t0
+
+    n = len(base)
+    print(f"[요금 캘린더] 리스팅 {n:,}개 × 365일 = {n * 365:,}박 ({start} ~)")
+    for k, v in timings.items():
+        print(f"  {k:14s} {v * 1000:9.1f} ms")
+    p = cal["price"][0]
+    print(f"  첫 리스팅: 기준 ₩{base[0]:,.0f} → 최저 ₩{p.min():,.0f} · 최고 ₩{p.max():,.0f} · 평균 ₩{p.mean():,.0f}")
+    print(f"  CSV {len(data) / 2**20:.1f} MB · iCal {len(ics) / 1024:.0f} KB")
+    if args.out:
+        Path(args.out).write_bytes(data)
+        print(f"  → {args.out}")
@@ -0,0 +1,278 @@
+"""
+seasonality.py — 월별 계절성 프로필 + 12개월 수익 전망
+======================================================
+
+사용법:
+    # 월별 스냅샷(파일명에 YYYY_MM)으로 프로필 추정 → seasonality_profiles.csv
+    python seasonality.py build data/raw/snapshot_2025_08.csv data/raw/snapshot_2025_10.csv ...
+
+    from seasonality import SeasonalityProfiles, project_12m
+
+    profiles = SeasonalityProfiles.load()             # 파일이 없으면 평탄 프로필 (전부 1.0)
+    season = profiles.lookup(["Mapo-gu"], [0])        # (n, 12) 월별 지수 (평균 1.0)
+    out = project_12m(revpar, opex, 2025, 11, season, trend=None, fee_rate=0.03)
+    out["revenue"], out["profit"]                     # (n, 12) — 리스팅 수와 무관하게 배열 연산 1회
+
+계절성 추정:
+    스냅샷마다 리스팅의 l90d_revpar / ttm_revpar (둘 다 일평균 RevPAR) 는
+    "스냅샷 직전 3개월 평균 지수" 입니다. 여러 달의 스냅샷에서 그룹별 중앙값을 모은 뒤,
+    3개월 이동평균을 되돌리는 최소제곱 (인접 월 평활화 + 평균 1 제약) 으로 12개월 지수를 풉니다.
+    관측된 달이 적으면 평활화 항이 나머지 달을 채웁니다.
+    자치구 프로필은 클러스터 프로필로, 클러스터 프로필은 서울 전체 프로필로
+    리스팅 수 n / (n + shrink) 비율만큼 수축합니다.
+
+전망 계산:
+    월 매출 = 기준 RevPAR × 계절 지수[월] × 추세 배율[k] × 그 달의 일수 (calendar.monthrange)
+    월 순이익 = 월 매출 × (1 - 수수료율) - 월 운영비
+    추세 배율 = 1 + trend × decay^k  — 최근 모멘텀이 몇 달에 걸쳐 사라진다고 가정
+"""
+
+import calendar
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROFILES_PATH = Path(__file__).parent / "seasonality_profiles.csv"
+MONTH_COLS = [f"m{m:02d}" for m in range(1, 13)]
+
+# 3개월 창 비율의 이상치 절단 (신규·휴면 리스팅의 극단값)
+_RATIO_CLIP = (0.2, 5.0)
+
+
+def window_ratios(snapshots: pd.DataFrame, by: str | None = None) -> pd.DataFrame:
+    """스냅샷 행 → (그룹, snapshot_month) 별 l90d/ttm 중앙값과 리스팅 수.
+
+    snapshots 컬럼: snapshot_month (1~12), l90d_revpar, ttm_revpar, [by]
+    """
+    ok = (snapshots["ttm_revpar"] > 0) & (snapshots["l90d_revpar"] >= 0)
+    s = snapshots.loc[ok].copy()
+    s["ratio"] = (s["l90d_revpar"] / s["ttm_revpar"]).clip(*_RATIO_CLIP)
+    keys = [by, "snapshot_month"] if by else ["snapshot_month"]
+    return s.groupby(keys)["ratio"].agg(ratio="median", n="size").reset_index()
+
+
+def fit_profile(ratios: dict[int, float], smooth: float = 0.3) -> np.ndarray:
+    """{스냅샷 월: 직전 3개월 평균 지수} → 12개월 지수 (평균 1.0).
+
+    창 관측식 (s[m-2] + s[m-1] + s[m]) / 3 = r, 순환 인접 차분 평활화, 평균 1 제약을
+    한 번의 최소제곱으로 풉니다. 관측이 없으면 전부 1.0.
+    """
+    rows, rhs = [], []
+    for m, r in ratios.items():
+        a = np.zeros(12)
+        a[[(m - 3) % 12, (m - 2) % 12, (m - 1) % 12]] = 1.0 / 3.0
+        rows.append(a)
+        rhs.append(r)
+    d = np.eye(12) - np.roll(np.eye(12), 1, axis=1)  # s[m] - s[m+1]
+    rows.extend(np.sqrt(smooth) * d)
+    rhs.extend(np.zeros(12))
+    rows.append(np.full(12, 10.0 / 12.0))  # 평균 1 제약 (가중치 10)
+    rhs.append(10.0)
+    s, *_ = np.linalg.lstsq(np.array(rows), np.array(rhs), rcond=None)
+    s = np.clip(s, 0.05, None)
+    return s / s.mean()
+
+
+class SeasonalityProfiles:
+    """자치구 → 클러스터 → 서울 전체 순으로 찾는 (12,) 월별 지수 테이블."""
+
+    def __init__(self, table: pd.DataFrame):
+        # table 컬럼: level ('district'|'cluster'|'all'), key, n, m01..m12
+        self.table = table.reset_index(drop=True)
+        t = self.table
+        self._values = t[MONTH_COLS].to_numpy(dtype=np.float64)
+        self._district = {k: i for i, k in enumerate(t["key"]) if t.at[i, "level"] == "district"}
+        self._cluster = {int(k): i for i, k in enumerate(t["key"]) if t.at[i, "level"] == "cluster"}
+        pooled = np.flatnonzero(t["level"].to_numpy() == "all")
+        self._pooled = self._values[pooled[0]] if len(pooled) else np.ones(12)
+
+    @property
+    def is_flat(self) -> bool:
+        return bool(np.allclose(self._values, 1.0)) if len(self._values) else True
+
+    @classmethod
+    def flat(cls) -> "SeasonalityProfiles":
+        return cls(pd.DataFrame([{"level": "all", "key": "all", "n": 0, **dict.fromkeys(MONTH_COLS, 1.0)}]))
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> "SeasonalityProfiles":
+        p = Path(path) if path else PROFILES_PATH
+        if not p.exists():
+            return cls.flat()
+        return cls(pd.read_csv(p, dtype={"key": str}))
+
+    def save(self, path: str | Path | None = None) -> Path:
+        p = Path(path) if path else PROFILES_PATH
+        self.table.to_csv(p, index=False, float_format="%.4f")
+        return p
+
+    @classmethod
+    def from_snapshots(cls, snapshots: pd.DataFrame, shrink: float = 200.0,
+                       smooth: float = 0.3) -> "SeasonalityProfiles":
+        """스냅샷 DataFrame (snapshot_month, l90d_revpar, ttm_revpar, district, cluster) 에서 추정."""
+        def fit(ratios: pd.DataFrame) -> tuple[np.ndarray, int]:
+            return fit_profile(dict(zip(ratios["snapshot_month"], ratios["ratio"])), smooth), int(ratios["n"].sum())
+
+        pooled, n_all = fit(window_ratios(snapshots))
+        records = [{"level": "all", "key": "all", "n": n_all, **dict(zip(MONTH_COLS, pooled))}]
+
+        cluster_prof = {}
+        for c, g in window_ratios(snapshots, "cluster").groupby("cluster"):
+            s, n = fit(g)
+            w = n / (n + shrink)
+            cluster_prof[int(c)] = w * s + (1 - w) * pooled
+            records.append({"level": "cluster", "key": str(int(c)), "n": n,
+                            **dict(zip(MONTH_COLS, cluster_prof[int(c)]))})
+
+        district_cluster = snapshots.groupby("district")["cluster"].agg(lambda x: int(x.mode().iloc[0]))
+        for d, g in window_ratios(snapshots, "district").groupby("district"):
+            s, n = fit(g)
+            w = n / (n + shrink)
+            parent = cluster_prof.get(int(district_cluster[d]), pooled)
+            records.append({"level": "district", "key": d, "n": n, **dict(zip(MONTH_COLS, w * s + (1 - w) * parent))})
+        return cls(pd.DataFrame(records))
+
+    def profile(self, district: str | None = None, cluster: int | None = None) -> np.ndarray:
+        """(12,) 월별 지수 — 1월이 인덱스 0."""
+        i = self._district.get(district)
+        if i is None and cluster is not None:
+            i = self._cluster.get(int(cluster))
+        return self._values[i] if i is not None else self._pooled
+
+    def lookup(self, districts, clusters=None) -> np.ndarray:
+        """(n, 12) — 리스팅별 자치구(없으면 클러스터, 그것도 없으면 서울 전체) 프로필."""
+        values = np.vstack([self._values, self._pooled])  # 마지막 행 = 서울 전체
+        pooled = len(values) - 1
+        rows = pd.Series(np.asarray(districts, dtype=object)).map(self._district)
+        if clusters is not None:
+            rows = rows.fillna(pd.Series(pd.to_numeric(np.asarray(clusters), errors="coerce")).map(self._cluster))
+        return values[rows.fillna(pooled).to_numpy(dtype=np.int64)]
+
+
+def trend_from_revpar(ttm_revpar, l90d_revpar, season: np.ndarray, snapshot_month: int) -> np.ndarray:
+    """l90d/ttm 모멘텀에서 계절 효과(직전 3개월 평균 지수)를 뺀 추세 (0 = 평년 수준).
+
+    predict_revpar 의 revpar_trend 와 달리 두 값을 모두 일평균 RevPAR 로 봅니다.
+    """
+    season = np.atleast_2d(season)
+    window = season[:, [(snapshot_month - 3) % 12, (snapshot_month - 2) % 12, (snapshot_month - 1) % 12]].mean(axis=1)
+    ttm = np.asarray(ttm_revpar, dtype=np.float64)
+    ratio = np.where(ttm > 0, np.asarray(l90d_revpar, dtype=np.float64) / np.where(ttm > 0, ttm, 1.0), 1.0)
+    return np.clip(ratio, *_RATIO_CLIP) / window - 1.0
+
+
+def project_12m(
+    revpar,
+    opex_per_month,
+    start_year: int,
+    start_month: int,
+    season: np.ndarray,
+    trend=None,
+    *,
+    months: int = 12,
+    fee_rate: float = 0.0,
+    trend_decay: float = 0.8,
+    trend_cap: float = 0.5,
+) -> dict:
+    """리스팅 n개 × months 개월 매출·순이익 전망 (브로드캐스팅 1회).
+
+    Parameters
+    ----------
+    revpar : float | array (n,)
+        계절성을 뺀 기준(연평균) 일 RevPAR (원). predict_revpar 의 RevPAR_pred 등.
+    opex_per_month : float | array (n,)
+        월 운영비 (원).
+    start_year, start_month : int
+        전망 첫 달.
+    season : array (12,) | (n, 12)
+        SeasonalityProfiles.profile / lookup 결과.
+    trend : float | array (n,) | None
+        trend_from_revpar 결과 (±trend_cap 으로 절단). None 이면 0.
+    fee_rate : float
+        플랫폼 수수료율 (app.py 손익계산서는 0.03).
+
+    Returns
+    -------
+    dict with keys:
+        months  : list[(int, int)] — (연, 월)
+        days    : ndarray (months,) — 그 달의 일수
+        revenue : ndarray (n, months) — 월 매출 (원)
+        profit  : ndarray (n, months) — 월 순이익 (원)
+    """
+    ym = [divmod(start_year * 12 + start_month - 1 + k, 12) for k in range(months)]
+    ym = [(y, m + 1) for y, m in ym]
+    days = np.array([calendar.monthrange(y, m)[1] for y, m in ym], dtype=np.float64)
+    month_idx = np.array([m - 1 for _, m in ym])
+
+    revpar = np.atleast_1d(np.asarray(revpar, dtype=np.float64))
+    season = np.atleast_2d(np.asarray(season, dtype=np.float64))[:, month_idx]
+    t = np.zeros_like(revpar) if trend is None else np.clip(np.atleast_1d(np.asarray(trend, dtype=np.float64)),
+                                                            -trend_cap, trend_cap)
+    trend_mult = 1.0 + t[:, None] * trend_decay ** np.arange(1, months + 1)[None, :]
+
+    revenue = revpar[:, None] * season * trend_mult * days[None, :]
+    opex = np.atleast_1d(np.asarray(opex_per_month, dtype=np.float64))[:, None]
+    return {"months": ym, "days": days, "revenue": revenue, "profit": revenue * (1.0 - fee_rate) - opex}
+
+
+def _load_snapshot(path: Path) -> pd.DataFrame:
+    """파일명 YYYY_MM → snapshot_month, district_lookup.csv 로 cluster 부여."""
+    m = re.search(r"(\d{4})[_-](\d{2})", path.stem)
+    if m is None:
+        raise ValueError(f"파일명에서 스냅샷 연·월(YYYY_MM)을 찾을 수 없습니다: {path.name}")
+    df = pd.read_csv(path, usecols=lambda c: c in {"district", "ttm_revpar", "l90d_revpar", "cluster"})
+    if "cluster" not in df.columns:
+        lookup = pd.read_csv(Path(__file__).parent / "district_lookup.csv", usecols=["district", "cluster"])
+        df = df.merge(lookup, on="district", how="left")
+    df["snapshot_month"] = int(m.group(2))
+    return df.dropna(subset=["district", "cluster"])
+
+
+# ── CLI / 벤치마크 (직접 실행 시) ─────────────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) > 2 and sys.argv[1] == "build":
+        snaps = pd.concat([_load_snapshot(Path(p)) for p in sys.argv[2:]], ignore_index=True)
+        profiles = SeasonalityProfiles.from_snapshots(snaps)
+        p = profiles.save()
+        months = sorted(int(m) for m in snaps["snapshot_month"].unique())
+        print(f"[계절성] 스냅샷 {len(sys.argv) - 2}개 (월 {months}) · {len(snaps):,}행 → {p}")
+        print("  서울 전체: " + " ".join(f"{v:.2f}" for v in profiles.profile()))
+        sys.exit(0)
+
+    # 실제 스냅샷이 없으면 알려진 계절 곡선으로 합성한 12개월 스냅샷으로 추정 정확도·속도만 확인
+    rng = np.random.default_rng(0)
+    ao = pd.read_csv(Path(__file__).parent / "cluster_listings_ao.csv", usecols=["district", "cluster"])
+    true = 1.0 + 0.25 * np.cos(2 * np.pi * (np.arange(12) - 6.5) / 12)  # 7~8월 성수기
+    true /= true.mean()
+    window_true = np.array([true[[(m - 3) % 12, (m - 2) % 12, (m - 1) % 12]].mean() for m in range(1, 13)])
+    snaps = pd.concat([
+        ao.assign(snapshot_month=m, ttm_revpar=rng.lognormal(10.5, 0.6, len(ao)))
+          .assign(l90d_revpar=lambda d, m=m: d["ttm_revpar"] * window_true[m - 1] * rng.lognormal(0, 0.3, len(d)))
+        for m in range(1, 13)
+    ], ignore_index=True)
+
+    t0 = time.perf_counter()
+    profiles = SeasonalityProfiles.from_snapshots(snaps)
+    t_fit = (time.perf_counter() - t0) * 1000
+    err = float(np.max(np.abs(profiles.profile() - true)))
+
+    n = len(ao)
+    revpar = rng.lognormal(10.5, 0.6, n)
+    t0 = time.perf_counter()
+    season = profiles.lookup(ao["district"], ao["cluster"])
+    t_lookup = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    out = project_12m(revpar, 500_000, 2025, 11, season, trend=rng.normal(0, 0.1, n), fee_rate=0.03)
+    t_proj = (time.perf_counter() - t0) * 1000
+
+    print(f"[계절성] 합성 스냅샷 {len(snaps):,}행 · 프로필 {len(profiles.table)}개 추정 {t_fit:.0f} ms "
+          f"(실제 곡선 대비 최대 오차 {err:.3f})")
+    print("  서울 전체: " + " ".join(f"{m}월 {v:.2f}" for m, v in zip(range(1, 13), profiles.profile())))
+    print(f"  12개월 전망 {n:,}개 리스팅: 프로필 조회 {t_lookup:.1f} ms · 계산 {t_proj:.2f} ms "
+          f"→ {out['revenue'].shape}")
+    print(f"  첫 리스팅: " + " ".join(f"{m}월 ₩{r / 10000:.0f}만" for (_, m), r in zip(out["months"], out["revenue"][0])))
@@ -0,0 +1,255 @@
+"""
+supply_shock.py — 자치구 공급 변화 시나리오 (Model A·B 배치 재채점)
+===================================================================
+
+사용법:
+    from predict_utils import load_models
+    from supply_shock import model_frame, simulate_supply_shock, supply_grid
+
+    artifacts = load_models()
+    frame = model_frame(active_listings, district_lookup, stats)     # 원본 AO 리스팅 → 모델 입력
+    grid = supply_grid(3270)            # 마포구 숙소 수 기준 (-1635, -818, -327, 0, 327, 818, 1635, 3270)
+    res = simulate_supply_shock(frame[frame["district"] == "Mapo-gu"], grid, **artifacts)
+    res.summary()                       # 공급 변화별 ADR·RevPAR 변화율 분포 (p10 / p50 / p90 …)
+    res.revpar_shift[res.index(818)]    # 집 전체 818개 (+25%) 가 더 생길 때 리스팅별 RevPAR 변화율
+
+    # 전 자치구 × 그리드 벤치마크
+    python supply_shock.py data/raw/seoul_airbnb_cleaned.csv
+
+시나리오:
+    자치구에 숙소 added 개가 새로 생기면 (음수면 사라지면) Model A 의 자치구 피처 3개가
+        district_listing_count'    = count + added
+        district_entire_home_rate' = (rate × count + added × new_entire_share) / count'
+        district_superhost_rate'   = (rate × count + added × new_superhost_share) / count'
+    로 바뀝니다. 새 숙소는 기본값으로 전부 집 전체, 슈퍼호스트 0% (신규 호스트) 로 가정합니다.
+    district_median_revpar 는 공급 변화의 "결과" 이므로 고정합니다.
+    그리드는 자치구 숙소 수에 대한 비율 (SUPPLY_STEPS, -50% ~ +100%) 로 정합니다 — 고정 개수를 쓰면
+    작은 구 (금천구 33개) 에서 감소 시나리오가 숙소 수 1 로 잘리고 증가는 10배 넘는 외삽이 됩니다.
+    Model A 의 ADR 이 바뀌면 Model B 의 price_gap (현재 요금 - 적정 ADR) 도 바뀌어
+    예약률·RevPAR 까지 함께 움직입니다.
+
+배치:
+    리스팅 n개 × 그리드 G개를 (G·n) 행 하나로 펼쳐 predict_revpar_batch 1회로 채점합니다.
+    행마다 자기 자치구의 기준 피처에 충격을 적용하므로 여러 자치구를 한 번에 넣어도 됩니다.
+    added = 0 (기준) 은 항상 그리드에 포함되며 변화율의 분모가 됩니다.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from predict_utils import get_photos_tier, get_poi_dist_category, predict_revpar_batch
+
+SUPPLY_STEPS = (-0.5, -0.25, -0.1, 0.0, 0.1, 0.25, 0.5, 1.0)   # 자치구 숙소 수 대비 공급 변화
+SHOCK_COLS = ("district_listing_count", "district_entire_home_rate", "district_superhost_rate")
+DISTRICT_COLS = ("cluster", "district_median_revpar", *SHOCK_COLS, "ttm_pop")
+QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+# 원본에 없을 수 있는 모델 입력의 기본값 (predict_utils 입력 설명 기준)
+_DEFAULTS = {
+    "nearest_poi_type_name": "관광지",
+    "extra_guest_fee_policy": "0",
+    "rating_overall": 4.5,
+    "num_reviews": 0,
+    "photos_count": 0,
+    "min_nights": 2,
+    "instant_book": 0,
+    "superhost": 0,
+    "nearest_poi_dist_km": 0.5,
+}
+
+
+def _flag(s: pd.Series) -> np.ndarray:
+    """True/False · t/f · 1/0 혼재 컬럼 → 0/1 int."""
+    if s.dtype == bool:
+        return s.to_numpy(dtype=np.int64)
+    return s.astype(str).str.strip().str.lower().isin(("true", "t", "1", "1.0", "yes", "y")).to_numpy(dtype=np.int64)
+
+
+def model_frame(listings: pd.DataFrame, district_lookup: pd.DataFrame, stats=None) -> pd.DataFrame:
+    """원본 Active+Operating 리스팅 → predict_revpar_batch 입력 (district 컬럼 유지).
+
+    Parameters
+    ----------
+    listings : pd.DataFrame
+        district, room_type, bedrooms, baths, guests 와 운영 컬럼 (없는 컬럼은 _DEFAULTS).
+    district_lookup : pd.DataFrame
+        district_lookup.csv (district 인덱스 또는 컬럼).
+    stats : DistrictStatsIndex | None
+        주면 *_rel_dist 4개를 자치구 평균 기준으로 채웁니다 (없으면 1.0).
+    """
+    lookup = district_lookup if "district" not in district_lookup.columns else district_lookup.set_index("district")
+    df = listings[listings["district"].isin(lookup.index)].reset_index(drop=True)
+    out = pd.DataFrame({"district": df["district"].to_numpy(), "room_type": df["room_type"].astype(str).to_numpy()})
+    for c in ("bedrooms", "baths", "guests"):
+        v = pd.to_numeric(df[c], errors="coerce")
+        out[c] = v.fillna(v.median()).to_numpy()
+    for c, default in _DEFAULTS.items():
+        if c not in df.columns:
+            out[c] = default
+        elif c in ("instant_book", "superhost"):
+            out[c] = _flag(df[c])
+        elif isinstance(default, str):
+            out[c] = df[c].fillna(default).astype(str).to_numpy()
+        else:
+            out[c] = pd.to_numeric(df[c], errors="coerce").fillna(default).to_numpy()
+    out["extra_guest_fee_policy"] = out["extra_guest_fee_policy"].str.replace(r"\.0$", "", regex=True)
+    out["poi_dist_category"] = [get_poi_dist_category(d) for d in out["nearest_poi_dist_km"]]
+    out["photos_tier"] = [get_photos_tier(p) for p in out["photos_count"]]
+    out["is_active_operating"] = 1
+    if "ttm_avg_rate" in df.columns:
+        out["ttm_avg_rate"] = pd.to_numeric(df["ttm_avg_rate"], errors="coerce").to_numpy()
+    for c in DISTRICT_COLS:
+        out[c] = lookup[c].reindex(out["district"]).to_numpy()
+    return stats.assemble_batch(out) if stats is not None else out
+
+
+def supply_grid(count: float, steps=SUPPLY_STEPS) -> tuple[int, ...]:
+    """자치구 숙소 수 count 기준 공급 변화 그리드 (정수, 중복 제거, 항상 added > -count · 0 포함)."""
+    added = {0, *(int(round(count * s)) for s in steps)}
+    return tuple(sorted(a for a in added if a > -count))
+
+
+def shocked_features(base: pd.DataFrame, added, new_entire_share: float = 1.0,
+                     new_superhost_share: float = 0.0) -> dict:
+    """기준 자치구 피처 (n행) × 공급 변화 (G,) → {피처: (G, n) 배열}."""
+    added = np.asarray(added, dtype=np.float64)[:, None]
+    count = base["district_listing_count"].to_numpy(dtype=np.float64)[None, :]
+    new_count = np.maximum(count + added, 1.0)
+    out = {"district_listing_count": new_count}
+    for col, share in (("district_entire_home_rate", new_entire_share),
+                       ("district_superhost_rate", new_superhost_share)):
+        rate = base[col].to_numpy(dtype=np.float64)[None, :]
+        # 공급이 줄 때는 새 숙소와 같은 구성의 숙소가 빠진다고 보고 같은 식 그대로 적용
+        out[col] = np.clip((rate * count + added * share) / new_count, 0.0, 1.0)
+    return out
+
+
+class SupplyShockResult:
+    """공급 변화 그리드 × 리스팅 예측 결과. 행 = 그리드, 열 = 리스팅."""
+
+    def __init__(self, grid, districts, features: dict, adr: np.ndarray, revpar: np.ndarray):
+        self.grid = np.asarray(grid)
+        self.districts = np.asarray(districts)
+        self.features = features
+        self.adr = adr
+        self.revpar = revpar
+        base = self.index(0)
+        self.adr_shift = adr / np.where(adr[base] > 0, adr[base], np.nan) - 1.0
+        self.revpar_shift = revpar / np.where(revpar[base] > 0, revpar[base], np.nan) - 1.0
+
+    def index(self, added: int) -> int:
+        hit = np.flatnonzero(self.grid == added)
+        if not len(hit):
+            raise KeyError(f"그리드에 없는 공급 변화: {added} (가능: {self.grid.tolist()})")
+        return int(hit[0])
+
+    def summary(self, by_district: bool = False) -> pd.DataFrame:
+        """그리드 (× 자치구) 별 변화율 분포 — 컬럼 adr_p10 … revpar_p90, *_mean, n."""
+        keys = np.unique(self.districts) if by_district else [None]
+        records = []
+        for d in keys:
+            cols = np.flatnonzero(self.districts == d) if d is not None else slice(None)
+            a, r = self.adr_shift[:, cols], self.revpar_shift[:, cols]
+            qa, qr = np.nanquantile(a, QUANTILES, axis=1), np.nanquantile(r, QUANTILES, axis=1)
+            first = cols[0] if d is not None else 0
+            for g, added in enumerate(self.grid):
+                rec = {"added": int(added), "n": a.shape[1]}
+                if d is not None:
+                    rec["district"] = d
+                rec.update({c: float(self.features[c][g, first]) for c in SHOCK_COLS})
+                rec.update({f"adr_p{int(q * 100)}": qa[k, g] for k, q in enumerate(QUANTILES)})
+                rec.update({f"revpar_p{int(q * 100)}": qr[k, g] for k, q in enumerate(QUANTILES)})
+                rec["adr_mean"], rec["revpar_mean"] = float(np.nanmean(a[g])), float(np.nanmean(r[g]))
+                records.append(rec)
+        return pd.DataFrame(records)
+
+
+def simulate_supply_shock(
+    frame: pd.DataFrame,
+    grid,
+    *,
+    new_entire_share: float = 1.0,
+    new_superhost_share: float = 0.0,
+    model_A,
+    model_B,
+    iso_reg,
+    encoders: dict,
+    feature_config: dict,
+) -> SupplyShockResult:
+    """리스팅 n개 × 공급 변화 G개를 한 번의 배치 예측으로 재채점합니다.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        model_frame() 결과 또는 predict_revpar 입력과 같은 컬럼의 DataFrame
+        (app.py 의 _listing 한 건도 가능). district 컬럼이 있으면 요약을 자치구별로 나눌 수 있습니다.
+    grid : sequence of int
+        새로 생기는 숙소 수 (supply_grid). 0 이 없으면 자동으로 추가합니다.
+    new_entire_share, new_superhost_share : float
+        새 숙소 중 집 전체 / 슈퍼호스트 비율.
+    **artifacts
+        load_models() 반환값을 그대로 언패킹해서 전달.
+    """
+    grid = np.array(sorted({0, *(int(g) for g in grid)}))
+    frame = frame.reset_index(drop=True)
+    n, n_grid = len(frame), len(grid)
+    feats = shocked_features(frame, grid, new_entire_share, new_superhost_share)
+
+    rows = frame.iloc[np.tile(np.arange(n), n_grid)].reset_index(drop=True)
+    for col, values in feats.items():
+        rows[col] = values.ravel()
+    pred = predict_revpar_batch(rows, model_A=model_A, model_B=model_B, iso_reg=iso_reg,
+                                encoders=encoders, feature_config=feature_config)
+    districts = frame["district"].to_numpy() if "district" in frame.columns else np.full(n, None)
+    return SupplyShockResult(grid, districts, feats,
+                             pred["ADR_pred"].to_numpy().reshape(n_grid, n),
+                             pred["RevPAR_pred"].to_numpy().reshape(n_grid, n))
+
+
+# ── 벤치마크 (직접 실행 시) ───────────────────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+
+    from district_stats import DistrictStatsIndex
+    from predict_utils import load_models
+
+    if len(sys.argv) < 2:
+        sys.exit("사용법: python supply_shock.py data/raw/seoul_airbnb_cleaned.csv")
+
+    pkg = Path(__file__).parent
+    artifacts = load_models()
+    lookup = pd.read_csv(pkg / "district_lookup.csv")
+    raw = pd.read_csv(sys.argv[1])
+    if "refined_status" in raw.columns:
+        raw = raw[(raw["refined_status"] == "Active") & (raw["operation_status"] == "Operating")]
+
+    t0 = time.perf_counter()
+    frame = model_frame(raw, lookup, DistrictStatsIndex.load())
+    t_prep = (time.perf_counter() - t0) * 1000
+
+    counts = lookup.set_index("district")["district_listing_count"]
+    t0 = time.perf_counter()
+    summary = pd.concat([
+        simulate_supply_shock(g, supply_grid(counts[d]), **artifacts).summary(by_district=True)
+        for d, g in frame.groupby("district")
+    ], ignore_index=True)
+    t_all = time.perf_counter() - t0
+
+    one = frame[frame["district"] == "Mapo-gu"]
+    grid = supply_grid(counts["Mapo-gu"])
+    t0 = time.perf_counter()
+    simulate_supply_shock(one, grid, **artifacts)
+    t_one = (time.perf_counter() - t0) * 1000
+
+    print(f"[공급 충격] AO 리스팅 {len(frame):,}개 모델 입력 준비 {t_prep:.0f} ms")
+    print(f"  전 자치구 × 자치구별 그리드 ({len(SUPPLY_STEPS)}단계) = {int(summary['n'].sum()):,}행 "
+          f"배치 채점 {t_all:.2f} s")
+    print(f"  마포구 {len(one):,}개 × {len(grid)} 재채점 {t_one:.0f} ms (슬라이더는 캐시된 결과를 인덱싱)")
+    print("  자치구별 집 전체 +25% → ADR 변화율 중앙값 [p10, p90] / RevPAR 변화율 중앙값")
+    plus = summary[summary["added"] == [int(round(counts[d] * 0.25)) for d in summary["district"]]]
+    for _, r in plus.sort_values("adr_p50").iterrows():
+        print(f"    {r['district']:16s} n={r['n']:5,d} +{r['added']:4d}  ADR {r['adr_p50']:+6.1%} "
+              f"[{r['adr_p10']:+6.1%}, {r['adr_p90']:+6.1%}]  RevPAR {r['revpar_p50']:+6.1%}")
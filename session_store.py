@@ -0,0 +1,354 @@
+"""
+session_store.py — 세션 상태 압축 스냅샷 + 유휴 세션 메모리 반납
+================================================================
+
+사용법 (app.py):
+    vault = get_session_vault()                   # st.cache_resource, 프로세스당 1개
+    session_id, state = current_session()         # Streamlit 세션 id + 세션 수명 동안 유지되는 SessionState
+    if "step" not in st.session_state:
+        st.session_state.update(vault.restore(session_id) or {})
+    init_state()
+    vault.touch(session_id, state)
+
+CompactSession:
+    init_state() 가 만드는 40여 개 키를 slots dataclass 하나로 표현합니다.
+        - 자치구 / 숙소 종류 / 호스터 유형 / 인테리어 스타일 → 정수 코드
+        - booked_days (set of int) → 31비트 마스크
+        - 체크박스 3개 + 위치 확인 여부 → 플래그 바이트
+    to_bytes() 는 struct 고정 레이아웃 + 주소 문자열로 ~160바이트 블롭을 만듭니다.
+
+SessionVault:
+    세션마다 마지막 실행 시각을 기록하고, idle_seconds 이상 조용한 세션의
+    상태 키를 블롭으로 바꿔 보관한 뒤 SessionState 에서 삭제합니다.
+    사용자가 돌아와 rerun 하면 restore() 로 복원해 이어서 진행합니다.
+
+    블롭의 키는 Streamlit 세션 id 입니다 — URL 등 다른 사람에게 넘어갈 수 있는 값이 아니라
+    같은 브라우저 세션만 자기 상태를 되찾습니다. 기록하는 상태는 실행마다 새로 만들어지는
+    SafeSessionState 래퍼가 아니라 그 안의 세션 SessionState 이고, is_alive(session_id) 가 False 인
+    (닫힌) 세션은 스윕 때 참조와 블롭을 함께 버립니다.
+
+메모리 비교는 `python session_store.py` 로 확인할 수 있습니다.
+"""
+
+import math
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, fields
+
+from calendar_bits import days_to_mask, mask_to_days
+
+DISTRICTS = (
+    "Dobong-gu", "Dongdaemun-gu", "Dongjak-gu", "Eunpyeong-gu", "Gangbuk-gu",
+    "Gangdong-gu", "Gangnam-gu", "Gangseo-gu", "Geumcheon-gu", "Guro-gu",
+    "Gwanak-gu", "Gwangjin-gu", "Jongno-gu", "Jung-gu", "Jungnang-gu",
+    "Mapo-gu", "Nowon-gu", "Seocho-gu", "Seodaemun-gu", "Seongbuk-gu",
+    "Seongdong-gu", "Songpa-gu", "Yangcheon-gu", "Yeongdeungpo-gu", "Yongsan-gu",
+)
+ROOM_TYPES = ("entire_home", "private_room", "hotel_room", "shared_room")
+HOST_TYPES = (None, "new", "existing")
+ROOM_STYLES = ("모던/미니멀", "빈티지/레트로", "한옥/전통", "아늑/가정적", "럭셔리/프리미엄")
+
+OPEX_KEYS = ("opex_elec", "opex_water", "opex_mgmt", "opex_net", "opex_clean", "opex_loan", "opex_etc")
+
+# init_state() 가 관리하는 키 — 유휴 세션에서 삭제·복원 대상
+SESSION_KEYS = (
+    "step", "host_type", "district", "room_type",
+    "my_adr", "my_occ_pct", "weekday_occ_pct", "weekend_occ_pct",
+    "weekdays_booked", "weekends_booked", "weekdays_total", "weekends_total",
+    *OPEX_KEYS,
+    "my_photos", "my_superhost", "my_instant", "my_extra_fee", "my_min_nights",
+    "my_rating", "my_reviews",
+    "my_guests", "my_bedrooms", "my_baths_count", "my_beds", "my_room_style",
+    "calendar_year", "calendar_month", "booked_days",
+    "my_address", "my_lat", "my_lng", "my_location_name", "location_confirmed",
+)
+
+_BLOB_VERSION = 1
+# version, step, host, district, room, style, flags, cal_month, cal_year, booked_mask,
+# occ/wd/we pct, wd/we booked, wd/we total, opex×7, adr, photos, min_nights, rating×10,
+# reviews, guests, bedrooms, baths, beds, lat, lng, len(address), len(location_name)
+_LAYOUT = struct.Struct("<8BHI3h4B7iihhhihhhhddHH")
+
+_FLAG_BITS = ("my_superhost", "my_instant", "my_extra_fee", "location_confirmed")
+_NONE = -1
+
+
+def _opt_int(v) -> int:
+    return _NONE if v is None else int(v)
+
+
+def _from_opt(v: int):
+    return None if v == _NONE else v
+
+
+@dataclass(slots=True)
+class CompactSession:
+    """init_state() 세션 키의 압축 표현."""
+
+    step: int
+    host_type: int
+    district: int
+    room_type: int
+    room_style: int
+    flags: int
+    calendar_month: int
+    calendar_year: int
+    booked_mask: int
+    my_occ_pct: int
+    weekday_occ_pct: int
+    weekend_occ_pct: int
+    weekdays_booked: int
+    weekends_booked: int
+    weekdays_total: int
+    weekends_total: int
+    opex: tuple
+    my_adr: int
+    my_photos: int
+    my_min_nights: int
+    my_rating_x10: int
+    my_reviews: int
+    my_guests: int
+    my_bedrooms: int
+    my_baths_count: int
+    my_beds: int
+    my_lat: float
+    my_lng: float
+    my_address: str
+    my_location_name: str
+
+    @classmethod
+    def from_state(cls, state) -> "CompactSession":
+        """st.session_state (또는 dict) → CompactSession. 코드표에 없는 값이면 ValueError."""
+        flags = 0
+        for bit, key in enumerate(_FLAG_BITS):
+            flags |= bool(state[key]) << bit
+        rating = state["my_rating"]
+        return cls(
+            step=int(state["step"]),
+            host_type=HOST_TYPES.index(state["host_type"]),
+            district=DISTRICTS.index(state["district"]),
+            room_type=ROOM_TYPES.index(state["room_type"]),
+            room_style=ROOM_STYLES.index(state["my_room_style"]),
+            flags=flags,
+            calendar_month=int(state["calendar_month"]),
+            calendar_year=int(state["calendar_year"]),
+            booked_mask=days_to_mask(state["booked_days"]),
+            my_occ_pct=_opt_int(state["my_occ_pct"]),
+            weekday_occ_pct=int(state["weekday_occ_pct"]),
+            weekend_occ_pct=int(state["weekend_occ_pct"]),
+            weekdays_booked=int(state["weekdays_booked"]),
+            weekends_booked=int(state["weekends_booked"]),
+            weekdays_total=int(state["weekdays_total"]),
+            weekends_total=int(state["weekends_total"]),
+            opex=tuple(int(state[k]) for k in OPEX_KEYS),
+            my_adr=_opt_int(state["my_adr"]),
+            my_photos=_opt_int(state["my_photos"]),
+            my_min_nights=_opt_int(state["my_min_nights"]),
+            my_rating_x10=_NONE if rating is None else int(round(float(rating) * 10)),
+            my_reviews=_opt_int(state["my_reviews"]),
+            my_guests=_opt_int(state["my_guests"]),
+            my_bedrooms=_opt_int(state["my_bedrooms"]),
+            my_baths_count=_opt_int(state["my_baths_count"]),
+            my_beds=_opt_int(state["my_beds"]),
+            my_lat=math.nan if state["my_lat"] is None else float(state["my_lat"]),
+            my_lng=math.nan if state["my_lng"] is None else float(state["my_lng"]),
+            my_address=state["my_address"] or "",
+            my_location_name=state["my_location_name"] or "",
+        )
+
+    def to_state(self) -> dict:
+        """CompactSession → init_state() 와 같은 키의 dict."""
+        state = {
+            "step": self.step,
+            "host_type": HOST_TYPES[self.host_type],
+            "district": DISTRICTS[self.district],
+            "room_type": ROOM_TYPES[self.room_type],
+            "my_room_style": ROOM_STYLES[self.room_style],
+            "calendar_year": self.calendar_year,
+            "calendar_month": self.calendar_month,
+            "booked_days": mask_to_days(self.booked_mask),
+            "my_occ_pct": _from_opt(self.my_occ_pct),
+            "weekday_occ_pct": self.weekday_occ_pct,
+            "weekend_occ_pct": self.weekend_occ_pct,
+            "weekdays_booked": self.weekdays_booked,
+            "weekends_booked": self.weekends_booked,
+            "weekdays_total": self.weekdays_total,
+            "weekends_total": self.weekends_total,
+            **dict(zip(OPEX_KEYS, self.opex)),
+            "my_adr": _from_opt(self.my_adr),
+            "my_photos": _from_opt(self.my_photos),
+            "my_min_nights": _from_opt(self.my_min_nights),
+            "my_rating": None if self.my_rating_x10 == _NONE else self.my_rating_x10 / 10,
+            "my_reviews": _from_opt(self.my_reviews),
+            "my_guests": _from_opt(self.my_guests),
+            "my_bedrooms": _from_opt(self.my_bedrooms),
+            "my_baths_count": _from_opt(self.my_baths_count),
+            "my_beds": _from_opt(self.my_beds),
+            "my_lat": None if math.isnan(self.my_lat) else self.my_lat,
+            "my_lng": None if math.isnan(self.my_lng) else self.my_lng,
+            "my_address": self.my_address,
+            "my_location_name": self.my_location_name,
+        }
+        for bit, key in enumerate(_FLAG_BITS):
+            state[key] = bool(self.flags >> bit & 1)
+        return state
+
+    def to_bytes(self) -> bytes:
+        addr = self.my_address.encode("utf-8")
+        loc = self.my_location_name.encode("utf-8")
+        head = _LAYOUT.pack(
+            _BLOB_VERSION, self.step, self.host_type, self.district, self.room_type,
+            self.room_style, self.flags, self.calendar_month, self.calendar_year,
+            self.booked_mask, self.my_occ_pct, self.weekday_occ_pct, self.weekend_occ_pct,
+            self.weekdays_booked, self.weekends_booked, self.weekdays_total, self.weekends_total,
+            *self.opex, self.my_adr, self.my_photos, self.my_min_nights, self.my_rating_x10,
+            self.my_reviews, self.my_guests, self.my_bedrooms, self.my_baths_count, self.my_beds,
+            self.my_lat, self.my_lng, len(addr), len(loc),
+        )
+        return head + addr + loc
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "CompactSession":
+        v = _LAYOUT.unpack_from(blob)
+        if v[0] != _BLOB_VERSION:
+            raise ValueError(f"지원하지 않는 세션 블롭 버전: {v[0]}")
+        off = _LAYOUT.size
+        addr = blob[off:off + v[-2]].decode("utf-8")
+        loc = blob[off + v[-2]:off + v[-2] + v[-1]].decode("utf-8")
+        names = [f.name for f in fields(cls)]
+        # opex 7개를 튜플로 묶어 필드 순서에 맞춤
+        i_opex = names.index("opex")
+        flat = list(v[1:-2])
+        values = flat[:i_opex] + [tuple(flat[i_opex:i_opex + 7])] + flat[i_opex + 7:]
+        return cls(*values, my_address=addr, my_location_name=loc)
+
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """컨테이너를 따라가며 합산한 객체 크기 (바이트, 공유 객체는 1회만)."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(x, seen) for x in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__)
+    return size
+
+
+def current_session() -> tuple[str, object]:
+    """현재 스크립트 실행의 (Streamlit 세션 id, 세션 SessionState).
+
+    get_script_run_ctx().session_state 는 ScriptRunner 마다 새로 만들어지는 SafeSessionState 라
+    실행이 끝나면 버려집니다. 유휴 세션을 비우려면 그 안의 세션 수명 SessionState 를 잡아야 합니다.
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id, ctx.session_state._state
+
+
+def streamlit_session_alive(session_id: str) -> bool:
+    """Streamlit 런타임에서 세션이 아직 연결돼 있는지 (런타임이 없으면 — AppTest 등 — True)."""
+    from streamlit.runtime import Runtime
+
+    return not Runtime.exists() or Runtime.instance().is_active_session(session_id)
+
+
+class SessionVault:
+    """유휴 세션의 상태를 압축 블롭으로 보관하고 SessionState 에서 비웁니다."""
+
+    def __init__(self, idle_seconds: float = 900.0, sweep_seconds: float = 60.0, start: bool = True,
+                 is_alive=None):
+        self.idle_seconds = idle_seconds
+        self.sweep_seconds = sweep_seconds
+        self.is_alive = is_alive or (lambda session_id: True)
+        self._blobs: dict[str, bytes] = {}
+        self._live: dict[str, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        if start:
+            threading.Thread(target=self._sweep, name="session-vault", daemon=True).start()
+
+    def touch(self, session_id: str, session_state) -> None:
+        """rerun · fragment 재실행마다 호출 — 마지막 실행 시각과 세션 SessionState 를 기록합니다."""
+        with self._lock:
+            self._live[session_id] = (time.monotonic(), session_state)
+
+    def restore(self, session_id: str | None) -> dict | None:
+        """이 세션의 블롭이 있으면 꺼내 세션 키 dict 로 복원합니다."""
+        if not session_id:
+            return None
+        with self._lock:
+            blob = self._blobs.pop(session_id, None)
+        return CompactSession.from_bytes(blob).to_state() if blob else None
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """닫힌 세션은 잊고, idle_seconds 이상 실행이 없던 세션을 블롭으로 바꿔 상태 키를 삭제합니다."""
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        with self._lock:
+            for session_id in [s for s in self._blobs if not self.is_alive(s)]:
+                del self._blobs[session_id]
+            for session_id, (last_seen, state) in list(self._live.items()):
+                if not self.is_alive(session_id):
+                    del self._live[session_id]   # 닫힌 세션 — SessionState 참조를 놓아줌
+                    continue
+                if now - last_seen < self.idle_seconds:
+                    continue
+                del self._live[session_id]
+                if "step" not in state:
+                    continue  # 이미 비워진 세션
+                try:
+                    blob = CompactSession.from_state(state).to_bytes()
+                except (KeyError, ValueError, TypeError):
+                    continue  # 코드표 밖 값 — 압축하지 않고 그대로 둠
+                self._blobs[session_id] = blob
+                for key in SESSION_KEYS:
+                    if key in state:
+                        del state[key]
+                evicted += 1
+        return evicted
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "live_sessions": len(self._live),
+                "evicted_sessions": len(self._blobs),
+                "evicted_bytes": sum(len(b) for b in self._blobs.values()),
+            }
+
+    def _sweep(self) -> None:
+        while not self._stop.wait(self.sweep_seconds):
+            self.evict_idle()
+
+
+# ── 메모리 비교 (직접 실행 시) ────────────────────────────────────────────────
+if __name__ == "__main__":
+    state = {
+        "step": 5, "host_type": "existing", "district": "Mapo-gu", "room_type": "entire_home",
+        "my_adr": 125000, "my_occ_pct": 64, "weekday_occ_pct": 59, "weekend_occ_pct": 78,
+        "weekdays_booked": 13, "weekends_booked": 7, "weekdays_total": 22, "weekends_total": 9,
+        "opex_elec": 80000, "opex_water": 30000, "opex_mgmt": 150000, "opex_net": 30000,
+        "opex_clean": 200000, "opex_loan": 0, "opex_etc": 50000,
+        "my_photos": 28, "my_superhost": True, "my_instant": False, "my_extra_fee": True,
+        "my_min_nights": 2, "my_rating": 4.8, "my_reviews": 57,
+        "my_guests": 4, "my_bedrooms": 2, "my_baths_count": 1, "my_beds": 2,
+        "my_room_style": "모던/미니멀", "calendar_year": 2026, "calendar_month": 3,
+        "booked_days": {1, 2, 3, 6, 7, 8, 13, 14, 15, 20, 21, 22, 24, 25, 26, 27, 28, 29, 30, 31},
+        "my_address": "마포구 서교동", "my_lat": 37.5555, "my_lng": 126.9249,
+        "my_location_name": "서교동, 마포구, 서울특별시, 대한민국", "location_confirmed": True,
+    }
+    compact = CompactSession.from_state(state)
+    blob = compact.to_bytes()
+    assert CompactSession.from_bytes(blob).to_state() == state
+
+    print("[세션 메모리 비교]")
+    print(f"  session_state dict : {deep_sizeof(state):>6,} bytes")
+    print(f"  CompactSession     : {deep_sizeof(compact):>6,} bytes")
+    print(f"  유휴 블롭 (bytes)  : {sys.getsizeof(blob):>6,} bytes  (payload {len(blob)} bytes)")
@@ -0,0 +1,10 @@
+"""pytest 공통 — 루트 모듈과 revpar_model_package 를 import 경로에 추가합니다."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PKG_DIR = ROOT / "revpar_model_package"
+for p in (ROOT, PKG_DIR):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
@@ -0,0 +1,24 @@
+"""booking_import — CSV 인코딩과 최근 12개월 요약."""
+
+from datetime import date
+
+import pytest
+
+from booking_import import load_bookings, trailing_summary
+
+CSV = "Start date,End date,Status\n2025-03-01,2025-03-04,확정\n2025-04-10,2025-04-12,취소됨\n"
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "cp949"])
+def test_csv_encodings(encoding):
+    hist = load_bookings(CSV.encode(encoding), "bookings.csv")
+    s = trailing_summary(hist, today=date(2025, 6, 15))
+    assert s["nights"] == 3
+
+
+def test_nights_counted_over_window():
+    csv = "Start date,End date\n2023-01-01,2023-01-11\n2025-03-01,2025-03-04\n"
+    hist = load_bookings(csv.encode(), "bookings.csv")
+    s = trailing_summary(hist, today=date(2025, 6, 15))
+    assert s["months"] == 12
+    assert s["nights"] == 3
@@ -0,0 +1,31 @@
+"""calibration — np.interp 보정이 sklearn IsotonicRegression 과 정확히 같은지."""
+
+import warnings
+
+import joblib
+import numpy as np
+import pytest
+
+from calibration import IsotonicCalibrator
+from predict_utils import _MODELS_DIR
+
+
+@pytest.fixture(scope="module")
+def iso():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")     # pkl 저장 당시 sklearn 버전 경고
+        return joblib.load(_MODELS_DIR / "iso_reg.pkl")
+
+
+def test_matches_sklearn_including_out_of_range(iso):
+    cal = IsotonicCalibrator.from_sklearn(iso)
+    lo, hi = cal.x_range
+    x = np.random.default_rng(0).uniform(lo * 0.5, hi * 1.2, 100_000)
+    np.testing.assert_array_equal(cal.predict(x), iso.predict(x))
+
+
+def test_scalar_call_returns_float(iso):
+    cal = IsotonicCalibrator.from_sklearn(iso)
+    v = cal(52_000.0)
+    assert isinstance(v, float)
+    assert v == iso.predict([52_000.0])[0]
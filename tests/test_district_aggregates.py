@@ -0,0 +1,61 @@
+"""district_aggregates — 델타 누적 결과가 처음부터 다시 집계한 결과와 같은지."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from district_aggregates import (
+    DISTRICT_CLUSTERED_PATH, DISTRICT_LOOKUP_PATH, DistrictAggregator,
+)
+
+
+def _listings(rng, ids, districts):
+    n = len(ids)
+    return pd.DataFrame({
+        "listing_id": ids,
+        "district": rng.choice(districts, n),
+        "room_type": rng.choice(["entire_home", "private_room"], n),
+        "refined_status": rng.choice(["Active", "Inactive"], n, p=[0.7, 0.3]),
+        "operation_status": rng.choice(["Operating", "Dormant"], n, p=[0.6, 0.4]),
+        "superhost": rng.random(n) < 0.4,
+        "ttm_revpar": rng.lognormal(10, 0.8, n),
+    })
+
+
+@pytest.fixture
+def tables():
+    return (pd.read_csv(DISTRICT_LOOKUP_PATH),
+            pd.read_csv(DISTRICT_CLUSTERED_PATH, encoding="utf-8-sig"))
+
+
+def test_deltas_match_full_rebuild(tables):
+    rng = np.random.default_rng(0)
+    districts = list(tables[0]["district"])
+    live = _listings(rng, np.arange(2_000), districts)
+    agg = DistrictAggregator(*tables)
+    agg.apply_snapshot(live)
+    next_id = 2_000
+    for _ in range(20):
+        removed = rng.choice(live["listing_id"], 50, replace=False)
+        changed = _listings(rng, rng.choice(np.setdiff1d(live["listing_id"], removed), 80, replace=False),
+                            districts)
+        added = _listings(rng, np.arange(next_id, next_id + 60), districts)
+        next_id += 60
+        agg.apply_delta(pd.concat([changed, added]), removed)
+        live = live[~live["listing_id"].isin(np.concatenate([removed, changed["listing_id"]]))]
+        live = pd.concat([live, changed, added], ignore_index=True)
+
+    fresh = DistrictAggregator(*tables)
+    fresh.apply_snapshot(live)
+    pd.testing.assert_frame_equal(agg.district_lookup(), fresh.district_lookup())
+    pd.testing.assert_frame_equal(agg.district_clustered(), fresh.district_clustered())
+    assert len(agg._row) == len(live)
+
+
+def test_snapshot_applies_only_changes(tables):
+    rng = np.random.default_rng(1)
+    snap = _listings(rng, np.arange(500), list(tables[0]["district"]))
+    agg = DistrictAggregator(*tables)
+    assert agg.apply_snapshot(snap) == 500
+    assert agg.apply_snapshot(snap) == 0
+    assert agg.apply_snapshot(snap.iloc[:-10]) == 10
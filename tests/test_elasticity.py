@@ -0,0 +1,34 @@
+"""elasticity — 100% 예약률 절단을 고려한 추정과 앱에 넘기는 값의 절단."""
+
+import numpy as np
+import pandas as pd
+
+from elasticity import ALL_ROOMS, ELASTICITY_CLIP, ElasticityTable, design, estimate, fit_loglog, \
+    synthetic_listings
+
+
+def test_uncensored_fit_matches_least_squares():
+    df, _ = synthetic_listings(n=2_000)
+    X, y = design(df[df["ttm_occupancy"] < 1.0])
+    beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+    assert np.isclose(fit_loglog(X, y, n_boot=0)["elasticity"], beta[1], atol=1e-6)
+
+
+def test_intervals_cover_synthetic_truth():
+    df, truth = synthetic_listings()
+    table = estimate(df, n_boot=200)
+    rows = table[table["room_type"] != ALL_ROOMS]
+    covered = [r.ci_low <= truth[(r.cluster_name, r.room_type)] <= r.ci_high for r in rows.itertuples()]
+    assert sum(covered) >= len(covered) - 1
+    assert (rows["censored"] > 0).all()
+
+
+def test_lookup_clips_point_and_interval():
+    table = ElasticityTable(pd.DataFrame([{
+        "cluster_name": "c", "room_type": "entire_home", "n": 500, "elasticity": -3.4,
+        "ci_low": -3.8, "ci_high": -2.9, "se": 0.2, "r2": 0.5, "censored": 0.1, "usable": True, "version": "v",
+    }]))
+    row = table.lookup("c", "entire_home")
+    assert row["clipped"] and row["raw_elasticity"] == -3.4
+    assert row["elasticity"] == row["ci_low"] == ELASTICITY_CLIP[0]
+    assert row["ci_high"] == -2.9
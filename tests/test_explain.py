@@ -0,0 +1,53 @@
+"""explain — TreeSHAP 기여도 합이 원래 예측과 같은지, 단건 빠른 경로가 배치 경로와 같은지."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from explain import CATEGORY_LABELS, aggregate_categories, explain_listing, feature_contributions
+from health_leaderboard import AO_PATH
+from predict_utils import load_models, predict_revpar_batch
+
+EXAMPLE = {
+    "cluster": 2, "nearest_poi_dist_km": 0.5, "poi_dist_category": "보통",
+    "bedrooms": 2, "baths": 1, "guests": 4, "room_type": "entire_home",
+    "nearest_poi_type_name": "관광지", "district_median_revpar": 50000,
+    "district_listing_count": 800, "district_superhost_rate": 0.25,
+    "district_entire_home_rate": 0.70, "ttm_pop": 100000,
+    "min_nights": 5, "instant_book": 0, "superhost": 0, "rating_overall": 4.6,
+    "photos_count": 12, "num_reviews": 20, "extra_guest_fee_policy": "1",
+    "photos_tier": "하", "is_active_operating": 1, "ttm_avg_rate": 110000,
+}
+
+
+@pytest.fixture(scope="module")
+def artifacts():
+    return load_models()
+
+
+@pytest.fixture(scope="module")
+def frame():
+    ao = pd.read_csv(AO_PATH).head(300)
+    f = pd.DataFrame([EXAMPLE] * len(ao))
+    for c in ("cluster", "num_reviews", "rating_overall", "photos_count", "min_nights",
+              "nearest_poi_dist_km", "bedrooms", "baths"):
+        f[c] = ao[c].to_numpy()
+    f["instant_book"] = ao["instant_book"].astype(int).to_numpy()
+    return f
+
+
+def test_contributions_sum_to_predictions(artifacts, frame):
+    adr, occ = feature_contributions(frame, **artifacts)
+    pred = predict_revpar_batch(frame, **artifacts)
+    np.testing.assert_allclose(np.expm1(adr.sum(axis=1)), pred["ADR_pred"], rtol=1e-9)
+    np.testing.assert_allclose(np.clip(occ.sum(axis=1), 0, 1), pred["Occ_pred"], atol=1e-9)
+
+
+def test_listing_fast_path_matches_batch(artifacts):
+    one = explain_listing(EXAMPLE, **artifacts)
+    adr, occ = feature_contributions(pd.DataFrame([EXAMPLE]), **artifacts)
+    adr_cat, occ_cat = aggregate_categories(adr).iloc[0], aggregate_categories(occ).iloc[0]
+    for cat in CATEGORY_LABELS:
+        assert np.isclose(one["adr_pct"][cat], np.expm1(adr_cat[cat]), atol=1e-12)
+        assert np.isclose(one["occ_pp"][cat], occ_cat[cat], atol=1e-12)
+    assert np.isclose(one["adr_base"], np.expm1(adr["base"].iloc[0]))
@@ -0,0 +1,39 @@
+"""health_leaderboard — 배치 채점이 리스팅별 compute_health_score 와 같은지, 순위 계산."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from health_leaderboard import AO_PATH, HealthLeaderboard, scalar_inputs, score_listings
+from predict_utils import HEALTH_COMPONENTS, compute_health_score
+
+
+@pytest.fixture(scope="module")
+def ao():
+    return pd.read_csv(AO_PATH)
+
+
+@pytest.fixture(scope="module")
+def scores(ao):
+    return score_listings(ao)
+
+
+def test_batch_matches_scalar(ao, scores):
+    rng = np.random.default_rng(0)
+    peers = {c: g for c, g in ao.groupby("cluster")}
+    for i in rng.choice(len(ao), 500, replace=False):
+        h = compute_health_score(scalar_inputs(ao.iloc[i]), peers[ao.iloc[i]["cluster"]])
+        row = scores.iloc[i]
+        assert h["composite"] == row["composite"]
+        assert h["grade"] == row["grade"]
+        assert all(h["components"][k] == row[k] for k in HEALTH_COMPONENTS)
+
+
+def test_rank_counts_higher_scores(scores):
+    board = HealthLeaderboard.from_scores(scores)
+    cluster = scores["cluster"].iloc[0]
+    peers = scores.loc[scores["cluster"] == cluster, "composite"].to_numpy()
+    v = float(np.median(peers))
+    r = board.rank(v, cluster=cluster)["cluster"]
+    assert r["n"] == len(peers)
+    assert r["rank"] == int((peers > v).sum()) + 1
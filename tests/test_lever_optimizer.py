@@ -0,0 +1,32 @@
+"""lever_optimizer — 같은 순이익 조합 중복 제거와 요금 그리드 끝 표시."""
+
+import pytest
+
+from lever_optimizer import ADR_DELTA_GRID, optimize_levers
+from predict_utils import load_models
+
+LISTING = {
+    "cluster": 2, "nearest_poi_dist_km": 0.5, "poi_dist_category": "보통",
+    "bedrooms": 2, "baths": 1, "guests": 4, "room_type": "entire_home",
+    "nearest_poi_type_name": "관광지", "district_median_revpar": 50000,
+    "district_listing_count": 800, "district_superhost_rate": 0.25,
+    "district_entire_home_rate": 0.70, "ttm_pop": 100000,
+    "min_nights": 5, "instant_book": 0, "superhost": 0, "rating_overall": 4.6,
+    "photos_count": 12, "num_reviews": 20, "extra_guest_fee_policy": "1",
+    "photos_tier": "하", "is_active_operating": 1, "ttm_avg_rate": 110000,
+}
+
+
+@pytest.fixture(scope="module")
+def top():
+    return optimize_levers(LISTING, 500_000, top_k=10, **load_models())
+
+
+def test_top_rows_have_distinct_outcomes(top):
+    assert top["net_profit"].round(0).is_unique
+    assert top["gain"].is_monotonic_decreasing
+
+
+def test_edge_flag_marks_grid_bounds(top):
+    edge = top["adr_delta"].isin((ADR_DELTA_GRID[0], ADR_DELTA_GRID[-1]))
+    assert (top["adr_at_edge"] == edge).all()
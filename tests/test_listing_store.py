@@ -0,0 +1,55 @@
+"""listing_store — 실패한 빌드 정리와 여러 워커의 동시 open."""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import listing_store
+from listing_store import ListingStore
+
+
+@pytest.fixture
+def sources(tmp_path):
+    raw, clustered, ao = tmp_path / "raw.csv", tmp_path / "clustered.csv", tmp_path / "ao.csv"
+    pd.DataFrame({
+        "district": ["Mapo-gu", "Jung-gu", "Mapo-gu"],
+        "room_type": ["entire_home", "private_room", "entire_home"],
+        "refined_status": ["Active", "Active", "Inactive"],
+        "operation_status": ["Operating", "Operating", "Dormant"],
+        "ttm_avg_rate": [100_000, 60_000, 80_000],
+    }).to_csv(raw, index=False)
+    pd.DataFrame({"district": ["Mapo-gu", "Jung-gu"], "cluster": [0, 1],
+                  "cluster_name": ["a", "b"]}).to_csv(clustered, index=False)
+    pd.DataFrame({"district": ["Mapo-gu"], "cluster": [0]}).to_csv(ao, index=False)
+    return raw, clustered, ao
+
+
+def test_failed_build_leaves_no_tmp(tmp_path, sources):
+    _, clustered, ao = sources
+    with pytest.raises(FileNotFoundError):
+        listing_store.build_store(tmp_path / "store.sqlite", tmp_path / "missing.csv", clustered, ao)
+    assert list(tmp_path.glob("store.sqlite*")) == []
+
+
+def test_concurrent_open_builds_once(tmp_path, sources, monkeypatch):
+    builds = []
+    real = listing_store.build_store
+
+    def slow_build(*args, **kwargs):
+        builds.append(1)
+        time.sleep(0.2)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(listing_store, "build_store", slow_build)
+    path = tmp_path / "store.sqlite"
+    stores = []
+    threads = [threading.Thread(target=lambda: stores.append(ListingStore.open(path, *sources)))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(builds) == 1
+    assert [len(s.bench("Mapo-gu", "entire_home")) for s in stores] == [1] * 4
@@ -0,0 +1,52 @@
+"""model_registry — 골든셋 재현과 검증을 통과한 아티팩트만 교체."""
+
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_registry import ARTIFACT_FILES, GOLDEN_FILE, ModelRegistry, load_golden_set, validate_artifacts
+from predict_utils import _MODELS_DIR, load_models, predict_revpar_batch
+
+
+@pytest.fixture(scope="module")
+def golden():
+    return load_golden_set(_MODELS_DIR)
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    for name in (*ARTIFACT_FILES, GOLDEN_FILE):
+        shutil.copy2(_MODELS_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+def test_current_artifacts_reproduce_golden(golden):
+    pred = predict_revpar_batch(pd.DataFrame(golden["inputs"]), **load_models())
+    for col in ("ADR_pred", "RevPAR_pred"):
+        np.testing.assert_allclose(pred[col], golden["expected"][col], atol=0.005)
+    assert validate_artifacts(load_models(), golden)[0]
+
+
+def test_drifted_golden_is_rejected(golden):
+    drifted = {**golden, "expected": {k: [v * 2 for v in vs] for k, vs in golden["expected"].items()}}
+    ok, msg = validate_artifacts(load_models(), drifted)
+    assert not ok and "ADR_pred" in msg
+
+
+def test_registry_swaps_only_valid_versions(models_dir):
+    registry = ModelRegistry(models_dir, start=False)
+    first = registry.version
+
+    config = json.loads((models_dir / "feature_config.json").read_text(encoding="utf-8"))
+    (models_dir / "feature_config.json").write_text(json.dumps(config, indent=2), encoding="utf-8")
+    assert registry.check_now(debounce=False)
+    assert registry.version != first
+
+    swapped = registry.version
+    (models_dir / "model_b.pkl").write_bytes(b"broken")
+    assert not registry.check_now(debounce=False)
+    assert registry.version == swapped
+    assert registry.history[-1]["status"] == "rejected"
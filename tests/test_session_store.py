@@ -0,0 +1,79 @@
+"""session_store — 유휴 세션 비우기 · 복원 (Streamlit AppTest 로 실제 세션을 돌려 확인)."""
+
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from session_store import SESSION_KEYS, CompactSession, SessionVault
+
+STATE = {
+    "step": 5, "host_type": "existing", "district": "Mapo-gu", "room_type": "entire_home",
+    "my_adr": 125000, "my_occ_pct": 64, "weekday_occ_pct": 59, "weekend_occ_pct": 78,
+    "weekdays_booked": 13, "weekends_booked": 7, "weekdays_total": 22, "weekends_total": 9,
+    "opex_elec": 80000, "opex_water": 30000, "opex_mgmt": 150000, "opex_net": 30000,
+    "opex_clean": 200000, "opex_loan": 0, "opex_etc": 50000,
+    "my_photos": 28, "my_superhost": True, "my_instant": False, "my_extra_fee": True,
+    "my_min_nights": 2, "my_rating": 4.8, "my_reviews": 57,
+    "my_guests": 4, "my_bedrooms": 2, "my_baths_count": 1, "my_beds": 2,
+    "my_room_style": "모던/미니멀", "calendar_year": 2026, "calendar_month": 3,
+    "booked_days": {1, 2, 3, 6, 7, 8, 13, 14, 15, 20, 21, 22},
+    "my_address": "마포구 서교동", "my_lat": 37.5555, "my_lng": 126.9249,
+    "my_location_name": "서교동, 마포구, 서울특별시, 대한민국", "location_confirmed": True,
+}
+
+# app.py 와 같은 흐름: 복원 → 초기화 → touch. 짧은 idle / sweep 으로 백그라운드 스윕이 실제로 돌게 함
+SCRIPT = f"""
+import streamlit as st
+from session_store import SessionVault, current_session
+
+@st.cache_resource
+def get_session_vault():
+    return SessionVault(idle_seconds=0.2, sweep_seconds=0.05)
+
+session_id, state = current_session()
+if "step" not in st.session_state:
+    st.session_state.update(get_session_vault().restore(session_id) or {{}})
+for k, v in {STATE!r}.items():
+    st.session_state.setdefault(k, v)
+get_session_vault().touch(session_id, state)
+st.text(type(state).__name__)
+"""
+
+
+def test_compact_session_round_trip():
+    assert CompactSession.from_bytes(CompactSession.from_state(STATE).to_bytes()).to_state() == STATE
+
+
+def test_idle_session_is_evicted_and_restored():
+    at = AppTest.from_string(SCRIPT).run()
+    assert not at.exception
+    # 실행마다 새로 만들어지는 SafeSessionState 래퍼가 아니라 세션 수명의 SessionState 를 기록
+    assert at.text[0].value == "SessionState"
+    at.session_state["my_adr"] = 99000
+
+    time.sleep(0.6)   # idle_seconds 를 넘겨 스윕이 돌 때까지
+    assert all(k not in at.session_state for k in SESSION_KEYS)
+
+    at.run()          # 사용자가 돌아와 rerun → 같은 세션 id 의 블롭으로 복원
+    assert at.session_state["step"] == 5
+    assert at.session_state["my_adr"] == 99000
+
+
+def test_active_session_is_not_evicted():
+    vault = SessionVault(idle_seconds=10, start=False)
+    state = dict(STATE)
+    vault.touch("a", state)
+    assert vault.evict_idle(now=time.monotonic() + 5) == 0
+    assert state["step"] == 5
+
+
+def test_closed_session_is_forgotten():
+    alive = {"a"}
+    vault = SessionVault(idle_seconds=1, start=False, is_alive=lambda s: s in alive)
+    vault.touch("a", dict(STATE))
+    assert vault.evict_idle(now=time.monotonic() + 5) == 1
+    assert vault.stats()["evicted_sessions"] == 1
+    alive.clear()
+    vault.evict_idle()
+    assert vault.stats() == {"live_sessions": 0, "evicted_sessions": 0, "evicted_bytes": 0}
+    assert vault.restore("a") is None